@@ -2,11 +2,13 @@
 Cached AST utilities for hook pattern matching.
 
 Provides AST-based extraction for patterns where regex is fragile.
-Falls back gracefully on parse errors.
+Falls back gracefully on parse errors. Parsing and fact extraction are
+shared with other Python-aware gates through lib/ast_cache.
 """
 
 import ast
-from functools import lru_cache
+
+from ast_cache import clear_memory, get_facts, parse
 
 # Standard library modules (Python 3.12) - skip these in dependency checks
 STDLIB_MODULES = frozenset(
@@ -213,13 +215,9 @@ STDLIB_MODULES = frozenset(
 )
 
 
-@lru_cache(maxsize=32)
 def _parse_python(content: str) -> ast.Module | None:
     """Parse Python with caching. Returns None on syntax error."""
-    try:
-        return ast.parse(content)
-    except SyntaxError:
-        return None
+    return parse(content)
 
 
 def extract_imports(content: str) -> set[str]:
@@ -237,22 +235,7 @@ def extract_imports(content: str) -> set[str]:
     - from foo.bar import baz  -> 'foo'
     - from . import foo  -> skipped (relative)
     """
-    tree = _parse_python(content)
-    if not tree:
-        return set()
-
-    imports = set()
-    for node in ast.walk(tree):
-        if isinstance(node, ast.Import):
-            for alias in node.names:
-                # Get top-level module (before first dot)
-                imports.add(alias.name.split(".")[0])
-        elif isinstance(node, ast.ImportFrom):
-            # Skip relative imports (module is None or level > 0)
-            if node.module and node.level == 0:
-                imports.add(node.module.split(".")[0])
-
-    return imports
+    return set(get_facts(content)["imports"])
 
 
 def extract_non_stdlib_imports(content: str) -> set[str]:
@@ -271,27 +254,8 @@ def extract_calls(content: str) -> tuple[set[str], set[str]]:
 
     More accurate than regex - ignores strings, comments, and variable names.
     """
-    tree = _parse_python(content)
-    if not tree:
-        return set(), set()
-
-    class_calls = set()
-    method_calls = set()
-
-    for node in ast.walk(tree):
-        if isinstance(node, ast.Call):
-            if isinstance(node.func, ast.Name):
-                name = node.func.id
-                # PascalCase heuristic: starts with uppercase
-                if name[0].isupper():
-                    class_calls.add(name)
-                else:
-                    method_calls.add(name)
-            elif isinstance(node.func, ast.Attribute):
-                # Method call like obj.method()
-                method_calls.add(node.func.attr)
-
-    return class_calls, method_calls
+    facts = get_facts(content)
+    return set(facts["class_calls"]), set(facts["method_calls"])
 
 
 def extract_all_calls(content: str) -> set[str]:
@@ -393,48 +357,15 @@ def find_mutable_defaults(content: str) -> list[tuple[str, int, str]]:
 
     More accurate than regex - handles multiline signatures, nested defaults.
     """
-    tree = _parse_python(content)
-    if not tree:
-        return []
-
     issues = []
-    for node in ast.walk(tree):
-        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
-            # Check positional defaults
-            for default in node.args.defaults:
-                mutable_type = _get_mutable_type(default)
-                if mutable_type:
-                    issues.append((node.name, node.lineno, mutable_type))
-                    break  # One warning per function
-
-            # Check keyword-only defaults
-            if not any(node.name == i[0] for i in issues):  # Skip if already flagged
-                for default in node.args.kw_defaults:
-                    if default is not None:
-                        mutable_type = _get_mutable_type(default)
-                        if mutable_type:
-                            issues.append((node.name, node.lineno, mutable_type))
-                            break
-
+    seen = set()
+    for name, lineno, mutable_type in get_facts(content)["mutable_defaults"]:
+        if (name, lineno) not in seen:  # One warning per function
+            seen.add((name, lineno))
+            issues.append((name, lineno, mutable_type))
     return issues
 
 
-def _get_mutable_type(node: ast.expr) -> str | None:
-    """Check if an AST node represents a mutable default value."""
-    if isinstance(node, ast.List):
-        return "[]"
-    elif isinstance(node, ast.Dict):
-        return "{}"
-    elif isinstance(node, ast.Set):
-        return "set literal"
-    elif isinstance(node, ast.Call):
-        # Check for list(), dict(), set() calls
-        if isinstance(node.func, ast.Name):
-            if node.func.id in ("list", "dict", "set"):
-                return f"{node.func.id}()"
-    return None
-
-
 def has_mutable_defaults(content: str) -> bool:
     """Quick check if code has any mutable defaults."""
     return len(find_mutable_defaults(content)) > 0
@@ -442,4 +373,4 @@ def has_mutable_defaults(content: str) -> bool:
 
 def clear_cache():
     """Clear the AST parse cache."""
-    _parse_python.cache_clear()
+    clear_memory()
@@ -2,6 +2,8 @@
 Bead (task tracking) helpers for hook runners.
 
 Provides caching and utility functions for interacting with the `bd` CLI.
+Bead queries are served from lib/bead_cache.py, an on-disk snapshot shared
+across hook processes.
 Extracted from pre_tool_use_runner.py to reduce file size and improve reusability.
 
 Integration Synergy:
@@ -25,38 +27,23 @@ LIB_DIR = Path(__file__).parent.parent / "lib"
 if str(LIB_DIR) not in sys.path:
     sys.path.insert(0, str(LIB_DIR))
 
-# Import shared bd client (no more temp file dance!)
-from bd_client import (  # noqa: E402
-    get_blocked_beads as _get_blocked,
-    get_open_beads as _get_open,
-    get_in_progress_beads as _get_in_progress,
-)
-
-# Simple per-process cache (hooks run as subprocesses, so this resets each call)
-_BD_CACHE: list | None = None
+# Cross-process snapshot cache (invalidated by beads DB mtime/size and bd_client writes)
+from bead_cache import get_cached_beads, invalidate as invalidate_bead_cache  # noqa: E402, F401
 
 
 def get_open_beads(state: "SessionState") -> list:
-    """Get open beads. Caches within single hook invocation."""
-    global _BD_CACHE
-
-    # Use cached result if already queried this invocation
-    if _BD_CACHE is not None:
-        return _BD_CACHE
-
+    """Get open and in_progress beads from the shared bead snapshot."""
     try:
-        _BD_CACHE = _get_open()
+        return get_cached_beads("open") + get_cached_beads("in_progress")
     except Exception as e:
         log_debug("_beads", f"bd list failed: {e}")
-        _BD_CACHE = []
-
-    return _BD_CACHE
+        return []
 
 
 def get_in_progress_beads(state: "SessionState") -> list:
     """Get beads currently being worked on."""
     try:
-        return _get_in_progress()
+        return get_cached_beads("in_progress")
     except Exception as e:
         log_debug("_beads", f"bd list in_progress failed: {e}")
         return []
@@ -79,7 +66,7 @@ def get_independent_beads(state: "SessionState") -> list:
     # Get blocked beads to exclude
     blocked_ids = set()
     try:
-        blocked = _get_blocked()
+        blocked = get_cached_beads("blocked")
         blocked_ids = {b.get("id") for b in blocked}
     except Exception as e:
         log_debug("_beads", f"bd blocked failed: {e}")
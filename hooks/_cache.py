@@ -5,7 +5,7 @@ Performance: Reduces repeated file I/O and subprocess calls.
 
 Features:
 - LRU cache with TTL for file reads
-- Git command cache with configurable TTL
+- Git state cache with configurable TTL (read from .git, no fork)
 - JSON parse cache with mtime invalidation
 """
 
@@ -15,6 +15,12 @@ import time
 from pathlib import Path
 from typing import Any, Optional
 
+import _lib_path  # noqa: F401
+
+try:
+    import git_probe
+except ImportError:
+    git_probe = None
 
 # =============================================================================
 # TTL CACHE DECORATOR
@@ -129,7 +135,11 @@ class FileCache:
 
 
 class GitCache:
-    """Cache git command results with TTL."""
+    """Cache git state with TTL.
+
+    Branch and status come from git_probe (reads .git directly); the git
+    CLI is only used when the probe is unavailable.
+    """
 
     def __init__(self, ttl_seconds: float = 5.0):
         self.ttl = ttl_seconds
@@ -161,8 +171,11 @@ class GitCache:
             if time.time() - timestamp < self.ttl:
                 return value
 
-        # Cache miss - run command
-        result = self._run_git("branch", "--show-current", cwd=cwd)
+        # Cache miss - read .git
+        if git_probe is not None:
+            result = git_probe.current_branch(cwd)
+        else:
+            result = self._run_git("branch", "--show-current", cwd=cwd)
         if result is not None:
             self._cache[cache_key] = (time.time(), result)
         return result
@@ -177,8 +190,11 @@ class GitCache:
             if time.time() - timestamp < self.ttl:
                 return value
 
-        # Cache miss - run command
-        result = self._run_git("status", "--porcelain", cwd=cwd)
+        # Cache miss - index stat cache (+ cached git status for staged/untracked)
+        if git_probe is not None:
+            result = git_probe.status_porcelain(cwd)
+        else:
+            result = self._run_git("status", "--porcelain", cwd=cwd)
         if result is not None:
             self._cache[cache_key] = (time.time(), result)
         return result
@@ -77,6 +77,7 @@ DEFAULTS = {
         "context_decay_warn_turns": 15,
         "context_decay_critical_turns": 30,
         "tech_risk_months_threshold": 6,
+        "quality_scan_budget_ms": 300,  # Max wait for ruff before deferring
     },
     "limits": {
         "context_items": 8,
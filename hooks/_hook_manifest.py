@@ -0,0 +1,282 @@
+"""
+Hook Manifest: Hook metadata (name, matcher, priority) without imports.
+
+Runners used to import every hook module up front so the @register_hook
+decorators could run - including gates that never match the current tool
+and their heavy dependencies. The manifest reads the decorators from the
+module source instead (AST, no import) and hands the runner LazyHook
+stand-ins that import the implementation on first call.
+
+The manifest is cached per runner and revalidated against each module's
+mtime/size on load (a stat per module), so it can never go stale. Modules
+whose registrations can't be read statically (non-literal arguments,
+conditional registration) are imported eagerly as before.
+
+Storage: ~/.claude/tmp/hook_manifest/<runner>.json
+
+Usage:
+    from _hook_manifest import load_hooks
+
+    HOOKS = load_hooks("post_tool_use", ["_hooks_state", ...], registry=HOOKS)
+"""
+
+from __future__ import annotations
+
+import importlib
+import json
+import os
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Optional
+
+import _lib_path  # noqa: F401
+from _atomic_io import write_json_atomic
+
+# `ast` is imported inside the scan functions: it is only needed when a
+# module changed, and importing it costs more than loading the manifest.
+if TYPE_CHECKING:
+    import ast
+
+HOOKS_DIR = Path(__file__).resolve().parent
+MANIFEST_DIR = HOOKS_DIR.parent / "tmp" / "hook_manifest"
+
+# Bump when the entry format or scan rules change
+MANIFEST_VERSION = 1
+
+# (name, matcher, priority, function)
+Entry = tuple[str, Optional[str], int, str]
+
+
+class LazyHook:
+    """Callable standing in for a hook function until its module is needed."""
+
+    __slots__ = ("module", "__name__", "_func")
+
+    def __init__(self, module: str, function: str):
+        self.module = module
+        self.__name__ = function
+        self._func: Callable | None = None
+
+    def resolve(self) -> Callable:
+        """Import the hook's module (once) and return the real function."""
+        if self._func is None:
+            self._func = getattr(importlib.import_module(self.module), self.__name__)
+        return self._func
+
+    def __call__(self, *args, **kwargs):
+        return self.resolve()(*args, **kwargs)
+
+    def __repr__(self) -> str:
+        state = "loaded" if self._func is not None else "lazy"
+        return f"<LazyHook {self.module}.{self.__name__} ({state})>"
+
+
+# =============================================================================
+# MATCHERS
+# =============================================================================
+
+_LITERAL_NAME = frozenset(
+    "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789_"
+)
+_MATCHER_CACHE: dict[Optional[str], Callable[[str], bool]] = {}
+
+
+def compile_matcher(matcher: Optional[str]) -> Callable[[str], bool]:
+    """Predicate equivalent to re.match(f"^({matcher})$", tool_name).
+
+    Most matchers are plain alternations of tool names ("Edit|Write"); those
+    become a set lookup instead of a compiled regex, which is most of the
+    cost of indexing ~50 hooks in a short-lived process.
+    """
+    func = _MATCHER_CACHE.get(matcher)
+    if func is not None:
+        return func
+    if matcher is None:
+        func = lambda tool_name: True  # noqa: E731
+    elif all(name and set(name) <= _LITERAL_NAME for name in matcher.split("|")):
+        func = frozenset(matcher.split("|")).__contains__
+    else:
+        import re
+
+        func = re.compile(f"^({matcher})$").match
+    _MATCHER_CACHE[matcher] = func
+    return func
+
+
+# =============================================================================
+# STATIC SCAN
+# =============================================================================
+
+
+def _is_register_call(node: ast.AST) -> bool:
+    import ast
+
+    if not isinstance(node, ast.Call):
+        return False
+    func = node.func
+    name = func.id if isinstance(func, ast.Name) else getattr(func, "attr", "")
+    return name == "register_hook"
+
+
+def _literal(node: ast.AST, constants: dict) -> object:
+    import ast
+
+    if isinstance(node, ast.Constant):
+        return node.value
+    if isinstance(node, ast.Name) and node.id in constants:
+        return constants[node.id]
+    raise ValueError("non-literal register_hook argument")
+
+
+def scan_source(source: str) -> list[Entry] | None:
+    """Registrations in a hook module's source, in registration order.
+
+    Returns None if any registration can't be read statically.
+    """
+    import ast
+
+    try:
+        tree = ast.parse(source)
+    except SyntaxError:
+        return None
+
+    constants = {}
+    for node in tree.body:
+        if (
+            isinstance(node, ast.Assign)
+            and len(node.targets) == 1
+            and isinstance(node.targets[0], ast.Name)
+            and isinstance(node.value, ast.Constant)
+        ):
+            constants[node.targets[0].id] = node.value.value
+
+    entries: list[Entry] = []
+    top_level = 0
+    for node in tree.body:
+        if not isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            continue
+        # Decorators apply bottom-up
+        for deco in reversed(node.decorator_list):
+            if not _is_register_call(deco):
+                continue
+            top_level += 1
+            params = dict(zip(("name", "matcher", "priority"), deco.args))
+            params.update((kw.arg, kw.value) for kw in deco.keywords)
+            try:
+                name = _literal(params["name"], constants)
+                matcher = (
+                    _literal(params["matcher"], constants)
+                    if "matcher" in params
+                    else None
+                )
+                priority = (
+                    _literal(params["priority"], constants)
+                    if "priority" in params
+                    else 50
+                )
+            except (KeyError, ValueError):
+                return None
+            if not isinstance(name, str) or not isinstance(priority, int):
+                return None
+            entries.append((name, matcher, priority, node.name))
+
+    # Registrations nested in if/try/functions aren't visible above
+    total = sum(
+        1
+        for node in ast.walk(tree)
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef))
+        for deco in node.decorator_list
+        if _is_register_call(deco)
+    )
+    return entries if total == top_level else None
+
+
+def module_path(module: str) -> Path:
+    return HOOKS_DIR / (module.replace(".", os.sep) + ".py")
+
+
+def _stamp(module: str) -> list[int] | None:
+    try:
+        st = os.stat(module_path(module))
+    except OSError:
+        return None
+    return [st.st_mtime_ns, st.st_size]
+
+
+# =============================================================================
+# MANIFEST
+# =============================================================================
+
+
+def build_manifest(modules: list[str]) -> dict:
+    """Scan modules and return a manifest dict (no caching)."""
+    stamps, entries = {}, {}
+    for module in modules:
+        stamps[module] = _stamp(module)
+        try:
+            source = module_path(module).read_text()
+        except OSError:
+            entries[module] = None
+            continue
+        entries[module] = scan_source(source)
+    return {"version": MANIFEST_VERSION, "stamps": stamps, "entries": entries}
+
+
+def load_manifest(runner: str, modules: list[str]) -> dict:
+    """Cached manifest for a runner, rebuilt when any module changed."""
+    path = MANIFEST_DIR / f"{runner}.json"
+    try:
+        with open(path) as f:
+            manifest = json.load(f)
+        if (
+            manifest.get("version") == MANIFEST_VERSION
+            and list(manifest["stamps"]) == modules
+            and all(manifest["stamps"][m] == _stamp(m) for m in modules)
+        ):
+            return manifest
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+
+    manifest = build_manifest(modules)
+    try:
+        write_json_atomic(path, manifest)
+    except OSError:
+        pass
+    return manifest
+
+
+def load_hooks(
+    runner: str, modules: list[str], registry: list | None = None
+) -> list[tuple[str, Optional[str], Callable, int]]:
+    """Registry tuples (name, matcher, func, priority) for a runner's modules.
+
+    Functions are LazyHook stand-ins, so no hook module is imported here.
+    Order matches eager import order (module order, then source order), and
+    CLAUDE_HOOK_DISABLE_<NAME>=1 is honoured as register_hook does.
+
+    Args:
+        runner: Manifest cache name
+        modules: Hook modules in registration order
+        registry: Shared HOOKS list the modules' register_hook appends to;
+            used for modules that must be imported eagerly
+
+    Returns:
+        Hook tuples in registration order (caller sorts by priority)
+    """
+    manifest = load_manifest(runner, modules)
+    hooks = []
+    for module in modules:
+        entries = manifest["entries"].get(module)
+        if entries is None:
+            # Not statically readable: import and take its real registrations
+            importlib.import_module(module)
+            hooks.extend(
+                hook
+                for hook in (registry or [])
+                if getattr(hook[2], "__module__", None) == module
+            )
+            continue
+        for name, matcher, priority, function in entries:
+            if os.environ.get(f"CLAUDE_HOOK_DISABLE_{name.upper()}", "0") == "1":
+                continue
+            hooks.append((name, matcher, LazyHook(module, function), priority))
+    return hooks
@@ -6,9 +6,10 @@ Hook modules import `register_hook` and `HOOKS` from here.
 """
 
 import os
-import re
 from typing import Optional, Callable
 
+from _hook_manifest import compile_matcher
+
 # Format: (name, matcher_pattern, check_function, priority)
 # Lower priority = runs first
 # matcher_pattern: None = all tools, str = regex pattern
@@ -45,9 +46,7 @@ def register_hook(name: str, matcher: Optional[str], priority: int = 50):
 
 def matches_tool(matcher: Optional[str], tool_name: str) -> bool:
     """Check if tool matches the hook's matcher pattern."""
-    if matcher is None:
-        return True
-    return bool(re.match(f"^({matcher})$", tool_name))
+    return bool(compile_matcher(matcher)(tool_name))
 
 
 def sort_hooks() -> None:
@@ -21,18 +21,23 @@ from _cooldown import (
     intuition_cooldown,
 )
 from _patterns import is_scratch_path
-from _config import get_magic_number
+from _config import get_magic_number, get_threshold
 
 from session_state import SessionState, get_adaptive_threshold, record_threshold_trigger
 
 # Quality scanner (ruff + radon)
 try:
-    from _quality_scanner import scan_file as quality_scan_file, format_report
+    from _quality_scanner import (
+        scan_file as quality_scan_file,
+        collect_late_results,
+        format_report,
+    )
 
     QUALITY_SCANNER_AVAILABLE = True
 except ImportError:
     QUALITY_SCANNER_AVAILABLE = False
     quality_scan_file = None
+    collect_late_results = None
     format_report = None
 
 
@@ -446,7 +451,9 @@ def check_quality_scan(
     """Scan code for quality issues using ruff (lint) and radon (complexity).
 
     Fast rule-based analysis - no ML model required.
-    Advisory only - warns but doesn't block.
+    Advisory only - warns but doesn't block. Waits at most
+    quality_scan_budget_ms for ruff; slower scans are reported on the
+    next Edit/Write instead.
     """
     if not QUALITY_SCANNER_AVAILABLE or quality_scan_file is None:
         return HookResult.none()
@@ -462,14 +469,17 @@ def check_quality_scan(
     if is_scratch_path(file_path):
         return HookResult.none()
 
-    # Scan file for quality issues
-    result = quality_scan_file(file_path, complexity_threshold="C")
+    # Deliver scans that missed their budget on an earlier edit
+    results = [r for r in collect_late_results() if r["file"] != file_path]
 
-    if result is None:
-        return HookResult.none()
+    # Scan file for quality issues
+    budget = get_threshold("quality_scan_budget_ms") / 1000
+    result = quality_scan_file(file_path, complexity_threshold="C", budget=budget)
+    if result is not None:
+        results.append(result)
 
     # Quality issues found - advisory warning
-    report = format_report(result)
+    report = "\n\n".join(filter(None, (format_report(r) for r in results)))
     if report:
         return HookResult.with_context(report)
 
@@ -43,6 +43,7 @@ from session_state import (
     extract_function_def_lines,
     add_pending_integration_grep,
     clear_integration_grep,
+    resolve_integration_callers,
     create_checkpoint,
     track_feature_file,
     complete_feature,
@@ -391,9 +392,28 @@ def _handle_read_tool(tool_input: dict, result: dict, state: SessionState) -> No
                 )
 
 
-def _handle_edit_tool(tool_input: dict, result: dict, state: SessionState) -> None:
-    """Handle Edit tool state updates."""
+def _update_symbol_index(filepath: str) -> None:
+    """Keep an existing project symbol index (caller graph) current after a write.
+
+    Journals just this file (one parse, one appended line); the index itself
+    is neither loaded nor rewritten here.
+    """
+    if not filepath.endswith(".py"):
+        return
+    try:
+        from symbol_index import record_write
+
+        record_write(filepath)
+    except (ImportError, OSError, ValueError):
+        pass
+
+
+def _handle_edit_tool(
+    tool_input: dict, result: dict, state: SessionState
+) -> str | None:
+    """Handle Edit tool state updates. Returns caller context if any."""
     filepath = tool_input.get("file_path", "")
+    context = None
     edit_error = _detect_error_in_result(result)
     if edit_error and filepath and ".claude/" in filepath:
         _trigger_self_heal(state, target=filepath, error=edit_error)
@@ -402,6 +422,7 @@ def _handle_edit_tool(tool_input: dict, result: dict, state: SessionState) -> No
         # Track for mastermind drift detection
         if not edit_error:
             _track_mastermind_file(filepath, state)
+            _update_symbol_index(filepath)
 
         old_code = tool_input.get("old_string", "")
         new_code = tool_input.get("new_string", "")
@@ -417,12 +438,14 @@ def _handle_edit_tool(tool_input: dict, result: dict, state: SessionState) -> No
                     new_def = new_func_lines.get(func_name)
                     if new_def is not None and old_def != new_def:
                         add_pending_integration_grep(state, func_name, filepath)
+                context = resolve_integration_callers(state, filepath) or None
         if (
             not edit_error
             and getattr(state, "self_heal_required", False)
             and ".claude/" in filepath
         ):
             _clear_self_heal(state)
+    return context
 
 
 def _handle_write_tool(
@@ -439,6 +462,7 @@ def _handle_write_tool(
         # Track for mastermind drift detection
         if not write_error:
             _track_mastermind_file(filepath, state)
+            _update_symbol_index(filepath)
 
         is_new_file = filepath not in state.files_read
         if is_new_file:
@@ -761,7 +785,7 @@ def check_state_updater(
     if tool_name == "Read":
         _handle_read_tool(tool_input, result, state)
     elif tool_name == "Edit":
-        _handle_edit_tool(tool_input, result, state)
+        warning = _handle_edit_tool(tool_input, result, state)
     elif tool_name == "Write":
         warning = _handle_write_tool(tool_input, result, state)
     elif tool_name == "Bash":
@@ -4,8 +4,15 @@ Unified logging framework for hook runners.
 Features:
 - Environment-controlled log levels via CLAUDE_HOOK_LOG_LEVEL
 - Consistent error logging with context
-- Optional file logging to .claude/tmp/hooks.log
+- Optional structured file logging (CLAUDE_HOOK_FILE_LOG=true)
 - Per-hook timing instrumentation
+
+File logging writes JSON records (ts, level, hook, event, session, msg,
+duration_ms) to .claude/tmp/hook_logs/hooks.jsonl. Records are buffered in
+memory and appended once at interpreter exit, DEBUG records are sampled at
+CLAUDE_HOOK_LOG_SAMPLE (default 0.1), and the file is rotated at
+LOG_MAX_BYTES. Each rotated segment's time range, hooks and levels are kept
+in index.json so query_logs() opens only the segments that can match.
 """
 
 import os
@@ -23,9 +30,18 @@ LOG_LEVELS = {"DEBUG": 10, "INFO": 20, "WARN": 30, "ERROR": 40, "NONE": 100}
 
 LOG_LEVEL = LOG_LEVELS.get(os.environ.get("CLAUDE_HOOK_LOG_LEVEL", "WARN").upper(), 30)
 
-LOG_FILE = Path.home() / ".claude" / "tmp" / "hooks.log"
+LOG_DIR = Path.home() / ".claude" / "tmp" / "hook_logs"
+LOG_FILE = LOG_DIR / "hooks.jsonl"
+LOG_INDEX = LOG_DIR / "index.json"
 FILE_LOGGING = os.environ.get("CLAUDE_HOOK_FILE_LOG", "").lower() == "true"
 
+LOG_MAX_BYTES = 1024 * 1024  # Rotate the active file at this size
+LOG_MAX_FILES = 10  # Rotated segments kept
+try:
+    DEBUG_SAMPLE_RATE = float(os.environ.get("CLAUDE_HOOK_LOG_SAMPLE", "0.1"))
+except ValueError:
+    DEBUG_SAMPLE_RATE = 0.1
+
 # Profiling enabled via environment
 PROFILING = os.environ.get("CLAUDE_HOOK_PROFILE", "").lower() == "true"
 
@@ -34,6 +50,17 @@ PROFILING = os.environ.get("CLAUDE_HOOK_PROFILE", "").lower() == "true"
 # LOGGING FUNCTIONS
 # =============================================================================
 
+# Hook event and session of the running runner, stamped on file records
+_context: dict[str, Optional[str]] = {"event": None, "session": None}
+
+
+def set_log_context(
+    event: Optional[str] = None, session_id: Optional[str] = None
+) -> None:
+    """Set the hook event and session recorded with file log records."""
+    _context["event"] = event
+    _context["session"] = session_id
+
 
 def _should_log(level: str) -> bool:
     """Check if message should be logged at given level."""
@@ -46,35 +73,51 @@ def _format_message(hook_name: str, level: str, message: str) -> str:
     return f"[{timestamp}] [{level}] [{hook_name}] {message}"
 
 
-def _write_log(message: str) -> None:
-    """Write log message to stderr and optionally to file."""
-    print(message, file=sys.stderr)
+def _emit(
+    hook_name: str,
+    level: str,
+    message: str,
+    duration_ms: Optional[float] = None,
+) -> None:
+    """Write a message to stderr and buffer its record for the file sink."""
+    print(_format_message(hook_name, level, message), file=sys.stderr)
 
-    if FILE_LOGGING:
-        try:
-            LOG_FILE.parent.mkdir(parents=True, exist_ok=True)
-            with open(LOG_FILE, "a") as f:
-                f.write(message + "\n")
-        except OSError:
-            pass
+    if not FILE_LOGGING:
+        return
+    if level == "DEBUG":
+        import random
+
+        if random.random() >= DEBUG_SAMPLE_RATE:
+            return
+    record = {
+        "ts": round(time.time(), 3),
+        "level": level,
+        "hook": hook_name,
+        "event": _context["event"],
+        "session": _context["session"],
+        "msg": message,
+    }
+    if duration_ms is not None:
+        record["duration_ms"] = round(duration_ms, 1)
+    _buffer_record(record)
 
 
 def log_debug(hook_name: str, message: str) -> None:
     """Log debug message."""
     if _should_log("DEBUG"):
-        _write_log(_format_message(hook_name, "DEBUG", message))
+        _emit(hook_name, "DEBUG", message)
 
 
 def log_info(hook_name: str, message: str) -> None:
     """Log info message."""
     if _should_log("INFO"):
-        _write_log(_format_message(hook_name, "INFO", message))
+        _emit(hook_name, "INFO", message)
 
 
 def log_warn(hook_name: str, message: str) -> None:
     """Log warning message."""
     if _should_log("WARN"):
-        _write_log(_format_message(hook_name, "WARN", message))
+        _emit(hook_name, "WARN", message)
 
 
 def log_error(hook_name: str, message: str, error: Optional[Exception] = None) -> None:
@@ -82,7 +125,175 @@ def log_error(hook_name: str, message: str, error: Optional[Exception] = None) -
     if _should_log("ERROR"):
         if error:
             message = f"{message}: {type(error).__name__}: {error}"
-        _write_log(_format_message(hook_name, "ERROR", message))
+        _emit(hook_name, "ERROR", message)
+
+
+def log_timing(hook_name: str, duration_ms: float, level: str = "DEBUG") -> None:
+    """Log a hook's or runner's execution time as a duration record."""
+    if _should_log(level):
+        _emit(hook_name, level, f"Completed in {duration_ms:.1f}ms", duration_ms)
+
+
+# =============================================================================
+# FILE SINK
+# =============================================================================
+
+_records: list[dict] = []
+_flush_registered = False
+
+
+def _buffer_record(record: dict) -> None:
+    global _flush_registered
+    _records.append(record)
+    if not _flush_registered:
+        import atexit
+
+        atexit.register(flush_logs)
+        _flush_registered = True
+
+
+def flush_logs() -> None:
+    """Append buffered records to the log file, rotating it when full.
+
+    Registered with atexit by the first buffered record.
+    """
+    if not _records:
+        return
+    import json
+
+    import _lib_path  # noqa: F401
+    from _atomic_io import locked
+
+    lines = "".join(json.dumps(r) + "\n" for r in _records)
+    _records.clear()
+    try:
+        with locked(LOG_DIR / ".lock"):
+            with open(LOG_FILE, "a") as f:
+                f.write(lines)
+                size = f.tell()
+            if size >= LOG_MAX_BYTES:
+                _rotate()
+    except OSError:
+        pass
+
+
+def _read_records(path: Path, needle: Optional[str] = None):
+    """Parse records from a log file, skipping lines without needle."""
+    import json
+
+    try:
+        with open(path) as f:
+            for line in f:
+                if needle and needle not in line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    continue
+    except OSError:
+        return
+
+
+def _load_index() -> dict:
+    import json
+
+    try:
+        index = json.loads(LOG_INDEX.read_text())
+        return index if isinstance(index, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+
+def _rotate() -> None:
+    """Move the active file to a segment and index it (caller holds lock)."""
+    from _atomic_io import write_json_atomic
+
+    start, end = None, None
+    hooks: set[str] = set()
+    levels: set[str] = set()
+    for record in _read_records(LOG_FILE):
+        ts = record.get("ts", 0)
+        start = ts if start is None else min(start, ts)
+        end = ts if end is None else max(end, ts)
+        hooks.add(record.get("hook", ""))
+        levels.add(record.get("level", ""))
+
+    stamp = int(time.time() * 1000)
+    while (LOG_DIR / f"hooks.{stamp}.jsonl").exists():
+        stamp += 1
+    name = f"hooks.{stamp}.jsonl"
+    os.replace(LOG_FILE, LOG_DIR / name)
+
+    index = _load_index()
+    index[name] = {
+        "start": start or 0,
+        "end": end or 0,
+        "hooks": sorted(hooks),
+        "levels": sorted(levels),
+    }
+    for old in sorted(index)[:-LOG_MAX_FILES]:
+        (LOG_DIR / old).unlink(missing_ok=True)
+        del index[old]
+
+    write_json_atomic(LOG_INDEX, index, indent=2)
+
+
+def query_logs(
+    hook: Optional[str] = None,
+    level: Optional[str] = None,
+    since: Optional[float] = None,
+    until: Optional[float] = None,
+    session: Optional[str] = None,
+    limit: Optional[int] = None,
+) -> list[dict]:
+    """File log records matching every given filter, oldest first.
+
+    Rotated segments whose indexed time range, hooks or levels rule them
+    out are not opened.
+
+    Args:
+        hook: Exact hook name
+        level: Minimum level (DEBUG, INFO, WARN, ERROR)
+        since: Earliest timestamp (epoch seconds)
+        until: Latest timestamp (epoch seconds)
+        session: Session ID
+        limit: Return only the newest `limit` matches
+
+    Returns:
+        List of record dicts
+    """
+    min_level = LOG_LEVELS.get(level.upper(), 0) if level else 0
+    wanted_levels = {name for name, n in LOG_LEVELS.items() if n >= min_level}
+
+    paths = []
+    for name, meta in sorted(_load_index().items()):
+        if since is not None and meta.get("end", 0) < since:
+            continue
+        if until is not None and meta.get("start", 0) > until:
+            continue
+        if hook and hook not in meta.get("hooks", ()):
+            continue
+        if not wanted_levels & set(meta.get("levels", ())):
+            continue
+        paths.append(LOG_DIR / name)
+    paths.append(LOG_FILE)
+
+    matches = []
+    for path in paths:
+        for record in _read_records(path, needle=hook):
+            ts = record.get("ts", 0)
+            if since is not None and ts < since:
+                continue
+            if until is not None and ts > until:
+                continue
+            if hook and record.get("hook") != hook:
+                continue
+            if LOG_LEVELS.get(record.get("level", ""), 0) < min_level:
+                continue
+            if session and record.get("session") != session:
+                continue
+            matches.append(record)
+    return matches[-limit:] if limit else matches
 
 
 # =============================================================================
@@ -156,7 +367,7 @@ def timed_hook(hook_name: str):
     finally:
         duration_ms = (time.perf_counter() - start) * 1000
         hook_timer.record(hook_name, duration_ms)
-        log_debug(hook_name, f"Completed in {duration_ms:.1f}ms")
+        log_timing(hook_name, duration_ms)
 
 
 def time_hook(func):
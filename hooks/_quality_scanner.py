@@ -6,23 +6,59 @@ Fast, reliable, and actionable - no ML model loading required.
 Detects:
 - Lint issues (ruff): style, imports, potential bugs
 - Complexity issues (radon): functions too complex, low maintainability
+
+Runs inside the PostToolUse path, so it is built to stay cheap:
+- Radon runs in-process via its Python API (CLI fallback if only the
+  command is installed); ruff is a single subprocess started up front.
+- Results are cached by file content hash (+ ruff binary and config), so
+  re-scanning identical content costs a hash and a small read.
+- With a budget, scan_file() waits at most that long for ruff. A scan that
+  misses the budget leaves ruff running detached and a pending marker;
+  collect_late_results() delivers it on the next invocation.
+
+Storage: ~/.claude/tmp/quality_scan/<key>.json, pending/<key>.{json,ruff.json}
 """
 
 from __future__ import annotations
 
-import subprocess
+import hashlib
 import json
+import os
+import subprocess
+import time
 from pathlib import Path
 from typing import Optional
 
+import _lib_path  # noqa: F401
+from _atomic_io import prune_oldest, write_json_atomic
+
+CACHE_DIR = Path(__file__).resolve().parent.parent / "tmp" / "quality_scan"
+PENDING_DIR = CACHE_DIR / "pending"
+
+# Bump when result shape or scan rules change so stale entries are ignored
+SCAN_VERSION = 1
+
+# Cached results kept before pruning the oldest quarter
+MAX_CACHE_ENTRIES = 500
+
+# Late results older than this are abandoned (ruff hung or was killed)
+PENDING_MAX_AGE = 120.0
 
-def scan_file(file_path: str, complexity_threshold: str = "C") -> Optional[dict]:
+_RUFF_CONFIGS = ("ruff.toml", ".ruff.toml", "pyproject.toml")
+
+
+def scan_file(
+    file_path: str, complexity_threshold: str = "C", budget: float | None = None
+) -> Optional[dict]:
     """
     Scan a Python file for quality issues.
 
     Args:
         file_path: Path to Python file
         complexity_threshold: Min complexity grade to report (A-F, default C)
+        budget: Max seconds to wait for ruff (None = wait for completion).
+            When exceeded, returns None and the result is delivered later by
+            collect_late_results()
 
     Returns:
         Dict with 'issues', 'complexity', 'recommendations' or None if clean
@@ -30,38 +66,80 @@ def scan_file(file_path: str, complexity_threshold: str = "C") -> Optional[dict]
     path = Path(file_path)
     if not path.exists() or path.suffix != ".py":
         return None
+    try:
+        content = path.read_bytes()
+    except OSError:
+        return None
 
-    issues = []
-    recommendations = []
+    deadline = time.monotonic() + budget if budget is not None else None
+    sha = hashlib.sha256(content).hexdigest()
+    key = _cache_key(sha, file_path, complexity_threshold)
+    hit, cached = _load_cached(key)
+    if hit:
+        return _for_file(cached, file_path)
 
-    # Run ruff for lint issues
-    ruff_issues = _run_ruff(file_path)
-    if ruff_issues:
-        issues.extend(ruff_issues)
-        recommendations.append("🔧 Run `ruff check --fix` to auto-fix style issues")
+    if _is_pending(key):
+        return None  # Same content already scanning; delivered when done
 
-    # Run radon for complexity
-    complexity = _run_radon_cc(file_path, complexity_threshold)
-    if complexity:
-        issues.extend(complexity)
-        recommendations.append(
-            "🧩 Consider breaking complex functions into smaller pieces"
-        )
+    # Start ruff first so it runs while radon works in-process
+    ruff_out = PENDING_DIR / f"{key}.ruff.json"
+    proc = _start_ruff(file_path, ruff_out)
 
-    # Run radon for maintainability index
-    mi_issues = _run_radon_mi(file_path)
-    if mi_issues:
-        issues.extend(mi_issues)
+    text = content.decode("utf-8", "replace")
+    radon_issues = _run_radon_cc(text, file_path, complexity_threshold)
+    radon_issues += _run_radon_mi(text, file_path)
 
-    if not issues:
+    ruff_issues = _finish_ruff(proc, ruff_out, deadline)
+    if ruff_issues is None:
+        _write_pending(key, sha, file_path, radon_issues)
         return None
 
-    return {
-        "file": file_path,
-        "issue_count": len(issues),
-        "issues": issues[:5],  # Limit to top 5
-        "recommendations": recommendations,
-    }
+    result = _build_result(file_path, ruff_issues, radon_issues)
+    _store_cached(key, result)
+    return result
+
+
+def collect_late_results() -> list[dict]:
+    """Results of earlier scans that missed their budget and have now finished.
+
+    Each pending scan is delivered once (the marker is claimed by unlinking)
+    and only while the file still has the scanned content.
+    """
+    delivered = []
+    try:
+        markers = list(PENDING_DIR.glob("*.pending.json"))
+    except OSError:
+        return delivered
+
+    for marker in markers:
+        try:
+            pending = json.loads(marker.read_text())
+        except (OSError, ValueError):
+            continue
+        key = marker.name.split(".", 1)[0]
+        ruff_out = PENDING_DIR / f"{key}.ruff.json"
+        ruff_issues = _read_ruff_output(ruff_out)
+        if ruff_issues is None:
+            if time.time() - pending.get("started", 0) > PENDING_MAX_AGE:
+                marker.unlink(missing_ok=True)
+                ruff_out.unlink(missing_ok=True)
+            continue
+        try:
+            marker.unlink()  # Claim: another runner may be delivering it
+        except FileNotFoundError:
+            continue
+        ruff_out.unlink(missing_ok=True)
+
+        file_path = pending["file"]
+        result = _build_result(file_path, ruff_issues, pending.get("radon", []))
+        _store_cached(key, result)
+        try:
+            current = hashlib.sha256(Path(file_path).read_bytes()).hexdigest()
+        except OSError:
+            continue
+        if result and current == pending.get("sha"):
+            delivered.append(result)
+    return delivered
 
 
 def scan_code(code: str, complexity_threshold: str = "C") -> Optional[dict]:
@@ -94,34 +172,240 @@ def scan_code(code: str, complexity_threshold: str = "C") -> Optional[dict]:
         Path(temp_path).unlink(missing_ok=True)
 
 
-def _run_ruff(file_path: str) -> list[dict]:
-    """Run ruff check and return issues."""
+# =============================================================================
+# CACHE
+# =============================================================================
+
+
+def _ruff_stamp(file_path: str) -> str:
+    """Ruff binary + nearest config, so upgrades and rule changes miss."""
     try:
-        result = subprocess.run(
-            ["ruff", "check", "--output-format=json", file_path],
-            capture_output=True,
-            text=True,
-            timeout=10,
+        from scan_pipeline import tool_fingerprint
+
+        binary = tool_fingerprint("ruff") or ""
+    except ImportError:
+        binary = ""
+    for parent in Path(file_path).resolve().parents:
+        for name in _RUFF_CONFIGS:
+            try:
+                st = os.stat(parent / name)
+            except OSError:
+                continue
+            return f"{binary}|{parent / name}:{st.st_mtime_ns}"
+    return binary
+
+
+def _cache_key(sha: str, file_path: str, threshold: str) -> str:
+    stamp = f"{SCAN_VERSION}|{sha}|{threshold}|{_ruff_stamp(file_path)}"
+    return hashlib.sha256(stamp.encode()).hexdigest()[:32]
+
+
+def _load_cached(key: str) -> tuple[bool, Optional[dict]]:
+    try:
+        with open(CACHE_DIR / f"{key}.json") as f:
+            return True, json.load(f)["result"]
+    except (OSError, ValueError, KeyError, TypeError):
+        return False, None
+
+
+def _store_cached(key: str, result: Optional[dict]) -> None:
+    """Atomic write, then prune the oldest entries; best effort."""
+    try:
+        write_json_atomic(
+            CACHE_DIR / f"{key}.json", {"result": result}, separators=(",", ":")
         )
-        if result.stdout:
-            data = json.loads(result.stdout)
-            return [
-                {
-                    "type": "lint",
-                    "code": item.get("code", ""),
-                    "message": item.get("message", ""),
-                    "line": item.get("location", {}).get("row", 0),
-                    "severity": _ruff_severity(item.get("code", "")),
-                }
-                for item in data[:10]  # Limit
-            ]
-    except (subprocess.TimeoutExpired, json.JSONDecodeError, FileNotFoundError):
+        prune_oldest(CACHE_DIR, MAX_CACHE_ENTRIES)
+    except OSError:
         pass
+
+
+def _for_file(result: Optional[dict], file_path: str) -> Optional[dict]:
+    if result is None:
+        return None
+    return {**result, "file": file_path}
+
+
+def _is_pending(key: str) -> bool:
+    try:
+        started = os.stat(PENDING_DIR / f"{key}.pending.json").st_mtime
+    except OSError:
+        return False
+    return time.time() - started < PENDING_MAX_AGE
+
+
+def _write_pending(key: str, sha: str, file_path: str, radon_issues: list) -> None:
+    marker = PENDING_DIR / f"{key}.pending.json"
+    data = {
+        "file": file_path,
+        "sha": sha,
+        "radon": radon_issues,
+        "started": time.time(),
+    }
+    try:
+        write_json_atomic(marker, data)
+    except OSError:
+        pass
+
+
+def _build_result(
+    file_path: str, ruff_issues: list[dict], radon_issues: list[dict]
+) -> Optional[dict]:
+    issues = []
+    recommendations = []
+
+    if ruff_issues:
+        issues.extend(ruff_issues)
+        recommendations.append("🔧 Run `ruff check --fix` to auto-fix style issues")
+
+    complexity = [i for i in radon_issues if i["type"] == "complexity"]
+    if complexity:
+        issues.extend(complexity)
+        recommendations.append(
+            "🧩 Consider breaking complex functions into smaller pieces"
+        )
+
+    issues.extend(i for i in radon_issues if i["type"] == "maintainability")
+
+    if not issues:
+        return None
+
+    return {
+        "file": file_path,
+        "issue_count": len(issues),
+        "issues": issues[:5],  # Limit to top 5
+        "recommendations": recommendations,
+    }
+
+
+# =============================================================================
+# RUFF (one subprocess, output to a file so it can outlive the hook)
+# =============================================================================
+
+
+def _start_ruff(file_path: str, out_path: Path) -> subprocess.Popen | None:
+    try:
+        PENDING_DIR.mkdir(parents=True, exist_ok=True)
+        with open(out_path, "w") as out:
+            return subprocess.Popen(
+                ["ruff", "check", "--output-format=json", file_path],
+                stdout=out,
+                stderr=subprocess.DEVNULL,
+                stdin=subprocess.DEVNULL,
+                start_new_session=True,  # Survives the hook if it runs late
+            )
+    except (OSError, ValueError):
+        out_path.unlink(missing_ok=True)
+        return None
+
+
+def _finish_ruff(
+    proc: subprocess.Popen | None, out_path: Path, deadline: float | None
+) -> list[dict] | None:
+    """Ruff issues, or None if ruff is still running past the deadline."""
+    if proc is None:
+        return []
+    timeout = 10.0 if deadline is None else max(0.0, deadline - time.monotonic())
+    try:
+        proc.wait(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        if deadline is None:
+            proc.kill()
+            out_path.unlink(missing_ok=True)
+            return []
+        return None
+    issues = _read_ruff_output(out_path) or []
+    out_path.unlink(missing_ok=True)
+    return issues
+
+
+def _read_ruff_output(out_path: Path) -> list[dict] | None:
+    """Parse ruff JSON output (None while incomplete)."""
+    try:
+        data = json.loads(out_path.read_text() or "null")
+    except FileNotFoundError:
+        return []
+    except (OSError, ValueError):
+        return None
+    if data is None:
+        return None
+    return [
+        {
+            "type": "lint",
+            "code": item.get("code", ""),
+            "message": item.get("message", ""),
+            "line": item.get("location", {}).get("row", 0),
+            "severity": _ruff_severity(item.get("code", "")),
+        }
+        for item in data[:10]  # Limit
+    ]
+
+
+# =============================================================================
+# RADON (in-process API, CLI fallback)
+# =============================================================================
+
+
+def _run_radon_cc(code: str, file_path: str, min_grade: str = "C") -> list[dict]:
+    """Cyclomatic complexity blocks at or above min_grade."""
+    try:
+        from radon.complexity import cc_rank, cc_visit
+    except ImportError:
+        return _run_radon_cc_cli(file_path, min_grade)
+    try:
+        blocks = [
+            (b.name, b.complexity, cc_rank(b.complexity), b.lineno)
+            for b in cc_visit(code)
+        ]
+    except Exception:
+        return []
+    return [
+        _complexity_issue(name, complexity, rank, lineno)
+        for name, complexity, rank, lineno in blocks
+        if rank >= min_grade
+    ]
+
+
+def _run_radon_mi(code: str, file_path: str, threshold: float = 50.0) -> list[dict]:
+    """Maintainability index issue if below threshold or rank C+."""
+    try:
+        from radon.metrics import mi_rank, mi_visit
+    except ImportError:
+        return _run_radon_mi_cli(file_path, threshold)
+    try:
+        mi = mi_visit(code, multi=True)
+    except Exception:
+        return []
+    return _mi_issues(mi, mi_rank(mi), threshold)
+
+
+def _complexity_issue(name: str, complexity: int, rank: str, lineno: int) -> dict:
+    return {
+        "type": "complexity",
+        "name": name,
+        "complexity": complexity,
+        "rank": rank,
+        "line": lineno,
+        "message": f"{name} has complexity {complexity} (rank {rank})",
+        "severity": _complexity_severity(rank),
+    }
+
+
+def _mi_issues(mi: float, rank: str, threshold: float) -> list[dict]:
+    if mi < threshold or rank in ("C", "D", "E", "F"):
+        return [
+            {
+                "type": "maintainability",
+                "mi_score": round(mi, 1),
+                "rank": rank,
+                "message": f"Maintainability index {round(mi, 1)} (rank {rank}) - consider refactoring",
+                "severity": _mi_severity(rank),
+            }
+        ]
     return []
 
 
-def _run_radon_cc(file_path: str, min_grade: str = "C") -> list[dict]:
-    """Run radon cyclomatic complexity check."""
+def _run_radon_cc_cli(file_path: str, min_grade: str = "C") -> list[dict]:
+    """Run radon cyclomatic complexity check (CLI)."""
     try:
         result = subprocess.run(
             ["radon", "cc", "-j", "-n", min_grade, file_path],
@@ -131,28 +415,23 @@ def _run_radon_cc(file_path: str, min_grade: str = "C") -> list[dict]:
         )
         if result.stdout:
             data = json.loads(result.stdout)
-            issues = []
-            for path, blocks in data.items():
-                for block in blocks:
-                    issues.append(
-                        {
-                            "type": "complexity",
-                            "name": block.get("name", ""),
-                            "complexity": block.get("complexity", 0),
-                            "rank": block.get("rank", ""),
-                            "line": block.get("lineno", 0),
-                            "message": f"{block.get('name')} has complexity {block.get('complexity')} (rank {block.get('rank')})",
-                            "severity": _complexity_severity(block.get("rank", "A")),
-                        }
-                    )
-            return issues
+            return [
+                _complexity_issue(
+                    block.get("name", ""),
+                    block.get("complexity", 0),
+                    block.get("rank", "A"),
+                    block.get("lineno", 0),
+                )
+                for blocks in data.values()
+                for block in blocks
+            ]
     except (subprocess.TimeoutExpired, json.JSONDecodeError, FileNotFoundError):
         pass
     return []
 
 
-def _run_radon_mi(file_path: str, threshold: float = 50.0) -> list[dict]:
-    """Run radon maintainability index check."""
+def _run_radon_mi_cli(file_path: str, threshold: float = 50.0) -> list[dict]:
+    """Run radon maintainability index check (CLI)."""
     try:
         result = subprocess.run(
             ["radon", "mi", "-j", file_path],
@@ -163,19 +442,10 @@ def _run_radon_mi(file_path: str, threshold: float = 50.0) -> list[dict]:
         if result.stdout:
             data = json.loads(result.stdout)
             issues = []
-            for path, info in data.items():
-                mi = info.get("mi", 100)
-                rank = info.get("rank", "A")
-                if mi < threshold or rank in ("C", "D", "E", "F"):
-                    issues.append(
-                        {
-                            "type": "maintainability",
-                            "mi_score": round(mi, 1),
-                            "rank": rank,
-                            "message": f"Maintainability index {round(mi, 1)} (rank {rank}) - consider refactoring",
-                            "severity": _mi_severity(rank),
-                        }
-                    )
+            for info in data.values():
+                issues += _mi_issues(
+                    info.get("mi", 100), info.get("rank", "A"), threshold
+                )
             return issues
     except (subprocess.TimeoutExpired, json.JSONDecodeError, FileNotFoundError):
         pass
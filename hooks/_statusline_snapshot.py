@@ -0,0 +1,223 @@
+"""
+Statusline snapshot: precomputed statusline fields shared across processes.
+
+The statusline command runs on every UI refresh, so it must not import the
+confidence system, parse transcripts or spawn subprocesses. Instead:
+
+- Hook runners publish session fields (confidence, serena, session start)
+  right after saving state, via publish_session_fields().
+- statusline.py --refresh (a detached background process) recomputes stale
+  system fields (git, ports, GPU, services, network, beads, context usage).
+- statusline.py renders straight from the snapshot and spawns a refresher
+  when fields are older than their TTL - it never waits for one. Refreshers
+  start at most once per REFRESH_MIN_INTERVAL.
+
+Writers merge into the snapshot under an flock, so runners publishing
+session fields and a refresher finishing at the same moment don't drop
+each other's fields.
+
+Snapshot: ~/.claude/tmp/statusline/<cwd_hash>.json
+    {"fields": {name: {"val": ..., "ts": epoch}}, "context": {...},
+     "refreshed_at": epoch}
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import _lib_path  # noqa: F401
+from _atomic_io import locked, write_json_atomic
+
+if TYPE_CHECKING:
+    from session_state import SessionState
+
+SNAPSHOT_DIR = Path(__file__).resolve().parent.parent / "tmp" / "statusline"
+
+# Refresh lock older than this is considered abandoned
+REFRESH_LOCK_TIMEOUT = 10.0
+
+# Minimum seconds between the end of one refresh and the next spawn; the
+# shortest TTLs below are about this long, so a render rarely spawns
+REFRESH_MIN_INTERVAL = 5.0
+
+# TTL per field (seconds) - tuned for typical change frequency
+FIELD_TTL: dict[str, float] = {
+    "cpu": 5,
+    "ram": 5,
+    "swap": 5,
+    "disk": 30,
+    "gpu": 5,  # VRAM can change during inference
+    "services": 5,  # Docker/node/python processes stable
+    "net": 10,  # Connectivity rarely changes
+    "git": 3,  # Changes with edits but not rapidly
+    "ports": 3,  # Dev servers start/stop occasionally
+    "beads": 5,  # Task status relatively stable
+    "project": 60,
+    "mm_turn": 3,
+    # Published by hook runners; the refresher only backfills these
+    "confidence": 30,
+    "serena": 30,
+    "started_at": 300,
+}
+
+
+def _cwd_key(cwd: str | None = None) -> str:
+    path = os.path.realpath(cwd or os.getcwd())
+    return hashlib.sha256(path.encode()).hexdigest()[:12]
+
+
+def snapshot_path(cwd: str | None = None) -> Path:
+    """Snapshot file for a working directory."""
+    return SNAPSHOT_DIR / f"{_cwd_key(cwd)}.json"
+
+
+def load_snapshot(cwd: str | None = None) -> dict[str, Any]:
+    """Load snapshot, returning an empty one when missing/invalid."""
+    try:
+        with open(snapshot_path(cwd)) as f:
+            data = json.load(f)
+        if isinstance(data, dict):
+            data.setdefault("fields", {})
+            return data
+    except (OSError, json.JSONDecodeError):
+        pass
+    return {"fields": {}}
+
+
+def update_snapshot(
+    fields: dict[str, Any] | None = None,
+    context: dict[str, Any] | None = None,
+    cwd: str | None = None,
+    refreshed: bool = False,
+) -> None:
+    """Merge fields into the snapshot (locked, atomic, best effort).
+
+    Args:
+        fields: Field values to stamp with the current time
+        context: Context usage to store, if given
+        cwd: Working directory whose snapshot to update
+        refreshed: Record this as a refresher run (see refresh_due())
+    """
+    path = snapshot_path(cwd)
+    try:
+        with locked(path.with_suffix(".write.lock")):
+            snapshot = load_snapshot(cwd)
+            now = time.time()
+            for name, value in (fields or {}).items():
+                snapshot["fields"][name] = {"val": value, "ts": now}
+            if context is not None:
+                snapshot["context"] = context
+            if refreshed:
+                snapshot["refreshed_at"] = now
+            write_json_atomic(path, snapshot)
+    except OSError:
+        pass
+
+
+def stale_fields(snapshot: dict[str, Any], now: float | None = None) -> list[str]:
+    """Names of fields missing or older than their TTL."""
+    now = time.time() if now is None else now
+    fields = snapshot.get("fields", {})
+    stale = []
+    for name, ttl in FIELD_TTL.items():
+        entry = fields.get(name)
+        if not entry or now - entry.get("ts", 0) >= ttl:
+            stale.append(name)
+    return stale
+
+
+def refresh_due(snapshot: dict[str, Any], now: float | None = None) -> bool:
+    """Whether REFRESH_MIN_INTERVAL has passed since the last refresher run."""
+    now = time.time() if now is None else now
+    return now - snapshot.get("refreshed_at", 0) >= REFRESH_MIN_INTERVAL
+
+
+def acquire_refresh_lock(cwd: str | None = None) -> bool:
+    """Claim the right to spawn a refresher (one at a time per snapshot)."""
+    lock = snapshot_path(cwd).with_suffix(".lock")
+    try:
+        lock.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(lock, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        os.close(fd)
+        return True
+    except FileExistsError:
+        try:
+            if time.time() - lock.stat().st_mtime > REFRESH_LOCK_TIMEOUT:
+                lock.unlink()
+                return acquire_refresh_lock(cwd)
+        except OSError:
+            pass
+        return False
+    except OSError:
+        return False
+
+
+def release_refresh_lock(cwd: str | None = None) -> None:
+    try:
+        snapshot_path(cwd).with_suffix(".lock").unlink()
+    except OSError:
+        pass
+
+
+# =============================================================================
+# SESSION FIELDS (published by hook runners)
+# =============================================================================
+
+
+def format_confidence(confidence: int, streak: int = 0, turn_count: int = 0) -> str:
+    """Confidence level with streak, fatigue and trajectory indicators."""
+    from _confidence_constants import STASIS_FLOOR
+    from _confidence_tiers import get_tier_info
+
+    _, emoji, _ = get_tier_info(confidence)
+
+    # Streak indicator
+    streak_str = ""
+    if streak >= 5:
+        streak_str = f" 🔥 {streak}"
+    elif streak >= 2:
+        streak_str = f" ⚡ {streak}"
+
+    # Fatigue indicator (v4.9) - show when not fresh
+    fatigue_str = ""
+    fatigue_mult = 1.0
+    try:
+        from _fatigue import get_fatigue_tier
+
+        tier, fatigue_emoji, fatigue_mult = get_fatigue_tier(turn_count)
+        if tier != "fresh":  # Only show if fatigued
+            fatigue_str = f" {fatigue_emoji}{fatigue_mult:.1f}x"
+    except ImportError:
+        fatigue_mult = 1.0  # Fallback if fatigue module not available
+
+    # Trajectory prediction (3 turns decay, adjusted for fatigue)
+    projected = confidence - int(3 * fatigue_mult)
+    trajectory = ""
+    if projected < STASIS_FLOOR and confidence >= STASIS_FLOOR:
+        trajectory = " 📉"
+
+    return f"{emoji} {confidence}%{streak_str}{fatigue_str}{trajectory}"
+
+
+def publish_session_fields(state: "SessionState") -> None:
+    """Push session-derived statusline fields (call after save_state)."""
+    try:
+        nudge_history = getattr(state, "nudge_history", {}) or {}
+        update_snapshot(
+            {
+                "confidence": format_confidence(
+                    getattr(state, "confidence", 70),
+                    nudge_history.get("_confidence_streak", 0),
+                    getattr(state, "turn_count", 0),
+                ),
+                "serena": bool(getattr(state, "serena_activated", False)),
+                "started_at": getattr(state, "started_at", 0) or 0,
+            }
+        )
+    except Exception:
+        pass  # Statusline must never break a hook
@@ -0,0 +1,152 @@
+"""
+Task Graph: Run independent hook steps concurrently with per-step timeouts.
+
+Each task runs in its own daemon thread as soon as its dependencies have
+finished. A task that overruns its timeout is abandoned (its thread keeps
+running but the result is dropped) and dependents proceed with its default
+value, so one slow step can't hold up the hook's output. An overall budget
+bounds the whole graph. A task with timeout=None is never abandoned: steps
+that write state run to completion, past the budget if need be, so callers
+never race a half-finished write.
+
+Threads are daemons so abandoned steps never delay process exit.
+
+Usage:
+    from _task_graph import Task, run_tasks
+
+    results, timings = run_tasks(
+        [
+            Task("project", lambda r: get_current_project(), timeout=2.0),
+            Task("state", lambda r: init(r["project"]), deps=("project",)),
+        ],
+        budget=4.0,
+    )
+"""
+
+from __future__ import annotations
+
+import math
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
+
+@dataclass
+class Task:
+    """A step in the graph.
+
+    func receives the results dict (values of finished tasks, defaults for
+    failed/timed-out ones) and returns this task's value. timeout=None waits
+    for the task however long it takes, even past the graph budget.
+    """
+
+    name: str
+    func: Callable[[dict[str, Any]], Any]
+    deps: tuple[str, ...] = ()
+    timeout: Optional[float] = 2.0
+    default: Any = None
+
+
+def run_tasks(
+    tasks: list[Task], budget: Optional[float] = None
+) -> tuple[dict[str, Any], list[dict]]:
+    """Run tasks respecting dependencies, concurrently where possible.
+
+    Args:
+        tasks: Tasks in any order; deps must name tasks in the list
+        budget: Seconds for the whole graph; unfinished tasks time out
+            (except timeout=None ones, which are waited for) and unstarted
+            ones are skipped when it runs out
+
+    Returns:
+        (results, timings): results maps every task name to its value (or
+        default); timings is one dict per task with name, status
+        (ok/error/timeout/skipped), start_ms and ms, in start order
+    """
+    by_name = {t.name: t for t in tasks}
+    for task in tasks:
+        unknown = [d for d in task.deps if d not in by_name]
+        if unknown:
+            raise ValueError(f"task {task.name!r} depends on unknown {unknown}")
+
+    t0 = time.perf_counter()
+    graph_deadline = t0 + budget if budget is not None else None
+    cond = threading.Condition()
+    results: dict[str, Any] = {}
+    finished: dict[str, dict] = {}
+    running: dict[str, tuple[float, float]] = {}  # name -> (start, deadline)
+    pending = list(tasks)
+
+    def finish(name: str, status: str, value: Any, start: float) -> None:
+        # Caller holds cond
+        if name in finished:
+            return  # Already timed out
+        running.pop(name, None)
+        results[name] = value
+        finished[name] = {
+            "name": name,
+            "status": status,
+            "start_ms": round((start - t0) * 1000, 1),
+            "ms": round((time.perf_counter() - start) * 1000, 1),
+        }
+        cond.notify_all()
+
+    def worker(task: Task, start: float, inputs: dict[str, Any]) -> None:
+        try:
+            value, status = task.func(inputs), "ok"
+        except Exception:
+            value, status = task.default, "error"
+        with cond:
+            finish(task.name, status, value, start)
+
+    with cond:
+        while pending or running:
+            now = time.perf_counter()
+
+            if graph_deadline is not None and now >= graph_deadline:
+                for name, (start, deadline) in list(running.items()):
+                    if deadline != math.inf:
+                        finish(name, "timeout", by_name[name].default, start)
+                for task in pending:
+                    finish(task.name, "skipped", task.default, now)
+                pending.clear()
+                if running:
+                    cond.wait()  # Uncapped tasks run to completion
+                continue
+
+            for task in [t for t in pending if all(d in finished for d in t.deps)]:
+                pending.remove(task)
+                start = time.perf_counter()
+                timeout = math.inf if task.timeout is None else task.timeout
+                running[task.name] = (start, start + timeout)
+                threading.Thread(
+                    target=worker,
+                    args=(task, start, dict(results)),
+                    name=f"task-{task.name}",
+                    daemon=True,
+                ).start()
+
+            if not running:
+                # Nothing running and nothing ready: dependency cycle
+                for task in pending:
+                    finish(task.name, "skipped", task.default, now)
+                break
+
+            deadlines = [d for _, d in running.values() if d != math.inf]
+            if graph_deadline is not None:
+                deadlines.append(graph_deadline)
+            if deadlines:
+                cond.wait(timeout=max(0.0, min(deadlines) - time.perf_counter()))
+            else:
+                cond.wait()
+
+            now = time.perf_counter()
+            for name, (start, deadline) in list(running.items()):
+                if now >= deadline:
+                    finish(name, "timeout", by_name[name].default, start)
+
+    for task in tasks:
+        results.setdefault(task.name, task.default)
+    timings = sorted(finished.values(), key=lambda t: t["start_ms"])
+    return results, timings
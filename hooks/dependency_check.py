@@ -14,14 +14,16 @@ Checks:
 9. Installed plugins (valid paths and structure)
 
 Features:
-- Fast (<500ms total with caching)
+- Fast (a few stats when nothing changed)
 - Non-blocking (warnings only, never fails session)
 - Comprehensive (catches missing deps before cryptic failures)
 - Auto-fix mode (--fix to install missing Python packages)
-- Result caching (5 min TTL to avoid re-checking mid-session)
-- Timeout protection on slow external commands
+- Per-probe caching keyed on each probe's declared inputs (binary paths,
+  site-packages mtimes, config hashes, plugin dirs) - see PROBES
+- Probes that must re-run execute concurrently, with timeout protection
 """
 
+import hashlib
 import json
 import os
 import sys
@@ -29,15 +31,21 @@ import shutil
 import subprocess
 import importlib.util
 import time
+from functools import partial
 from pathlib import Path
 
+import _lib_path  # noqa: F401
+from _atomic_io import write_json_atomic
+
 # =============================================================================
 # CONFIGURATION
 # =============================================================================
 
 # Cache settings
 CACHE_FILE = Path.home() / ".claude" / "tmp" / "dep_check_cache.json"
-CACHE_TTL_SECONDS = 300  # 5 minutes
+CACHE_VERSION = 2
+CACHE_TTL_SECONDS = 300  # 5 minutes, for probes without declarable inputs
+PROBE_MAX_AGE_SECONDS = 86400  # Re-run fingerprinted probes at least daily
 
 # Timeout for external commands (seconds)
 CMD_TIMEOUT_FAST = 2  # For quick commands like node --version
@@ -165,31 +173,22 @@ MCP_PROCESS_PATTERNS = [
 # =============================================================================
 
 
-def load_cache() -> dict | None:
-    """Load cached results if valid."""
-    if not CACHE_FILE.exists():
-        return None
-
+def load_cache() -> dict:
+    """Load cached probe entries ({probe: {fingerprint, cached_at, issues}})."""
     try:
         with open(CACHE_FILE) as f:
             cache = json.load(f)
-
-        # Check TTL
-        cached_at = cache.get("cached_at", 0)
-        if time.time() - cached_at > CACHE_TTL_SECONDS:
-            return None
-
-        return cache.get("result")
-    except (json.JSONDecodeError, KeyError, IOError):
-        return None
+        if cache.get("version") != CACHE_VERSION:
+            return {}
+        return cache.get("probes", {})
+    except (json.JSONDecodeError, KeyError, IOError, AttributeError):
+        return {}
 
 
-def save_cache(result: dict) -> None:
-    """Save results to cache."""
-    CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+def save_cache(probes: dict) -> None:
+    """Save probe entries to cache (atomic)."""
     try:
-        with open(CACHE_FILE, "w") as f:
-            json.dump({"cached_at": time.time(), "result": result}, f)
+        write_json_atomic(CACHE_FILE, {"version": CACHE_VERSION, "probes": probes})
     except IOError:
         pass  # Non-critical
 
@@ -344,43 +343,51 @@ def check_node_ecosystem() -> list[dict]:
     return issues
 
 
-def check_mcp_servers() -> list[dict]:
-    """Check MCP server dependencies with timeout protection."""
+def check_mcp_server(server_name: str) -> list[dict]:
+    """Check one MCP server's npm package with timeout protection."""
     issues = []
 
     if not shutil.which("npm"):
         return issues
 
-    for server_name, info in MCP_SERVERS.items():
-        package = info["package"]
-        is_global = info.get("global", False)
+    info = MCP_SERVERS[server_name]
+    package = info["package"]
+    is_global = info.get("global", False)
 
-        try:
-            cmd = ["npm", "list", package]
-            if is_global:
-                cmd.insert(2, "-g")
-
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=CMD_TIMEOUT_SLOW,
+    try:
+        cmd = ["npm", "list", package]
+        if is_global:
+            cmd.insert(2, "-g")
+
+        result = subprocess.run(
+            cmd,
+            capture_output=True,
+            text=True,
+            timeout=CMD_TIMEOUT_SLOW,
+        )
+
+        if result.returncode != 0 and "(empty)" not in result.stdout:
+            issues.append(
+                {
+                    "type": "mcp_server",
+                    "name": server_name,
+                    "package": package,
+                    "required": info.get("required", False),
+                    "hint": f"npm install {'-g ' if is_global else ''}{package}",
+                }
             )
+    except subprocess.TimeoutExpired:
+        # Skip slow checks, don't report as issue
+        pass
+
+    return issues
 
-            if result.returncode != 0 and "(empty)" not in result.stdout:
-                issues.append(
-                    {
-                        "type": "mcp_server",
-                        "name": server_name,
-                        "package": package,
-                        "required": info.get("required", False),
-                        "hint": f"npm install {'-g ' if is_global else ''}{package}",
-                    }
-                )
-        except subprocess.TimeoutExpired:
-            # Skip slow checks, don't report as issue
-            pass
 
+def check_mcp_servers() -> list[dict]:
+    """Check MCP server dependencies with timeout protection."""
+    issues = []
+    for server_name in MCP_SERVERS:
+        issues.extend(check_mcp_server(server_name))
     return issues
 
 
@@ -607,6 +614,224 @@ def check_installed_plugins() -> list[dict]:
     return issues
 
 
+# =============================================================================
+# PROBE INPUTS (cache fingerprints)
+# =============================================================================
+# Each returns the JSON-able state a probe's answer depends on. They must be
+# much cheaper than the probe (stats, small file hashes - no subprocesses).
+
+
+def _stamp(path) -> list | None:
+    """[mtime_ns, size] of a path, or None if missing."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return [st.st_mtime_ns, st.st_size]
+
+
+def _file_hash(path) -> str | None:
+    """Content hash of a (small) file, or None if unreadable."""
+    try:
+        with open(path, "rb") as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except OSError:
+        return None
+
+
+def _path_dir_inputs() -> list:
+    """PATH and its directories' mtimes (installs/removals change them)."""
+    dirs = [d for d in os.environ.get("PATH", "").split(os.pathsep) if d]
+    return [os.environ.get("PATH", ""), [_stamp(d) for d in dirs]]
+
+
+def _python_package_inputs() -> list:
+    """Interpreter and import path directories (site-packages mtime etc.)."""
+    return [sys.executable, [[p, _stamp(p)] for p in sys.path if p]]
+
+
+def _binary_inputs(name: str) -> list:
+    """Resolved binary and its stamp (upgrades replace the file)."""
+    path = shutil.which(name)
+    real = os.path.realpath(path) if path else None
+    return [real, _stamp(real) if real else None]
+
+
+def _npm_global_inputs() -> list:
+    """npm binary plus global node_modules dir and npm config."""
+    npm = _binary_inputs("npm")
+    node = shutil.which("node")
+    prefix = os.environ.get("NPM_CONFIG_PREFIX") or (
+        str(Path(os.path.realpath(node)).parent.parent) if node else ""
+    )
+    return [
+        npm,
+        prefix,
+        _stamp(Path(prefix) / "lib" / "node_modules") if prefix else None,
+        _stamp(Path.home() / ".npmrc"),
+    ]
+
+
+def _mcp_config_inputs() -> list:
+    """settings.json content plus the hooks dir its scripts live in."""
+    claude_dir = Path.home() / ".claude"
+    return [
+        _file_hash(claude_dir / "settings.json"),
+        _stamp(claude_dir / "hooks"),
+    ]
+
+
+def _plugin_inputs() -> list:
+    """installed_plugins.json content plus each install dir's mtime."""
+    plugins_file = Path.home() / ".claude" / "plugins" / "installed_plugins.json"
+    digest = _file_hash(plugins_file)
+    install_dirs = []
+    if digest:
+        try:
+            with open(plugins_file) as f:
+                plugins = json.load(f).get("plugins", {})
+            install_dirs = [
+                [install.get("installPath"), _stamp(install.get("installPath"))]
+                for installations in plugins.values()
+                if isinstance(installations, list)
+                for install in installations
+                if isinstance(install, dict) and install.get("installPath")
+            ]
+        except (json.JSONDecodeError, AttributeError, IOError):
+            pass
+    return [digest, install_dirs]
+
+
+# =============================================================================
+# PROBES
+# =============================================================================
+# name -> {"check": fn() -> issues, "inputs": fn() -> fingerprint inputs,
+#          "ttl": max cache age, "timeout": seconds when run concurrently}
+# Probes without "inputs" or "ttl" are cheap in-process checks that always run;
+# with only "ttl" the result is reused for that long (no inputs to declare).
+# Order is issue order in the report.
+
+PROBES = {
+    "critical_paths": {"check": check_critical_paths},
+    "venv": {"check": check_venv_integrity},
+    "binaries": {"check": check_binaries, "inputs": _path_dir_inputs},
+    "python_packages": {
+        "check": check_python_packages,
+        "inputs": _python_package_inputs,
+    },
+    "node": {
+        "check": check_node_ecosystem,
+        "inputs": partial(_binary_inputs, "node"),
+        "timeout": CMD_TIMEOUT_FAST + 1,
+    },
+    **{
+        f"mcp_server:{server_name}": {
+            "check": partial(check_mcp_server, server_name),
+            "inputs": _npm_global_inputs,
+            "timeout": CMD_TIMEOUT_SLOW + 1,
+        }
+        for server_name in MCP_SERVERS
+    },
+    "mcp_config": {"check": check_mcp_config, "inputs": _mcp_config_inputs},
+    # Running processes have no stable inputs: short TTL instead
+    "stale_mcp_processes": {
+        "check": check_stale_mcp_processes,
+        "ttl": CACHE_TTL_SECONDS,
+        "timeout": CMD_TIMEOUT_FAST + 1,
+    },
+    "api_keys": {"check": check_api_keys},
+    "plugins": {"check": check_installed_plugins, "inputs": _plugin_inputs},
+}
+
+
+def probe_fingerprint(name: str) -> str | None:
+    """Fingerprint of a probe's inputs (None for uncached probes)."""
+    probe = PROBES[name]
+    if "inputs" not in probe and "ttl" not in probe:
+        return None
+    inputs = probe["inputs"]() if "inputs" in probe else []
+    payload = json.dumps([CACHE_VERSION, name, inputs], default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()[:32]
+
+
+def run_probes(
+    use_cache: bool = True, refresh: bool = True
+) -> tuple[list[dict], dict[str, str]]:
+    """Run every probe, reusing cached results whose inputs are unchanged.
+
+    Probes that need to run are executed concurrently; a probe that times
+    out contributes no issues and is not cached. With refresh=False they
+    are not run at all: the last cached result (whatever its inputs) stands
+    in, and a later full run refreshes the cache.
+
+    Args:
+        use_cache: Reuse and update cached probe results.
+        refresh: Run probes whose cached result is missing or stale.
+
+    Returns:
+        (issues in PROBES order,
+         {probe: "cached"|"ok"|"error"|"timeout"|"pending"})
+    """
+    now = time.time()
+    cache = load_cache() if use_cache else {}
+    fingerprints = {name: probe_fingerprint(name) for name in PROBES}
+    results: dict[str, list] = {}
+    status: dict[str, str] = {}
+    to_run = []
+
+    for name, probe in PROBES.items():
+        fingerprint = fingerprints[name]
+        entry = cache.get(name)
+        if (
+            fingerprint is not None
+            and entry
+            and entry.get("fingerprint") == fingerprint
+            and now - entry.get("cached_at", 0)
+            < probe.get("ttl", PROBE_MAX_AGE_SECONDS)
+        ):
+            results[name] = entry.get("issues", [])
+            status[name] = "cached"
+        elif fingerprint is None and "timeout" not in probe:
+            results[name] = probe["check"]()  # Cheap: run inline
+            status[name] = "ok"
+        elif not refresh:
+            results[name] = entry.get("issues", []) if entry else []
+            status[name] = "pending"
+        else:
+            to_run.append(name)
+
+    if to_run:
+        from _task_graph import Task, run_tasks
+
+        ran, timings = run_tasks(
+            [
+                Task(
+                    name,
+                    lambda r, check=PROBES[name]["check"]: check(),
+                    timeout=PROBES[name].get("timeout", CMD_TIMEOUT_FAST),
+                    default=[],
+                )
+                for name in to_run
+            ],
+            budget=CMD_TIMEOUT_SLOW + 2,
+        )
+        for timing in timings:
+            name = timing["name"]
+            results[name] = ran[name]
+            status[name] = timing["status"]
+            if timing["status"] == "ok" and fingerprints[name] is not None:
+                cache[name] = {
+                    "fingerprint": fingerprints[name],
+                    "cached_at": now,
+                    "issues": ran[name],
+                }
+        if use_cache:
+            save_cache(cache)
+
+    issues = [issue for name in PROBES for issue in results.get(name, [])]
+    return issues, status
+
+
 # =============================================================================
 # FIX FUNCTIONS
 # =============================================================================
@@ -669,6 +894,7 @@ def run_dependency_check(
     verbose: bool = False,
     use_cache: bool = True,
     force_refresh: bool = False,
+    refresh: bool = True,
 ) -> dict:
     """Run all dependency checks and return results.
 
@@ -677,6 +903,9 @@ def run_dependency_check(
         verbose: If True, print progress messages during fix.
         use_cache: If True, use cached results if available.
         force_refresh: If True, ignore cache and run fresh checks.
+        refresh: If False, don't run slow probes whose cache is missing or
+            stale; report their last cached result and leave them "pending"
+            for a full run (SessionStart's critical path).
 
     Returns:
         dict with keys:
@@ -685,28 +914,16 @@ def run_dependency_check(
             - warnings: list of warnings (optional deps missing)
             - summary: str (human-readable summary)
             - fixed: int (number of issues fixed, if auto_fix=True)
-            - cached: bool (True if results came from cache)
+            - cached: bool (True if no probe needed re-running)
+            - probes: dict of probe -> "cached"/"ok"/"error"/"timeout"/"pending"
     """
-    # Check cache first (unless fixing or forcing refresh)
-    if use_cache and not auto_fix and not force_refresh:
-        cached = load_cache()
-        if cached:
-            cached["cached"] = True
-            return cached
-
-    all_issues = []
-
-    # Run all checks
-    all_issues.extend(check_critical_paths())
-    all_issues.extend(check_venv_integrity())
-    all_issues.extend(check_binaries())
-    all_issues.extend(check_python_packages())
-    all_issues.extend(check_node_ecosystem())
-    all_issues.extend(check_mcp_servers())
-    all_issues.extend(check_mcp_config())
-    all_issues.extend(check_stale_mcp_processes())
-    all_issues.extend(check_api_keys())
-    all_issues.extend(check_installed_plugins())
+    # Run all probes; unchanged inputs are answered from cache
+    if auto_fix or force_refresh:
+        clear_cache()
+    all_issues, probe_status = run_probes(
+        use_cache=use_cache and not auto_fix,
+        refresh=refresh or auto_fix or force_refresh,
+    )
 
     fixed_count = 0
 
@@ -772,13 +989,13 @@ def run_dependency_check(
         "warnings": warnings,
         "summary": "\n".join(summary_parts),
         "fixed": fixed_count,
-        "cached": False,
+        "cached": all(
+            state == "cached" or PROBES[name].keys() == {"check"}
+            for name, state in probe_status.items()
+        ),
+        "probes": probe_status,
     }
 
-    # Save to cache (if not fixing)
-    if use_cache and not auto_fix:
-        save_cache(result)
-
     return result
 
 
@@ -5,6 +5,11 @@ Gates Package - Modular PreToolUse hook gates.
 This package breaks down pre_tool_use_runner.py into category-based modules.
 Each module registers its hooks into the shared HOOKS list on import.
 
+Importing the package does NOT import the gate modules: the runner reads
+their registrations from _hook_manifest and imports a module only when one
+of its gates matches the tool. The check_* re-exports below resolve lazily
+on first attribute access.
+
 Modules:
   _serena.py     - Serena activation and code tool gates
   _content.py    - Content quality gates (dangerous patterns, stubs, docs, etc.)
@@ -13,107 +18,125 @@ Modules:
   _pal.py        - PAL mandate enforcement gates
   _beads.py      - Beads/parallel execution gates
   _meta.py       - Meta/recovery gates (self-heal, caching, thinking coach)
+  (+ _mastermind_mandate, _agent_preflight, _delegation,
+     _workflow_enforcement, _blast_radius)
 """
 
 from ._common import HOOKS, register_hook, HookResult
-from ._serena import (
-    check_serena_universal_gate,
-    check_serena_activation_gate,
-    check_code_tools_require_serena,
-)
-from ._content import (
-    check_content_gate,
-    suggest_crawl4ai,
-    check_god_component_gate,
-    check_gap_detector,
-    check_production_gate,
-    check_deferral_gate,
-    check_doc_theater_gate,
-    check_root_pollution_gate,
-    check_recommendation_gate,
-    check_security_claim_gate,
-    check_epistemic_boundary,
-    check_research_gate,
-    check_import_gate,
-    check_modularization,
-    inject_curiosity_prompt,
-)
-from ._confidence import (
-    check_homeostatic_drive,
-    check_threat_anticipation,
-    check_confidence_tool_gate,
-    check_oracle_gate,
-    check_confidence_external_suggestion,
-    check_integration_gate,
-    check_error_suppression,
-)
-from ._bash import (
-    check_loop_detector,
-    check_python_path_enforcer,
-    check_script_nudge,
-    check_inline_server_background,
-    check_background_enforcer,
-    check_probe_gate,
-    check_commit_gate,
-    check_tool_preference,
-    check_hf_cli_redirect,
-)
-from ._pal import (
-    check_pal_mandate_enforcer,
-    track_pal_tool_usage,
-    check_pal_proactive_consultation,
-    suggest_pal_continuation,
-    check_pal_mandate_lock,
-    clear_pal_mandate_lock,
-)
-from ._mastermind_mandate import (
-    check_mastermind_mandate,
-)
-from ._beads import (
-    check_parallel_nudge,
-    check_beads_parallel,
-    check_bead_enforcement,
-    check_parallel_bead_delegation,
-    check_recursion_guard,
-)
-from ._agent_preflight import (
-    check_agent_preflight,
-)
-from ._delegation import (
-    check_exploration_circuit_breaker,
-    check_debug_circuit_breaker,
-    check_research_circuit_breaker,
-    check_review_circuit_breaker,
-    check_docs_skill_circuit_breaker,
-    check_commit_skill_circuit_breaker,
-    check_think_skill_circuit_breaker,
-)
-from ._meta import (
-    check_fp_fix_enforcer,
-    check_self_heal_enforcer,
-    check_read_cache,
-    check_exploration_cache,
-    check_sunk_cost,
-    check_thinking_coach,
-    check_thinking_suggester,
-)
-from ._workflow_enforcement import (
-    check_workflow_beads_check,
-    check_workflow_pal_gate,
-    check_workflow_memory_gate,
-    check_workflow_research_gate,
-    check_workflow_bead_gate,
-)
-from ._blast_radius import (
-    check_blast_radius_gate,
+
+# Gate modules in registration order (runner manifest + load_all())
+GATE_MODULES = (
+    "_serena",
+    "_content",
+    "_confidence",
+    "_bash",
+    "_pal",
+    "_mastermind_mandate",
+    "_beads",
+    "_agent_preflight",
+    "_delegation",
+    "_meta",
+    "_workflow_enforcement",
+    "_blast_radius",
 )
 
+# Re-exported gate function -> defining module
+_EXPORTS = {
+    "check_serena_activation_gate": "_serena",
+    "check_code_tools_require_serena": "_serena",
+    "check_content_gate": "_content",
+    "suggest_crawl4ai": "_content",
+    "check_god_component_gate": "_content",
+    "check_gap_detector": "_content",
+    "check_production_gate": "_content",
+    "check_deferral_gate": "_content",
+    "check_doc_theater_gate": "_content",
+    "check_root_pollution_gate": "_content",
+    "check_recommendation_gate": "_content",
+    "check_security_claim_gate": "_content",
+    "check_epistemic_boundary": "_content",
+    "check_research_gate": "_content",
+    "check_import_gate": "_content",
+    "check_modularization": "_content",
+    "inject_curiosity_prompt": "_content",
+    "check_homeostatic_drive": "_confidence",
+    "check_threat_anticipation": "_confidence",
+    "check_confidence_tool_gate": "_confidence",
+    "check_oracle_gate": "_confidence",
+    "check_confidence_external_suggestion": "_confidence",
+    "check_integration_gate": "_confidence",
+    "check_error_suppression": "_confidence",
+    "check_loop_detector": "_bash",
+    "check_python_path_enforcer": "_bash",
+    "check_script_nudge": "_bash",
+    "check_inline_server_background": "_bash",
+    "check_background_enforcer": "_bash",
+    "check_probe_gate": "_bash",
+    "check_commit_gate": "_bash",
+    "check_tool_preference": "_bash",
+    "check_hf_cli_redirect": "_bash",
+    "check_pal_mandate_enforcer": "_pal",
+    "track_pal_tool_usage": "_pal",
+    "check_pal_proactive_consultation": "_pal",
+    "suggest_pal_continuation": "_pal",
+    "check_pal_mandate_lock": "_pal",
+    "clear_pal_mandate_lock": "_pal",
+    "check_mastermind_mandate": "_mastermind_mandate",
+    "check_parallel_nudge": "_beads",
+    "check_beads_parallel": "_beads",
+    "check_bead_enforcement": "_beads",
+    "check_parallel_bead_delegation": "_beads",
+    "check_recursion_guard": "_beads",
+    "check_agent_preflight": "_agent_preflight",
+    "check_exploration_circuit_breaker": "_delegation",
+    "check_debug_circuit_breaker": "_delegation",
+    "check_research_circuit_breaker": "_delegation",
+    "check_review_circuit_breaker": "_delegation",
+    "check_docs_skill_circuit_breaker": "_delegation",
+    "check_commit_skill_circuit_breaker": "_delegation",
+    "check_think_skill_circuit_breaker": "_delegation",
+    "check_fp_fix_enforcer": "_meta",
+    "check_self_heal_enforcer": "_meta",
+    "check_read_cache": "_meta",
+    "check_exploration_cache": "_meta",
+    "check_sunk_cost": "_meta",
+    "check_thinking_coach": "_meta",
+    "check_thinking_suggester": "_meta",
+    "check_workflow_beads_check": "_workflow_enforcement",
+    "check_workflow_pal_gate": "_workflow_enforcement",
+    "check_workflow_memory_gate": "_workflow_enforcement",
+    "check_workflow_research_gate": "_workflow_enforcement",
+    "check_workflow_bead_gate": "_workflow_enforcement",
+    "check_blast_radius_gate": "_blast_radius",
+}
+
+
+def __getattr__(name: str):
+    """Resolve check_* re-exports by importing their gate module (PEP 562)."""
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from importlib import import_module
+
+    return getattr(import_module(f".{module}", __name__), name)
+
+
+def load_all() -> list:
+    """Import every gate module (eager registration) and return HOOKS."""
+    from importlib import import_module
+
+    for module in GATE_MODULES:
+        import_module(f".{module}", __name__)
+    return HOOKS
+
+
 __all__ = [
     "HOOKS",
     "register_hook",
     "HookResult",
+    "GATE_MODULES",
+    "load_all",
     # Serena gates
-    "check_serena_universal_gate",
     "check_serena_activation_gate",
     "check_code_tools_require_serena",
     # Content gates
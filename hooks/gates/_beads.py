@@ -18,14 +18,6 @@ from session_state import SessionState
 from ._common import register_hook, HookResult
 from ._bash import strip_heredoc_content
 
-# =============================================================================
-# SHARED STATE FOR BEADS CACHING
-# =============================================================================
-
-# Cache for bd command results (shared with pre_tool_use_runner.py)
-_BD_CACHE: dict = {}
-_BD_CACHE_TURN: int = 0
-
 # =============================================================================
 # HELPER CONSTANTS AND FUNCTIONS
 # =============================================================================
@@ -134,8 +126,6 @@ def check_beads_parallel(data: dict, state: SessionState) -> HookResult:
 
     PATTERN: Multiple bd create/update/close commands should be batched or parallelized.
     """
-    global _BD_CACHE, _BD_CACHE_TURN
-
     tool_input = data.get("tool_input", {})
     command = tool_input.get("command", "")
 
@@ -143,9 +133,10 @@ def check_beads_parallel(data: dict, state: SessionState) -> HookResult:
     if not re.search(r"\bbd\s+(create|update|close|dep)", command):
         return HookResult.approve()
 
-    # Invalidate cache - bd state is changing
-    _BD_CACHE = {}
-    _BD_CACHE_TURN = 0
+    # Invalidate shared bead snapshot - bd state is changing
+    from _beads import invalidate_bead_cache
+
+    invalidate_bead_cache()
 
     # Track beads commands
     if not hasattr(state, "recent_beads_commands"):
@@ -247,6 +238,10 @@ def _auto_create_and_claim_bead(
         if result.returncode != 0:
             return False, f"claim failed: {result.stderr}"
 
+        from _beads import invalidate_bead_cache
+
+        invalidate_bead_cache()
+
         # Track the auto-created bead
         if not hasattr(state, "auto_created_beads"):
             state.auto_created_beads = []
@@ -336,6 +331,9 @@ def check_bead_enforcement(data: dict, state: SessionState) -> HookResult:
                     timeout=5,
                 )
                 if result.returncode == 0:
+                    from _beads import invalidate_bead_cache
+
+                    invalidate_bead_cache()
                     return HookResult.approve(
                         f"📋 **Auto-claimed bead**: `{bead_id[:12]}` - {bead_title}"
                     )
@@ -315,8 +315,12 @@ def check_confidence_external_suggestion(data: dict, state: SessionState) -> Hoo
 
 @register_hook("integration_gate", "Edit|Write|Task", priority=35)
 def check_integration_gate(data: dict, state: SessionState) -> HookResult:
-    """Enforce grep after function edits."""
-    from session_state import check_integration_blindness
+    """Enforce caller verification after function edits.
+
+    Python edits are verified from the symbol index caller graph (callers are
+    injected as context); other languages still require a grep.
+    """
+    from session_state import check_integration_blindness, resolve_integration_callers
 
     # Subagent bypass: Fresh agents shouldn't inherit pending greps from parent (v4.32)
     if _is_subagent_confidence(state):
@@ -333,10 +337,11 @@ def check_integration_gate(data: dict, state: SessionState) -> HookResult:
         if current_turn - g.get("turn", 0) <= 5
     ]
 
+    callers = resolve_integration_callers(state)
     should_block, message = check_integration_blindness(state, tool_name, tool_input)
     if should_block:
-        return HookResult.deny(message)
-    return HookResult.approve()
+        return HookResult.deny(f"{callers}\n\n{message}" if callers else message)
+    return HookResult.approve(callers)
 
 
 # =============================================================================
@@ -22,10 +22,7 @@ Priority ordering (lower = runs first):
 - Priority 8: Bead gate
 """
 
-from pathlib import Path
 import shlex
-import subprocess
-import json
 import sys
 
 from ._common import register_hook, HookResult
@@ -137,44 +134,18 @@ def _get_prerequisites(state) -> dict:
     )
 
 
-# Cache for bead lookup to avoid repeated subprocess calls
-_bead_cache: dict = {"beads": [], "turn": -1}
-
-
 def _get_in_progress_beads(state=None) -> list:
-    """Get list of in_progress beads for current project (cached per turn)."""
-    # Use cache if same turn
-    current_turn = getattr(state, "turn_count", 0) if state else 0
-    if _bead_cache["turn"] == current_turn and current_turn > 0:
-        return _bead_cache["beads"]
+    """Get list of in_progress beads for current project.
 
+    Served from the cross-process bead snapshot (lib/bead_cache.py), which is
+    invalidated by beads DB changes, so no per-turn cache is needed here.
+    """
     try:
-        result = subprocess.run(
-            ["bd", "list", "--status=in_progress", "--format=json"],
-            capture_output=True,
-            text=True,
-            timeout=5,
-            cwd=Path.home() / ".claude",
-        )
-        if result.returncode == 0 and result.stdout.strip():
-            beads = json.loads(result.stdout)
-            _bead_cache["beads"] = beads
-            _bead_cache["turn"] = current_turn
-            return beads
-        _bead_cache["beads"] = []
-        _bead_cache["turn"] = current_turn
-        return []
-    except subprocess.TimeoutExpired:
-        print("[workflow] bd list timed out", file=sys.stderr)
-        return []
-    except json.JSONDecodeError as e:
-        print(f"[workflow] bd list invalid JSON: {e}", file=sys.stderr)
-        return []
-    except FileNotFoundError:
-        # bd not installed - not an error, just no beads
-        return []
-    except OSError as e:
-        print(f"[workflow] bd list failed: {e}", file=sys.stderr)
+        from _beads import get_in_progress_beads
+
+        return get_in_progress_beads(state)
+    except ImportError as e:
+        print(f"[workflow] bead cache unavailable: {e}", file=sys.stderr)
         return []
 
 
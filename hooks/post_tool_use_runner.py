@@ -56,6 +56,9 @@ HOOKS INDEX (by priority):
 
 ARCHITECTURE:
   - Hooks register via @register_hook(name, matcher, priority)
+  - Registrations are read from the hook manifest (_hook_manifest.py), so
+    hook modules are imported only when a matching tool arrives
+  - Import budget enforced by ops/import_budget.py
   - Lower priority = runs first
   - All hooks run (no blocking for PostToolUse)
   - Contexts are aggregated and returned
@@ -66,6 +69,7 @@ import _lib_path  # noqa: F401
 import sys
 import json
 import time
+from pathlib import Path
 
 # Performance: centralized configuration
 
@@ -86,23 +90,30 @@ from session_state import (
 # HOOK REGISTRY (shared across modules)
 # =============================================================================
 
-from _hook_registry import HOOKS, matches_tool
-
-# Import hook modules (triggers registration via decorators)
-import _hooks_cache  # noqa: F401 - Cache hooks (priority 5-6)
-import _hooks_state_pal  # noqa: F401 - PAL mandate hook (priority 5)
-import _hooks_workflow_tracking  # noqa: F401 - Workflow prerequisite tracking (priority 8)
-import _hooks_state  # noqa: F401 - State hooks (priority 9-10) + shared utilities
-import _hooks_state_decay  # noqa: F401 - Confidence decay (priority 11)
-import _hooks_state_reducers  # noqa: F401 - Confidence reducers (priority 12)
-import _hooks_state_increasers  # noqa: F401 - Confidence increasers (priority 14-16)
-import _hooks_quality  # noqa: F401 - Quality hooks (priority 22-50)
-import _hooks_tracking  # noqa: F401 - Tracking hooks (priority 55-72)
-import _hooks_stuck_loop  # noqa: F401 - Stuck loop detection (priority 78-83)
-import _hooks_mastermind  # noqa: F401 - Mastermind integration (priority 86-89)
-import _hooks_smart_commit  # noqa: F401 - Smart auto-commit (priority 95-97)
-import _hooks_codemode  # noqa: F401 - Code-mode result recording (priority 88)
-from _hooks_tracking import _get_scratch_state_file, _get_info_gain_state_file
+from _hook_registry import HOOKS as REGISTERED_HOOKS, matches_tool
+from _hook_manifest import load_hooks
+from _cooldown import _resolve_state_path  # Runner state files (project-isolated)
+
+# Hook modules in registration order. Their registrations are read from the
+# hook manifest (no import); a module is imported when one of its hooks
+# first matches the incoming tool.
+HOOK_MODULES = [
+    "_hooks_cache",  # Cache hooks (priority 5-6)
+    "_hooks_state_pal",  # PAL mandate hook (priority 5)
+    "_hooks_workflow_tracking",  # Workflow prerequisite tracking (priority 8)
+    "_hooks_state",  # State hooks (priority 9-10) + shared utilities
+    "_hooks_state_decay",  # Confidence decay (priority 11)
+    "_hooks_state_reducers",  # Confidence reducers (priority 12)
+    "_hooks_state_increasers",  # Confidence increasers (priority 14-16)
+    "_hooks_quality",  # Quality hooks (priority 22-50)
+    "_hooks_tracking",  # Tracking hooks (priority 55-72)
+    "_hooks_stuck_loop",  # Stuck loop detection (priority 78-83)
+    "_hooks_mastermind",  # Mastermind integration (priority 86-89)
+    "_hooks_smart_commit",  # Smart auto-commit (priority 95-97)
+    "_hooks_codemode",  # Code-mode result recording (priority 88)
+]
+
+HOOKS = load_hooks("post_tool_use", HOOK_MODULES, registry=REGISTERED_HOOKS)
 
 # =============================================================================
 # MAIN RUNNER
@@ -128,6 +139,16 @@ def _save_state_file(path, data: dict) -> None:
         print(f"[post-runner] State save failed: {path}: {e}", file=sys.stderr)
 
 
+def _get_scratch_state_file() -> Path:
+    """Get project-isolated scratch enforcer state file."""
+    return _resolve_state_path("scratch_enforcer_state.json")
+
+
+def _get_info_gain_state_file() -> Path:
+    """Get project-isolated info gain state file."""
+    return _resolve_state_path("info_gain_state.json")
+
+
 def _load_runner_state() -> dict:
     """Load persisted runner state from disk."""
     runner_state = {}
@@ -188,6 +209,10 @@ def main():
         print(json.dumps({"hookSpecificOutput": {"hookEventName": "PostToolUse"}}))
         sys.exit(0)
 
+    from _logging import log_timing, set_log_context
+
+    set_log_context("PostToolUse", data.get("session_id"))
+
     # Single state load
     state = load_state()
 
@@ -197,6 +222,11 @@ def main():
     # Single state save
     save_state(state)
 
+    # Keep the statusline snapshot current (statusline only renders it)
+    from _statusline_snapshot import publish_session_fields
+
+    publish_session_fields(state)
+
     # Output result
     print(json.dumps(result))
 
@@ -204,6 +234,7 @@ def main():
     elapsed = (time.time() - start) * 1000
     if elapsed > 100:
         print(f"[post-runner] Slow: {elapsed:.1f}ms", file=sys.stderr)
+    log_timing("post_tool_use_runner", elapsed)
 
     sys.exit(0)
 
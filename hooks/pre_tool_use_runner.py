@@ -26,7 +26,7 @@ HOOKS INDEX (by priority):
     25 tool_preference     - Nudge toward preferred tools
     30 oracle_gate         - Enforce think/council after failures
     32 confidence_external_suggestion - Suggest alternatives at low confidence
-    35 integration_gate    - Require grep after function edits
+    35 integration_gate    - Verify callers after function edits (caller graph)
     40 error_suppression   - Block until errors resolved
     45 content_gate        - Block eval/exec/SQL injection
     47 crawl4ai_preference - Suggest crawl4ai over WebFetch
@@ -51,16 +51,18 @@ HOOKS INDEX (by priority):
 
 ARCHITECTURE:
   - Hooks register via @register_hook(name, matcher, priority)
+  - Registrations are read from the hook manifest (_hook_manifest.py), so
+    gate modules are imported only when a matching tool arrives
   - Lower priority = runs first
   - First DENY wins, contexts are aggregated
   - Single state load/save per invocation
+  - Import budget enforced by ops/import_budget.py
 """
 
 import _lib_path  # noqa: F401
 import sys
 import json
 import os
-import re
 import time
 from typing import Optional, Callable
 
@@ -81,16 +83,10 @@ from _hook_result import HookResult
 # LAZY IMPORTS - These are loaded inside hooks that need them:
 # - confidence (check_tool_permission, get_tier_info) -> confidence_tool_gate, homeostatic_drive, threat_anticipation
 # - _beads (get_open_beads, etc.) -> bead_enforcement, parallel_bead_delegation
+#   (bead state itself is cached cross-process in lib/bead_cache.py)
 # - _confidence_constants -> homeostatic_drive, threat_anticipation
 # - _confidence_streaks -> threat_anticipation
 
-# =============================================================================
-# MODULE-LEVEL STATE (for hooks that need cross-invocation caching)
-# =============================================================================
-_BD_CACHE: dict = {}  # Beads cache for beads_parallel hook
-_BD_CACHE_TURN: int = 0  # Turn when cache was last valid
-
-
 # =============================================================================
 # SHARED HELPERS
 # =============================================================================
@@ -129,13 +125,21 @@ def register_hook(name: str, matcher: Optional[str], priority: int = 50):
 
 
 # =============================================================================
-# IMPORT MODULAR GATES
+# LOAD MODULAR GATES (lazily)
 # =============================================================================
-# Gates are being extracted to hooks/gates/ for better organization.
-# Import them here so their @register_hook decorators execute.
-from gates import HOOKS as GATES_HOOKS  # noqa: E402
-
-HOOKS.extend(GATES_HOOKS)
+# Gates live in hooks/gates/. Their registrations come from the hook manifest
+# (read from source, no import); each gate module is imported only when one
+# of its gates matches the incoming tool.
+import gates  # noqa: E402 - light: gate modules are not imported
+from _hook_manifest import compile_matcher, load_hooks  # noqa: E402
+
+HOOKS.extend(
+    load_hooks(
+        "pre_tool_use",
+        [f"gates.{module}" for module in gates.GATE_MODULES],
+        registry=gates.HOOKS,
+    )
+)
 
 # =============================================================================
 # HOOK IMPLEMENTATIONS (remaining inline hooks)
@@ -159,14 +163,15 @@ HOOKS.extend(GATES_HOOKS)
 
 # Pre-built lookup for fast hook filtering (built after HOOKS.sort())
 HOOKS_BY_TOOL: dict[str, list] = {}  # Populated by _build_hook_index()
-_HOOK_MATCHERS: dict[str, re.Pattern] = {}  # Pre-compiled regex patterns
+_HOOK_MATCHERS: dict[str, Callable[[str], bool]] = {}  # Matcher predicates
 
 
 def _build_hook_index():
     """Build optimized hook lookup index at module load.
 
     Creates:
-    - _HOOK_MATCHERS: Pre-compiled regex for each unique matcher
+    - _HOOK_MATCHERS: Predicate for each unique matcher (set lookup for plain
+      tool-name alternations, compiled regex otherwise)
     - HOOKS_BY_TOOL["__all__"]: Hooks that match all tools (matcher=None)
     """
     global HOOKS_BY_TOOL, _HOOK_MATCHERS
@@ -178,8 +183,7 @@ def _build_hook_index():
         if matcher is None:
             HOOKS_BY_TOOL["__all__"].append(hook)
         elif matcher not in _HOOK_MATCHERS:
-            # Pre-compile regex pattern
-            _HOOK_MATCHERS[matcher] = re.compile(f"^({matcher})$")
+            _HOOK_MATCHERS[matcher] = compile_matcher(matcher)
 
 
 def _get_hooks_for_tool(tool_name: str) -> list:
@@ -192,9 +196,8 @@ def _get_hooks_for_tool(tool_name: str) -> list:
             name, matcher, check_func, priority = hook
             if matcher is None:
                 continue  # Already included in __all__
-            # Use pre-compiled pattern
-            pattern = _HOOK_MATCHERS.get(matcher)
-            if pattern and pattern.match(tool_name):
+            matches = _HOOK_MATCHERS.get(matcher)
+            if matches and matches(tool_name):
                 applicable.append(hook)
 
         # Sort by priority (should already be sorted, but ensure)
@@ -206,9 +209,7 @@ def _get_hooks_for_tool(tool_name: str) -> list:
 
 def matches_tool(matcher: Optional[str], tool_name: str) -> bool:
     """Check if tool matches the hook's matcher pattern."""
-    if matcher is None:
-        return True
-    return bool(re.match(f"^({matcher})$", tool_name))
+    return bool(compile_matcher(matcher)(tool_name))
 
 
 def run_hooks(data: dict, state: SessionState) -> dict:
@@ -300,6 +301,10 @@ def main():
         print(json.dumps({"hookSpecificOutput": {"hookEventName": "PreToolUse"}}))
         sys.exit(0)
 
+    from _logging import log_timing, set_log_context
+
+    set_log_context("PreToolUse", data.get("session_id"))
+
     # Single state load
     state = load_state()
 
@@ -316,6 +321,7 @@ def main():
     elapsed = (time.time() - start) * 1000
     if elapsed > 50:
         print(f"[runner] Slow: {elapsed:.1f}ms", file=sys.stderr)
+    log_timing("pre_tool_use_runner", elapsed)
 
     sys.exit(0)
 
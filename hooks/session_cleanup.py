@@ -10,16 +10,21 @@ This hook fires when Claude Code session ends and:
 - Saves final state snapshot
 
 Silent by default - performs cleanup in background.
+
+Only the small critical writes (progress, handoff, session log, state) run
+inline. Lesson persistence, grooming and cleanup are queued as a job record
+in memory/state/cleanup_jobs/ and run by a detached
+`session_cleanup.py --worker`, which resumes interrupted jobs.
 """
 
 import _lib_path  # noqa: F401
 from _logging import log_debug
+from _atomic_io import locked, write_json_atomic
 import sys
 import json
 import time
 import os
 import fcntl
-import tempfile
 from pathlib import Path
 from datetime import datetime
 
@@ -421,6 +426,26 @@ def cleanup_empty_session_dirs() -> int:
     return removed
 
 
+def roll_up_block_log() -> int:
+    """Fold idle per-session block log shards into the rollup summary.
+
+    Returns count of shards retired.
+    """
+    from block_log import roll_up
+
+    return roll_up()
+
+
+def prune_mastermind_telemetry() -> int:
+    """Delete raw mastermind telemetry past retention (daily rollups stay).
+
+    Returns count of files deleted.
+    """
+    from mastermind.telemetry import prune_telemetry
+
+    return prune_telemetry()
+
+
 def cleanup_session_env() -> int:
     """Clean up old session-env directories, keeping most recent N.
 
@@ -519,32 +544,22 @@ def log_session(state, lessons: list[dict]):
 # =============================================================================
 
 
-def _atomic_json_write(filepath: Path, data: dict):
+def _atomic_json_write(filepath: Path, data: dict, lock: bool = True):
     """Write JSON atomically with file locking to prevent corruption.
 
     Uses fcntl.flock for exclusive access and temp file + rename for atomicity.
-    """
-    filepath.parent.mkdir(parents=True, exist_ok=True)
-    lock_file = filepath.parent / f".{filepath.name}.lock"
-
-    # Acquire exclusive lock
-    lock_fd = os.open(str(lock_file), os.O_CREAT | os.O_RDWR)
-    try:
-        fcntl.flock(lock_fd, fcntl.LOCK_EX)
 
-        # Write to temp file first
-        fd, tmp_path = tempfile.mkstemp(dir=filepath.parent, suffix=".json")
-        try:
-            with os.fdopen(fd, "w") as f:
-                json.dump(data, f, indent=2, default=str)
-            os.replace(tmp_path, filepath)  # Atomic on POSIX
-        except Exception:
-            if os.path.exists(tmp_path):
-                os.unlink(tmp_path)
-            raise
-    finally:
-        fcntl.flock(lock_fd, fcntl.LOCK_UN)
-        os.close(lock_fd)
+    Args:
+        filepath: Destination file
+        data: JSON-serializable data
+        lock: Take the per-file lock; pass False when the caller already
+            serializes writers (the cleanup worker lock)
+    """
+    if not lock:
+        write_json_atomic(filepath, data, indent=2, default=str)
+        return
+    with locked(filepath.parent / f".{filepath.name}.lock"):
+        write_json_atomic(filepath, data, indent=2, default=str)
 
 
 def save_progress(state):
@@ -625,6 +640,246 @@ def save_handoff(state):
     _atomic_json_write(handoff_file, handoff_data)
 
 
+# =============================================================================
+# CLEANUP JOBS (detached worker)
+# =============================================================================
+# The job record is rewritten after every stage, so a worker killed mid-way
+# leaves the remaining stages pending for the next one. One worker runs at a
+# time (flock). Shared stages are coalesced across queued jobs and skipped if
+# they ran recently, so a fleet of ending sessions doesn't sweep the same
+# directories concurrently.
+
+JOBS_DIR = STATE_DIR / "cleanup_jobs"
+WORKER_LOCK = JOBS_DIR / "worker.lock"
+STAGE_RUNS_FILE = JOBS_DIR / "stage_runs.json"  # Last run per shared stage
+STAGE_MIN_INTERVAL = 600  # Shared stages run at most every 10 minutes
+STAGE_MAX_ATTEMPTS = 3  # Give up on a stage that keeps failing or crashing
+STAGE_TIMEOUT = 120  # Seconds before a stage is interrupted (and retried)
+JOB_MAX_AGE = 86400 * 7  # Drop unfinished jobs after 7 days
+
+# (stage, func(job), scope) in run order. Scopes: "job" uses the job's own
+# data; "cwd" depends on the session's directory; "global" is machine-wide.
+CLEANUP_STAGES = (
+    ("lessons", lambda job: persist_lessons(job.get("lessons", [])), "job"),
+    ("scratch", lambda job: len(cleanup_scratch()), "global"),
+    ("session_env", lambda job: cleanup_session_env(), "global"),
+    ("stale_locks", lambda job: cleanup_stale_locks(), "global"),
+    ("session_dirs", lambda job: cleanup_empty_session_dirs(), "global"),
+    ("serena", lambda job: groom_serena_memories(), "cwd"),
+    ("thinking", lambda job: groom_thinking_memory(), "global"),
+    ("beads", lambda job: sync_and_cleanup_beads(), "cwd"),
+    ("block_log", lambda job: roll_up_block_log(), "global"),
+    ("telemetry", lambda job: prune_mastermind_telemetry(), "global"),
+)
+
+
+class StageTimeout(Exception):
+    """A cleanup stage overran STAGE_TIMEOUT."""
+
+
+def _run_stage(name: str, func, job: dict):
+    """Run a stage, interrupting it after STAGE_TIMEOUT seconds.
+
+    The worker holds the worker lock while stages run, so a hung stage
+    (a blocked lock, a stuck subprocess) would stall every later worker.
+    SIGALRM raises StageTimeout in the stage; subprocess.run() kills its
+    child on the way out.
+    """
+    import signal
+
+    def on_alarm(signum, frame):
+        raise StageTimeout(f"{name} exceeded {STAGE_TIMEOUT}s")
+
+    previous = signal.signal(signal.SIGALRM, on_alarm)
+    signal.alarm(STAGE_TIMEOUT)
+    try:
+        return func(job)
+    finally:
+        signal.alarm(0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def enqueue_cleanup_job(lessons: list[dict]) -> Path:
+    """Record a cleanup job for the worker.
+
+    Args:
+        lessons: Lessons extracted from the session, persisted by the worker.
+
+    Returns:
+        Path of the job record.
+    """
+    job_id = f"job_{time.time_ns()}_{os.getpid()}"
+    job = {
+        "id": job_id,
+        "created_at": time.time(),
+        "session_id": os.environ.get("CLAUDE_SESSION_ID", "")[:16],
+        "cwd": os.getcwd(),
+        "lessons": lessons,
+        "stages": {
+            name: {"status": "pending", "attempts": 0} for name, _, _ in CLEANUP_STAGES
+        },
+    }
+    path = JOBS_DIR / f"{job_id}.json"
+    _atomic_json_write(path, job, lock=False)  # New file, owned by this session
+    return path
+
+
+def spawn_cleanup_worker():
+    """Start run_cleanup_worker() in a detached process."""
+    import subprocess
+
+    try:
+        subprocess.Popen(
+            [sys.executable, str(Path(__file__).resolve()), "--worker"],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True,
+        )
+    except OSError as e:
+        log_debug("session_cleanup", f"cleanup worker spawn failed: {e}")
+
+
+def _stage_key(name: str, scope: str, job: dict) -> str | None:
+    """Coalescing key for shared stages (None for per-job stages)."""
+    if scope == "global":
+        return name
+    if scope == "cwd":
+        return f"{name}:{job.get('cwd', '')}"
+    return None
+
+
+def _run_job(path: Path, stage_runs: dict, results: dict):
+    """Run a job's pending stages, saving progress after each one."""
+    try:
+        job = json.loads(path.read_text())
+        stages = job["stages"]
+    except (OSError, ValueError, KeyError, TypeError):
+        path.unlink(missing_ok=True)  # Unreadable: nothing to resume
+        return
+
+    if time.time() - job.get("created_at", 0) > JOB_MAX_AGE:
+        path.unlink(missing_ok=True)
+        return
+
+    for name, func, scope in CLEANUP_STAGES:
+        stage = stages.setdefault(name, {"status": "pending", "attempts": 0})
+        # "running" means a previous worker died mid-stage
+        if stage["status"] not in ("pending", "running"):
+            continue
+        if stage["attempts"] >= STAGE_MAX_ATTEMPTS:
+            stage["status"] = "failed"
+            _atomic_json_write(path, job, lock=False)
+            continue
+
+        key = _stage_key(name, scope, job)
+        if key and time.time() - stage_runs.get(key, 0) < STAGE_MIN_INTERVAL:
+            stage["status"] = "skipped"  # Ran recently (this or another job)
+            _atomic_json_write(path, job, lock=False)
+            continue
+
+        stage["status"] = "running"
+        stage["attempts"] += 1
+        _atomic_json_write(path, job, lock=False)
+        try:
+            if scope == "cwd":
+                os.chdir(job["cwd"])
+            results[name] = _run_stage(name, func, job)
+            stage["status"] = "done"
+            if key:
+                stage_runs[key] = time.time()
+                _atomic_json_write(STAGE_RUNS_FILE, stage_runs, lock=False)
+        except Exception as e:
+            log_debug("session_cleanup", f"cleanup stage {name} failed: {e}")
+            stage["status"] = "pending"  # Retried by the next worker
+        _atomic_json_write(path, job, lock=False)
+
+    if all(
+        stage["status"] in ("done", "skipped", "failed") for stage in stages.values()
+    ):
+        path.unlink(missing_ok=True)
+
+
+def run_cleanup_worker() -> dict:
+    """Entry point for `session_cleanup.py --worker`: drain the job queue.
+
+    Exits immediately if another worker holds the lock - that worker picks
+    up newly queued jobs before it exits.
+
+    Returns:
+        Stage results from this run (stage -> function result)
+    """
+    JOBS_DIR.mkdir(parents=True, exist_ok=True)
+    results: dict = {}
+    seen: set[Path] = set()
+
+    while True:
+        lock_fd = os.open(str(WORKER_LOCK), os.O_CREAT | os.O_RDWR)
+        try:
+            try:
+                fcntl.flock(lock_fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                break  # Another worker is draining the queue
+
+            try:
+                stage_runs = json.loads(STAGE_RUNS_FILE.read_text())
+            except (OSError, ValueError):
+                stage_runs = {}
+
+            # Each job once per run; jobs queued meanwhile are picked up too
+            while True:
+                jobs = [p for p in sorted(JOBS_DIR.glob("job_*.json")) if p not in seen]
+                if not jobs:
+                    break
+                for path in jobs:
+                    seen.add(path)
+                    _run_job(path, stage_runs, results)
+        finally:
+            fcntl.flock(lock_fd, fcntl.LOCK_UN)
+            os.close(lock_fd)
+
+        # A job queued between our last scan and the unlock may have found
+        # the lock held; take another pass rather than strand it
+        if not any(p not in seen for p in JOBS_DIR.glob("job_*.json")):
+            break
+
+    summary = format_cleanup_summary(results)
+    if summary:
+        log_debug("session_cleanup", summary)
+    return results
+
+
+def format_cleanup_summary(results: dict) -> str:
+    """One-line summary of what a worker run cleaned."""
+    cleanup_parts = []
+    if results.get("scratch"):
+        cleanup_parts.append(f"{results['scratch']} scratch files")
+    if results.get("session_env"):
+        cleanup_parts.append(f"{results['session_env']} old sessions")
+    if results.get("stale_locks"):
+        cleanup_parts.append(f"{results['stale_locks']} stale lock files")
+    if results.get("session_dirs"):
+        cleanup_parts.append(f"{results['session_dirs']} empty session dirs")
+    if results.get("block_log"):
+        cleanup_parts.append(f"{results['block_log']} block logs rolled up")
+    if results.get("telemetry"):
+        cleanup_parts.append(f"{results['telemetry']} old telemetry files")
+    serena_groom = results.get("serena") or {}
+    if serena_groom.get("pruned", 0) > 0:
+        cleanup_parts.append(f"{serena_groom['pruned']} stale Serena memories")
+    thinking_groom = results.get("thinking") or {}
+    if thinking_groom.get("indexed", 0) > 0:
+        cleanup_parts.append(f"{thinking_groom['indexed']} thinking memories indexed")
+    if thinking_groom.get("pruned", 0) > 0:
+        cleanup_parts.append(f"{thinking_groom['pruned']} old thinking records pruned")
+    beads_cleanup = results.get("beads") or {}
+    if beads_cleanup.get("orphans_recovered", 0) > 0:
+        cleanup_parts.append(
+            f"{beads_cleanup['orphans_recovered']} orphaned beads recovered"
+        )
+    return f"🧹 Cleaned {', '.join(cleanup_parts)}" if cleanup_parts else ""
+
+
 # =============================================================================
 # MAIN
 # =============================================================================
@@ -649,12 +904,9 @@ def main():
     # Auto-extract work items from unresolved errors
     extract_work_from_errors(state)
 
-    # Extract lessons from session patterns
+    # Extract lessons from session patterns (persisted by the worker)
     lessons = extract_lessons(state)
 
-    # Persist lessons to long-term memory
-    persist_lessons(lessons)
-
     # === AUTONOMOUS AGENT: Save progress & handoff ===
 
     # Save progress log (JSON, survives sessions)
@@ -663,62 +915,29 @@ def main():
     # Save handoff data for next session onboarding
     save_handoff(state)
 
-    # Clean up old scratch files
-    cleaned_files = cleanup_scratch()
-
-    # Clean up old session-env directories (keep last 20)
-    removed_sessions = cleanup_session_env()
-
-    # Clean up stale lock files from old sessions
-    removed_locks = cleanup_stale_locks()
-
-    # Clean up empty session directories
-    removed_session_dirs = cleanup_empty_session_dirs()
-
-    # Groom Serena memories (keep structural + last N session memories)
-    serena_groom = groom_serena_memories()
-
-    # Groom thinking memory (auto-index + prune)
-    thinking_groom = groom_thinking_memory()
-
-    # Sync beads and cleanup orphaned agent assignments
-    beads_cleanup = sync_and_cleanup_beads()
-
     # Log session summary
     log_session(state, lessons)
 
     # Save final state
     save_state(state)
 
-    # Output result (silent unless debugging)
-    output = {}
+    # === Grooming & cleanup: queued for the detached worker ===
+    try:
+        enqueue_cleanup_job(lessons)
+    except OSError as e:
+        log_debug("session_cleanup", f"cleanup job enqueue failed: {e}")
 
-    # Optionally surface cleanup info
-    cleanup_parts = []
-    if cleaned_files:
-        cleanup_parts.append(f"{len(cleaned_files)} scratch files")
-    if removed_sessions:
-        cleanup_parts.append(f"{removed_sessions} old sessions")
-    if removed_locks:
-        cleanup_parts.append(f"{removed_locks} stale lock files")
-    if removed_session_dirs:
-        cleanup_parts.append(f"{removed_session_dirs} empty session dirs")
-    if serena_groom.get("pruned", 0) > 0:
-        cleanup_parts.append(f"{serena_groom['pruned']} stale Serena memories")
-    if thinking_groom.get("indexed", 0) > 0:
-        cleanup_parts.append(f"{thinking_groom['indexed']} thinking memories indexed")
-    if thinking_groom.get("pruned", 0) > 0:
-        cleanup_parts.append(f"{thinking_groom['pruned']} old thinking records pruned")
-    if beads_cleanup.get("orphans_recovered", 0) > 0:
-        cleanup_parts.append(
-            f"{beads_cleanup['orphans_recovered']} orphaned beads recovered"
-        )
-    if cleanup_parts:
-        output["message"] = f"🧹 Cleaned {', '.join(cleanup_parts)}"
+    # Output result (silent; the worker logs what it cleaned)
+    print(json.dumps({}))
+    sys.stdout.flush()
 
-    print(json.dumps(output))
+    # Also resumes jobs left unfinished by an interrupted worker
+    spawn_cleanup_worker()
     sys.exit(0)
 
 
 if __name__ == "__main__":
-    main()
+    if len(sys.argv) > 1 and sys.argv[1] == "--worker":
+        run_cleanup_worker()
+    else:
+        main()
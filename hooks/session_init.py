@@ -16,18 +16,36 @@ This hook fires when Claude Code starts a new session and:
 - Surfaces actionable context on resume (files, tasks, errors)
 
 Silent by default - outputs brief status only if resuming work or issues detected.
+
+STARTUP PIPELINE:
+- Critical path (before output) is a task graph (_task_graph): health check,
+  dependency check, project detection and Serena context run concurrently,
+  each with its own timeout; session state waits only on project detection
+  and, since it saves state, always runs to completion.
+  The dependency check answers from its probe cache only.
+- Non-essential work (maintenance, schema cache, memory prewarm, beads sync,
+  re-running stale dependency probes) runs in a detached
+  `session_init.py --background` process after output.
+- Step timings and time-to-first-output are appended to
+  tmp/session_start_timings.jsonl (summarised by ops/health.py).
 """
 
-import _lib_path  # noqa: F401
-from _logging import log_debug
-import sys
-import json
-import os
 import time
-from pathlib import Path
+
+# Process start reference for time-to-first-output (before heavy imports)
+_T0 = time.perf_counter()
+
+import _lib_path  # noqa: F401, E402
+from _logging import log_debug  # noqa: E402
+import sys  # noqa: E402
+import json  # noqa: E402
+import copy  # noqa: E402
+import os  # noqa: E402
+from pathlib import Path  # noqa: E402
+from _atomic_io import write_atomic  # noqa: E402
 
 # Import the state machine
-from session_state import (
+from session_state import (  # noqa: E402
     load_state,
     save_state,
     reset_state,
@@ -108,9 +126,6 @@ except ImportError:
 # Scope's punch list file
 PUNCH_LIST_FILE = MEMORY_DIR / "punch_list.json"
 
-# Cross-session FP history (Entity Model: immune memory)
-FP_HISTORY_FILE = Path.home() / ".claude" / "tmp" / "fp_history.jsonl"
-
 
 def write_persistent_env_vars(project_context=None, state=None):
     """Write persistent environment variables via CLAUDE_ENV_FILE (v3.17).
@@ -230,11 +245,12 @@ def start_health_check_async():
         return None
 
 
-def collect_health_result(proc) -> str | None:
+def collect_health_result(proc, timeout: float = 0.5) -> str | None:
     """Collect health check result from background process.
 
     Args:
         proc: Popen handle from start_health_check_async(), or None.
+        timeout: Seconds to wait for the process to finish.
 
     Returns warning message if resources are constrained, None otherwise.
     """
@@ -245,7 +261,7 @@ def collect_health_result(proc) -> str | None:
 
     try:
         # Wait with short timeout - process should be done by now
-        stdout, _ = proc.communicate(timeout=0.5)
+        stdout, _ = proc.communicate(timeout=timeout)
         if proc.returncode != 0:
             return None
 
@@ -279,6 +295,54 @@ def collect_health_result(proc) -> str | None:
         return None
 
 
+def check_system_health() -> str | None:
+    """Run the health check and return its warning (critical-path task)."""
+    return collect_health_result(start_health_check_async(), timeout=1.2)
+
+
+# =============================================================================
+# CRITICAL-PATH STEPS (run concurrently by main)
+# =============================================================================
+
+# Seconds before output is emitted regardless of unfinished steps
+CRITICAL_PATH_BUDGET = 5.0
+
+
+def check_dependencies() -> str | None:
+    """Dependency check summary if anything is missing (v3.10).
+
+    Answers from the probe cache only; probes whose inputs changed are
+    re-run by refresh_dependencies() in the background process.
+    """
+    if not DEPENDENCY_CHECK_AVAILABLE:
+        return None
+    try:
+        dep_result = run_dependency_check(refresh=False)
+        if not dep_result["ok"] or dep_result["warnings"]:
+            return dep_result["summary"]
+    except Exception:
+        pass  # Non-critical, don't fail session start
+    return None
+
+
+def detect_project_context():
+    """Current ProjectContext, or None to fall back to legacy behavior."""
+    if not PROJECT_AWARE:
+        return None
+    try:
+        return get_current_project()
+    except (ImportError, FileNotFoundError, PermissionError):
+        # Expected errors: module not available, git not found, permission issues
+        return None
+    except Exception as e:
+        # Unexpected errors: log for debugging but don't block
+        print(
+            f"Warning: project detection failed: {type(e).__name__}: {e}",
+            file=sys.stderr,
+        )
+        return None
+
+
 # =============================================================================
 # MEMORY PRE-WARMING
 # =============================================================================
@@ -656,40 +720,22 @@ def get_cross_session_fp_insights() -> list[str]:
 
     Returns list of high-severity insights requiring attention.
     """
-    if not FP_HISTORY_FILE.exists():
-        return []
-
     try:
-        import json as _json
         from collections import Counter
-        from datetime import datetime, timedelta
+        from fp_rollup import load_rollup, window
 
-        # Load recent entries (last 14 days)
-        cutoff = datetime.now() - timedelta(days=14)
-        entries = []
+        # Recent entries (last 14 days), from the precomputed rollup
+        recent = window(load_rollup(), days=14)
 
-        with FP_HISTORY_FILE.open() as f:
-            for line in f:
-                line = line.strip()
-                if not line:
-                    continue
-                try:
-                    entry = _json.loads(line)
-                    ts = datetime.fromisoformat(entry["timestamp"])
-                    if ts >= cutoff:
-                        entries.append(entry)
-                except (ValueError, KeyError, _json.JSONDecodeError):
-                    continue
-
-        if len(entries) < 3:
+        if recent["total"] < 3:
             return []  # Not enough data for patterns
 
         # Analyze patterns
-        reducer_counts = Counter(e["reducer"] for e in entries)
+        reducer_counts = Counter(recent["reducers"])
         insights = []
 
         # High-frequency reducers (likely broken)
-        total = len(entries)
+        total = recent["total"]
         for reducer, count in reducer_counts.most_common(3):
             pct = (count / total) * 100
             if count >= 3 and pct >= 30:
@@ -707,11 +753,27 @@ def get_recent_block_lessons(limit: int = 3) -> list[str]:
     """Get recent block-reflection lessons for session injection.
 
     These are lessons learned from hook blocks in previous sessions.
-    Surfacing them prevents the same mistakes from recurring.
+    Surfacing them prevents the same mistakes from recurring. Read from the
+    block log rollup; global memory is the fallback until it has lessons.
     """
     if not PROJECT_AWARE:
         return []
 
+    try:
+        from block_log import recent_lessons
+
+        rolled_up = recent_lessons(max_age_days=7)
+        if rolled_up:
+            block_lessons = [
+                f"{lesson['hooks'][0] if lesson.get('hooks') else 'unknown'}: "
+                f"{lesson.get('content', '')[:80]}"
+                for lesson in rolled_up
+                if lesson.get("content")
+            ]
+            return block_lessons[-limit:]
+    except (ImportError, OSError, KeyError):
+        pass
+
     try:
         from project_state import load_global_memory
         import time
@@ -1006,6 +1068,102 @@ def build_resume_context(state, result: dict) -> str:
     return " | ".join(parts) if parts else ""
 
 
+# =============================================================================
+# SERENA CONTEXT (v3.13)
+# =============================================================================
+
+
+def build_serena_context() -> str | None:
+    """Serena activation instruction plus key memory insights.
+
+    If .serena/ exists in cwd, inject activation + surface key memories.
+    Returns None when there is no .serena/ directory.
+    """
+    serena_dir = Path.cwd() / ".serena"
+    if not serena_dir.is_dir():
+        return None
+
+    memories_dir = serena_dir / "memories"
+    memory_insights = []
+    stale_count = 0
+
+    if memories_dir.is_dir():
+        try:
+            import json as _json
+            from datetime import datetime
+
+            # Priority memories to surface at session start (most useful for context)
+            PRIORITY_MEMORIES = [
+                "project_overview.md",
+                "codebase_structure.md",
+                "style_conventions.md",
+            ]
+
+            # Surface key insights from priority memories
+            for mem_name in PRIORITY_MEMORIES:
+                mem_file = memories_dir / mem_name
+                if mem_file.exists():
+                    try:
+                        content = mem_file.read_text()
+                        # Extract first meaningful section (skip header)
+                        lines = content.strip().split("\n")
+                        insight_lines = []
+                        in_content = False
+                        for line in lines[:15]:  # Limit to first 15 lines
+                            if line.startswith("## ") or line.startswith("- "):
+                                in_content = True
+                            if in_content and line.strip():
+                                insight_lines.append(line)
+                            if len(insight_lines) >= 3:
+                                break
+                        if insight_lines:
+                            memory_insights.append(
+                                f"📎 **{mem_name.replace('.md', '')}**: {insight_lines[0][:80]}"
+                            )
+                    except Exception:
+                        pass
+
+            # Quick staleness check
+            memories = list(memories_dir.glob("*.md"))
+            metadata_file = serena_dir / "memory_metadata.json"
+            metadata = {}
+            if metadata_file.exists():
+                metadata = _json.loads(metadata_file.read_text())
+
+            now = datetime.now()
+            for mem in memories:
+                if mem.name.startswith("session_"):
+                    continue  # Skip session memories for staleness check
+                meta = metadata.get(mem.name, {})
+                mtime = datetime.fromtimestamp(mem.stat().st_mtime)
+                age_days = (now - mtime).days
+
+                last_validated = meta.get("last_validated")
+                if age_days > 14 and not last_validated:
+                    stale_count += 1
+                elif last_validated:
+                    validated_date = datetime.fromisoformat(last_validated)
+                    if (now - validated_date).days > 14:
+                        stale_count += 1
+        except Exception:
+            pass  # Silent fail on memory processing
+
+    # Build Serena instruction with memory insights
+    memory_status = ""
+    if stale_count > 0:
+        memory_status = f"\n⚠️ **{stale_count} stale memories** — run `/serena-mem status` for details"
+
+    memory_context = ""
+    if memory_insights:
+        memory_context = "\n" + "\n".join(memory_insights[:3])
+
+    return (
+        "🔮 **SERENA PROJECT DETECTED**\n"
+        "MANDATORY: Call `mcp__serena__activate_project` with current directory "
+        f"NOW before any other action.{memory_status}{memory_context}"
+    )
+
+
 # =============================================================================
 # INITIALIZATION
 # =============================================================================
@@ -1022,6 +1180,7 @@ def initialize_session(project_context=None) -> dict:
         "message": "",
         "session_id": "",
         "handoff": None,  # For onboarding context
+        "state": None,  # Initialized SessionState (saves callers a reload)
     }
 
     # Try to load existing state
@@ -1050,8 +1209,10 @@ def initialize_session(project_context=None) -> dict:
         if work_queue:
             state.work_queue = work_queue
     else:
-        # Refresh existing state
+        # Refresh existing state; the resume context reads the state as it
+        # was (pruning below reassigns fields, so a shallow copy suffices)
         state = existing_state
+        result["previous_state"] = copy.copy(existing_state)
 
         # Prune old data
         prune_old_errors(state)
@@ -1081,17 +1242,128 @@ def initialize_session(project_context=None) -> dict:
 
     # Save updated state
     save_state(state)
+    result["state"] = state
 
-    # Ensure code-mode schema cache is populated (v3.15)
-    ensure_schema_cache()
+    # Schema cache, memory prewarm and beads sync run in the background
+    # process after output (see run_background_tasks)
 
-    # Pre-warm memory cache (synapse map, lessons index)
-    prewarm_memory_cache()
+    return result
 
-    # Sync beads at session start (non-blocking)
-    sync_beads_on_start()
 
-    return result
+# =============================================================================
+# BACKGROUND WORK (detached after output)
+# =============================================================================
+
+# Seconds the background process may spend before giving up on stragglers
+BACKGROUND_BUDGET = 30.0
+
+# Step timings per SessionStart (foreground + background records)
+TIMINGS_FILE = (
+    Path(__file__).resolve().parent.parent / "tmp" / "session_start_timings.jsonl"
+)
+TIMINGS_MAX_BYTES = 256 * 1024
+
+
+def refresh_dependencies():
+    """Re-run dependency probes missing from or stale in the cache."""
+    if not DEPENDENCY_CHECK_AVAILABLE:
+        return
+    try:
+        run_dependency_check()
+    except Exception as e:
+        log_debug("session_init", f"dependency refresh failed: {e}")
+
+
+def refresh_symbol_index():
+    """Bring the project's symbol index up to date (folds in edit journals).
+
+    Kept off the tool-call hooks, which only read the index or journal single
+    files. Outside a git repo only an index that already exists is refreshed.
+    """
+    try:
+        from symbol_index import SymbolIndex, find_root
+
+        root = find_root(os.environ.get("CLAUDE_PROJECT_DIR") or os.getcwd())
+        index = SymbolIndex(root)
+        if index.path.exists() or (root / ".git").exists():
+            index.refresh()
+    except Exception as e:
+        log_debug("session_init", f"symbol index refresh failed: {e}")
+
+
+def run_maintenance_safe():
+    """Project maintenance (cleanup stale projects, ephemeral state)."""
+    if not PROJECT_AWARE:
+        return
+    try:
+        run_maintenance()
+    except Exception as e:
+        log_debug("session_init", f"maintenance failed: {e}")
+
+
+def run_background_tasks():
+    """Entry point for `session_init.py --background`: non-essential startup work."""
+    from _task_graph import Task, run_tasks
+
+    start = time.perf_counter()
+    _, timings = run_tasks(
+        [
+            Task("maintenance", lambda r: run_maintenance_safe(), timeout=15.0),
+            # ensure_schema_cache bounds its own subprocess at 5s
+            Task("schema_cache", lambda r: ensure_schema_cache(), timeout=10.0),
+            Task("memory_prewarm", lambda r: prewarm_memory_cache(), timeout=10.0),
+            Task("beads_sync", lambda r: sync_beads_on_start(), timeout=5.0),
+            # Probes bound their own subprocesses (run_probes budget: 7s)
+            Task("dependencies", lambda r: refresh_dependencies(), timeout=10.0),
+            Task("symbol_index", lambda r: refresh_symbol_index(), timeout=25.0),
+        ],
+        budget=BACKGROUND_BUDGET,
+    )
+    record_timings(
+        "background",
+        timings,
+        total_ms=round((time.perf_counter() - start) * 1000, 1),
+        session_id=os.environ.get("CLAUDE_SESSION_ID", "default")[:16],
+    )
+
+
+def spawn_background_tasks():
+    """Start run_background_tasks() in a detached process."""
+    import subprocess
+
+    try:
+        subprocess.Popen(
+            [sys.executable, str(Path(__file__).resolve()), "--background"],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True,
+        )
+    except OSError as e:
+        log_debug("session_init", f"background spawn failed: {e}")
+
+
+def record_timings(phase: str, timings: list[dict], **fields):
+    """Append a SessionStart timing record (best effort).
+
+    Args:
+        phase: "foreground" (critical path) or "background"
+        timings: Per-step timings from run_tasks()
+        **fields: Headline metrics (first_output_ms, total_ms, session_id)
+    """
+    record = {"ts": time.time(), "phase": phase, **fields, "steps": timings}
+    summary = ", ".join(f"{t['name']}={t['ms']:.0f}ms/{t['status']}" for t in timings)
+    log_debug("session_init", f"{phase} {fields} {summary}")
+    try:
+        TIMINGS_FILE.parent.mkdir(parents=True, exist_ok=True)
+        if TIMINGS_FILE.exists() and TIMINGS_FILE.stat().st_size > TIMINGS_MAX_BYTES:
+            # Keep the newer half
+            lines = TIMINGS_FILE.read_text().splitlines(keepends=True)
+            write_atomic(TIMINGS_FILE, "".join(lines[len(lines) // 2 :]))
+        with open(TIMINGS_FILE, "a") as f:
+            f.write(json.dumps(record) + "\n")
+    except OSError as e:
+        log_debug("session_init", f"timing record failed: {e}")
 
 
 # =============================================================================
@@ -1106,48 +1378,39 @@ def main():
     except (json.JSONDecodeError, ValueError):
         pass
 
-    # === SYSTEM HEALTH CHECK (v3.9) - Start async early ===
-    health_proc = start_health_check_async()
-
-    # === DEPENDENCY CHECK (v3.10) ===
-    dep_warning = None
-    if DEPENDENCY_CHECK_AVAILABLE:
-        try:
-            dep_result = run_dependency_check()
-            if not dep_result["ok"] or dep_result["warnings"]:
-                dep_warning = dep_result["summary"]
-        except Exception:
-            pass  # Non-critical, don't fail session start
-
-    # === SYSTEM HEALTH CHECK - Collect result (runs in parallel with dep check) ===
-    health_warning = collect_health_result(health_proc)
-
-    # === PROJECT-AWARE INITIALIZATION ===
-    project_context = None
-    if PROJECT_AWARE:
-        try:
-            project_context = get_current_project()
-            # Run maintenance (cleanup stale projects, ephemeral state)
-            run_maintenance()
-        except (ImportError, FileNotFoundError, PermissionError):
-            # Expected errors: module not available, git not found, permission issues
-            pass  # Fall back to legacy behavior
-        except Exception as e:
-            # Unexpected errors: log for debugging but don't block
-            print(
-                f"Warning: project detection failed: {type(e).__name__}: {e}",
-                file=sys.stderr,
-            )
-
-    # Load state BEFORE initialize (to capture previous session's context)
-    previous_state = load_state()
+    from _task_graph import Task, run_tasks
+
+    # === CRITICAL PATH: independent steps run concurrently ===
+    results, timings = run_tasks(
+        [
+            Task("health", lambda r: check_system_health(), timeout=1.5),
+            Task("dependencies", lambda r: check_dependencies(), timeout=2.0),
+            Task("project", lambda r: detect_project_context(), timeout=2.0),
+            Task("serena", lambda r: build_serena_context(), timeout=1.0),
+            # Needs the project for project-scoped state/handoff files.
+            # Never abandoned: it resets and saves state, which the fallback
+            # below must not race
+            Task(
+                "session",
+                lambda r: initialize_session(r["project"]),
+                deps=("project",),
+                timeout=None,
+            ),
+        ],
+        budget=CRITICAL_PATH_BUDGET,
+    )
+    health_warning = results["health"]
+    dep_warning = results["dependencies"]
+    project_context = results["project"]
 
-    # Initialize session (pass project_context for project-scoped operations)
-    result = initialize_session(project_context)
+    result = results["session"]
+    if result is None:
+        # Failed or skipped (it never ran): fall back to a plain load
+        result = {"action": "none", "message": "", "handoff": None}
+        result["state"] = load_state()
 
     # === CLAUDE_ENV_FILE: Persist env vars for session (v3.17) ===
-    # Load current state for env var injection
-    current_state = load_state()
+    current_state = result["state"]
     write_persistent_env_vars(project_context, current_state)
 
     # SUDO SECURITY: Audit passed - clear stop hook flags for this session
@@ -1169,8 +1432,8 @@ def main():
     # ENHANCED: Project-aware onboarding for multi-project swiss army knife
 
     if result["action"] == "reset":
-        # Fresh session - load state for onboarding context
-        state = load_state()
+        # Fresh session - onboarding context from the initialized state
+        state = current_state
         handoff = result.get("handoff")
 
         # Build onboarding context (auto-selects next work item)
@@ -1192,11 +1455,11 @@ def main():
 
     elif result["action"] == "refresh":
         # Resuming within same session - surface context from previous state
-        context = build_resume_context(previous_state, result)
+        context = build_resume_context(result["previous_state"], result)
 
         # Check for project switching (user changed directories mid-session)
         if PROJECT_AWARE and project_context:
-            if not is_same_project(getattr(previous_state, "_project_context", None)):
+            if not is_same_project(getattr(current_state, "_project_context", None)):
                 # Project changed! Save old state, load new
                 try:
                     save_active_state()
@@ -1227,97 +1490,30 @@ def main():
     elif health_warning:
         output["message"] = f"🖥️ **SYSTEM**: {health_warning}"
 
-    # === SERENA AUTO-ACTIVATION + MEMORY SURFACING (v3.13) ===
-    # If .serena/ exists in cwd, inject activation + surface key memories
-    serena_dir = Path.cwd() / ".serena"
-    if serena_dir.is_dir():
-        memories_dir = serena_dir / "memories"
-        memory_insights = []
-        stale_count = 0
-
-        if memories_dir.is_dir():
-            try:
-                import json as _json
-                from datetime import datetime
-
-                # Priority memories to surface at session start (most useful for context)
-                PRIORITY_MEMORIES = [
-                    "project_overview.md",
-                    "codebase_structure.md",
-                    "style_conventions.md",
-                ]
-
-                # Surface key insights from priority memories
-                for mem_name in PRIORITY_MEMORIES:
-                    mem_file = memories_dir / mem_name
-                    if mem_file.exists():
-                        try:
-                            content = mem_file.read_text()
-                            # Extract first meaningful section (skip header)
-                            lines = content.strip().split("\n")
-                            insight_lines = []
-                            in_content = False
-                            for line in lines[:15]:  # Limit to first 15 lines
-                                if line.startswith("## ") or line.startswith("- "):
-                                    in_content = True
-                                if in_content and line.strip():
-                                    insight_lines.append(line)
-                                if len(insight_lines) >= 3:
-                                    break
-                            if insight_lines:
-                                memory_insights.append(
-                                    f"📎 **{mem_name.replace('.md', '')}**: {insight_lines[0][:80]}"
-                                )
-                        except Exception:
-                            pass
-
-                # Quick staleness check
-                memories = list(memories_dir.glob("*.md"))
-                metadata_file = serena_dir / "memory_metadata.json"
-                metadata = {}
-                if metadata_file.exists():
-                    metadata = _json.loads(metadata_file.read_text())
-
-                now = datetime.now()
-                for mem in memories:
-                    if mem.name.startswith("session_"):
-                        continue  # Skip session memories for staleness check
-                    meta = metadata.get(mem.name, {})
-                    mtime = datetime.fromtimestamp(mem.stat().st_mtime)
-                    age_days = (now - mtime).days
-
-                    last_validated = meta.get("last_validated")
-                    if age_days > 14 and not last_validated:
-                        stale_count += 1
-                    elif last_validated:
-                        validated_date = datetime.fromisoformat(last_validated)
-                        if (now - validated_date).days > 14:
-                            stale_count += 1
-            except Exception:
-                pass  # Silent fail on memory processing
-
-        # Build Serena instruction with memory insights
-        memory_status = ""
-        if stale_count > 0:
-            memory_status = f"\n⚠️ **{stale_count} stale memories** — run `/serena-mem status` for details"
-
-        memory_context = ""
-        if memory_insights:
-            memory_context = "\n" + "\n".join(memory_insights[:3])
-
-        serena_instruction = (
-            "\n\n🔮 **SERENA PROJECT DETECTED**\n"
-            "MANDATORY: Call `mcp__serena__activate_project` with current directory "
-            f"NOW before any other action.{memory_status}{memory_context}"
-        )
+    serena_instruction = results["serena"]
+    if serena_instruction:
         if output.get("message"):
-            output["message"] += serena_instruction
+            output["message"] += f"\n\n{serena_instruction}"
         else:
-            output["message"] = serena_instruction.strip()
+            output["message"] = serena_instruction
 
     print(json.dumps(output))
+    sys.stdout.flush()
+    first_output_ms = (time.perf_counter() - _T0) * 1000
+
+    # === NON-ESSENTIAL WORK: detached, after output ===
+    spawn_background_tasks()
+    record_timings(
+        "foreground",
+        timings,
+        first_output_ms=round(first_output_ms, 1),
+        session_id=session_id,
+    )
     sys.exit(0)
 
 
 if __name__ == "__main__":
-    main()
+    if len(sys.argv) > 1 and sys.argv[1] == "--background":
+        run_background_tasks()
+    else:
+        main()
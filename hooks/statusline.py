@@ -5,6 +5,15 @@ System Assistant Statusline v2.1 - Full WSL2 system status at a glance
 Line 1: Model | Context$ | CPU | RAM | Swap | Disk | GPU | Services | Ports | Network
 Line 2: Session | Project | Confidence+Streak | Beads | Serena | Git
 
+v3.0 Snapshot rendering:
+- Rendering reads one precomputed snapshot (hooks/_statusline_snapshot.py)
+  and never imports the confidence system or spawns probes inline
+- Hook runners publish confidence/serena/session fields after saving state
+- Stale fields are recomputed by a detached `statusline.py --refresh`
+  process (one at a time per cwd); the current render uses the last values
+- Context usage reads only the transcript tail, keyed on transcript size
+- Git branch/status read from .git via lib/git_probe.py (no git fork)
+
 v2.1 Improvements:
 - Subprocess consolidation: services now uses single `ps aux` (-2 calls)
 - Git commands combined: single `git status --porcelain --branch` (-1 call)
@@ -33,16 +42,23 @@ import os
 import subprocess
 import sys
 import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable
 
 # Add lib path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent / "lib"))
 sys.path.insert(0, str(Path(__file__).parent))  # For _config
 
-from _config import get_magic_number
 from _logging import log_debug
+from _statusline_snapshot import (
+    acquire_refresh_lock,
+    format_confidence,
+    load_snapshot,
+    refresh_due,
+    release_refresh_lock,
+    stale_fields,
+    update_snapshot,
+)
 
 # =============================================================================
 # CONSTANTS - Extracted thresholds for easy tuning
@@ -81,22 +97,11 @@ class Timeouts:
 
 
 # =============================================================================
-# CACHE LAYER - subprocess results don't change rapidly
+# SNAPSHOT - rendering reads precomputed fields, refresher recomputes them
 # =============================================================================
 
-# User-specific cache to avoid collision between instances
-CACHE_FILE = Path.home() / ".claude" / "tmp" / "statusline_cache.json"
-
-# TTL per metric (seconds) - tuned for typical change frequency
-CACHE_TTL: dict[str, int] = {
-    "gpu": 2,  # VRAM can change during inference
-    "services": 5,  # Docker/node/python processes stable
-    "net": 10,  # Connectivity rarely changes
-    "git": 3,  # Changes with edits but not rapidly
-    "ports": 3,  # Dev servers start/stop occasionally
-    "beads": 5,  # Task status relatively stable
-    "swap": 5,  # Swap usage relatively stable
-}
+# Bytes of transcript tail scanned for the latest usage record
+TRANSCRIPT_TAIL_BYTES = 512 * 1024
 
 # Dev ports worth monitoring (port -> short label)
 DEV_PORTS: dict[int, str] = {
@@ -114,40 +119,6 @@ DEV_PORTS: dict[int, str] = {
 }
 
 
-def load_cache() -> dict[str, Any]:
-    """Load cache from file, return empty dict if missing/invalid."""
-    try:
-        if CACHE_FILE.exists():
-            return json.loads(CACHE_FILE.read_text())
-    except Exception as e:
-        log_debug("statusline", f"cache load failed: {e}")
-    return {}
-
-
-def save_cache(cache: dict[str, Any]) -> None:
-    """Save cache to file (best effort)."""
-    try:
-        CACHE_FILE.write_text(json.dumps(cache))
-    except Exception as e:
-        log_debug("statusline", f"cache save failed: {e}")
-
-
-def get_cached(cache: dict[str, Any], key: str) -> tuple[bool, str]:
-    """Return (hit, value) - hit is True if cache is fresh."""
-    entry = cache.get(key)
-    if not entry:
-        return False, ""
-    ttl = CACHE_TTL.get(key, 5)
-    if time.time() - entry.get("ts", 0) < ttl:
-        return True, entry.get("val", "")
-    return False, ""
-
-
-def set_cached(cache: dict[str, Any], key: str, value: str) -> None:
-    """Store value in cache with current timestamp."""
-    cache[key] = {"ts": time.time(), "val": value}
-
-
 # =============================================================================
 # ANSI COLORS
 # =============================================================================
@@ -366,35 +337,17 @@ def get_dev_ports() -> str:
 
 
 def get_git_info() -> str:
-    """Get git branch and status in single command."""
+    """Get git branch and status from .git directly (no subprocess)."""
     try:
-        # Combined: --branch shows branch info, --porcelain shows file status
-        result = subprocess.run(
-            ["git", "status", "--porcelain", "--branch"],
-            capture_output=True,
-            text=True,
-            timeout=Timeouts.FAST,
-        )
-        if result.returncode != 0:
-            return ""
-
-        lines = result.stdout.strip().split("\n")
-        if not lines:
-            return ""
-
-        # First line: ## branch...tracking or ## HEAD (detached)
-        branch_line = lines[0]
-        branch = ""
-        if branch_line.startswith("## "):
-            branch_part = branch_line[3:]  # Remove "## "
-            # Handle "branch...origin/branch" format
-            branch = branch_part.split("...")[0].split()[0]
+        from git_probe import current_branch, status_porcelain
 
-        if not branch:
+        branch = current_branch()
+        if branch is None:
             return ""
+        branch = branch or "HEAD"  # Detached
 
-        # Rest is file status
-        status_lines = lines[1:] if len(lines) > 1 else []
+        status = status_porcelain()
+        status_lines = status.split("\n") if status else []
         status_str = ""
         if status_lines:
             modified = sum(1 for ln in status_lines if len(ln) > 1 and ln[1] == "M")
@@ -480,59 +433,31 @@ def get_project_info() -> tuple[str, str]:
         return Path.cwd().name, ""
 
 
-def get_confidence_status() -> str:
-    """Get confidence level with streak indicator from session state."""
+def _load_state_data() -> dict[str, Any]:
+    """Load project session state JSON (empty dict if unavailable)."""
     try:
         from _session_constants import get_project_state_file
 
         state_file = get_project_state_file()
         if not state_file.exists():
-            return ""
+            return {}
         with open(state_file) as f:
-            data = json.load(f)
-
-        confidence = data.get("confidence", 70)
-
-        # Get streak from confidence_streaks module
-        try:
-            from _confidence_streaks import get_current_streak
-
-            streak = get_current_streak(data)
-        except Exception as e:
-            log_debug("statusline", f"confidence_streak failed: {e}")
-            streak = 0
-
-        from confidence import get_tier_info, STASIS_FLOOR
-
-        tier_name, emoji, _ = get_tier_info(confidence)
-
-        # Streak indicator
-        streak_str = ""
-        if streak >= 5:
-            streak_str = f" 🔥 {streak}"
-        elif streak >= 2:
-            streak_str = f" ⚡ {streak}"
-
-        # Fatigue indicator (v4.9) - show when not fresh
-        fatigue_str = ""
-        fatigue_mult = 1.0
-        turn_count = data.get("turn_count", 0)
-        try:
-            from _fatigue import get_fatigue_tier
-
-            tier, fatigue_emoji, fatigue_mult = get_fatigue_tier(turn_count)
-            if tier != "fresh":  # Only show if fatigued
-                fatigue_str = f" {fatigue_emoji}{fatigue_mult:.1f}x"
-        except ImportError:
-            fatigue_mult = 1.0  # Fallback if fatigue module not available
+            return json.load(f)
+    except Exception as e:
+        log_debug("statusline", f"state load failed: {e}")
+        return {}
 
-        # Trajectory prediction (3 turns decay, adjusted for fatigue)
-        projected = confidence - int(3 * fatigue_mult)
-        trajectory = ""
-        if projected < STASIS_FLOOR and confidence >= STASIS_FLOOR:
-            trajectory = " 📉"
 
-        return f"{emoji} {confidence}%{streak_str}{fatigue_str}{trajectory}"
+def get_confidence_status(data: dict[str, Any] | None = None) -> str:
+    """Get confidence level with streak indicator from session state."""
+    try:
+        data = _load_state_data() if data is None else data
+        if not data:
+            return ""
+        streak = data.get("nudge_history", {}).get("_confidence_streak", 0)
+        return format_confidence(
+            data.get("confidence", 70), streak, data.get("turn_count", 0)
+        )
     except Exception as e:
         log_debug("statusline", f"confidence_status failed: {e}")
         return ""
@@ -570,23 +495,9 @@ def get_mastermind_turn() -> str:
         return ""
 
 
-def get_serena_status() -> str:
-    """Check if Serena is activated for current project."""
-    try:
-        from _session_constants import get_project_state_file
-
-        state_file = get_project_state_file()
-        if not state_file.exists():
-            return ""
-        with open(state_file) as f:
-            data = json.load(f)
-
-        if data.get("serena_activated", False):
-            return f"{C.MAGENTA}🔮{C.RESET}"
-        return ""
-    except Exception as e:
-        log_debug("statusline", f"serena_status failed: {e}")
-        return ""
+def format_serena_status(activated: bool) -> str:
+    """Serena activation indicator."""
+    return f"{C.MAGENTA}🔮{C.RESET}" if activated else ""
 
 
 def get_session_age(started_at: float) -> str:
@@ -642,36 +553,54 @@ def format_token_budget(used: int, total: int) -> str:
     return f"{color}{emoji}${dollars}{C.RESET}"
 
 
+def _usage_from_line(line: str) -> int | None:
+    """Total tokens from an assistant transcript line (None if not usage)."""
+    try:
+        data = json.loads(line.strip())
+    except (json.JSONDecodeError, ValueError):
+        return None
+    message = data.get("message", {}) if isinstance(data, dict) else {}
+    if message.get("role") != "assistant":
+        return None
+    if "synthetic" in str(message.get("model", "")).lower():
+        return None
+    usage = message.get("usage")
+    if not usage:
+        return None
+    return (
+        usage.get("input_tokens", 0)
+        + usage.get("output_tokens", 0)
+        + usage.get("cache_read_input_tokens", 0)
+        + usage.get("cache_creation_input_tokens", 0)
+    )
+
+
 def get_context_usage(
     transcript_path: str, context_window: int
 ) -> tuple[int, int, float]:
-    """Calculate context window usage from transcript. Returns (used, total, pct)."""
+    """Calculate context window usage from transcript. Returns (used, total, pct).
+
+    Scans the transcript tail backwards; only falls back to a full scan when
+    the tail holds no assistant usage record.
+    """
     if not transcript_path or not Path(transcript_path).exists():
         return 0, 0, 0.0
     try:
-        with open(transcript_path, "r") as f:
-            lines = f.readlines()
-        for line in reversed(lines):
-            try:
-                data = json.loads(line.strip())
-                if data.get("message", {}).get("role") != "assistant":
-                    continue
-                model = str(data.get("message", {}).get("model", "")).lower()
-                if "synthetic" in model:
-                    continue
-                usage = data.get("message", {}).get("usage")
-                if usage:
-                    used = (
-                        usage.get("input_tokens", 0)
-                        + usage.get("output_tokens", 0)
-                        + usage.get("cache_read_input_tokens", 0)
-                        + usage.get("cache_creation_input_tokens", 0)
-                    )
-                    pct = (used / context_window) * 100 if context_window else 0
-                    return used, context_window, pct
-            except Exception as e:
-                log_debug("statusline", f"context_usage line parse failed: {e}")
-                continue
+        with open(transcript_path, "rb") as f:
+            f.seek(0, 2)
+            size = f.tell()
+            for tail in (TRANSCRIPT_TAIL_BYTES, size):
+                f.seek(max(0, size - tail))
+                lines = f.read().decode("utf-8", errors="replace").splitlines()
+                if tail < size:
+                    lines = lines[1:]  # first line may be partial
+                for line in reversed(lines):
+                    used = _usage_from_line(line)
+                    if used is not None:
+                        pct = (used / context_window) * 100 if context_window else 0
+                        return used, context_window, pct
+                if tail >= size:
+                    break
         return 0, 0, 0.0
     except Exception as e:
         log_debug("statusline", f"context_usage failed: {e}")
@@ -679,16 +608,136 @@ def get_context_usage(
 
 
 # =============================================================================
-# MAIN
+# BACKGROUND REFRESH
 # =============================================================================
 
 
-def main() -> None:
+def _state_fields(data: dict[str, Any]) -> dict[str, Any]:
+    """Session fields normally published by hook runners (backfill)."""
+    return {
+        "confidence": get_confidence_status(data),
+        "serena": bool(data.get("serena_activated", False)),
+        "started_at": data.get("started_at", 0) or 0,
+    }
+
+
+# Refreshable fields -> compute functions (values stored raw in snapshot)
+FIELD_FUNCS: dict[str, Callable[[], Any]] = {
+    "cpu": get_cpu_load,
+    "ram": get_ram_usage,
+    "swap": get_swap_usage,
+    "disk": get_disk_usage,
+    "gpu": get_gpu_vram,
+    "services": get_services_status,
+    "ports": get_dev_ports,
+    "net": get_network_status,
+    "git": get_git_info,
+    "beads": get_beads_status,
+    "project": lambda: get_project_info()[0],
+    "mm_turn": get_mastermind_turn,
+}
+STATE_FIELDS = ("confidence", "serena", "started_at")
+
+
+def refresh_snapshot(
+    keys: list[str], transcript_path: str = "", context_window: int = 0
+) -> None:
+    """Recompute the given fields (plus context usage) into the snapshot."""
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+
+    results: dict[str, Any] = {}
+    funcs = {k: FIELD_FUNCS[k] for k in keys if k in FIELD_FUNCS}
+    if funcs:
+        with ThreadPoolExecutor(max_workers=len(funcs)) as executor:
+            futures = {executor.submit(fn): name for name, fn in funcs.items()}
+            try:
+                for future in as_completed(futures, timeout=Timeouts.PARALLEL):
+                    name = futures[future]
+                    try:
+                        results[name] = future.result()
+                    except Exception as e:
+                        log_debug("statusline", f"refresh {name} failed: {e}")
+                        results[name] = ""
+            except TimeoutError:
+                log_debug("statusline", "refresh timed out; keeping old values")
+
+    if any(k in STATE_FIELDS for k in keys):
+        state_data = _load_state_data()
+        if state_data:
+            results.update(
+                {k: v for k, v in _state_fields(state_data).items() if k in keys}
+            )
+
+    context = None
+    if transcript_path:
+        try:
+            size = Path(transcript_path).stat().st_size
+        except OSError:
+            size = 0
+        used, total, _ = get_context_usage(transcript_path, context_window)
+        context = {"path": transcript_path, "size": size, "used": used, "total": total}
+
+    update_snapshot(results, context, refreshed=True)
+
+
+def _context_is_stale(snapshot: dict[str, Any], transcript_path: str) -> bool:
+    if not transcript_path:
+        return False
+    ctx = snapshot.get("context") or {}
+    if ctx.get("path") != transcript_path:
+        return True
     try:
-        input_data = json.loads(sys.stdin.read())
-    except Exception as e:
-        log_debug("statusline", f"input parse failed: {e}")
-        input_data = {}
+        return os.stat(transcript_path).st_size != ctx.get("size")
+    except OSError:
+        return False
+
+
+def spawn_refresher(keys: list[str], transcript_path: str, context_window: int) -> None:
+    """Start a detached refresher unless one is already running."""
+    if not acquire_refresh_lock():
+        return
+    try:
+        subprocess.Popen(
+            [
+                sys.executable,
+                str(Path(__file__).resolve()),
+                "--refresh",
+                transcript_path,
+                str(context_window),
+                *keys,
+            ],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True,
+        )
+    except OSError as e:
+        log_debug("statusline", f"refresher spawn failed: {e}")
+        release_refresh_lock()
+
+
+def run_refresher(argv: list[str]) -> None:
+    """Entry point for `statusline.py --refresh <transcript> <ctx_window> keys...`."""
+    try:
+        transcript_path = argv[0] if argv else ""
+        context_window = int(argv[1]) if len(argv) > 1 and argv[1].isdigit() else 0
+        refresh_snapshot(argv[2:], transcript_path, context_window)
+    finally:
+        release_refresh_lock()
+
+
+# =============================================================================
+# MAIN
+# =============================================================================
+
+
+def render(input_data: dict[str, Any], snapshot: dict[str, Any]) -> str:
+    """Render both statusline lines from input + snapshot (no I/O)."""
+    fields = snapshot.get("fields", {})
+
+    def field(name: str, default: Any = "") -> Any:
+        entry = fields.get(name)
+        return entry.get("val", default) if entry else default
 
     # Model
     model = input_data.get("model", {})
@@ -703,125 +752,89 @@ def main() -> None:
         model_short = f"{C.DIM}{model_name[:6]}{C.RESET}"
 
     # Context with warning + money framing (Entity Model: loss aversion)
-    transcript = input_data.get("transcript_path", "")
-    context_window = model.get(
-        "context_window", get_magic_number("default_context_window", 200000)
-    )
-    used, total, pct = get_context_usage(transcript, context_window)
-    if used > 0 and total > 0:
+    ctx = snapshot.get("context") or {}
+    used, total = ctx.get("used", 0), ctx.get("total", 0)
+    if ctx.get("path") == input_data.get("transcript_path") and used and total:
+        pct = (used / total) * 100
         warn = "🚨" if pct >= Thresholds.CTX_WARN else ""
         # Money framing: show remaining budget instead of % used
-        budget_str = format_token_budget(used, total)
-        context_str = f"{budget_str}{warn}"
+        context_str = f"{format_token_budget(used, total)}{warn}"
     else:
         context_str = f"{C.GREEN}💰$200K{C.RESET}"
 
-    # Fast system stats
-    cpu = get_cpu_load()
-    ram = get_ram_usage()
-    disk = get_disk_usage()
-
-    # Slow subprocess calls - cached + parallel
-    slow_funcs = {
-        "gpu": get_gpu_vram,
-        "services": get_services_status,
-        "ports": get_dev_ports,
-        "net": get_network_status,
-        "git": get_git_info,
-        "beads": get_beads_status,
-    }
-
-    cache = load_cache()
-    results: dict[str, str] = {}
-    stale_funcs: dict[str, Any] = {}
-
-    for name, fn in slow_funcs.items():
-        hit, val = get_cached(cache, name)
-        if hit:
-            results[name] = val
-        else:
-            stale_funcs[name] = fn
-
-    if stale_funcs:
-        with ThreadPoolExecutor(max_workers=len(stale_funcs)) as executor:
-            futures = {executor.submit(fn): name for name, fn in stale_funcs.items()}
-            for future in as_completed(futures, timeout=Timeouts.PARALLEL):
-                name = futures[future]
-                try:
-                    val = future.result()
-                    results[name] = val
-                    set_cached(cache, name, val)
-                except Exception as e:
-                    log_debug("statusline", f"future {name} failed: {e}")
-                    results[name] = ""
-        save_cache(cache)
-
-    gpu = results.get("gpu", "")
-    services = results.get("services", "")
-    ports = results.get("ports", "")
-    net = results.get("net", f"{C.DIM}NET{C.RESET}")
-    git = results.get("git", "")
-    beads = results.get("beads", "")
-    swap = get_swap_usage()  # Fast /proc read, not cached
+    dim = f"{C.DIM}--{C.RESET}"
+    swap = field("swap")
+    gpu = field("gpu")
+    services = field("services")
+    ports = field("ports")
 
     # Line 1: Model | Context | System
     line1_parts = [
         model_short,
         f"CTX:{context_str}",
-        f"CPU:{cpu}",
-        f"RAM:{ram}",
+        f"CPU:{field('cpu', dim) or dim}",
+        f"RAM:{field('ram', dim) or dim}",
     ]
     if swap:
         line1_parts.append(f"SW:{swap}")
-    line1_parts.append(f"DSK:{disk}")
+    line1_parts.append(f"DSK:{field('disk', dim) or dim}")
     if gpu:
         line1_parts.append(f"GPU:{gpu}")
     if services:
         line1_parts.append(services)
     if ports:
         line1_parts.append(ports)
-    line1_parts.append(net)
+    line1_parts.append(field("net") or f"{C.DIM}NET{C.RESET}")
     line1 = f" {C.DIM}|{C.RESET} ".join(line1_parts)
 
     # Line 2: Session | Project | Confidence | Turn | Beads | Serena | Git
     session_id = input_data.get("session_id", "")[:8]
-    project_name, _ = get_project_info()
-    confidence = get_confidence_status()
-    mm_turn = get_mastermind_turn()
-    serena = get_serena_status()
-
-    # Session age from state
-    try:
-        from _session_constants import get_project_state_file
-
-        state_file = get_project_state_file()
-        if state_file.exists():
-            with open(state_file) as f:
-                state_data = json.load(f)
-            session_age = get_session_age(state_data.get("started_at", 0))
-        else:
-            session_age = ""
-    except Exception as e:
-        log_debug("statusline", f"session_age_main failed: {e}")
-        session_age = ""
+    project_name = field("project") or Path.cwd().name
+    session_age = get_session_age(field("started_at", 0))
 
     line2_parts = [f"{C.DIM}{session_id}{C.RESET}"]
     if session_age:
         line2_parts.append(session_age)
     line2_parts.append(f"{C.CYAN}{project_name}{C.RESET}")
-    if confidence:
-        line2_parts.append(confidence)
-    if mm_turn:
-        line2_parts.append(mm_turn)
-    if beads:
-        line2_parts.append(beads)
-    if serena:
-        line2_parts.append(serena)
-    if git:
-        line2_parts.append(git)
+    for value in (
+        field("confidence"),
+        field("mm_turn"),
+        field("beads"),
+        format_serena_status(field("serena", False)),
+        field("git"),
+    ):
+        if value:
+            line2_parts.append(value)
     line2 = f" {C.DIM}|{C.RESET} ".join(line2_parts)
 
-    print(f"{line1}\n{line2}")
+    return f"{line1}\n{line2}"
+
+
+def main() -> None:
+    if len(sys.argv) > 1 and sys.argv[1] == "--refresh":
+        run_refresher(sys.argv[2:])
+        return
+
+    try:
+        input_data = json.loads(sys.stdin.read())
+    except Exception as e:
+        log_debug("statusline", f"input parse failed: {e}")
+        input_data = {}
+
+    snapshot = load_snapshot()
+
+    # Schedule background refresh of anything stale - never wait for it
+    transcript = input_data.get("transcript_path", "")
+    stale = stale_fields(snapshot)
+    if refresh_due(snapshot) and (stale or _context_is_stale(snapshot, transcript)):
+        context_window = input_data.get("model", {}).get("context_window")
+        if not context_window:
+            from _config import get_magic_number
+
+            context_window = get_magic_number("default_context_window", 200000)
+        spawn_refresher(stale, transcript, int(context_window))
+
+    print(render(input_data, snapshot))
 
 
 if __name__ == "__main__":
@@ -261,6 +261,13 @@ def persist_lessons_to_memory(lessons: list[str], blocks: list[dict]) -> None:
     except ImportError:
         pass
 
+    try:
+        from block_log import record_lessons
+
+        record_lessons([lesson.strip().rstrip(".") for lesson in lessons], hook_names)
+    except (ImportError, OSError):
+        pass
+
 
 def check_dismissals_in_transcript(transcript_path: str) -> list[str]:
     """Check if Claude claimed any false positives without fixing them."""
@@ -905,24 +912,12 @@ def check_ralph_evidence(data: dict, state: SessionState) -> StopHookResult:
 
 
 def _get_in_progress_beads_for_stop() -> list:
-    """Get list of in_progress beads for stop gate (no caching needed)."""
+    """Get list of in_progress beads for stop gate (shared bead snapshot)."""
     try:
-        result = subprocess.run(
-            ["bd", "list", "--status=in_progress", "--format=json"],
-            capture_output=True,
-            text=True,
-            timeout=5,
-            cwd=str(CLAUDE_DIR),
-        )
-        if result.returncode == 0 and result.stdout.strip():
-            return json.loads(result.stdout)
-        return []
-    except (
-        subprocess.TimeoutExpired,
-        json.JSONDecodeError,
-        FileNotFoundError,
-        OSError,
-    ):
+        from bead_cache import get_cached_beads
+
+        return get_cached_beads("in_progress")
+    except Exception:
         return []
 
 
@@ -1476,6 +1471,10 @@ def main():
     except (json.JSONDecodeError, ValueError):
         data = {}
 
+    from _logging import log_timing, set_log_context
+
+    set_log_context("Stop", data.get("session_id"))
+
     # Single state load
     try:
         state = load_state()
@@ -1497,6 +1496,7 @@ def main():
     elapsed = (time.time() - start) * 1000
     if elapsed > 200:
         print(f"[stop-runner] Slow: {elapsed:.1f}ms", file=sys.stderr)
+    log_timing("stop_runner", elapsed)
 
     sys.exit(0)
 
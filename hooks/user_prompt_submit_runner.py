@@ -139,6 +139,10 @@ def main():
         print(json.dumps({"hookSpecificOutput": {"hookEventName": "UserPromptSubmit"}}))
         sys.exit(0)
 
+    from _logging import log_timing, set_log_context
+
+    set_log_context("UserPromptSubmit", data.get("session_id"))
+
     # Normalize prompt field
     prompt = data.get("prompt", "") or data.get("user_prompt", "")
     data["prompt"] = prompt
@@ -155,6 +159,11 @@ def main():
     # Single state save
     save_state(state)
 
+    # Keep the statusline snapshot current (statusline only renders it)
+    from _statusline_snapshot import publish_session_fields
+
+    publish_session_fields(state)
+
     # Output result
     print(json.dumps(result))
 
@@ -162,6 +171,7 @@ def main():
     elapsed = (time.time() - start) * 1000
     if elapsed > 100:
         print(f"[ups-runner] Slow: {elapsed:.1f}ms", file=sys.stderr)
+    log_timing("user_prompt_submit_runner", elapsed)
 
     sys.exit(0)
 
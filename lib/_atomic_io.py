@@ -0,0 +1,123 @@
+"""
+Atomic I/O: tmp-file writes, fcntl locks and cache-directory pruning.
+
+Caches, rollups and logs under ~/.claude are read and written by many
+short-lived hook processes at once. The three patterns they all need live
+here, so each store gets the same guarantees:
+
+- write_atomic() / write_json_atomic(): write a hidden sibling temp file and
+  os.replace() it over the target, so readers see the old or the new
+  contents, never a partial write. Temp names are unique per process and
+  thread.
+- locked(): exclusive flock on a separate lock file. If the holder unlinks
+  the lock file (to retire a store), waiters that wake up on the orphaned
+  inode retry on the file now at the path instead of running beside a
+  newer holder.
+- prune_oldest(): once a cache directory holds more than max_entries files,
+  drop the oldest quarter by mtime.
+
+Usage:
+    from _atomic_io import locked, prune_oldest, write_json_atomic
+
+    with locked(STATE_DIR / ".lock"):
+        write_json_atomic(STATE_DIR / "state.json", state)
+    prune_oldest(CACHE_DIR, 500)
+"""
+
+from __future__ import annotations
+
+import fcntl
+import json
+import os
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Iterator, Union
+
+PathLike = Union[str, Path]
+
+
+def write_atomic(path: PathLike, data: Union[str, bytes]) -> None:
+    """Replace path's contents with data (tmp + rename).
+
+    The parent directory is created if missing. Raises OSError on failure;
+    the temp file is removed and path is left untouched.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        with open(tmp, "wb" if isinstance(data, bytes) else "w") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def write_json_atomic(path: PathLike, obj: Any, **dumps_kwargs: Any) -> None:
+    """write_atomic() of json.dumps(obj, **dumps_kwargs)."""
+    write_atomic(path, json.dumps(obj, **dumps_kwargs))
+
+
+@contextmanager
+def locked(lock_path: PathLike) -> Iterator[None]:
+    """Hold an exclusive flock on lock_path (created if missing).
+
+    The lock file may be unlinked by its holder; a waiter that then gets the
+    orphaned inode reopens the path and locks again.
+    """
+    lock_path = str(lock_path)
+    os.makedirs(os.path.dirname(lock_path) or ".", exist_ok=True)
+    while True:
+        fd = os.open(lock_path, os.O_CREAT | os.O_RDWR)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            if os.stat(lock_path).st_ino == os.fstat(fd).st_ino:
+                break
+        except FileNotFoundError:
+            pass
+        except BaseException:
+            os.close(fd)
+            raise
+        os.close(fd)  # Closing releases the flock
+    try:
+        yield
+    finally:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+        os.close(fd)
+
+
+def prune_oldest(directory: PathLike, max_entries: int) -> int:
+    """Drop the oldest quarter of directory's files once it exceeds max_entries.
+
+    Best effort: files that vanish meanwhile are skipped.
+
+    Returns:
+        Number of files removed
+    """
+    try:
+        entries = [e for e in os.scandir(directory) if e.is_file()]
+    except OSError:
+        return 0
+    if len(entries) <= max_entries:
+        return 0
+
+    def mtime(entry: os.DirEntry) -> float:
+        try:
+            return entry.stat().st_mtime
+        except OSError:
+            return 0.0
+
+    entries.sort(key=mtime)
+    removed = 0
+    for entry in entries[: len(entries) // 4]:
+        try:
+            os.unlink(entry.path)
+            removed += 1
+        except OSError:
+            pass
+    return removed
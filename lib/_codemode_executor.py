@@ -24,19 +24,27 @@ Usage:
 
 from __future__ import annotations
 
+import hashlib
+import heapq
 import json
+import os
+import re
 import sys
+import time
 import traceback
+from collections import OrderedDict
+from contextlib import contextmanager
 from dataclasses import dataclass, field
 from io import StringIO
 from pathlib import Path
-from typing import Any, Callable
+from typing import Any, Callable, Iterator
 
 # Ensure lib directory is in path for sibling imports
 _LIB_DIR = Path(__file__).parent
 if str(_LIB_DIR) not in sys.path:
     sys.path.insert(0, str(_LIB_DIR))
 
+from _atomic_io import locked, write_atomic, write_json_atomic  # noqa: E402
 from _codemode_interfaces import (  # noqa: E402
     ToolInterface,
     bind_executor,
@@ -51,8 +59,11 @@ from _codemode_planner import (  # noqa: E402
 # Execution log location
 EXECUTION_LOG = Path.home() / ".claude" / "tmp" / "codemode_execution.jsonl"
 
-# Handoff state file for Claude-mediated tool execution
-HANDOFF_STATE = Path.home() / ".claude" / "tmp" / "codemode_handoff.json"
+# Persistent tool result cache (append-only log, see ResultCache)
+RESULT_CACHE_LOG = Path.home() / ".claude" / "tmp" / "codemode_results.jsonl"
+
+# Handoff store for Claude-mediated tool execution (see HANDOFF STORE)
+HANDOFF_DIR = Path.home() / ".claude" / "tmp" / "codemode_handoff"
 
 
 @dataclass
@@ -133,77 +144,310 @@ class HandoffState:
         )
 
 
-def write_handoff_state(state: HandoffState) -> None:
-    """Write handoff state for Claude to process."""
-    import time
+# =============================================================================
+# HANDOFF STORE
+# =============================================================================
+#
+# HANDOFF_DIR/
+#   log.jsonl        append-only history of submit/result events
+#   pending/<id>     one request per pending call (the pending-ID index)
+#   results/<id>     one response per completed call
+#   notify/<id>      FIFO a waiting executor blocks on (wait_for_result)
+#
+# Submitting or recording a call touches only that call's files plus one
+# log append, so neither operation rewrites shared state and hooks that
+# only need "anything pending?" do a single directory listing.
 
-    HANDOFF_STATE.parent.mkdir(parents=True, exist_ok=True)
-    state.created_at = time.time()
-    HANDOFF_STATE.write_text(json.dumps(state.to_dict(), indent=2))
 
+_SAFE_CALL_ID = re.compile(r"[A-Za-z0-9_-][A-Za-z0-9_.-]{0,127}")
 
-def read_handoff_state() -> HandoffState | None:
-    """Read handoff state, returns None if not exists."""
-    if not HANDOFF_STATE.exists():
+
+def _handoff_path(kind: str, call_id: str | None = None) -> Path:
+    """A kind's directory, or the file for call_id within it.
+
+    IDs are caller-chosen: anything that isn't a plain file name (empty,
+    "..", separators, hidden or overlong) is stored under a hash of the ID.
+    Already-safe names (including hashed ones) map to themselves.
+    """
+    if call_id is None:
+        return HANDOFF_DIR / kind
+    if _SAFE_CALL_ID.fullmatch(call_id):
+        return HANDOFF_DIR / kind / call_id
+    digest = hashlib.sha256(call_id.encode("utf-8", "surrogatepass")).hexdigest()
+    return HANDOFF_DIR / kind / f"id-{digest[:32]}"
+
+
+def _write_json_atomic(path: Path, data: dict) -> None:
+    write_json_atomic(path, data, default=str)
+
+
+def _read_json(path: Path) -> dict | None:
+    try:
+        data = json.loads(path.read_text())
+        return data if isinstance(data, dict) else None
+    except (OSError, ValueError):
         return None
+
+
+def _append_handoff_log(event: dict) -> None:
+    """Append one event line (O_APPEND keeps concurrent lines whole)."""
     try:
-        data = json.loads(HANDOFF_STATE.read_text())
-        return HandoffState.from_dict(data)
-    except (json.JSONDecodeError, OSError):
+        HANDOFF_DIR.mkdir(parents=True, exist_ok=True)
+        with open(HANDOFF_DIR / "log.jsonl", "a") as f:
+            f.write(json.dumps({"ts": time.time(), **event}, default=str) + "\n")
+    except OSError:
+        return  # History is informational only
+
+
+def _notify(call_id: str) -> None:
+    """Wake an executor blocked in wait_for_result (no-op if none)."""
+    try:
+        fd = os.open(_handoff_path("notify", call_id), os.O_WRONLY | os.O_NONBLOCK)
+    except OSError:
+        return  # No FIFO or no reader
+    try:
+        os.write(fd, b"1")
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def _handoff_exists() -> bool:
+    """Whether the store holds any calls or history (notify/ aside)."""
+    return any(
+        path.exists()
+        for path in (
+            HANDOFF_DIR / "log.jsonl",
+            _handoff_path("pending"),
+            _handoff_path("results"),
+        )
+    )
+
+
+def _clear_calls() -> None:
+    """Remove pending calls, results and history; notify/ FIFOs stay."""
+    import shutil
+
+    for kind in ("pending", "results"):
+        shutil.rmtree(_handoff_path(kind), ignore_errors=True)
+    (HANDOFF_DIR / "log.jsonl").unlink(missing_ok=True)
+
+
+def _wake_waiters() -> None:
+    """Wake every blocked wait_for_result so it re-checks its call."""
+    try:
+        names = os.listdir(_handoff_path("notify"))
+    except OSError:
+        return
+    for name in names:
+        _notify(name)
+
+
+def write_handoff_state(state: HandoffState) -> None:
+    """Replace the handoff store with the given state."""
+    _clear_calls()
+    for call in state.pending:
+        submit_tool_call(call)
+    for response in state.completed.values():
+        _write_json_atomic(_handoff_path("results", response.id), response.to_dict())
+    _wake_waiters()
+
+
+def read_handoff_state() -> HandoffState | None:
+    """Snapshot of the handoff store, returns None if not exists."""
+    if not _handoff_exists():
         return None
+    completed = {}
+    try:
+        names = sorted(os.listdir(_handoff_path("results")))
+    except OSError:
+        names = []
+    for name in names:
+        data = _read_json(_handoff_path("results", name))
+        if data is not None and "id" in data:
+            completed[data["id"]] = ToolCallResponse(
+                id=data["id"],
+                success=data["success"],
+                result=data.get("result"),
+                error=data.get("error"),
+            )
+    try:
+        created_at = (HANDOFF_DIR / "log.jsonl").stat().st_ctime
+    except OSError:
+        created_at = 0.0
+    return HandoffState(
+        pending=get_pending_calls(), completed=completed, created_at=created_at
+    )
 
 
 def clear_handoff_state() -> None:
-    """Clear handoff state after processing."""
-    if HANDOFF_STATE.exists():
-        HANDOFF_STATE.unlink()
+    """Clear handoff state after processing.
+
+    Executors blocked in wait_for_result keep their FIFOs and are woken, so
+    they see their call is gone instead of sleeping until their timeout.
+    """
+    _clear_calls()
+    _wake_waiters()
 
 
 def submit_tool_call(call: ToolCallRequest) -> None:
     """Add a tool call request to the handoff queue."""
-    import time
-
-    state = read_handoff_state()
-    if state is None:
-        state = HandoffState(pending=[], completed={}, created_at=time.time())
-    state.pending.append(call)
-    write_handoff_state(state)
+    record = {**call.to_dict(), "submitted_ns": time.time_ns()}
+    # A resubmitted ID starts over: drop any stale response
+    _handoff_path("results", call.id).unlink(missing_ok=True)
+    _write_json_atomic(_handoff_path("pending", call.id), record)
+    _append_handoff_log({"op": "submit", "id": call.id, "tool": call.tool})
 
 
 def record_tool_result(
     call_id: str, success: bool, result: Any = None, error: str | None = None
 ) -> None:
     """Record a tool call result (called by Claude after execution)."""
-    state = read_handoff_state()
-    if state is None:
+    if not _handoff_exists():
         return
 
-    # Remove from pending, add to completed
-    state.pending = [r for r in state.pending if r.id != call_id]
-    state.completed[call_id] = ToolCallResponse(
+    response = ToolCallResponse(
         id=call_id,
         success=success,
         result=result,
         error=error,
     )
-    write_handoff_state(state)
+    _write_json_atomic(_handoff_path("results", call_id), response.to_dict())
+    _handoff_path("pending", call_id).unlink(missing_ok=True)
+    _append_handoff_log({"op": "result", "id": call_id, "success": success})
+    _notify(call_id)
 
 
 def get_pending_calls() -> list[ToolCallRequest]:
     """Get pending tool calls for Claude to execute."""
-    state = read_handoff_state()
-    if state is None:
+    try:
+        names = os.listdir(_handoff_path("pending"))
+    except OSError:
         return []
-    # Sort by priority (lower first)
-    return sorted(state.pending, key=lambda r: r.priority)
+
+    records = []
+    for name in names:
+        if name.startswith("."):
+            continue  # In-flight atomic write
+        data = _read_json(_handoff_path("pending", name))
+        if data is not None and "id" in data and "tool" in data:
+            records.append(data)
+    # Sort by priority (lower first), then submission order
+    records.sort(key=lambda r: (r.get("priority", 0), r.get("submitted_ns", 0)))
+    return [
+        ToolCallRequest(
+            id=r["id"],
+            tool=r["tool"],
+            args=r.get("args", {}),
+            priority=r.get("priority", 0),
+        )
+        for r in records
+    ]
 
 
 def get_completed_result(call_id: str) -> ToolCallResponse | None:
     """Get result for a completed call."""
-    state = read_handoff_state()
-    if state is None:
+    data = _read_json(_handoff_path("results", call_id))
+    if data is None:
         return None
-    return state.completed.get(call_id)
+    return ToolCallResponse(
+        id=data["id"],
+        success=data["success"],
+        result=data.get("result"),
+        error=data.get("error"),
+    )
+
+
+def wait_for_result(call_id: str, timeout: float = 300.0) -> ToolCallResponse | None:
+    """
+    Block until a handoff call has a recorded result.
+
+    Waits on a per-call FIFO that record_tool_result writes to, so a
+    long-lived executor wakes immediately instead of re-reading state.
+    Falls back to short polling where FIFOs are unavailable. Returns early
+    if the call is cleared from the store without a result.
+
+    Args:
+        call_id: ID passed to submit_tool_call
+        timeout: Seconds to wait
+
+    Returns:
+        The response, or None on timeout
+    """
+    import select
+
+    deadline = time.time() + timeout
+    fifo = _handoff_path("notify", call_id)
+    read_fd = keep_fd = None
+    try:
+        fifo.parent.mkdir(parents=True, exist_ok=True)
+        if not fifo.exists():
+            os.mkfifo(fifo)
+        read_fd = os.open(fifo, os.O_RDONLY | os.O_NONBLOCK)
+        # Hold a write end too, so the reader never sees EOF between writers
+        keep_fd = os.open(fifo, os.O_WRONLY | os.O_NONBLOCK)
+    except (OSError, AttributeError):
+        read_fd = keep_fd = None
+
+    pending = _handoff_path("pending", call_id)
+    woken = False
+    try:
+        while True:
+            # Results are written before the pending file is removed, so
+            # checking pending first means "gone and no result" was a clear
+            gone = woken and not pending.exists()
+            # Check after opening the FIFO so a result recorded meanwhile
+            # is not missed
+            response = get_completed_result(call_id)
+            remaining = deadline - time.time()
+            if response is not None or remaining <= 0 or gone:
+                return response
+            if read_fd is None:
+                time.sleep(min(0.1, remaining))
+                woken = True
+                continue
+            ready, _, _ = select.select([read_fd], [], [], remaining)
+            if ready:
+                woken = True
+                try:
+                    os.read(read_fd, 64)
+                except BlockingIOError:
+                    pass
+    finally:
+        for fd in (read_fd, keep_fd):
+            if fd is not None:
+                os.close(fd)
+        if read_fd is not None:
+            fifo.unlink(missing_ok=True)
+
+
+def make_handoff_invoker(
+    timeout: float = 300.0,
+) -> Callable[[str, dict], dict]:
+    """
+    Tool invoker that routes calls through Claude via the handoff store.
+
+    For a long-lived PlanExecutor: each call is submitted, then the worker
+    blocks in wait_for_result until the PostToolUse recorder fills it in.
+    """
+    import uuid
+
+    def invoke(tool: str, args: dict) -> dict:
+        call_id = f"cm-{uuid.uuid4().hex[:12]}"
+        submit_tool_call(ToolCallRequest(id=call_id, tool=tool, args=args))
+        response = wait_for_result(call_id, timeout)
+        if response is None:
+            return {"error": f"Timed out waiting for {call_id}"}
+        if not response.success:
+            return {"error": response.error or "Tool call failed"}
+        return (
+            response.result
+            if isinstance(response.result, dict)
+            else {"result": response.result}
+        )
+
+    return invoke
 
 
 @dataclass
@@ -475,30 +719,66 @@ class ResultCache:
     Cache for tool call results with TTL support.
 
     Reduces redundant MCP calls for repeated (tool, args) patterns.
+
+    Entries persist in an append-only JSONL log (RESULT_CACHE_LOG) so they
+    survive across hook processes and handoff round-trips. Each instance
+    folds the log into an in-memory LRU (OrderedDict: O(1) touch/evict)
+    with an expiry heap, bounded by entry count and a byte budget. Hits are
+    logged too ({"op": "touch"} lines), so every instance replays the same
+    puts and touches and evicts the same least recently used entries.
+    Writers serialize on a sidecar lock; the log is rewritten in LRU order
+    once it grows well past the budget. Pass path=None for a memory-only
+    cache.
+
+    TTLs resolve per tool: explicit tool_ttls, then the "cache_ttl" field of
+    the tool's entry in the schema cache, then ttl_seconds. A TTL of 0 means
+    the tool is never cached (side effects, conversational tools).
     """
 
     # Default cache settings
     DEFAULT_TTL_SECONDS = 300  # 5 minutes
-    DEFAULT_MAX_ENTRIES = 100
+    DEFAULT_MAX_ENTRIES = 1000
+    DEFAULT_MAX_BYTES = 8 * 1024 * 1024
     HASH_PREFIX_LEN = 16
+    # Compact once the log holds this many times the live bytes
+    COMPACT_RATIO = 2
 
     def __init__(
         self,
         ttl_seconds: int = DEFAULT_TTL_SECONDS,
         max_entries: int = DEFAULT_MAX_ENTRIES,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        path: Path | None = RESULT_CACHE_LOG,
+        tool_ttls: dict[str, float] | None = None,
     ):
         """
         Initialize result cache.
 
         Args:
-            ttl_seconds: Time-to-live for cache entries (default 5 min).
-            max_entries: Maximum cache entries before eviction.
+            ttl_seconds: Default time-to-live for cache entries (default 5 min).
+            max_entries: Maximum cache entries before LRU eviction.
+            max_bytes: Byte budget for serialized results before LRU eviction.
+            path: JSONL log for persistence (None = in-memory only).
+            tool_ttls: Per-tool TTL overrides (seconds, 0 = never cache).
         """
-        self._cache: dict[str, tuple[Any, float]] = {}  # hash -> (result, expires_at)
+        import threading
+
+        # key -> (tool, result, expires_at, size), least recently used first
+        self._cache: OrderedDict[str, tuple[str, Any, float, int]] = OrderedDict()
+        self._expiry: list[tuple[float, str]] = []  # lazily invalidated heap
+        self._bytes = 0
         self._ttl = ttl_seconds
         self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._path = path
+        self._tool_ttls = tool_ttls
+        self._lock = threading.Lock()  # PlanExecutor calls from worker threads
+        self._inode: int | None = None
+        self._offset = 0
         self._hits = 0
         self._misses = 0
+        self._evictions = 0
+        self._by_tool: dict[str, list[int]] = {}  # tool -> [hits, misses]
 
     def _make_key(self, tool: str, args: dict) -> str:
         """Generate cache key from tool name and args."""
@@ -509,6 +789,119 @@ class ResultCache:
         content = f"{tool}:{args_str}"
         return hashlib.sha256(content.encode()).hexdigest()[: self.HASH_PREFIX_LEN]
 
+    def ttl_for(self, tool: str) -> float:
+        """Resolve the TTL policy for a tool."""
+        if self._tool_ttls is None:
+            self._tool_ttls = load_tool_ttls()
+        return self._tool_ttls.get(tool, self._ttl)
+
+    # -- in-memory LRU -----------------------------------------------------
+
+    def _drop(self, key: str) -> None:
+        entry = self._cache.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry[3]
+
+    def _put(self, key: str, tool: str, result: Any, expires_at: float, size: int):
+        self._drop(key)
+        self._cache[key] = (tool, result, expires_at, size)
+        self._bytes += size
+        heapq.heappush(self._expiry, (expires_at, key))
+
+    def _enforce_limits(self, now: float) -> None:
+        """Drop expired entries, then least recently used ones over budget."""
+        while self._expiry and self._expiry[0][0] <= now:
+            expires_at, key = heapq.heappop(self._expiry)
+            entry = self._cache.get(key)
+            if entry is not None and entry[2] == expires_at:
+                self._drop(key)
+        while self._cache and (
+            len(self._cache) > self._max_entries or self._bytes > self._max_bytes
+        ):
+            key, entry = self._cache.popitem(last=False)
+            self._bytes -= entry[3]
+            self._evictions += 1
+        if len(self._expiry) > 2 * len(self._cache) + 64:
+            self._expiry = [(e[2], k) for k, e in self._cache.items()]
+            heapq.heapify(self._expiry)
+
+    # -- persistence -------------------------------------------------------
+
+    def _refresh(self) -> None:
+        """Fold log lines appended by any process since the last read."""
+        if self._path is None:
+            return
+        try:
+            st = os.stat(self._path)
+        except OSError:
+            return
+        if st.st_ino != self._inode or st.st_size < self._offset:
+            # Rotated by compaction/clear: rebuild from the new log
+            self._inode, self._offset = st.st_ino, 0
+            self._cache.clear()
+            self._expiry = []
+            self._bytes = 0
+        if st.st_size == self._offset:
+            return
+        try:
+            with open(self._path, "rb") as f:
+                f.seek(self._offset)
+                chunk = f.read()
+        except OSError:
+            return
+
+        # Only consume complete lines; a concurrent writer may be mid-append
+        end = chunk.rfind(b"\n") + 1
+        for raw in chunk[:end].splitlines():
+            try:
+                entry = json.loads(raw)
+                if entry.get("op") == "touch":
+                    if entry["k"] in self._cache:
+                        self._cache.move_to_end(entry["k"])
+                    continue
+                self._put(entry["k"], entry["t"], entry["v"], entry["x"], len(raw))
+            except (ValueError, KeyError, TypeError, AttributeError):
+                continue
+        self._offset += end
+        self._enforce_limits(time.time())
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        """Exclusive writer lock (separate file so compaction can replace the log)."""
+        with locked(self._path.with_suffix(".lock")):
+            yield
+
+    def _append(self, line: bytes) -> bool:
+        """Append one entry under the writer lock, compacting when worthwhile.
+
+        Returns:
+            True if the entry was persisted (and folded back into memory)
+        """
+        try:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            with self._locked():
+                self._refresh()
+                with open(self._path, "ab") as f:
+                    f.write(line)
+                self._refresh()
+                if self._offset > self.COMPACT_RATIO * max(self._bytes, 64 * 1024):
+                    self._compact_locked()
+            return True
+        except OSError:
+            return False  # Persistence is best effort
+
+    def _compact_locked(self) -> None:
+        """Rewrite the log as live entries in LRU order. Caller holds the lock."""
+        lines = [
+            json.dumps({"k": key, "t": tool, "v": result, "x": expires_at}, default=str)
+            + "\n"
+            for key, (tool, result, expires_at, _) in self._cache.items()
+        ]
+        write_atomic(self._path, "".join(lines))
+        self._refresh()  # new inode -> rebuild from compacted log
+
+    # -- public API --------------------------------------------------------
+
     def get(self, tool: str, args: dict) -> tuple[bool, Any]:
         """
         Get cached result if available and not expired.
@@ -516,45 +909,102 @@ class ResultCache:
         Returns:
             (hit, result) - hit is True if cache hit, result is cached value
         """
-        import time
-
         key = self._make_key(tool, args)
-        if key in self._cache:
-            result, expires_at = self._cache[key]
-            if time.time() < expires_at:
+        with self._lock:
+            counts = self._by_tool.setdefault(tool, [0, 0])
+            self._refresh()
+            entry = self._cache.get(key)
+            if entry is not None and time.time() < entry[2]:
+                self._cache.move_to_end(key)
+                if self._path is not None:
+                    # Shared recency: other instances replay the touch
+                    touch = json.dumps({"op": "touch", "k": key}) + "\n"
+                    self._append(touch.encode())
                 self._hits += 1
-                return (True, result)
-            # Expired - remove
-            del self._cache[key]
-
-        self._misses += 1
-        return (False, None)
+                counts[0] += 1
+                return (True, entry[1])
+            if entry is not None:
+                self._drop(key)  # Expired
+            self._misses += 1
+            counts[1] += 1
+            return (False, None)
 
     def set(self, tool: str, args: dict, result: Any) -> None:
-        """Cache a result."""
-        import time
-
-        # Evict oldest if at capacity
-        if len(self._cache) >= self._max_entries:
-            oldest_key = min(self._cache, key=lambda k: self._cache[k][1])
-            del self._cache[oldest_key]
-
+        """Cache a result (no-op for tools with a TTL of 0)."""
+        ttl = self.ttl_for(tool)
+        if ttl <= 0:
+            return
         key = self._make_key(tool, args)
-        self._cache[key] = (result, time.time() + self._ttl)
+        now = time.time()
+        try:
+            line = (
+                json.dumps(
+                    {"k": key, "t": tool, "v": result, "x": now + ttl}, default=str
+                )
+                + "\n"
+            ).encode()
+        except (TypeError, ValueError):
+            return
+        if len(line) > self._max_bytes:
+            return  # Larger than the whole budget
+
+        with self._lock:
+            if self._path is None or not self._append(line):
+                # Stored as decoded from the log so hits look the same everywhere
+                self._put(key, tool, json.loads(line)["v"], now + ttl, len(line) - 1)
+            self._enforce_limits(now)
 
     def stats(self) -> dict:
-        """Return cache statistics."""
+        """Return cache statistics (hit rates overall and per tool).
+
+        hits/misses count this instance's lookups; entries, bytes and
+        evictions reflect the shared log as folded by this instance.
+        """
+        with self._lock:
+            self._refresh()
         total = self._hits + self._misses
         return {
             "hits": self._hits,
             "misses": self._misses,
             "hit_rate": self._hits / total if total > 0 else 0.0,
             "entries": len(self._cache),
+            "bytes": self._bytes,
+            "evictions": self._evictions,
+            "by_tool": {
+                tool: {
+                    "hits": hits,
+                    "misses": misses,
+                    "hit_rate": hits / (hits + misses) if hits + misses else 0.0,
+                }
+                for tool, (hits, misses) in sorted(self._by_tool.items())
+            },
         }
 
     def clear(self) -> None:
-        """Clear all cached entries."""
-        self._cache.clear()
+        """Clear all cached entries (including the persisted log)."""
+        with self._lock:
+            self._cache.clear()
+            self._expiry = []
+            self._bytes = 0
+            if self._path is None:
+                return
+            try:
+                with self._locked():
+                    self._path.unlink(missing_ok=True)
+                self._inode, self._offset = None, 0
+            except OSError:
+                pass
+
+
+def load_tool_ttls() -> dict[str, float]:
+    """Per-tool result TTLs from the "cache_ttl" field of cached schemas."""
+    from _codemode_interfaces import load_cached_schemas
+
+    return {
+        name: float(schema["cache_ttl"])
+        for name, schema in load_cached_schemas().items()
+        if isinstance(schema, dict) and "cache_ttl" in schema
+    }
 
 
 @dataclass
@@ -613,12 +1063,23 @@ class PlanExecutor:
     Unlike CodeModeExecutor (which runs Python code), PlanExecutor
     directly executes ToolCallSpec objects with dependency resolution.
 
+    Scheduling is a ready queue over the dependency DAG: a call starts as
+    soon as its own depends_on have succeeded, on a worker pool that lives
+    as long as the executor. Among ready calls, the one heading the longest
+    remaining chain (critical path, weighted by observed per-tool latency)
+    goes first. tool_limits caps concurrency per tool name or name prefix.
+
     Usage:
         plan = planner.create_tool_plan([...])
         executor = PlanExecutor(tool_invoker=my_invoker)
         result = executor.execute(plan)
     """
 
+    # Weight of a tool with no observed latency yet (ms)
+    DEFAULT_CALL_COST_MS = 100.0
+    # Smoothing factor for per-tool latency estimates
+    LATENCY_ALPHA = 0.3
+
     def __init__(
         self,
         tool_invoker: Callable[[str, dict], dict] | None = None,
@@ -626,6 +1087,7 @@ class PlanExecutor:
         parallel: bool = True,
         max_workers: int = 4,
         cache: ResultCache | None = None,
+        tool_limits: dict[str, int] | None = None,
     ):
         """
         Initialize plan executor.
@@ -638,12 +1100,94 @@ class PlanExecutor:
             parallel: Execute independent calls concurrently.
             max_workers: Max concurrent executions (default 4).
             cache: Optional ResultCache for caching repeated tool calls.
+            tool_limits: Max concurrent calls per tool. Keys are full tool
+                         names or prefixes (e.g. "mcp__pal__"); the longest
+                         matching key wins.
         """
         self._invoker = tool_invoker
         self._log_executions = log_executions
         self._parallel = parallel
         self._max_workers = max_workers
         self._cache = cache
+        self._tool_limits = {k: max(1, v) for k, v in (tool_limits or {}).items()}
+        self._tool_cost_ms: dict[str, float] = {}
+        self._pool = None  # Created on first parallel execute()
+
+    def __enter__(self) -> "PlanExecutor":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Shut down the worker pool (it is recreated on demand)."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+
+    def _get_pool(self):
+        from concurrent.futures import ThreadPoolExecutor
+
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(
+                max_workers=self._max_workers, thread_name_prefix="codemode-plan"
+            )
+        return self._pool
+
+    def _limit_key(self, tool: str) -> str | None:
+        """Longest tool_limits key matching tool (exact name or prefix)."""
+        best = None
+        for key in self._tool_limits:
+            if tool.startswith(key) and (best is None or len(key) > len(best)):
+                best = key
+        return best
+
+    def _priorities(self, calls: dict[str, ToolCallSpec]) -> dict[str, float]:
+        """Critical-path length from each call to the end of the plan."""
+        dependents: dict[str, list[str]] = {call_id: [] for call_id in calls}
+        for call in calls.values():
+            for dep in call.depends_on:
+                if dep in dependents:
+                    dependents[dep].append(call.id)
+
+        priority: dict[str, float] = {}
+        # Iterative post-order DFS; cycles are cut (their calls never run)
+        for root in calls:
+            if root in priority:
+                continue
+            stack = [(root, False)]
+            on_stack: set[str] = set()
+            while stack:
+                call_id, expanded = stack.pop()
+                if expanded:
+                    on_stack.discard(call_id)
+                    tail = max(
+                        (priority.get(d, 0.0) for d in dependents[call_id]),
+                        default=0.0,
+                    )
+                    cost = self._tool_cost_ms.get(
+                        calls[call_id].tool, self.DEFAULT_CALL_COST_MS
+                    )
+                    priority[call_id] = cost + tail
+                    continue
+                if call_id in priority or call_id in on_stack:
+                    continue
+                on_stack.add(call_id)
+                stack.append((call_id, True))
+                stack.extend((d, False) for d in dependents[call_id])
+        return priority
+
+    def _record_latency(self, result: PlanResult) -> None:
+        if result.cached or result.duration_ms <= 0:
+            return
+        previous = self._tool_cost_ms.get(result.tool)
+        if previous is None:
+            self._tool_cost_ms[result.tool] = result.duration_ms
+        else:
+            alpha = self.LATENCY_ALPHA
+            self._tool_cost_ms[result.tool] = (
+                alpha * result.duration_ms + (1 - alpha) * previous
+            )
 
     def execute(self, plan: ExecutionPlan) -> PlanExecutionResult:
         """
@@ -651,7 +1195,8 @@ class PlanExecutor:
 
         Respects dependency ordering - calls with depends_on wait for
         their dependencies to complete first. Independent calls run
-        in parallel when parallel=True.
+        in parallel when parallel=True. Calls whose dependencies fail,
+        are missing or form a cycle are reported as unresolved.
 
         Args:
             plan: The ExecutionPlan to execute
@@ -659,68 +1204,91 @@ class PlanExecutor:
         Returns:
             PlanExecutionResult with all tool results
         """
+        import heapq
         import time
-        from concurrent.futures import ThreadPoolExecutor, as_completed
+        from concurrent.futures import FIRST_COMPLETED, wait
 
         start_time = time.time()
         results: dict[str, PlanResult] = {}
         failed: list[str] = []
 
-        # Build dependency tracking
-        pending = {call.id: call for call in plan.calls}
-        completed_ids: set[str] = set()
-
-        # Execute in dependency order
-        while pending:
-            # Find calls whose dependencies are satisfied
-            ready = [
-                call
-                for call in pending.values()
-                if all(dep in completed_ids for dep in call.depends_on)
-            ]
-
-            if not ready:
-                # Circular or missing dependency - fail remaining
-                for call_id, call in pending.items():
-                    results[call_id] = PlanResult(
-                        call_id=call_id,
-                        tool=call.tool,
-                        success=False,
-                        error=f"Unresolved dependencies: {call.depends_on}",
-                    )
-                    failed.append(call_id)
-                break
-
-            # Execute ready calls (parallel if enabled and multiple ready)
-            if self._parallel and len(ready) > 1:
-                # Parallel execution for independent calls
-                with ThreadPoolExecutor(max_workers=self._max_workers) as pool:
-                    future_to_call = {
-                        pool.submit(self._execute_call, call): call for call in ready
-                    }
-                    for future in as_completed(future_to_call):
-                        call = future_to_call[future]
-                        result = future.result()
-                        results[call.id] = result
-
-                        if result.success:
-                            completed_ids.add(call.id)
-                        else:
-                            failed.append(call.id)
-
-                        del pending[call.id]
-            else:
-                # Sequential execution
-                for call in ready:
-                    result = self._execute_call(call)
-                    results[call.id] = result
-
-                    if result.success:
-                        completed_ids.add(call.id)
-                    else:
-                        failed.append(call.id)
-
-                    del pending[call.id]
+        calls = {call.id: call for call in plan.calls}
+        priority = self._priorities(calls)
+        order = {call_id: index for index, call_id in enumerate(calls)}
+
+        # Remaining unmet dependencies; unknown IDs can never be met
+        waiting_on = {call.id: len(set(call.depends_on)) for call in calls.values()}
+        dependents: dict[str, list[str]] = {call_id: [] for call_id in calls}
+        for call in calls.values():
+            for dep in set(call.depends_on):
+                if dep in dependents:
+                    dependents[dep].append(call.id)
+
+        ready: list[tuple[float, int, str]] = []
+
+        def release(call_id: str) -> None:
+            heapq.heappush(ready, (-priority[call_id], order[call_id], call_id))
+
+        for call_id, count in waiting_on.items():
+            if count == 0:
+                release(call_id)
+
+        def finish(call_id: str, result: PlanResult) -> None:
+            results[call_id] = result
+            self._record_latency(result)
+            if not result.success:
+                failed.append(call_id)
+                return
+            for child in dependents[call_id]:
+                waiting_on[child] -= 1
+                if waiting_on[child] == 0:
+                    release(child)
+
+        capacity = self._max_workers if self._parallel else 1
+        in_flight: dict = {}  # future -> call_id
+        per_tool: dict[str, int] = {}
+
+        while ready or in_flight:
+            # Dispatch highest-priority ready calls within the limits
+            deferred = []
+            while ready and len(in_flight) < capacity:
+                entry = heapq.heappop(ready)
+                call = calls[entry[2]]
+                key = self._limit_key(call.tool)
+                if key is not None and per_tool.get(key, 0) >= self._tool_limits[key]:
+                    deferred.append(entry)
+                    continue
+                if not self._parallel:
+                    finish(call.id, self._execute_call(call))
+                    break
+                if key is not None:
+                    per_tool[key] = per_tool.get(key, 0) + 1
+                future = self._get_pool().submit(self._execute_call, call)
+                in_flight[future] = call.id
+            for entry in deferred:
+                heapq.heappush(ready, entry)
+
+            if not in_flight:
+                continue
+
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                call_id = in_flight.pop(future)
+                key = self._limit_key(calls[call_id].tool)
+                if key is not None:
+                    per_tool[key] -= 1
+                finish(call_id, future.result())
+
+        # Anything never released had failed, missing or circular dependencies
+        for call_id, call in calls.items():
+            if call_id not in results:
+                results[call_id] = PlanResult(
+                    call_id=call_id,
+                    tool=call.tool,
+                    success=False,
+                    error=f"Unresolved dependencies: {call.depends_on}",
+                )
+                failed.append(call_id)
 
         total_ms = (time.time() - start_time) * 1000
 
@@ -814,6 +1382,7 @@ class PlanExecutor:
                 "call_count": len(plan.calls),
                 "success": result.success,
                 "failed_count": len(result.failed_calls),
+                "cached_count": sum(1 for r in result.results.values() if r.cached),
                 "total_ms": result.total_duration_ms,
             }
             with EXECUTION_LOG.open("a") as f:
@@ -845,8 +1414,8 @@ def execute_plan(
     Returns:
         PlanExecutionResult with all outcomes
     """
-    executor = PlanExecutor(tool_invoker=tool_invoker)
-    return executor.execute(plan)
+    with PlanExecutor(tool_invoker=tool_invoker) as executor:
+        return executor.execute(plan)
 
 
 def create_executor_from_mcp_list(mcp_tools: list[dict]) -> CodeModeExecutor:
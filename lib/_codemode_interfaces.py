@@ -22,7 +22,7 @@ from typing import Any, Callable
 # Cache location for discovered schemas
 SCHEMA_CACHE = Path.home() / ".claude" / "tmp" / "codemode_schemas.json"
 
-CACHE_PROTOCOL_VERSION = "1.0"  # Increment when cache format changes
+CACHE_PROTOCOL_VERSION = "1.1"  # Increment when cache format changes (1.1: cache_ttl)
 
 # Runtime tool executor - bound by codemode_executor at execution time
 _tool_executor: Callable[[str, dict], dict] | None = None
@@ -6,13 +6,11 @@ Allows disputing incorrect reducer triggers and adjusts cooldowns
 based on false positive history.
 
 Cross-session learning: FPs are persisted to ~/.claude/tmp/fp_history.jsonl
-for pattern analysis across sessions.
+for pattern analysis across sessions (aggregated incrementally by fp_rollup).
 """
 
-import json
 import re
 from datetime import datetime
-from pathlib import Path
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
@@ -21,9 +19,7 @@ if TYPE_CHECKING:
 from _confidence_reducers import REDUCERS
 from epistemology import TIER_PRIVILEGES
 from _confidence_tiers import get_tier_info
-
-# Persistent FP history for cross-session learning
-FP_HISTORY_FILE = Path.home() / ".claude" / "tmp" / "fp_history.jsonl"
+from fp_rollup import record_fp
 
 # =============================================================================
 
@@ -63,17 +59,16 @@ def get_adaptive_cooldown(state: "SessionState", reducer_name: str) -> int:
 
 
 def _persist_fp_to_history(reducer_name: str, reason: str, confidence_before: int = 0):
-    """Append FP to persistent history file for cross-session pattern analysis."""
+    """Append FP to persistent history (and its rollup) for cross-session analysis."""
     try:
-        FP_HISTORY_FILE.parent.mkdir(parents=True, exist_ok=True)
-        entry = {
-            "timestamp": datetime.now().isoformat(),
-            "reducer": reducer_name,
-            "reason": reason[:200] if reason else "",
-            "confidence_before": confidence_before,
-        }
-        with FP_HISTORY_FILE.open("a") as f:
-            f.write(json.dumps(entry) + "\n")
+        record_fp(
+            {
+                "timestamp": datetime.now().isoformat(),
+                "reducer": reducer_name,
+                "reason": reason[:200] if reason else "",
+                "confidence_before": confidence_before,
+            }
+        )
     except OSError:
         return  # Silent fail - don't break FP recording if persistence fails
 
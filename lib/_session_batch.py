@@ -27,6 +27,9 @@ FUNCTION_PATTERNS = [
     (re.compile(r"\bfunc\s+(\w+)\s*\("), "go"),
 ]
 
+# Caller-graph resolution of integration greps
+INTEGRATION_CALLERS_SHOWN = 8
+
 _FUNC_DEF_PATTERNS = [
     (re.compile(r"^(\s*def\s+(\w+)\s*\([^)]*\)\s*(?:->.*?)?:)"), 2),
     (re.compile(r"^(\s*(?:async\s+)?function\s+(\w+)\s*\([^)]*\))"), 2),
@@ -120,11 +123,7 @@ def clear_integration_grep(state: "SessionState", pattern: str):
     if len(pattern) > 3:
         state.grepped_functions[pattern] = state.turn_count
 
-    if len(state.grepped_functions) > 20:
-        sorted_funcs = sorted(
-            state.grepped_functions.items(), key=lambda x: x[1], reverse=True
-        )
-        state.grepped_functions = dict(sorted_funcs[:20])
+    _trim_grepped_functions(state)
 
     state.pending_integration_greps = [
         p
@@ -133,6 +132,15 @@ def clear_integration_grep(state: "SessionState", pattern: str):
     ]
 
 
+def _trim_grepped_functions(state: "SessionState"):
+    """Keep the 20 most recently grepped functions."""
+    if len(state.grepped_functions) > 20:
+        sorted_funcs = sorted(
+            state.grepped_functions.items(), key=lambda x: x[1], reverse=True
+        )
+        state.grepped_functions = dict(sorted_funcs[:20])
+
+
 def get_pending_integration_greps(state: "SessionState") -> list[dict]:
     """Get pending integration greps (max age: 10 turns)."""
     return [
@@ -142,6 +150,81 @@ def get_pending_integration_greps(state: "SessionState") -> list[dict]:
     ]
 
 
+def resolve_integration_callers(
+    state: "SessionState", file_path: str | None = None
+) -> str:
+    """Answer pending Python integration greps from the symbol index caller graph.
+
+    Instead of forcing a Grep round-trip, callers of each edited function are
+    looked up in the project's persistent symbol index, returned as context,
+    and the pending entries cleared. Read-only: the index is used as loaded
+    (edits are journaled into it; SessionStart refreshes it in the
+    background), never walked or rebuilt here. Entries stay pending (so the
+    gate still asks for a grep) when the project has no index yet.
+
+    Args:
+        state: Session state holding pending_integration_greps
+        file_path: Only resolve entries for this file (default: all pending)
+
+    Returns:
+        Markdown listing callers per function ("" if nothing was resolved)
+    """
+    pending = [
+        p
+        for p in get_pending_integration_greps(state)
+        if p["file"].endswith(".py") and file_path in (None, p["file"])
+    ]
+    if not pending:
+        return ""
+    try:
+        from symbol_index import SymbolIndex, find_root
+    except ImportError:
+        return ""
+
+    indexes = {}
+    sections = []
+    for entry in pending:
+        root = find_root(entry["file"])
+        if root not in indexes:
+            index = SymbolIndex(root)
+            indexes[root] = index if index.files else None
+        index = indexes[root]
+        if index is None:
+            continue
+
+        func = entry["function"]
+        sites = index.callers(func)
+        if sites:
+            lines = [
+                f"  - {s['filepath']}:{s['lineno']}"
+                + (f" in `{s['caller']}`" if s["caller"] else "")
+                for s in sites[:INTEGRATION_CALLERS_SHOWN]
+            ]
+            if len(sites) > INTEGRATION_CALLERS_SHOWN:
+                lines.append(f"  - ... +{len(sites) - INTEGRATION_CALLERS_SHOWN} more")
+            sections.append(
+                f"🔗 **Callers of `{func}`** ({len(sites)} site(s)):\n" + "\n".join(lines)
+            )
+        else:
+            sections.append(f"🔗 `{func}`: no call sites found in project")
+        # Only this entry: a substring clear would also drop other pending
+        # functions (run_tests for "run"), including non-Python ones
+        state.pending_integration_greps = [
+            p
+            for p in state.pending_integration_greps
+            if (p["function"], p["file"]) != (func, entry["file"])
+        ]
+        state.grepped_functions[func] = state.turn_count
+        _trim_grepped_functions(state)
+
+    if not sections:
+        return ""
+    return (
+        "**Signature changed - verify callers** (symbol index, no grep needed):\n"
+        + "\n".join(sections)
+    )
+
+
 def check_integration_blindness(
     state: "SessionState", tool_name: str, tool_input: dict
 ) -> tuple[bool, str]:
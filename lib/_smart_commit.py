@@ -79,11 +79,10 @@ def _run_git(args: list[str], cwd: str) -> tuple[int, str, str]:
 
 
 def get_repo_root(path: str) -> str | None:
-    """Find git repo root by walking up from path."""
-    code, stdout, _ = _run_git(["rev-parse", "--show-toplevel"], path)
-    if code == 0 and stdout:
-        return stdout
-    return None
+    """Find git repo root by walking up from path (reads .git, no fork)."""
+    from git_probe import repo_root
+
+    return repo_root(path)
 
 
 def is_framework_repo(repo_root: str) -> bool:
@@ -124,8 +123,10 @@ def get_uncommitted_changes(repo_root: str) -> dict:
     """Get summary of uncommitted changes in repo."""
     changes = {"modified": [], "added": [], "deleted": [], "renamed": [], "untracked": []}
 
-    code, stdout, _ = _run_git(["status", "--porcelain"], repo_root)
-    if code != 0 or not stdout:
+    from git_probe import status_porcelain
+
+    stdout = status_porcelain(repo_root)
+    if not stdout:
         return changes
 
     for line in stdout.split("\n"):
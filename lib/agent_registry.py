@@ -5,6 +5,10 @@ Prevents orphaned beads by tracking which agent claimed which bead,
 enabling automatic cleanup when agents crash or timeout.
 
 Storage: <project>/.beads/agent_assignments.jsonl (per-project)
+    Append-only log of claims plus heartbeat/release ops, folded into
+    in-memory indexes by bead id and agent id with a stale-deadline heap.
+    Writers serialize on agent_assignments.lock; the log is compacted once
+    superseded lines outnumber live assignments.
 
 Project detection uses project_context module - walks up from $PWD
 looking for .beads/ or CLAUDE.md markers.
@@ -12,13 +16,16 @@ looking for .beads/ or CLAUDE.md markers.
 
 from __future__ import annotations
 
-import fcntl
+import heapq
 import json
+import os
 import uuid
+from contextlib import contextmanager
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable, Iterator
 
+from _atomic_io import locked, write_atomic
 from project_context import (
     find_project_root,
     get_assignments_file,
@@ -37,6 +44,10 @@ TIMEOUT_BY_TYPE = {
 }
 
 
+# Compact the log once this many superseded lines have accumulated
+COMPACT_MIN_SUPERSEDED = 200
+
+
 def _get_storage_path(project_root: Path | None = None) -> Path:
     """Get assignments file path for project."""
     return get_assignments_file(project_root)
@@ -51,51 +62,247 @@ def _ensure_storage(project_root: Path | None = None) -> Path:
     return assignments_file
 
 
-def _read_assignments(project_root: Path | None = None) -> list[dict[str, Any]]:
-    """Read all assignments from storage."""
-    assignments_file = _ensure_storage(project_root)
-    assignments = []
+def _now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _parse_ts(value: str) -> float | None:
+    """Parse an ISO timestamp to epoch seconds (None if unparseable)."""
     try:
-        with open(assignments_file) as f:
-            for line in f:
-                line = line.strip()
-                if line:
-                    try:
-                        assignments.append(json.loads(line))
-                    except json.JSONDecodeError:
-                        continue
-    except OSError:
-        pass
-    return assignments
+        return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+    except (ValueError, TypeError, AttributeError):
+        return None
+
+
+# =============================================================================
+# INDEXED STORE
+# =============================================================================
+#
+# The JSONL file is an append-only log. Lines are either full assignment
+# records (claims, and legacy rewritten records) or small ops:
+#   {"op": "heartbeat", "assignment_id": ..., "ts": ...}
+#   {"op": "release", "assignment_id": ..., "status": ..., "ts": ...}
+# Every write is a single locked append, so concurrent Task agents never lose
+# each other's updates. Readers fold the log into in-memory indexes (by
+# assignment, bead and agent, plus stale-deadline heaps) and only read new
+# bytes on subsequent calls. Once enough lines are superseded the log is
+# compacted to one record per assignment under the same lock.
+
+
+class _AssignmentIndex:
+    """In-memory view of one project's assignment log."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._reset(None)
+
+    def _reset(self, inode: int | None) -> None:
+        self.inode = inode
+        self.offset = 0
+        self.lines = 0
+        self.by_id: dict[str, dict[str, Any]] = {}
+        self.active_by_bead: dict[str, set[str]] = {}
+        self.active_by_agent: dict[str, set[str]] = {}
+        # (deadline_ts, assignment_id, heartbeat) - lazily invalidated
+        self.deadlines: list[tuple[float, str, str]] = []
+        # (heartbeat_ts, assignment_id, heartbeat) - for timeout overrides
+        self.heartbeats: list[tuple[float, str, str]] = []
+
+    # -- folding -----------------------------------------------------------
+
+    def _deactivate(self, record: dict[str, Any]) -> None:
+        aid = record.get("assignment_id", "")
+        for index, key in (
+            (self.active_by_bead, record.get("bead_id", "")),
+            (self.active_by_agent, record.get("agent_session_id", "")),
+        ):
+            ids = index.get(key)
+            if ids is not None:
+                ids.discard(aid)
+                if not ids:
+                    del index[key]
+
+    def _index_active(self, record: dict[str, Any]) -> None:
+        aid = record.get("assignment_id", "")
+        self.active_by_bead.setdefault(record.get("bead_id", ""), set()).add(aid)
+        self.active_by_agent.setdefault(record.get("agent_session_id", ""), set()).add(
+            aid
+        )
+        self._push_deadline(record)
+
+    def _push_deadline(self, record: dict[str, Any]) -> None:
+        hb = record.get("last_heartbeat", record.get("claimed_at", ""))
+        hb_ts = _parse_ts(hb) if hb else None
+        if hb_ts is None:
+            hb_ts = float("-inf")  # unparseable = always stale
+        timeout = record.get("expected_duration_minutes", DEFAULT_TIMEOUT_MINUTES)
+        aid = record.get("assignment_id", "")
+        heapq.heappush(self.deadlines, (hb_ts + timeout * 60, aid, hb))
+        heapq.heappush(self.heartbeats, (hb_ts, aid, hb))
+
+    def apply(self, entry: dict[str, Any]) -> None:
+        """Fold one log line into the indexes."""
+        op = entry.get("op")
+        if op is None:
+            aid = entry.get("assignment_id")
+            if not aid:
+                return
+            previous = self.by_id.get(aid)
+            if previous is not None and previous.get("status") == "active":
+                self._deactivate(previous)
+            self.by_id[aid] = entry
+            if entry.get("status") == "active":
+                self._index_active(entry)
+            return
+
+        record = self.by_id.get(entry.get("assignment_id", ""))
+        if record is None or record.get("status") != "active":
+            return
+        if op == "heartbeat":
+            record["last_heartbeat"] = entry.get("ts", "")
+            self._push_deadline(record)
+        elif op == "release":
+            self._deactivate(record)
+            record["status"] = entry.get("status", "completed")
+            record["released_at"] = entry.get("ts", "")
+
+    def refresh(self) -> None:
+        """Read bytes appended since the last refresh (full reload on rotate)."""
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return
+        if st.st_ino != self.inode or st.st_size < self.offset:
+            self._reset(st.st_ino)
+        if st.st_size == self.offset:
+            return
+
+        try:
+            with open(self.path, "rb") as f:
+                f.seek(self.offset)
+                chunk = f.read()
+        except OSError:
+            return
+
+        # Only consume complete lines; a concurrent writer may be mid-append
+        end = chunk.rfind(b"\n") + 1
+        for raw in chunk[:end].splitlines():
+            raw = raw.strip()
+            if not raw:
+                continue
+            self.lines += 1
+            try:
+                entry = json.loads(raw)
+            except json.JSONDecodeError:
+                continue
+            if isinstance(entry, dict):
+                self.apply(entry)
+        self.offset += end
+
+    # -- queries -----------------------------------------------------------
+
+    def active_for(self, bead_id: str, agent_session_id: str | None) -> list[str]:
+        """Active assignment ids for a bead (optionally one agent)."""
+        ids = self.active_by_bead.get(bead_id, set())
+        if agent_session_id is None:
+            return sorted(ids)
+        agent_ids = self.active_by_agent.get(agent_session_id, set())
+        return sorted(ids & agent_ids)
+
+    def _due(
+        self, heap: list[tuple[float, str, str]], cutoff: float
+    ) -> list[dict[str, Any]]:
+        """Pop current entries at or below cutoff, drop superseded ones."""
+        due, keep = [], []
+        while heap and heap[0][0] <= cutoff:
+            entry = heapq.heappop(heap)
+            record = self.by_id.get(entry[1])
+            if (
+                record is None
+                or record.get("status") != "active"
+                or record.get("last_heartbeat", record.get("claimed_at", ""))
+                != entry[2]
+            ):
+                continue  # released or superseded by a newer heartbeat
+            keep.append(entry)
+            due.append(record)
+        for entry in keep:
+            heapq.heappush(heap, entry)
+        return due
+
+    def stale(self, now: float, timeout_minutes: int | None) -> list[dict[str, Any]]:
+        """Active assignments whose deadline has passed."""
+        if timeout_minutes is None:
+            return self._due(self.deadlines, now)
+        return self._due(self.heartbeats, now - timeout_minutes * 60)
+
+    @property
+    def superseded(self) -> int:
+        return self.lines - len(self.by_id)
+
 
+_INDEXES: dict[Path, _AssignmentIndex] = {}
 
-def _write_assignments(
-    assignments: list[dict[str, Any]], project_root: Path | None = None
+
+def _get_index(project_root: Path | None = None) -> _AssignmentIndex:
+    """Get the refreshed index for a project's assignment log."""
+    assignments_file = _ensure_storage(project_root)
+    index = _INDEXES.get(assignments_file)
+    if index is None:
+        index = _INDEXES[assignments_file] = _AssignmentIndex(assignments_file)
+    index.refresh()
+    return index
+
+
+@contextmanager
+def _locked(assignments_file: Path) -> Iterator[None]:
+    """Exclusive writer lock (separate file so compaction can replace the log)."""
+    with locked(assignments_file.with_suffix(".lock")):
+        yield
+
+
+def _append_entries(
+    entries: list[dict[str, Any]], project_root: Path | None = None
 ) -> None:
-    """Write all assignments to storage (atomic with file lock)."""
+    """Append log lines under the writer lock, compacting when worthwhile."""
     assignments_file = _ensure_storage(project_root)
     try:
-        with open(assignments_file, "w") as f:
-            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
-            for assignment in assignments:
-                f.write(json.dumps(assignment) + "\n")
-            fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+        with _locked(assignments_file):
+            with open(assignments_file, "a") as f:
+                f.write("".join(json.dumps(e) + "\n" for e in entries))
+            index = _get_index(project_root)
+            if index.superseded >= max(COMPACT_MIN_SUPERSEDED, len(index.by_id)):
+                _compact_locked(index)
     except OSError:
         pass
 
 
+def _compact_locked(
+    index: _AssignmentIndex, keep: Callable[[dict[str, Any]], bool] | None = None
+) -> int:
+    """Rewrite the log as one record per assignment. Caller holds the lock.
+
+    Returns:
+        Number of assignments dropped by the keep filter
+    """
+    index.refresh()
+    records = list(index.by_id.values())
+    kept = [r for r in records if keep is None or keep(r)]
+    write_atomic(index.path, "".join(json.dumps(r) + "\n" for r in kept))
+    index.refresh()  # new inode -> rebuild from compacted log
+    return len(records) - len(kept)
+
+
+def _read_assignments(project_root: Path | None = None) -> list[dict[str, Any]]:
+    """Read all assignments (current state of each) from storage."""
+    return [dict(r) for r in _get_index(project_root).by_id.values()]
+
+
 def _append_assignment(
     assignment: dict[str, Any], project_root: Path | None = None
 ) -> None:
     """Append a single assignment (with file lock)."""
-    assignments_file = _ensure_storage(project_root)
-    try:
-        with open(assignments_file, "a") as f:
-            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
-            f.write(json.dumps(assignment) + "\n")
-            fcntl.flock(f.fileno(), fcntl.LOCK_UN)
-    except OSError:
-        pass
+    _append_entries([assignment], project_root)
 
 
 def claim_bead(
@@ -165,24 +372,17 @@ def release_bead(
     Returns:
         True if assignment was found and updated
     """
-    assignments = _read_assignments(project_root)
-    found = False
-
-    for assignment in assignments:
-        if assignment.get("bead_id") == bead_id:
-            if (
-                agent_session_id is None
-                or assignment.get("agent_session_id") == agent_session_id
-            ):
-                if assignment.get("status") == "active":
-                    assignment["status"] = status
-                    assignment["released_at"] = datetime.now(timezone.utc).isoformat()
-                    found = True
-
-    if found:
-        _write_assignments(assignments, project_root)
-
-    return found
+    ids = _get_index(project_root).active_for(bead_id, agent_session_id)
+    if ids:
+        now = _now_iso()
+        _append_entries(
+            [
+                {"op": "release", "assignment_id": aid, "status": status, "ts": now}
+                for aid in ids
+            ],
+            project_root,
+        )
+    return bool(ids)
 
 
 def heartbeat(
@@ -196,31 +396,24 @@ def heartbeat(
     Returns:
         True if assignment was found and updated
     """
-    assignments = _read_assignments(project_root)
-    found = False
-
-    for assignment in assignments:
-        if assignment.get("bead_id") == bead_id:
-            if (
-                agent_session_id is None
-                or assignment.get("agent_session_id") == agent_session_id
-            ):
-                if assignment.get("status") == "active":
-                    assignment["last_heartbeat"] = datetime.now(
-                        timezone.utc
-                    ).isoformat()
-                    found = True
-
-    if found:
-        _write_assignments(assignments, project_root)
-
-    return found
+    ids = _get_index(project_root).active_for(bead_id, agent_session_id)
+    if ids:
+        now = _now_iso()
+        _append_entries(
+            [{"op": "heartbeat", "assignment_id": aid, "ts": now} for aid in ids],
+            project_root,
+        )
+    return bool(ids)
 
 
 def get_active_assignments(project_root: Path | None = None) -> list[dict[str, Any]]:
     """Get all active (uncompleted) assignments for a project."""
-    assignments = _read_assignments(project_root)
-    return [a for a in assignments if a.get("status") == "active"]
+    index = _get_index(project_root)
+    return [
+        dict(index.by_id[aid])
+        for ids in index.active_by_bead.values()
+        for aid in sorted(ids)
+    ]
 
 
 def get_stale_assignments(
@@ -230,6 +423,8 @@ def get_stale_assignments(
     """
     Get assignments that have exceeded their timeout.
 
+    Served from the deadline index, so only overdue assignments are touched.
+
     Args:
         timeout_minutes: Override timeout (uses per-assignment if None)
         project_root: Project root (auto-detected if None)
@@ -237,32 +432,14 @@ def get_stale_assignments(
     Returns:
         List of stale assignments
     """
-    now = datetime.now(timezone.utc)
-    active = get_active_assignments(project_root)
+    now = datetime.now(timezone.utc).timestamp()
     stale = []
-
-    for assignment in active:
-        # Get timeout for this assignment
-        if timeout_minutes is not None:
-            timeout = timeout_minutes
-        else:
-            timeout = assignment.get(
-                "expected_duration_minutes", DEFAULT_TIMEOUT_MINUTES
-            )
-
-        # Check last heartbeat
-        last_hb = assignment.get("last_heartbeat", assignment.get("claimed_at", ""))
-        if last_hb:
-            try:
-                hb_time = datetime.fromisoformat(last_hb.replace("Z", "+00:00"))
-                elapsed = (now - hb_time).total_seconds() / 60
-                if elapsed > timeout:
-                    assignment["elapsed_minutes"] = round(elapsed, 1)
-                    stale.append(assignment)
-            except (ValueError, TypeError):
-                # Can't parse timestamp, consider stale
-                stale.append(assignment)
-
+    for record in _get_index(project_root).stale(now, timeout_minutes):
+        assignment = dict(record)
+        hb_ts = _parse_ts(assignment.get("last_heartbeat", ""))
+        if hb_ts is not None:
+            assignment["elapsed_minutes"] = round((now - hb_ts) / 60, 1)
+        stale.append(assignment)
     return stale
 
 
@@ -285,11 +462,19 @@ def get_assignment_for_bead(
     project_root: Path | None = None,
 ) -> dict[str, Any] | None:
     """Get the active assignment for a bead, if any."""
-    active = get_active_assignments(project_root)
-    for assignment in active:
-        if assignment.get("bead_id") == bead_id:
-            return assignment
-    return None
+    index = _get_index(project_root)
+    ids = index.active_for(bead_id, None)
+    return dict(index.by_id[ids[0]]) if ids else None
+
+
+def get_assignments_for_agent(
+    agent_session_id: str,
+    project_root: Path | None = None,
+) -> list[dict[str, Any]]:
+    """Get active assignments held by an agent."""
+    index = _get_index(project_root)
+    ids = index.active_by_agent.get(agent_session_id, set())
+    return [dict(index.by_id[aid]) for aid in sorted(ids)]
 
 
 def cleanup_old_assignments(
@@ -297,30 +482,23 @@ def cleanup_old_assignments(
     project_root: Path | None = None,
 ) -> int:
     """
-    Remove assignments older than N days.
+    Remove assignments older than N days (compacts the log).
 
     Returns:
         Number of assignments removed
     """
     cutoff = datetime.now(timezone.utc).timestamp() - (days * 24 * 60 * 60)
-    assignments = _read_assignments(project_root)
-    original_count = len(assignments)
 
-    filtered = []
-    for assignment in assignments:
-        claimed = assignment.get("claimed_at", "")
-        if claimed:
-            try:
-                claimed_time = datetime.fromisoformat(claimed.replace("Z", "+00:00"))
-                if claimed_time.timestamp() > cutoff:
-                    filtered.append(assignment)
-            except (ValueError, TypeError):
-                filtered.append(assignment)
-        else:
-            filtered.append(assignment)
-
-    _write_assignments(filtered, project_root)
-    return original_count - len(filtered)
+    def keep(assignment: dict[str, Any]) -> bool:
+        claimed = _parse_ts(assignment.get("claimed_at", ""))
+        return claimed is None or claimed > cutoff
+
+    assignments_file = _ensure_storage(project_root)
+    try:
+        with _locked(assignments_file):
+            return _compact_locked(_get_index(project_root), keep)
+    except OSError:
+        return 0
 
 
 def get_timeout_for_type(issue_type: str) -> int:
@@ -8,7 +8,6 @@ Uses three layers:
 3. Churn - Edit frequency tracking
 """
 
-import ast
 import re
 from pathlib import Path
 from typing import Optional
@@ -136,47 +135,17 @@ def analyze_python_complexity(content: str) -> ComplexityMetrics:
     lines = _count_lines(content)
     has_marker, marker_reason = _check_allowlist_marker(content)
 
-    try:
-        tree = ast.parse(content)
-    except SyntaxError:
-        # Can't parse - return line count only
-        return ComplexityMetrics(
-            lines=lines,
-            functions=0,
-            classes=0,
-            imports=0,
-            max_depth=0,
-            has_allowlist_marker=has_marker,
-            marker_reason=marker_reason,
-        )
-
-    functions = 0
-    classes = 0
-    imports = 0
-    max_depth = 0
-
-    def visit(node, depth=0):
-        nonlocal functions, classes, imports, max_depth
-        max_depth = max(max_depth, depth)
-
-        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
-            functions += 1
-        elif isinstance(node, ast.ClassDef):
-            classes += 1
-        elif isinstance(node, (ast.Import, ast.ImportFrom)):
-            imports += 1
-
-        for child in ast.iter_child_nodes(node):
-            visit(child, depth + 1)
-
-    visit(tree)
+    from ast_cache import get_facts
 
+    facts = get_facts(content)
+    complexity = facts["complexity"]
+    # Unparseable files report line count only (all counts zero)
     return ComplexityMetrics(
         lines=lines,
-        functions=functions,
-        classes=classes,
-        imports=imports,
-        max_depth=max_depth,
+        functions=complexity["functions"],
+        classes=complexity["classes"],
+        imports=complexity["imports"],
+        max_depth=complexity["max_depth"],
         has_allowlist_marker=has_marker,
         marker_reason=marker_reason,
     )
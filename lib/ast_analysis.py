@@ -8,6 +8,9 @@ Provides AST-based detection that's more accurate than regex:
 - Import verification
 - Taint tracking for sensitive data flow
 
+Trees come from ast_cache, so running several analyzers over the same
+source parses it only once.
+
 Usage:
     from ast_analysis import SecurityAnalyzer, StubAnalyzer, ImportAnalyzer
 
@@ -25,6 +28,8 @@ from typing import List, Dict, Optional, Tuple
 from dataclasses import dataclass
 from pathlib import Path
 
+from ast_cache import parse
+
 
 @dataclass
 class Violation:
@@ -100,9 +105,13 @@ class SecurityAnalyzer(ast.NodeVisitor):
 
     def analyze(self) -> List[Violation]:
         """Parse and analyze source code. Returns list of violations."""
-        try:
-            tree = ast.parse(self.source, filename=self.filename)
+        tree = parse(self.source)
+        if tree is not None:
             self.visit(tree)
+            return self.violations
+        try:
+            # Re-parse only to report the error with our filename
+            ast.parse(self.source, filename=self.filename)
         except SyntaxError as e:
             self.violations.append(
                 Violation(
@@ -398,11 +407,9 @@ class StubAnalyzer(ast.NodeVisitor):
 
     def find_stubs(self) -> List[Violation]:
         """Analyze source and return list of stub violations."""
-        try:
-            tree = ast.parse(self.source, filename=self.filename)
+        tree = parse(self.source)
+        if tree is not None:  # Can't analyze unparseable code
             self.visit(tree)
-        except SyntaxError:
-            pass  # Can't analyze unparseable code
         return self.stubs
 
     def _get_line_context(self, lineno: int) -> str:
@@ -577,12 +584,10 @@ class ImportAnalyzer(ast.NodeVisitor):
 
     def verify_imports(self, check_existence: bool = True) -> List[Violation]:
         """Analyze imports. Set check_existence=False to skip pip checks."""
-        try:
-            tree = ast.parse(self.source, filename=self.filename)
+        tree = parse(self.source)
+        if tree is not None:
             self._check_existence = check_existence
             self.visit(tree)
-        except SyntaxError:
-            pass
         return self.issues
 
     def _get_line_context(self, lineno: int) -> str:
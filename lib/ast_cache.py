@@ -0,0 +1,226 @@
+"""
+AST Cache: Content-hash keyed Python parse and derived-facts cache.
+
+A single Edit/Write of a Python file used to be parsed by _ast_utils,
+ast_analysis (three analyzers), the god component detector and several
+code-quality reducers - each with its own ast.parse. This module parses each
+distinct source once per process and derives the commonly needed facts
+(imports, calls, function spans, mutable defaults, complexity) in a single
+walk. Facts are persisted on disk so the Pre and Post runners - and later
+invocations on unchanged content - reuse them without parsing at all.
+
+Trees are shared between callers: treat them as read-only.
+
+Storage: ~/.claude/tmp/ast_cache/<sha256>.json
+
+Usage:
+    from ast_cache import get_facts, parse
+
+    tree = parse(source)        # ast.Module or None on SyntaxError
+    facts = get_facts(source)   # dict, see _compute_facts()
+"""
+
+from __future__ import annotations
+
+import ast
+import hashlib
+import json
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any
+
+from _atomic_io import prune_oldest, write_json_atomic
+
+CACHE_DIR = Path(__file__).resolve().parent.parent / "tmp" / "ast_cache"
+
+# Bump when the facts schema changes so stale entries are ignored
+FACTS_VERSION = 1
+
+# In-process LRU sizes (trees are large, facts are small)
+_MAX_TREES = 32
+_MAX_FACTS = 128
+
+# Disk entries kept before pruning the least recently written quarter
+MAX_DISK_ENTRIES = 2000
+
+_trees: OrderedDict[str, ast.Module | None] = OrderedDict()
+_facts: OrderedDict[str, dict[str, Any]] = OrderedDict()
+
+
+def source_key(source: str) -> str:
+    """Content hash identifying a source string."""
+    return hashlib.sha256(source.encode("utf-8", "surrogatepass")).hexdigest()
+
+
+def _remember(cache: OrderedDict, key: str, value: Any, limit: int) -> None:
+    cache[key] = value
+    cache.move_to_end(key)
+    while len(cache) > limit:
+        cache.popitem(last=False)
+
+
+# =============================================================================
+# PARSE
+# =============================================================================
+
+
+def parse(source: str, key: str | None = None) -> ast.Module | None:
+    """Parse source once per process. Returns None on syntax error."""
+    key = key or source_key(source)
+    if key in _trees:
+        _trees.move_to_end(key)
+        return _trees[key]
+    try:
+        tree = ast.parse(source)
+    except (SyntaxError, ValueError):
+        tree = None
+    _remember(_trees, key, tree, _MAX_TREES)
+    return tree
+
+
+# =============================================================================
+# DERIVED FACTS
+# =============================================================================
+
+
+def mutable_default_type(node: ast.expr | None) -> str | None:
+    """Describe a mutable default value node ([], {}, set(), ...) or None."""
+    if isinstance(node, ast.List):
+        return "[]"
+    elif isinstance(node, ast.Dict):
+        return "{}"
+    elif isinstance(node, ast.Set):
+        return "set literal"
+    elif isinstance(node, ast.Call):
+        if isinstance(node.func, ast.Name) and node.func.id in ("list", "dict", "set"):
+            return f"{node.func.id}()"
+    return None
+
+
+def _empty_facts() -> dict[str, Any]:
+    return {
+        "v": FACTS_VERSION,
+        "ok": False,
+        "imports": [],
+        "class_calls": [],
+        "method_calls": [],
+        "functions": [],
+        "mutable_defaults": [],
+        "star_imports": [],
+        "complexity": {"functions": 0, "classes": 0, "imports": 0, "max_depth": 0},
+    }
+
+
+def _compute_facts(tree: ast.Module | None) -> dict[str, Any]:
+    """Derive facts in one breadth-first walk (same order as ast.walk).
+
+    Keys:
+        ok: source parsed
+        imports: top-level names of absolute imports
+        class_calls / method_calls: PascalCase vs other call names
+        functions: [name, lineno, end_lineno] per (async) function
+        mutable_defaults: [name, lineno, type] per mutable default value
+        star_imports: modules used in 'from X import *'
+        complexity: function/class/import counts and max node depth
+    """
+    facts = _empty_facts()
+    if tree is None:
+        return facts
+    facts["ok"] = True
+
+    imports: set[str] = set()
+    class_calls: set[str] = set()
+    method_calls: set[str] = set()
+    complexity = facts["complexity"]
+
+    queue = [(tree, 0)]
+    for node, depth in queue:  # list grows while iterating: BFS
+        if depth > complexity["max_depth"]:
+            complexity["max_depth"] = depth
+
+        if isinstance(node, ast.Call):
+            func = node.func
+            if isinstance(func, ast.Name):
+                if func.id[0].isupper():
+                    class_calls.add(func.id)
+                else:
+                    method_calls.add(func.id)
+            elif isinstance(func, ast.Attribute):
+                method_calls.add(func.attr)
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            complexity["functions"] += 1
+            facts["functions"].append(
+                [node.name, node.lineno, getattr(node, "end_lineno", None)]
+            )
+            for default in node.args.defaults + node.args.kw_defaults:
+                kind = mutable_default_type(default)
+                if kind:
+                    facts["mutable_defaults"].append([node.name, node.lineno, kind])
+        elif isinstance(node, ast.ClassDef):
+            complexity["classes"] += 1
+        elif isinstance(node, ast.Import):
+            complexity["imports"] += 1
+            for alias in node.names:
+                imports.add(alias.name.split(".")[0])
+        elif isinstance(node, ast.ImportFrom):
+            complexity["imports"] += 1
+            if node.module and node.level == 0:
+                imports.add(node.module.split(".")[0])
+            if node.names and node.names[0].name == "*":
+                facts["star_imports"].append(node.module or ".")
+
+        queue.extend((child, depth + 1) for child in ast.iter_child_nodes(node))
+
+    facts["imports"] = sorted(imports)
+    facts["class_calls"] = sorted(class_calls)
+    facts["method_calls"] = sorted(method_calls)
+    return facts
+
+
+def _disk_path(key: str) -> Path:
+    return CACHE_DIR / f"{key}.json"
+
+
+def _load_disk(key: str) -> dict[str, Any] | None:
+    try:
+        with open(_disk_path(key)) as f:
+            facts = json.load(f)
+        if isinstance(facts, dict) and facts.get("v") == FACTS_VERSION:
+            return facts
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def _store_disk(key: str, facts: dict[str, Any]) -> None:
+    """Atomic write, then prune the oldest entries; best effort."""
+    try:
+        write_json_atomic(_disk_path(key), facts, separators=(",", ":"))
+        prune_oldest(CACHE_DIR, MAX_DISK_ENTRIES)
+    except OSError:
+        pass
+
+
+def get_facts(source: str) -> dict[str, Any]:
+    """Derived facts for source: memory -> disk -> single parse.
+
+    The returned dict is shared; do not mutate it.
+    """
+    key = source_key(source)
+    facts = _facts.get(key)
+    if facts is not None:
+        _facts.move_to_end(key)
+        return facts
+
+    facts = _load_disk(key)
+    if facts is None:
+        facts = _compute_facts(parse(source, key))
+        _store_disk(key, facts)
+    _remember(_facts, key, facts, _MAX_FACTS)
+    return facts
+
+
+def clear_memory() -> None:
+    """Clear in-process caches (disk entries stay valid: content-addressed)."""
+    _trees.clear()
+    _facts.clear()
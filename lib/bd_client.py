@@ -83,6 +83,16 @@ def run_bd(
     return output
 
 
+def _invalidate_cache() -> None:
+    """Drop the cross-process bead snapshot after a write."""
+    try:
+        from bead_cache import invalidate
+
+        invalidate()
+    except Exception:
+        pass
+
+
 def list_beads(
     status: str | None = None,
     limit: int = 20,
@@ -203,6 +213,7 @@ def create_bead(
                 # This is non-fatal since the bead exists
                 result["_label_failed"] = True
 
+    _invalidate_cache()
     return result if isinstance(result, dict) else {}
 
 
@@ -216,6 +227,8 @@ def update_bead(bead_id: str, status: str | None = None) -> bool:
         return True
     except RuntimeError:
         return False
+    finally:
+        _invalidate_cache()
 
 
 def close_bead(bead_id: str) -> bool:
@@ -225,3 +238,5 @@ def close_bead(bead_id: str) -> bool:
         return True
     except RuntimeError:
         return False
+    finally:
+        _invalidate_cache()
@@ -0,0 +1,178 @@
+"""
+Bead Snapshot Cache: Cross-process cache of bd query results.
+
+Hooks run as short-lived subprocesses, so in-memory caches reset on every
+tool call and bead state was re-fetched by bead_enforcement,
+parallel_bead_delegation, workflow gates and the context packer each time.
+
+This module keeps one small JSON snapshot per project on disk. A snapshot is
+valid while the beads database fingerprint (mtime_ns + size of the .db,
+.db-wal and issues.jsonl files under .beads/) is unchanged. Writes made
+through bd_client call invalidate() so our own mutations are never served
+stale, even when the filesystem mtime granularity is coarse.
+
+Storage: ~/.claude/memory/bead_cache/<project_hash>.json
+
+Usage:
+    from bead_cache import get_cached_beads, invalidate
+
+    in_progress = get_cached_beads("in_progress")
+    invalidate()  # after bd create/update/close
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Callable
+
+from _atomic_io import write_json_atomic
+
+CACHE_DIR = Path(__file__).resolve().parent.parent / "memory" / "bead_cache"
+
+# Snapshots without a database fingerprint (bd DB not found) fall back to a
+# short TTL; fingerprinted snapshots get a long safety TTL.
+_UNFINGERPRINTED_TTL = 10.0
+_MAX_SNAPSHOT_AGE = 600.0
+
+# Files inside .beads/ whose changes mean bead state changed
+_DB_SUFFIXES = (".db", ".db-wal")
+_DB_NAMES = {"issues.jsonl"}
+
+
+def _fetchers() -> dict[str, Callable[[], list[dict]]]:
+    """Map query names to bd_client calls (lazy import avoids cycles)."""
+    from bd_client import get_blocked_beads, list_beads
+
+    return {
+        "open": lambda: list_beads(status="open"),
+        "in_progress": lambda: list_beads(status="in_progress"),
+        "blocked": get_blocked_beads,
+    }
+
+
+def _project_root() -> Path:
+    """Resolve current project root, falling back to cwd."""
+    try:
+        from project_context import find_project_root
+
+        return find_project_root()
+    except Exception:
+        return Path.cwd()
+
+
+def _snapshot_path(project_root: Path) -> Path:
+    """Get snapshot file path for a project."""
+    key = hashlib.sha256(str(project_root).encode()).hexdigest()[:16]
+    return CACHE_DIR / f"{key}.json"
+
+
+def _db_fingerprint(project_root: Path) -> list:
+    """Fingerprint the beads database files (name, mtime_ns, size)."""
+    candidates = [project_root / ".beads"]
+    env_dir = os.environ.get("BEADS_DIR")
+    if env_dir:
+        candidates.append(Path(env_dir))
+
+    fingerprint = []
+    for beads_dir in candidates:
+        try:
+            with os.scandir(beads_dir) as it:
+                for entry in it:
+                    name = entry.name
+                    if name in _DB_NAMES or name.endswith(_DB_SUFFIXES):
+                        st = entry.stat()
+                        fingerprint.append([name, st.st_mtime_ns, st.st_size])
+        except OSError:
+            continue
+    fingerprint.sort()
+    return fingerprint
+
+
+def _load_snapshot(path: Path) -> dict:
+    """Load snapshot file, returning empty dict on any error."""
+    try:
+        with open(path) as f:
+            data = json.load(f)
+        return data if isinstance(data, dict) else {}
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+
+def _save_snapshot(path: Path, snapshot: dict) -> None:
+    """Atomically write snapshot (tmp + rename)."""
+    try:
+        write_json_atomic(path, snapshot)
+    except OSError:
+        pass
+
+
+def _is_fresh(snapshot: dict, fingerprint: list, now: float) -> bool:
+    """Check snapshot validity against the current DB fingerprint."""
+    if not snapshot or snapshot.get("fingerprint") != fingerprint:
+        return False
+    ttl = _MAX_SNAPSHOT_AGE if fingerprint else _UNFINGERPRINTED_TTL
+    return now - snapshot.get("created", 0) < ttl
+
+
+def get_cached_beads(query: str, project_root: Path | None = None) -> list[dict]:
+    """
+    Get bead list for a query, served from the on-disk snapshot when valid.
+
+    Args:
+        query: One of "open", "in_progress", "blocked"
+        project_root: Project root (auto-detected if None)
+
+    Returns:
+        List of bead dicts (empty on bd failure)
+    """
+    if project_root is None:
+        project_root = _project_root()
+
+    path = _snapshot_path(project_root)
+    fingerprint = _db_fingerprint(project_root)
+    now = time.time()
+
+    snapshot = _load_snapshot(path)
+    if not _is_fresh(snapshot, fingerprint, now):
+        snapshot = {"fingerprint": fingerprint, "created": now, "queries": {}}
+
+    queries = snapshot.setdefault("queries", {})
+    if query in queries:
+        return queries[query]
+
+    fetch = _fetchers().get(query)
+    if fetch is None:
+        raise ValueError(f"Unknown bead query: {query}")
+
+    try:
+        beads = fetch()
+    except Exception:
+        # Don't cache failures - bd may be temporarily unavailable
+        return []
+
+    queries[query] = beads
+    _save_snapshot(path, snapshot)
+    return beads
+
+
+def invalidate(project_root: Path | None = None) -> None:
+    """Drop the snapshot for a project (call after bd writes)."""
+    if project_root is None:
+        project_root = _project_root()
+    try:
+        _snapshot_path(project_root).unlink()
+    except OSError:
+        pass
+
+
+def format_bead_line(bead: dict) -> str:
+    """Render a bead like a `bd list` row: id [P#] [type] status - title."""
+    return (
+        f"{bead.get('id', '?')} [P{bead.get('priority', '?')}] "
+        f"[{bead.get('issue_type') or bead.get('type', 'task')}] "
+        f"{bead.get('status', '?')} - {bead.get('title', 'untitled')}"
+    )
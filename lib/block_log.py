@@ -0,0 +1,261 @@
+"""
+Block Log: Per-session shards of hook blocks with tombstone clearing.
+
+Hook blocks used to go to one global memory/block_log.jsonl. Reading the
+current session's blocks scanned every session's entries, and each clear
+rewrote the whole file. Blocks are now sharded by session:
+
+- memory/block_log/<session>.jsonl holds the session's blocks. Clearing
+  appends a tombstone ({"cleared": hook or "*"}) that hides the blocks
+  before it, so a clear costs one short append. A shard is rewritten with
+  only live blocks (plus per-hook counts of the dropped ones, for the
+  rollup) once it holds COMPACT_DEAD_LINES dead lines.
+- memory/block_log/summary.json is the cross-session rollup: per-hook block
+  counts from retired shards, plus recent block-reflection lessons. roll_up()
+  folds in shards idle for SHARD_MAX_AGE_DAYS and deletes them. It runs as a
+  SessionEnd cleanup stage.
+
+A legacy block_log.jsonl is split into shards on first use.
+
+Usage:
+    from block_log import append_block, session_blocks, clear_blocks
+
+    append_block({"session_id": sid, "hook": "commit_gate", ...})
+    blocks = session_blocks(sid)
+    clear_blocks(sid, hook="commit_gate")
+"""
+
+from __future__ import annotations
+
+import json
+import re
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Optional
+
+from _atomic_io import locked, write_atomic
+
+MEMORY_DIR = Path(__file__).resolve().parent.parent / "memory"
+BLOCK_DIR = MEMORY_DIR / "block_log"
+LEGACY_LOG = MEMORY_DIR / "block_log.jsonl"
+SUMMARY_FILE = BLOCK_DIR / "summary.json"
+
+COMPACT_DEAD_LINES = 32  # Rewrite a shard once this many lines are dead
+SHARD_MAX_AGE_DAYS = 7  # Idle shards are rolled into the summary
+SUMMARY_MAX_LESSONS = 50
+
+
+def _shard_path(session_id: str) -> Path:
+    safe = re.sub(r"[^A-Za-z0-9_.-]", "_", session_id or "unknown")[:128]
+    return BLOCK_DIR / f"{safe}.jsonl"
+
+
+def _lock_path(path: Path) -> Path:
+    return BLOCK_DIR / f"{path.name}.lock"
+
+
+@contextmanager
+def _locked(path: Path) -> Iterator[None]:
+    """Exclusive lock guarding a shard or the summary (<name>.lock).
+
+    roll_up() unlinks a retired shard's lock file while holding it; locked()
+    makes a waiter on the orphaned file retry on the one now at the path.
+    """
+    with locked(_lock_path(path)):
+        yield
+
+
+def _write_lines(path: Path, lines: list[str]) -> None:
+    write_atomic(path, "".join(lines))
+
+
+def _replay(path: Path) -> tuple[list[dict], int, dict[str, int]]:
+    """Live blocks, dead line count and per-hook totals (cleared included)."""
+    live: list[dict] = []
+    dead = 0
+    totals: dict[str, int] = {}
+    try:
+        with open(path) as f:
+            lines = f.readlines()
+    except OSError:
+        return live, dead, totals
+
+    for line in lines:
+        try:
+            entry = json.loads(line)
+        except json.JSONDecodeError:
+            dead += 1
+            continue
+        if "compacted" in entry:
+            # Per-hook counts of blocks dropped by an earlier compaction
+            for hook, count in entry["compacted"].items():
+                totals[hook] = totals.get(hook, 0) + count
+            continue
+        cleared = entry.get("cleared")
+        if cleared is None:
+            live.append(entry)
+            hook = entry.get("hook", "unknown")
+            totals[hook] = totals.get(hook, 0) + 1
+            continue
+        kept = [b for b in live if cleared != "*" and b.get("hook") != cleared]
+        dead += len(live) - len(kept) + 1
+        live = kept
+    return live, dead, totals
+
+
+def _migrate_legacy() -> None:
+    """Split a legacy single-file log into shards (once)."""
+    if not LEGACY_LOG.exists():
+        return
+    with _locked(SUMMARY_FILE):
+        try:
+            lines = LEGACY_LOG.read_text().splitlines()
+        except OSError:
+            return
+        shards: dict[str, list[str]] = {}
+        for line in lines:
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            shards.setdefault(entry.get("session_id", "unknown"), []).append(
+                json.dumps(entry) + "\n"
+            )
+        for session_id, entries in shards.items():
+            path = _shard_path(session_id)
+            with _locked(path), open(path, "a") as f:
+                f.writelines(entries)
+        LEGACY_LOG.unlink(missing_ok=True)
+
+
+# =============================================================================
+# SESSION API
+# =============================================================================
+
+
+def append_block(entry: dict) -> None:
+    """Append a block entry to its session's shard."""
+    _migrate_legacy()
+    path = _shard_path(entry.get("session_id", "unknown"))
+    with _locked(path), open(path, "a") as f:
+        f.write(json.dumps(entry) + "\n")
+
+
+def session_blocks(session_id: str) -> list[dict]:
+    """Blocks for a session that haven't been cleared, oldest first."""
+    _migrate_legacy()
+    return _replay(_shard_path(session_id))[0]
+
+
+def clear_blocks(session_id: str, hook: Optional[str] = None) -> None:
+    """Clear a session's blocks (only one hook's, if given).
+
+    Appends a tombstone; compacts the shard when dead lines pile up.
+    """
+    _migrate_legacy()
+    path = _shard_path(session_id)
+    if not path.exists():
+        return
+    with _locked(path):
+        with open(path, "a") as f:
+            f.write(json.dumps({"cleared": hook or "*", "timestamp": time.time()}))
+            f.write("\n")
+        live, dead, totals = _replay(path)
+        if dead >= COMPACT_DEAD_LINES:
+            for block in live:
+                totals[block.get("hook", "unknown")] -= 1
+            header = json.dumps({"compacted": {h: n for h, n in totals.items() if n}})
+            _write_lines(path, [header + "\n"] + [json.dumps(b) + "\n" for b in live])
+
+
+# =============================================================================
+# ROLLUP
+# =============================================================================
+
+
+def load_summary() -> dict:
+    """Cross-session rollup: {"hooks": {hook: {...}}, "lessons": [...]}."""
+    try:
+        summary = json.loads(SUMMARY_FILE.read_text())
+        if isinstance(summary, dict):
+            summary.setdefault("hooks", {})
+            summary.setdefault("lessons", [])
+            return summary
+    except (OSError, ValueError):
+        pass
+    return {"hooks": {}, "lessons": [], "updated_at": 0}
+
+
+def _save_summary(summary: dict) -> None:
+    summary["updated_at"] = time.time()
+    BLOCK_DIR.mkdir(parents=True, exist_ok=True)
+    _write_lines(SUMMARY_FILE, [json.dumps(summary, indent=2)])
+
+
+def record_lessons(lessons: list[str], hooks: list[str]) -> None:
+    """Add block-reflection lessons to the rollup (newest last)."""
+    if not lessons:
+        return
+    with _locked(SUMMARY_FILE):
+        summary = load_summary()
+        now = time.time()
+        for lesson in lessons:
+            summary["lessons"].append(
+                {"hooks": hooks[:3], "content": lesson[:200], "added_at": now}
+            )
+        summary["lessons"] = summary["lessons"][-SUMMARY_MAX_LESSONS:]
+        _save_summary(summary)
+
+
+def recent_lessons(max_age_days: float = 7) -> list[dict]:
+    """Rollup lessons from the last max_age_days, oldest first."""
+    cutoff = time.time() - max_age_days * 86400
+    return [
+        lesson
+        for lesson in load_summary()["lessons"]
+        if lesson.get("added_at", 0) > cutoff
+    ]
+
+
+def roll_up(max_age_days: float = SHARD_MAX_AGE_DAYS) -> int:
+    """Fold shards idle for max_age_days into the summary and delete them.
+
+    Returns:
+        Number of shards retired
+    """
+    _migrate_legacy()
+    if not BLOCK_DIR.exists():
+        return 0
+    cutoff = time.time() - max_age_days * 86400
+    retired = 0
+
+    with _locked(SUMMARY_FILE):
+        summary = load_summary()
+        for path in BLOCK_DIR.glob("*.jsonl"):
+            try:
+                mtime = path.stat().st_mtime
+            except OSError:
+                continue
+            if mtime > cutoff:
+                continue
+            with _locked(path):
+                try:
+                    if path.stat().st_mtime > cutoff:
+                        continue  # Appended to while we waited
+                except OSError:
+                    continue
+                _, _, totals = _replay(path)
+                for hook, count in totals.items():
+                    stats = summary["hooks"].setdefault(
+                        hook, {"blocks": 0, "sessions": 0, "last_seen": 0}
+                    )
+                    stats["blocks"] += count
+                    stats["sessions"] += 1
+                    stats["last_seen"] = max(stats["last_seen"], mtime)
+                path.unlink(missing_ok=True)
+                _lock_path(path).unlink(missing_ok=True)
+            retired += 1
+        if retired:
+            _save_summary(summary)
+    return retired
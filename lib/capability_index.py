@@ -0,0 +1,268 @@
+"""
+Compiled Capability Index: Query capabilities without parsing the full JSON.
+
+capabilities_index.json is ~140KB. Parsing it in every fresh process just to
+count capabilities, check an ID or re-render the same compact routing list
+dominated the router's cost. ops/capability_inventory.py compiles it into a
+sibling artifact holding:
+
+- Columns: ids, types, names, and each card as its own JSON string that is
+  decoded only when that card is asked for
+- Inverted indexes: tag, stage and risk flag -> row numbers
+- The compact routing list (build_compact_index output), pre-rendered
+
+The artifact is marshal-serialized (plain data only, no pickle) and stamped
+with the interpreter's marshal version plus the JSON's size and mtime. A
+stale or foreign artifact is recompiled from the JSON on first use.
+
+Storage: <capabilities_index>.compiled next to the JSON
+
+Usage:
+    from capability_index import load_compiled
+
+    compiled = load_compiled(INDEX_PATH)
+    compiled.query(tags=["tests"], stages=["validate"], risk={"network": False})
+    compiled.get("ops__audit")
+"""
+
+from __future__ import annotations
+
+import json
+import marshal
+import sys
+from pathlib import Path
+from typing import Any, Iterable, Optional
+
+from _atomic_io import write_atomic
+
+COMPILED_FORMAT = 1
+COMPACT_MAX_CAPABILITIES = 100
+RISK_FLAGS = (
+    "read_only",
+    "writes_repo",
+    "network",
+    "executes_code",
+    "destructive_possible",
+)
+
+
+# =============================================================================
+# COMPILING
+# =============================================================================
+
+
+def compact_card(cap: dict[str, Any]) -> dict[str, Any]:
+    """Essential fields of a card for the routing prompt."""
+    return {
+        "id": cap.get("id"),
+        "type": cap.get("type"),
+        "name": cap.get("name"),
+        "summary": cap.get("summary", "")[:100],
+        "stages": cap.get("stages", []),
+        "tags": cap.get("tags", [])[:5],
+        "risk": {
+            "writes_repo": cap.get("risk", {}).get("writes_repo", False),
+            "network": cap.get("risk", {}).get("network", False),
+        },
+    }
+
+
+def render_compact_index(
+    capabilities: list[dict[str, Any]],
+    max_capabilities: int = COMPACT_MAX_CAPABILITIES,
+) -> str:
+    """Compact JSON list of the first max_capabilities cards."""
+    compact = [compact_card(cap) for cap in capabilities[:max_capabilities]]
+    return json.dumps(compact, separators=(",", ":"))
+
+
+def _source_stamp(json_path: Path) -> Optional[list[int]]:
+    try:
+        stat = json_path.stat()
+    except OSError:
+        return None
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def compile_index(index: dict[str, Any], json_path: Optional[Path] = None) -> dict:
+    """Build the columnar form of a capabilities index.
+
+    Args:
+        index: Parsed capabilities_index.json
+        json_path: The JSON file it came from; its size/mtime are recorded
+            so readers can tell when the artifact is stale
+
+    Returns:
+        Plain-data dict suitable for marshal
+    """
+    capabilities = index.get("capabilities", [])
+    tags: dict[str, list[int]] = {}
+    stages: dict[str, list[int]] = {}
+    risk: dict[str, list[int]] = {flag: [] for flag in RISK_FLAGS}
+
+    for row, cap in enumerate(capabilities):
+        for tag in cap.get("tags", []):
+            tags.setdefault(tag, []).append(row)
+        for stage in cap.get("stages", []):
+            stages.setdefault(stage, []).append(row)
+        for flag, value in cap.get("risk", {}).items():
+            if value:
+                risk.setdefault(flag, []).append(row)
+
+    return {
+        "format": COMPILED_FORMAT,
+        "marshal_version": marshal.version,
+        "python": list(sys.version_info[:2]),
+        "source": _source_stamp(json_path) if json_path else None,
+        "inventory_version": index.get("inventory_version", "unknown"),
+        "ids": [cap.get("id") for cap in capabilities],
+        "types": [cap.get("type") for cap in capabilities],
+        "names": [cap.get("name") for cap in capabilities],
+        "cards": [json.dumps(cap, separators=(",", ":")) for cap in capabilities],
+        "tags": tags,
+        "stages": stages,
+        "risk": risk,
+        "compact_index": render_compact_index(capabilities),
+    }
+
+
+def compiled_path_for(json_path: Path) -> Path:
+    """Where the compiled artifact for an index JSON lives."""
+    return json_path.with_suffix(".compiled")
+
+
+def write_compiled(compiled: dict, path: Path) -> None:
+    """Atomically write a compiled index."""
+    write_atomic(path, marshal.dumps(compiled))
+
+
+# =============================================================================
+# QUERYING
+# =============================================================================
+
+
+class CompiledIndex:
+    """Read-only view over a compiled capabilities index."""
+
+    def __init__(self, data: dict):
+        self._data = data
+        self._rows: Optional[dict[str, int]] = None
+
+    @property
+    def version(self) -> str:
+        return self._data["inventory_version"]
+
+    @property
+    def source(self) -> Optional[list[int]]:
+        """[size, mtime_ns] of the JSON this was compiled from."""
+        return self._data.get("source")
+
+    @property
+    def ids(self) -> list[str]:
+        return self._data["ids"]
+
+    @property
+    def compact_index(self) -> str:
+        """Pre-rendered build_compact_index() output for the routing prompt."""
+        return self._data["compact_index"]
+
+    def __len__(self) -> int:
+        return len(self._data["ids"])
+
+    def _row(self, capability_id: str) -> Optional[int]:
+        if self._rows is None:
+            self._rows = {cid: row for row, cid in enumerate(self._data["ids"])}
+        return self._rows.get(capability_id)
+
+    def __contains__(self, capability_id: str) -> bool:
+        return self._row(capability_id) is not None
+
+    def get(self, capability_id: str) -> Optional[dict[str, Any]]:
+        """Full card for an ID (decodes just that card)."""
+        row = self._row(capability_id)
+        return None if row is None else json.loads(self._data["cards"][row])
+
+    def query(
+        self,
+        tags: Iterable[str] = (),
+        stages: Iterable[str] = (),
+        risk: Optional[dict[str, bool]] = None,
+        types: Iterable[str] = (),
+    ) -> list[str]:
+        """IDs of capabilities matching every given criterion, in index order.
+
+        Args:
+            tags: Capabilities must carry all of these tags
+            stages: Capabilities must cover all of these stages
+            risk: Required risk flag values, e.g. {"network": False}
+            types: Capabilities must be one of these types
+        """
+        rows = set(range(len(self)))
+        for tag in tags:
+            rows &= set(self._data["tags"].get(tag, ()))
+        for stage in stages:
+            rows &= set(self._data["stages"].get(stage, ()))
+        for flag, wanted in (risk or {}).items():
+            flagged = set(self._data["risk"].get(flag, ()))
+            rows = rows & flagged if wanted else rows - flagged
+        wanted_types = set(types)
+        if wanted_types:
+            rows = {r for r in rows if self._data["types"][r] in wanted_types}
+        return [self._data["ids"][row] for row in sorted(rows)]
+
+
+def _read_compiled(path: Path) -> Optional[dict]:
+    try:
+        data = marshal.loads(path.read_bytes())
+    except (OSError, ValueError, EOFError, TypeError):
+        return None
+    if (
+        not isinstance(data, dict)
+        or data.get("format") != COMPILED_FORMAT
+        or data.get("marshal_version") != marshal.version
+        or data.get("python") != list(sys.version_info[:2])
+    ):
+        return None
+    return data
+
+
+def load_compiled(
+    json_path: Path,
+    rebuild: bool = True,
+    cached: Optional[CompiledIndex] = None,
+) -> Optional[CompiledIndex]:
+    """Load the compiled index for json_path, recompiling if it is stale.
+
+    Args:
+        json_path: capabilities_index.json
+        rebuild: Recompile from the JSON (and persist, best effort) when the
+            artifact is missing or stale; otherwise return None
+        cached: A previously loaded index, returned as-is while still fresh
+
+    Returns:
+        CompiledIndex, or None if neither artifact nor JSON is usable
+    """
+    stamp = _source_stamp(json_path)
+    if stamp is None:
+        return None
+    if cached is not None and cached.source == stamp:
+        return cached
+    path = compiled_path_for(json_path)
+    data = _read_compiled(path)
+    if data is not None and data.get("source") == stamp:
+        return CompiledIndex(data)
+    if not rebuild:
+        return None
+
+    try:
+        with open(json_path) as f:
+            data = compile_index(json.load(f))
+    except (OSError, ValueError):
+        return None
+    # Stamp taken before reading: a concurrent rewrite leaves it stale
+    data["source"] = stamp
+    try:
+        write_compiled(data, path)
+    except OSError:
+        pass  # Read-only install: still usable in-process
+    return CompiledIndex(data)
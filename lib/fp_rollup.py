@@ -0,0 +1,278 @@
+"""
+FP Rollup: Incremental aggregates of the cross-session false-positive history.
+
+fp_history.jsonl only grows, and session start, ops/health.py and
+ops/fp_analyze.py each used to re-read and re-parse all of it. The rollup
+keeps a byte offset into the history and the aggregates of everything before
+it, so each reader only folds in entries appended since the last update
+(usually none):
+
+- Per-reducer totals, hour-of-day and weekday distributions (all time)
+- Reason clusters per reducer: reasons normalized (case, digits, spacing)
+  into a key, with a count and the latest example
+- Hourly buckets (YYYY-MM-DDTHH) of reducer counts and reason keys for the
+  last BUCKET_MAX_DAYS, from which time windows are summed
+- The last RECENT_MAX entries, for spike detection
+
+record_fp() appends an entry and folds it in under the same lock. A history
+that shrank or was replaced is re-read from the start.
+
+Storage: ~/.claude/tmp/fp_rollup.json (next to fp_history.jsonl)
+
+Usage:
+    from fp_rollup import record_fp, load_rollup, window
+
+    record_fp({"timestamp": ..., "reducer": "edit_oscillation", "reason": ...})
+    recent = window(load_rollup(), days=14)
+    recent["reducers"]  # {"edit_oscillation": 3, ...}
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Iterator, Optional
+
+from _atomic_io import locked, write_json_atomic
+
+FP_HISTORY_FILE = Path.home() / ".claude" / "tmp" / "fp_history.jsonl"
+ROLLUP_FILE = FP_HISTORY_FILE.with_name("fp_rollup.json")
+
+ROLLUP_FORMAT = 1
+BUCKET_MAX_DAYS = 90  # Hourly buckets kept for windowed queries
+REASON_CLUSTERS_MAX = 20  # Per reducer; the rarest cluster is evicted
+RECENT_MAX = 10
+
+
+def _empty() -> dict[str, Any]:
+    return {
+        "format": ROLLUP_FORMAT,
+        "inode": None,
+        "offset": 0,
+        "total": 0,
+        "reducers": {},
+        "hours": {},
+        "weekdays": {},
+        "clusters": {},
+        "buckets": {},
+        "recent": [],
+    }
+
+
+def reason_key(reason: str) -> str:
+    """Cluster key for a reason: lowercased, digits and spacing normalized."""
+    key = re.sub(r"\d+", "#", reason.lower())
+    return " ".join(key.split())[:80]
+
+
+def _bump(counts: dict[str, int], key: str, n: int = 1) -> None:
+    counts[key] = counts.get(key, 0) + n
+
+
+def _fold(rollup: dict[str, Any], entry: dict[str, Any]) -> None:
+    """Add one history entry to the rollup."""
+    reducer = entry.get("reducer")
+    if not reducer:
+        return
+    reason = entry.get("reason") or ""
+    key = reason_key(reason) if reason else ""
+
+    rollup["total"] += 1
+    _bump(rollup["reducers"], reducer)
+
+    if key:
+        clusters = rollup["clusters"].setdefault(reducer, {})
+        cluster = clusters.setdefault(key, {"count": 0, "example": reason})
+        cluster["count"] += 1
+        cluster["example"] = reason
+        if len(clusters) > REASON_CLUSTERS_MAX:
+            rarest = min(
+                (k for k in clusters if k != key), key=lambda k: clusters[k]["count"]
+            )
+            del clusters[rarest]
+
+    try:
+        ts = datetime.fromisoformat(entry["timestamp"])
+    except (KeyError, TypeError, ValueError):
+        ts = None
+    if ts is not None:
+        _bump(rollup["hours"], str(ts.hour))
+        _bump(rollup["weekdays"], ts.strftime("%A"))
+        bucket = rollup["buckets"].setdefault(
+            ts.strftime("%Y-%m-%dT%H"), {"reducers": {}, "reasons": {}}
+        )
+        _bump(bucket["reducers"], reducer)
+        if key:
+            _bump(bucket["reasons"].setdefault(reducer, {}), key)
+
+    rollup["recent"] = (rollup["recent"] + [{"reducer": reducer, "reason": reason}])[
+        -RECENT_MAX:
+    ]
+
+
+def _catch_up(rollup: dict[str, Any]) -> tuple[dict[str, Any], bool]:
+    """Fold in history appended since the rollup's offset.
+
+    Returns:
+        (rollup, changed) - a fresh rollup if the history was replaced
+    """
+    try:
+        stat = FP_HISTORY_FILE.stat()
+    except OSError:
+        return _empty(), rollup["offset"] > 0  # History deleted
+    reset = rollup.get("inode") != stat.st_ino or stat.st_size < rollup["offset"]
+    if reset:
+        rollup = _empty()
+        rollup["inode"] = stat.st_ino
+    if stat.st_size == rollup["offset"]:
+        return rollup, reset
+
+    with open(FP_HISTORY_FILE, "rb") as f:
+        f.seek(rollup["offset"])
+        data = f.read()
+    end = data.rfind(b"\n") + 1  # A partial last line waits for the next read
+    for line in data[:end].splitlines():
+        try:
+            entry = json.loads(line)
+        except ValueError:
+            continue
+        if isinstance(entry, dict):
+            _fold(rollup, entry)
+    rollup["offset"] += end
+
+    oldest = (datetime.now() - timedelta(days=BUCKET_MAX_DAYS)).strftime("%Y-%m-%dT%H")
+    for hour in [h for h in rollup["buckets"] if h < oldest]:
+        del rollup["buckets"][hour]
+    return rollup, reset or end > 0
+
+
+def _read() -> dict[str, Any]:
+    try:
+        rollup = json.loads(ROLLUP_FILE.read_text())
+        if isinstance(rollup, dict) and rollup.get("format") == ROLLUP_FORMAT:
+            return rollup
+    except (OSError, ValueError):
+        pass
+    return _empty()
+
+
+def _save(rollup: dict[str, Any]) -> None:
+    write_json_atomic(ROLLUP_FILE, rollup, separators=(",", ":"))
+
+
+@contextmanager
+def _locked() -> Iterator[None]:
+    with locked(ROLLUP_FILE.with_suffix(".lock")):
+        yield
+
+
+def _is_current(rollup: dict[str, Any]) -> bool:
+    try:
+        stat = FP_HISTORY_FILE.stat()
+    except OSError:
+        return rollup["offset"] == 0
+    return rollup.get("inode") == stat.st_ino and rollup["offset"] == stat.st_size
+
+
+# =============================================================================
+# PUBLIC API
+# =============================================================================
+
+
+def record_fp(entry: dict[str, Any]) -> None:
+    """Append an entry to fp_history.jsonl and fold it into the rollup."""
+    with _locked():
+        with FP_HISTORY_FILE.open("a") as f:
+            f.write(json.dumps(entry) + "\n")
+        rollup, _ = _catch_up(_read())
+        _save(rollup)
+
+
+def load_rollup() -> dict[str, Any]:
+    """The rollup, caught up with the history (persisted if it changed)."""
+    rollup = _read()
+    if _is_current(rollup):
+        return rollup
+    try:
+        with _locked():
+            rollup, changed = _catch_up(_read())
+            if changed:
+                _save(rollup)
+    except OSError:
+        rollup, _ = _catch_up(rollup)  # Read-only: still usable in-process
+    return rollup
+
+
+def window(rollup: dict[str, Any], days: Optional[float] = None) -> dict[str, Any]:
+    """Aggregates for the last `days` days (hour resolution), or all time.
+
+    Buckets only cover BUCKET_MAX_DAYS, so a longer window is clamped to it
+    and the result carries "clamped_days" for callers to report.
+
+    Returns:
+        {"total", "reducers", "hours", "weekdays", "reasons"} where reasons
+        maps reducer -> [{"reason": example, "count": n}], most common first
+    """
+    clusters = rollup.get("clusters", {})
+    if days is None:
+        return {
+            "total": rollup["total"],
+            "reducers": dict(rollup["reducers"]),
+            "hours": dict(rollup["hours"]),
+            "weekdays": dict(rollup["weekdays"]),
+            "reasons": {
+                reducer: _ranked(
+                    {k: c["count"] for k, c in keyed.items()}, clusters.get(reducer)
+                )
+                for reducer, keyed in clusters.items()
+            },
+        }
+
+    clamped = days > BUCKET_MAX_DAYS
+    if clamped:
+        days = BUCKET_MAX_DAYS
+    oldest = (datetime.now() - timedelta(days=days)).strftime("%Y-%m-%dT%H")
+    reducers: dict[str, int] = {}
+    hours: dict[str, int] = {}
+    weekdays: dict[str, int] = {}
+    reason_counts: dict[str, dict[str, int]] = {}
+    for hour, bucket in rollup.get("buckets", {}).items():
+        if hour < oldest:
+            continue
+        count = sum(bucket["reducers"].values())
+        when = datetime.strptime(hour, "%Y-%m-%dT%H")
+        _bump(hours, str(when.hour), count)
+        _bump(weekdays, when.strftime("%A"), count)
+        for reducer, n in bucket["reducers"].items():
+            _bump(reducers, reducer, n)
+        for reducer, keys in bucket["reasons"].items():
+            for key, n in keys.items():
+                _bump(reason_counts.setdefault(reducer, {}), key, n)
+
+    view = {
+        "total": sum(reducers.values()),
+        "reducers": reducers,
+        "hours": hours,
+        "weekdays": weekdays,
+        "reasons": {
+            reducer: _ranked(keys, clusters.get(reducer))
+            for reducer, keys in reason_counts.items()
+        },
+    }
+    if clamped:
+        view["clamped_days"] = BUCKET_MAX_DAYS
+    return view
+
+
+def _ranked(
+    counts: dict[str, int], clusters: Optional[dict[str, dict]]
+) -> list[dict[str, Any]]:
+    """Reason clusters as {"reason", "count"}, most common first."""
+    clusters = clusters or {}
+    return [
+        {"reason": clusters.get(key, {}).get("example", key), "count": n}
+        for key, n in sorted(counts.items(), key=lambda kv: -kv[1])
+    ]
@@ -0,0 +1,536 @@
+"""
+Git Probe: Subprocess-free answers to hot git questions.
+
+Hooks asked git for the branch, remote, repo root and working-tree status
+on nearly every tool call, each a 5-10ms fork. Those answers live in a few
+small files, so this module reads them directly:
+
+- Repo root / git dir: walk up to `.git` (directory, or a `gitdir:` file
+  for worktrees and submodules)
+- Branch / HEAD: `HEAD`, loose refs, `packed-refs`
+- Remote URL: `config` (with `url.<base>.insteadOf` rewrites)
+- Worktree changes: the index's stat cache (mtime + size per entry),
+  confirmed by blob-hashing only files whose stat changed
+
+The parts of `git status` that can't be read cheaply (staged changes need
+HEAD's tree, untracked files need ignore rules) come from one
+`git status --porcelain` run, cached on disk and reused while HEAD, the
+index and the mtimes of tracked directories are unchanged. Editing tracked
+files in place - the common case in a session - never forks.
+
+Diffs and history still go through git. Unsupported layouts (index v4,
+split/sparse index, sha256 repos, $GIT_DIR overrides, unmerged entries)
+fall back to git transparently.
+
+Storage: ~/.claude/tmp/git_probe/<repo_hash>.json
+
+Usage:
+    from git_probe import current_branch, remote_url, repo_root, status_porcelain
+
+    branch = current_branch()          # None outside a repo, "" if detached
+    dirty = bool(status_porcelain())
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import struct
+import subprocess
+from dataclasses import dataclass
+from pathlib import Path
+
+from _atomic_io import write_json_atomic
+
+CACHE_DIR = Path(__file__).resolve().parent.parent / "tmp" / "git_probe"
+
+# Index entry layout (v2/v3): 10 x uint32 stat fields, 20-byte sha, flags
+_ENTRY_HEAD = struct.Struct(">10I20sH")
+_FLAG_EXTENDED = 0x4000
+_FLAG_STAGE = 0x3000
+_EXT_SKIP_WORKTREE = 0x4000
+_EXT_INTENT_TO_ADD = 0x2000
+_MODE_GITLINK = 0o160000
+_MODE_SYMLINK = 0o120000
+
+# Index extensions that move or hide entries (not handled: use git)
+_UNSUPPORTED_EXTENSIONS = (b"link", b"sdir")
+
+
+class Unsupported(Exception):
+    """Raised when a repo layout needs real git to answer."""
+
+
+@dataclass(frozen=True)
+class Repo:
+    """Locations of one working tree's git data."""
+
+    root: str  # Working tree root
+    git_dir: str  # Per-worktree git dir (HEAD, index)
+    common_dir: str  # Shared git dir (refs, packed-refs, config)
+
+
+# =============================================================================
+# DISCOVERY
+# =============================================================================
+
+
+def find_repo(path: str | None = None) -> Repo | None:
+    """Locate the repository containing path (default: cwd).
+
+    Returns None outside a repository.
+    """
+    current = os.path.realpath(path or os.getcwd())  # Physical, like git
+    if os.path.isfile(current):
+        current = os.path.dirname(current)
+    while True:
+        dotgit = os.path.join(current, ".git")
+        if os.path.isdir(dotgit):
+            return _repo_for(current, dotgit)
+        if os.path.isfile(dotgit):
+            try:
+                with open(dotgit) as f:
+                    line = f.readline().strip()
+            except OSError:
+                return None
+            if not line.startswith("gitdir:"):
+                return None
+            git_dir = os.path.normpath(os.path.join(current, line[7:].strip()))
+            return _repo_for(current, git_dir)
+        parent = os.path.dirname(current)
+        if parent == current:
+            return None
+        current = parent
+
+
+def _repo_for(root: str, git_dir: str) -> Repo:
+    common = git_dir
+    try:
+        with open(os.path.join(git_dir, "commondir")) as f:
+            common = os.path.normpath(os.path.join(git_dir, f.read().strip()))
+    except OSError:
+        pass
+    return Repo(root=root, git_dir=git_dir, common_dir=common)
+
+
+def _probe_repo(path: str | None) -> Repo | None:
+    """find_repo(), but raise Unsupported when git env overrides apply."""
+    if os.environ.get("GIT_DIR") or os.environ.get("GIT_WORK_TREE"):
+        raise Unsupported("GIT_DIR/GIT_WORK_TREE set")
+    return find_repo(path)
+
+
+# =============================================================================
+# REFS AND CONFIG
+# =============================================================================
+
+
+def read_head(repo: Repo) -> tuple[str, str | None]:
+    """Return (branch, commit sha). Branch is "" when HEAD is detached."""
+    try:
+        with open(os.path.join(repo.git_dir, "HEAD")) as f:
+            head = f.read().strip()
+    except OSError:
+        return "", None
+    if not head.startswith("ref:"):
+        return "", head or None
+    ref = head[4:].strip()
+    branch = ref.removeprefix("refs/heads/")
+    return branch, resolve_ref(repo, ref)
+
+
+def resolve_ref(repo: Repo, ref: str) -> str | None:
+    """Commit sha for a full ref name (loose refs, then packed-refs)."""
+    for base in (repo.git_dir, repo.common_dir):
+        try:
+            with open(os.path.join(base, ref)) as f:
+                value = f.read().strip()
+        except OSError:
+            continue
+        if value.startswith("ref:"):
+            return resolve_ref(repo, value[4:].strip())
+        return value or None
+    try:
+        with open(os.path.join(repo.common_dir, "packed-refs")) as f:
+            for line in f:
+                if line.startswith(("#", "^")):
+                    continue
+                sha, _, name = line.strip().partition(" ")
+                if name == ref:
+                    return sha
+    except OSError:
+        pass
+    return None
+
+
+def read_config(repo: Repo) -> dict[tuple[str, str], dict[str, list[str]]]:
+    """Parse the repo config into {(section, subsection): {key: [values]}}.
+
+    Section and key names are lowercased (git treats them case-insensitively);
+    subsections keep their case. Includes are not followed.
+    """
+    config: dict[tuple[str, str], dict[str, list[str]]] = {}
+    section = ("", "")
+    try:
+        with open(os.path.join(repo.common_dir, "config")) as f:
+            lines = f.read().splitlines()
+    except OSError:
+        return config
+    for raw in lines:
+        line = raw.strip()
+        if not line or line[0] in "#;":
+            continue
+        if line.startswith("["):
+            header = line[1 : line.index("]")] if "]" in line else line[1:]
+            name, _, sub = header.partition(" ")
+            section = (name.lower(), sub.strip().strip('"'))
+            config.setdefault(section, {})
+            continue
+        key, sep, value = line.partition("=")
+        value = value.strip() if sep else "true"
+        if value.startswith('"') and value.endswith('"') and len(value) > 1:
+            value = value[1:-1]
+        else:
+            for marker in (" #", " ;", "\t#", "\t;"):
+                value = value.split(marker, 1)[0]
+        config.setdefault(section, {}).setdefault(key.strip().lower(), []).append(
+            value.strip()
+        )
+    return config
+
+
+def _rewrite_url(config: dict, url: str) -> str:
+    """Apply the longest matching url.<base>.insteadOf rewrite."""
+    best = ("", "")
+    for (section, base), values in config.items():
+        if section != "url":
+            continue
+        for prefix in values.get("insteadof", []):
+            if url.startswith(prefix) and len(prefix) > len(best[0]):
+                best = (prefix, base)
+    if best[0]:
+        return best[1] + url[len(best[0]) :]
+    return url
+
+
+# =============================================================================
+# INDEX (stat cache)
+# =============================================================================
+
+
+def read_index(repo: Repo) -> list[tuple[str, int, int, int, bytes]]:
+    """Stage-0 worktree entries: (path, mode, mtime in ns, size, sha).
+
+    Raises:
+        Unsupported: index version/extension or state this parser doesn't cover
+    """
+    try:
+        with open(os.path.join(repo.git_dir, "index"), "rb") as f:
+            data = f.read()
+    except FileNotFoundError:
+        return []
+    except OSError as e:
+        raise Unsupported(str(e)) from e
+    if len(data) < 12 or data[:4] != b"DIRC":
+        raise Unsupported("bad index header")
+    version, count = struct.unpack_from(">II", data, 4)
+    if version not in (2, 3):
+        raise Unsupported(f"index v{version}")
+
+    entries = []
+    pos = 12
+    for _ in range(count):
+        (_, _, mtime_s, mtime_ns, _, _, mode, _, _, size, sha, flags) = (
+            _ENTRY_HEAD.unpack_from(data, pos)
+        )
+        name_start = pos + _ENTRY_HEAD.size
+        ext_flags = 0
+        if flags & _FLAG_EXTENDED:
+            (ext_flags,) = struct.unpack_from(">H", data, name_start)
+            name_start += 2
+        name_end = data.index(b"\0", name_start)
+        fixed = name_start - pos
+        pos += (fixed + (name_end - name_start) + 8) // 8 * 8
+        if flags & _FLAG_STAGE:
+            raise Unsupported("unmerged entries")
+        if ext_flags & _EXT_INTENT_TO_ADD:
+            raise Unsupported("intent-to-add entries")
+        if ext_flags & _EXT_SKIP_WORKTREE or mode == _MODE_GITLINK:
+            continue
+        path = data[name_start:name_end].decode("utf-8", "surrogateescape")
+        entries.append((path, mode, mtime_s * 1_000_000_000 + mtime_ns, size, sha))
+
+    end = len(data) - 20
+    while pos + 8 <= end:
+        signature = data[pos : pos + 4]
+        if signature in _UNSUPPORTED_EXTENSIONS:
+            raise Unsupported(f"index extension {signature.decode()}")
+        (length,) = struct.unpack_from(">I", data, pos + 4)
+        pos += 8 + length
+    return entries
+
+
+def _blob_sha(full: str, mode: int) -> bytes | None:
+    try:
+        if mode == _MODE_SYMLINK:
+            content = os.readlink(full).encode("utf-8", "surrogateescape")
+        else:
+            with open(full, "rb") as f:
+                content = f.read()
+    except OSError:
+        return None
+    return hashlib.sha1(b"blob %d\0" % len(content) + content).digest()
+
+
+def worktree_changes(repo: Repo, entries: list | None = None) -> dict[str, str]:
+    """Tracked files differing from the index: {path: "M" | "D"}.
+
+    Files whose stat matches the index entry are clean without being read
+    (as in git, files touched in the same second the index was written are
+    re-hashed). Content filters (autocrlf, clean filters) are not applied.
+
+    Args:
+        repo: Repository to check
+        entries: Pre-read read_index() result
+    """
+    if entries is None:
+        entries = read_index(repo)
+    try:
+        index_mtime_ns = os.stat(os.path.join(repo.git_dir, "index")).st_mtime_ns
+    except OSError:
+        index_mtime_ns = 0
+    prefix = repo.root + os.sep
+    lstat = os.lstat
+    changes = {}
+    for path, mode, mtime_ns, size, sha in entries:
+        full = prefix + path
+        try:
+            st = lstat(full)
+        except OSError:
+            changes[path] = "D"
+            continue
+        if mode & 0o170000 == 0o100000 and (st.st_mode & 0o100) != (mode & 0o100):
+            changes[path] = "M"
+        elif (
+            st.st_mtime_ns != mtime_ns
+            or st.st_size != size
+            or mtime_ns >= index_mtime_ns  # Racily clean: verify content
+        ):
+            if _blob_sha(full, mode) != sha:
+                changes[path] = "M"
+    return changes
+
+
+# =============================================================================
+# STATUS
+# =============================================================================
+
+
+def _status_stamp(repo: Repo, entries: list) -> str:
+    """Fingerprint of everything the cached staged/untracked parts depend on."""
+    branch, head = read_head(repo)
+    parts = [branch, head or ""]
+    for name in ("index", "info/exclude"):
+        for base in (repo.git_dir, repo.common_dir):
+            try:
+                st = os.stat(os.path.join(base, name))
+            except OSError:
+                continue
+            parts.append(f"{name}:{st.st_mtime_ns}:{st.st_size}")
+            break
+    dirs = {""}
+    ignores = []
+    for entry in entries:
+        path = entry[0]
+        if path == ".gitignore" or path.endswith("/.gitignore"):
+            ignores.append(path)
+        parent = os.path.dirname(path)
+        while parent not in dirs:
+            dirs.add(parent)
+            parent = os.path.dirname(parent)
+    for rel in sorted(dirs) + ignores:
+        try:
+            parts.append(f"{rel}:{os.stat(os.path.join(repo.root, rel)).st_mtime_ns}")
+        except OSError:
+            parts.append(f"{rel}:-")
+    return hashlib.sha1("\0".join(parts).encode("utf-8", "surrogateescape")).hexdigest()
+
+
+def _cache_path(repo: Repo) -> Path:
+    return CACHE_DIR / f"{hashlib.sha1(repo.root.encode()).hexdigest()[:16]}.json"
+
+
+def _run_status(root: str) -> str | None:
+    try:
+        result = subprocess.run(
+            ["git", "--no-optional-locks", "status", "--porcelain"],
+            capture_output=True,
+            text=True,
+            timeout=5,
+            cwd=root,
+        )
+    except (subprocess.TimeoutExpired, FileNotFoundError, OSError):
+        return None
+    return result.stdout.rstrip("\n") if result.returncode == 0 else None
+
+
+_C_ESCAPES = {"a": 7, "b": 8, "t": 9, "n": 10, "v": 11, "f": 12, "r": 13}
+_C_QUOTES = {code: f"\\{char}" for char, code in _C_ESCAPES.items()}
+_C_QUOTES.update({ord('"'): '\\"', ord("\\"): "\\\\"})
+
+
+def _unquote_path(quoted: str) -> str:
+    """Undo git's C-style path quoting ("caf\\303\\251.py" -> "café.py").
+
+    Octal escapes are raw bytes of the UTF-8 path, so they are collected
+    into a byte string and decoded once, like read_index() does.
+    """
+    out = bytearray()
+    body = quoted[1:-1]
+    i = 0
+    while i < len(body):
+        char = body[i]
+        if char != "\\" or i + 1 == len(body):
+            out += char.encode("utf-8", "surrogateescape")
+            i += 1
+            continue
+        nxt = body[i + 1]
+        if nxt in "01234567":
+            out.append(int(body[i + 1 : i + 4], 8) & 0xFF)
+            i += 4
+        else:
+            out.append(_C_ESCAPES.get(nxt, ord(nxt)))
+            i += 2
+    return out.decode("utf-8", "surrogateescape")
+
+
+def _quote_path(path: str) -> str:
+    """Quote a path the way `git status --porcelain` prints it.
+
+    Mirrors quote_c_style() with core.quotepath on: control characters,
+    quotes, backslashes and non-ASCII bytes force quoting, and bytes
+    without a short escape are written as octal.
+    """
+    raw = path.encode("utf-8", "surrogateescape")
+    if not any(b < 0x20 or b >= 0x7F or b in (0x22, 0x5C) for b in raw):
+        return path
+    parts = []
+    for b in raw:
+        if b in _C_QUOTES:
+            parts.append(_C_QUOTES[b])
+        elif b < 0x20 or b >= 0x7F:
+            parts.append(f"\\{b:03o}")
+        else:
+            parts.append(chr(b))
+    return '"' + "".join(parts) + '"'
+
+
+def _index_path(display: str) -> str:
+    """Path a porcelain entry refers to in the index (rename target)."""
+    path = display.split(" -> ")[-1]
+    if path.startswith('"') and path.endswith('"'):
+        path = _unquote_path(path)
+    return path
+
+
+def status_porcelain(path: str | None = None) -> str | None:
+    """Equivalent of `git status --porcelain` (None outside a repo).
+
+    Worktree columns are computed from the index stat cache; the staged
+    column and untracked files are reused from the last real `git status`
+    while HEAD, the index and tracked directory mtimes are unchanged.
+    """
+    try:
+        repo = _probe_repo(path)
+        if repo is None:
+            return None
+        extensions = read_config(repo).get(("extensions", ""), {})
+        if extensions.get("objectformat", ["sha1"])[0].lower() != "sha1":
+            raise Unsupported("non-sha1 object format")
+        entries = read_index(repo)
+        stamp = _status_stamp(repo, entries)
+        cache_file = _cache_path(repo)
+        try:
+            with open(cache_file) as f:
+                cached = json.load(f)
+        except (OSError, ValueError):
+            cached = None
+        if not cached or cached.get("stamp") != stamp:
+            cached = _refresh_status(repo, stamp, cache_file)
+            if cached is None:
+                return None
+        worktree = worktree_changes(repo, entries)
+    except Unsupported:
+        cwd = os.path.abspath(path or os.getcwd())
+        return _run_status(cwd if os.path.isdir(cwd) else os.path.dirname(cwd))
+
+    staged = {index_path: (x, display) for x, display, index_path in cached["staged"]}
+    lines = []
+    for p in sorted(set(staged) | set(worktree)):
+        x, display = staged.get(p) or (" ", _quote_path(p))
+        lines.append(f"{x}{worktree.get(p, ' ')} {display}")
+    lines.extend(f"?? {p}" for p in cached["untracked"])
+    return "\n".join(lines)
+
+
+def _refresh_status(repo: Repo, stamp: str, cache_file: Path) -> dict | None:
+    """Run git status once and cache its staged and untracked parts."""
+    output = _run_status(repo.root)
+    if output is None:
+        return None
+    staged, untracked = [], []
+    for line in output.split("\n"):
+        if len(line) < 4:
+            continue
+        if line.startswith("??"):
+            untracked.append(line[3:])
+        elif line[0] != " ":
+            staged.append([line[0], line[3:], _index_path(line[3:])])
+    cached = {"stamp": stamp, "staged": staged, "untracked": untracked}
+    try:
+        write_json_atomic(cache_file, cached)
+    except OSError:
+        pass
+    return cached
+
+
+# =============================================================================
+# CONVENIENCE API
+# =============================================================================
+
+
+def repo_root(path: str | None = None) -> str | None:
+    """Working tree root (like `git rev-parse --show-toplevel`)."""
+    repo = find_repo(path)
+    return repo.root if repo else None
+
+
+def current_branch(path: str | None = None) -> str | None:
+    """Checked-out branch (like `git branch --show-current`).
+
+    Returns None outside a repo and "" for a detached HEAD.
+    """
+    repo = find_repo(path)
+    return read_head(repo)[0] if repo else None
+
+
+def head_sha(path: str | None = None) -> str | None:
+    """Commit sha HEAD points at (None outside a repo or before first commit)."""
+    repo = find_repo(path)
+    return read_head(repo)[1] if repo else None
+
+
+def remote_url(path: str | None = None, name: str = "origin") -> str | None:
+    """URL of a remote (like `git remote get-url <name>`)."""
+    repo = find_repo(path)
+    if repo is None:
+        return None
+    config = read_config(repo)
+    urls = config.get(("remote", name), {}).get("url")
+    return _rewrite_url(config, urls[0]) if urls else None
+
+
+def is_dirty(path: str | None = None) -> bool:
+    """True if the working tree has staged, unstaged or untracked changes."""
+    return bool(status_porcelain(path))
@@ -33,11 +33,6 @@ _idf_cache: dict[str, float] | None = None
 _idf_cache_time: float = 0
 _IDF_CACHE_TTL = 300  # 5 minutes
 
-# Bead status cache (per-turn, keyed by timestamp truncated to 10s)
-_bead_cache: dict[str, bool] = {}
-_bead_cache_time: float = 0
-_BEAD_CACHE_TTL = 10  # 10 seconds (covers a single turn)
-
 
 def _compute_idf(documents: list[str]) -> dict[str, float]:
     """Compute IDF values for all terms in document corpus."""
@@ -190,8 +185,22 @@ def get_repo_structure(cwd: Path, max_depth: int = 2) -> str:
         return "[repo structure unavailable]"
 
 
+def _has_tracked_changes(cwd: Path) -> bool:
+    """Cheap pre-check (reads .git, no fork) so clean trees skip git diff."""
+    try:
+        from git_probe import status_porcelain
+    except ImportError:
+        return True
+    status = status_porcelain(str(cwd))
+    return bool(status) and any(
+        not line.startswith("??") for line in status.split("\n")
+    )
+
+
 def get_git_diff(cwd: Path, max_lines: int = 100) -> str:
     """Get current git diff (staged + unstaged)."""
+    if not _has_tracked_changes(cwd):
+        return "[no changes]"
     try:
         result = subprocess.run(
             ["git", "diff", "HEAD", "--stat"],
@@ -213,27 +222,27 @@ def get_git_diff(cwd: Path, max_lines: int = 100) -> str:
     return "[no changes]"
 
 
+def _cached_beads(query: str) -> list[dict]:
+    """Read beads from the cross-process snapshot (lib/bead_cache.py)."""
+    try:
+        from bead_cache import get_cached_beads
+
+        return get_cached_beads(query)
+    except Exception:
+        return []
+
+
 def get_beads_summary(max_items: int = 5) -> str:
     """Get summary of open beads."""
-    try:
-        result = subprocess.run(
-            ["bd", "list", "--status=open"],
-            capture_output=True,
-            text=True,
-            timeout=5,
-            env={"BEADS_DIR": str(Path.home() / ".beads"), **subprocess.os.environ},
-        )
-        if result.returncode == 0 and result.stdout.strip():
-            lines = result.stdout.strip().split("\n")
-            if len(lines) > max_items + 2:  # header + items
-                return (
-                    "\n".join(lines[: max_items + 2])
-                    + f"\n... [{len(lines) - max_items - 2} more]"
-                )
-            return result.stdout.strip()
-    except (subprocess.TimeoutExpired, FileNotFoundError):
-        pass
-    return "[no beads]"
+    beads = _cached_beads("open")
+    if not beads:
+        return "[no beads]"
+    from bead_cache import format_bead_line
+
+    lines = [format_bead_line(b) for b in beads[:max_items]]
+    if len(beads) > max_items:
+        lines.append(f"... [{len(beads) - max_items} more]")
+    return "\n".join(lines)
 
 
 def has_in_progress_bead() -> bool:
@@ -242,43 +251,10 @@ def has_in_progress_bead() -> bool:
     Used for bead-aware routing - if work is already tracked and in progress,
     we can adjust PAL routing recommendations.
 
-    Results are cached for 10 seconds to avoid repeated subprocess calls
-    within the same turn.
+    Served from the shared bead snapshot, which is invalidated by beads DB
+    changes, so repeated calls across hook processes don't spawn bd.
     """
-    global _bead_cache, _bead_cache_time
-    import time
-
-    now = time.time()
-
-    # Check cache (TTL-based)
-    if now - _bead_cache_time < _BEAD_CACHE_TTL and "in_progress" in _bead_cache:
-        return _bead_cache["in_progress"]
-
-    # Cache miss - run subprocess
-    result_value = False
-    try:
-        result = subprocess.run(
-            ["bd", "list", "--status=in_progress"],
-            capture_output=True,
-            text=True,
-            timeout=3,
-            env={"BEADS_DIR": str(Path.home() / ".beads"), **subprocess.os.environ},
-        )
-        if result.returncode == 0 and result.stdout.strip():
-            # Check if there are any non-header lines
-            lines = [
-                line
-                for line in result.stdout.strip().split("\n")
-                if line.strip() and not line.startswith("ID")
-            ]
-            result_value = len(lines) > 0
-    except (subprocess.TimeoutExpired, FileNotFoundError):
-        pass
-
-    # Update cache
-    _bead_cache["in_progress"] = result_value
-    _bead_cache_time = now
-    return result_value
+    return bool(_cached_beads("in_progress"))
 
 
 def get_test_status(cwd: Path) -> str:
@@ -298,6 +274,8 @@ def get_test_status(cwd: Path) -> str:
 
 def get_git_diff_compact(cwd: Path, max_files: int = 10) -> str:
     """Get compact git diff - just modified file names for router context."""
+    if not _has_tracked_changes(cwd):
+        return ""
     try:
         result = subprocess.run(
             ["git", "diff", "HEAD", "--name-only"],
@@ -320,30 +298,15 @@ def get_git_diff_compact(cwd: Path, max_files: int = 10) -> str:
 
 def get_in_progress_beads(max_items: int = 3) -> str:
     """Get in_progress beads - the active task context."""
-    try:
-        result = subprocess.run(
-            ["bd", "list", "--status=in_progress"],
-            capture_output=True,
-            text=True,
-            timeout=5,
-            env={"BEADS_DIR": str(Path.home() / ".beads"), **subprocess.os.environ},
-        )
-        if result.returncode == 0 and result.stdout.strip():
-            lines = result.stdout.strip().split("\n")
-            # Skip header, get task lines
-            tasks = [
-                line for line in lines[1:] if line.strip() and not line.startswith("-")
-            ]
-            if tasks:
-                if len(tasks) > max_items:
-                    return (
-                        "\n".join(tasks[:max_items])
-                        + f"\n(+{len(tasks) - max_items} more)"
-                    )
-                return "\n".join(tasks)
-    except (subprocess.TimeoutExpired, FileNotFoundError):
-        pass
-    return ""
+    beads = _cached_beads("in_progress")
+    if not beads:
+        return ""
+    from bead_cache import format_bead_line
+
+    tasks = [format_bead_line(b) for b in beads[:max_items]]
+    if len(beads) > max_items:
+        return "\n".join(tasks) + f"\n(+{len(beads) - max_items} more)"
+    return "\n".join(tasks)
 
 
 def get_serena_status() -> str:
@@ -446,29 +409,14 @@ def get_bead_goals(max_items: int = 3) -> list[str]:
     Returns:
         List of bead titles for in_progress work.
     """
-    try:
-        result = subprocess.run(
-            ["bd", "list", "--status=in_progress"],
-            capture_output=True,
-            text=True,
-            timeout=10,  # Increased timeout for slower systems
-        )
-        if result.returncode != 0 or not result.stdout.strip():
-            return []
-
-        goals = []
-        for line in result.stdout.strip().split("\n"):
-            # Format: {id} [{priority}] [{type}] {status} [{project:X}]? - {title}
-            # Extract title after " - "
-            if " - " in line:
-                title = line.split(" - ", 1)[1].strip()
-                if title:
-                    goals.append(title[:80])  # Truncate long titles
-                    if len(goals) >= max_items:
-                        break
-        return goals
-    except (subprocess.TimeoutExpired, FileNotFoundError, Exception):
-        return []
+    goals = []
+    for bead in _cached_beads("in_progress"):
+        title = (bead.get("title") or "").strip()
+        if title:
+            goals.append(title[:80])  # Truncate long titles
+            if len(goals) >= max_items:
+                break
+    return goals
 
 
 def get_recent_reducers(max_items: int = 5) -> list[str]:
@@ -571,23 +519,7 @@ def get_test_results() -> str:
 
 def get_open_beads_count() -> int:
     """Get count of open beads for routing context."""
-    try:
-        result = subprocess.run(
-            ["bd", "list", "--status=open"],
-            capture_output=True,
-            text=True,
-            timeout=3,
-            env={"BEADS_DIR": str(Path.home() / ".beads"), **subprocess.os.environ},
-        )
-        if result.returncode == 0 and result.stdout.strip():
-            lines = result.stdout.strip().split("\n")
-            # Count non-header, non-separator lines
-            return len(
-                [ln for ln in lines[1:] if ln.strip() and not ln.startswith("-")]
-            )
-    except (subprocess.TimeoutExpired, FileNotFoundError):
-        pass
-    return 0
+    return len(_cached_beads("open"))
 
 
 def get_project_name(cwd: Path) -> str:
@@ -31,7 +31,7 @@ from .executor_instructions import (
 )
 from .telemetry import log_router_decision, log_escalation
 from .variance import generate_variance_report, format_variance_for_user
-from .router_gpt import build_routing_prompt, load_capabilities_index
+from .router_gpt import build_routing_prompt, capability_count
 
 
 def get_session_id() -> str:
@@ -323,12 +323,12 @@ def generate_pal_suggestion(
 
     # Try capability-aware routing first
     if use_capability_routing:
-        index = load_capabilities_index()
-        if index.get("capabilities"):
+        count = capability_count()
+        if count:
             routing_prompt = build_routing_prompt(prompt, task_type)
             trigger_reason = (
                 f"Groq classified this as a **{task_type}** task. "
-                f"Using intelligent routing with {len(index['capabilities'])} capabilities."
+                f"Using intelligent routing with {count} capabilities."
             )
             result = CAPABILITY_ROUTING_TEMPLATE.format(
                 trigger_reason=trigger_reason,
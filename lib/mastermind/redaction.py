@@ -2,14 +2,31 @@
 
 Redacts secrets and sensitive data before sending to external services.
 Preserves data "shape" for debugging (e.g., "REDACTED_API_KEY_32_CHARS").
+
+Private keys span lines, so they are replaced first, wherever the BEGIN
+marker occurs. Every match of every other pattern starts at a known literal
+(PREFILTERS): the pattern's keyword or prefix, or, for line-anchored
+patterns, the start of a line containing one. The engine looks for those
+literals in the lowercased text, runs a pattern only where its literal
+occurs, and resolves overlaps before rebuilding the string once: the
+leftmost match wins, then the longest, then the pattern listed first in
+PATTERNS. A match that runs past the winner is dropped along with it, so
+overlapping matches never leave part of a secret behind. Text without any
+literal is returned untouched without running a regex.
+
+Where matches overlap, the replacement text can differ from applying each
+pattern in turn (e.g. "OPENAI_API_KEY=sk-..." redacts as env_secret rather
+than api_key); the secret is removed either way, and the list of detected
+types is the same. ops/redaction_bench.py measures throughput.
 """
 
 from __future__ import annotations
 
+import functools
 import re
 from typing import Callable
 
-from .config import get_config
+from .config import SafetyConfig, get_config
 
 # Patterns for sensitive data detection
 PATTERNS: list[tuple[str, re.Pattern[str], Callable[[re.Match[str]], str]]] = [
@@ -87,6 +104,131 @@ PATTERNS: list[tuple[str, re.Pattern[str], Callable[[re.Match[str]], str]]] = [
 ]
 
 
+# Lowercase literals every match of the pattern starts with (private keys
+# are replaced beforehand)
+PREFILTERS: dict[str, tuple[str, ...]] = {
+    "api_key": ("api", "secret_key"),
+    "bearer_token": ("bearer",),
+    "aws_key": ("akia",),
+    "env_secret": ("secret", "password", "token", "key", "credential", "auth"),
+    "database_url": ("postgres", "mysql", "mongodb", "redis"),
+    "github_token": ("ghp_", "github_pat_"),
+    "llm_key": ("sk-",),
+    "groq_key": ("gsk_",),
+    "env_file_mention": (".env",),
+}
+
+# Patterns whose literal may sit anywhere in the line; matches start at ^
+LINE_ANCHORED = frozenset(("env_secret",))
+
+PRIVATE_KEY_INDEX = next(
+    index for index, (name, _, _) in enumerate(PATTERNS) if name == "private_key"
+)
+
+API_KEY_PATTERNS = frozenset(
+    ("api_key", "bearer_token", "llm_key", "groq_key", "github_token", "aws_key")
+)
+
+# Key names whose values redact_dict() masks outright
+SENSITIVE_KEY_PARTS = (
+    "secret",
+    "password",
+    "token",
+    "key",
+    "credential",
+    "auth",
+    "api_key",
+)
+
+
+def enabled_patterns(safety: SafetyConfig) -> frozenset[str]:
+    """Pattern names allowed by the SafetyConfig toggles."""
+    if not safety.redact_secrets:
+        return frozenset()
+    names = {name for name, _, _ in PATTERNS}
+    if not safety.redact_env_vars:
+        names.discard("env_secret")
+    if not safety.redact_api_keys:
+        names -= API_KEY_PATTERNS
+    return frozenset(names)
+
+
+@functools.lru_cache(maxsize=16)
+def _literal_table(names: frozenset[str]) -> tuple[tuple[str, tuple[int, ...]], ...]:
+    """(literal, PATTERNS indexes starting there) for the enabled patterns."""
+    table: dict[str, list[int]] = {}
+    for index, (name, _, _) in enumerate(PATTERNS):
+        if name in names:
+            for literal in PREFILTERS[name]:
+                table.setdefault(literal, []).append(index)
+    return tuple((literal, tuple(indexes)) for literal, indexes in table.items())
+
+
+def _find_spans(text: str, names: frozenset[str]) -> list[tuple[int, int, re.Match]]:
+    """Candidate matches as (start, PATTERNS index, match), unresolved."""
+    lowered = text.lower()
+    if len(lowered) != len(text):
+        # Case mapping changed offsets (rare non-ASCII): scan each pattern
+        return [
+            (m.start(), index, m)
+            for index, (name, pattern, _) in enumerate(PATTERNS)
+            if name in names
+            for m in pattern.finditer(text)
+        ]
+
+    spans = []
+    tried: set[tuple[int, int]] = set()
+    for literal, indexes in _literal_table(names):
+        pos = lowered.find(literal)
+        while pos >= 0:
+            for index in indexes:
+                name, pattern, _ = PATTERNS[index]
+                start = text.rfind("\n", 0, pos) + 1 if name in LINE_ANCHORED else pos
+                if (start, index) not in tried:
+                    tried.add((start, index))
+                    match = pattern.match(text, start)
+                    if match:
+                        spans.append((start, index, match))
+            pos = lowered.find(literal, pos + 1)
+    return spans
+
+
+def _redact(text: str, enabled: frozenset[str]) -> tuple[str, list[str]]:
+    """Redact text using the enabled pattern names."""
+    if not enabled or not text:
+        return text, []
+    found: set[str] = set()
+    if "private_key" in enabled and "-----BEGIN " in text:
+        _, pattern, replacer = PATTERNS[PRIVATE_KEY_INDEX]
+        text, count = pattern.subn(replacer, text)
+        if count:
+            found.add("private_key")
+    spans = _find_spans(text, enabled - {"private_key"})
+    if not spans:
+        return text, _in_order(found)
+
+    spans.sort(key=lambda span: (span[0], -span[2].end(), span[1]))
+    pieces: list[str] = []
+    last = 0
+    for start, index, match in spans:
+        name, _, replacer = PATTERNS[index]
+        found.add(name)
+        if start < last:
+            # Overlaps a span already redacted; drop any part running past it
+            last = max(last, match.end())
+            continue
+        pieces.append(text[last:start])
+        pieces.append(replacer(match))
+        last = match.end()
+    pieces.append(text[last:])
+    return "".join(pieces), _in_order(found)
+
+
+def _in_order(names: set[str]) -> list[str]:
+    """Pattern names in PATTERNS order."""
+    return [name for name, _, _ in PATTERNS if name in names]
+
+
 def redact_text(text: str) -> tuple[str, list[str]]:
     """Redact sensitive data from text.
 
@@ -96,39 +238,7 @@ def redact_text(text: str) -> tuple[str, list[str]]:
     Returns:
         (redacted_text, list of redaction types applied)
     """
-    config = get_config()
-
-    if not config.safety.redact_secrets:
-        return text, []
-
-    redacted = text
-    applied: list[str] = []
-
-    for name, pattern, replacer in PATTERNS:
-        # Skip certain pattern types based on config
-        if name == "env_secret" and not config.safety.redact_env_vars:
-            continue
-        if (
-            name
-            in (
-                "api_key",
-                "bearer_token",
-                "llm_key",
-                "groq_key",
-                "github_token",
-                "aws_key",
-            )
-            and not config.safety.redact_api_keys
-        ):
-            continue
-
-        matches = pattern.findall(text)
-        if matches:
-            redacted = pattern.sub(replacer, redacted)
-            if name not in applied:
-                applied.append(name)
-
-    return redacted, applied
+    return _redact(text, enabled_patterns(get_config().safety))
 
 
 def redact_dict(data: dict, depth: int = 0, max_depth: int = 10) -> dict:
@@ -142,6 +252,12 @@ def redact_dict(data: dict, depth: int = 0, max_depth: int = 10) -> dict:
     Returns:
         Dictionary with sensitive values redacted
     """
+    return _redact_dict(data, depth, max_depth, enabled_patterns(get_config().safety))
+
+
+def _redact_dict(
+    data: dict, depth: int, max_depth: int, enabled: frozenset[str]
+) -> dict:
     if depth > max_depth:
         return data
 
@@ -150,31 +266,20 @@ def redact_dict(data: dict, depth: int = 0, max_depth: int = 10) -> dict:
         key_lower = key.lower()
 
         # Check if key name suggests sensitive data
-        if any(
-            s in key_lower
-            for s in (
-                "secret",
-                "password",
-                "token",
-                "key",
-                "credential",
-                "auth",
-                "api_key",
-            )
-        ):
+        if any(s in key_lower for s in SENSITIVE_KEY_PARTS):
             if isinstance(value, str):
                 result[key] = f"REDACTED_{len(value)}chars"
             else:
                 result[key] = "REDACTED"
         elif isinstance(value, str):
-            result[key], _ = redact_text(value)
+            result[key], _ = _redact(value, enabled)
         elif isinstance(value, dict):
-            result[key] = redact_dict(value, depth + 1, max_depth)
+            result[key] = _redact_dict(value, depth + 1, max_depth, enabled)
         elif isinstance(value, list):
             result[key] = [
-                redact_dict(v, depth + 1, max_depth)
+                _redact_dict(v, depth + 1, max_depth, enabled)
                 if isinstance(v, dict)
-                else (redact_text(v)[0] if isinstance(v, str) else v)
+                else (_redact(v, enabled)[0] if isinstance(v, str) else v)
                 for v in value
             ]
         else:
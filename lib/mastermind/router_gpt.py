@@ -31,6 +31,8 @@ except ImportError:
     get_current_phase = lambda: 1  # noqa: E731
     is_critical = lambda: False  # noqa: E731
 
+from capability_index import CompiledIndex, load_compiled, render_compact_index
+
 # Paths
 CAPABILITIES_DIR = Path.home() / ".claude" / "capabilities"
 INDEX_PATH = CAPABILITIES_DIR / "capabilities_index.json"
@@ -38,6 +40,7 @@ INDEX_PATH = CAPABILITIES_DIR / "capabilities_index.json"
 # Lazy-loading cache
 _capabilities_cache: dict[str, Any] | None = None
 _capabilities_mtime: float = 0.0
+_compiled_cache: CompiledIndex | None = None
 
 # GPT routing system prompt
 ROUTING_SYSTEM_PROMPT = """You are a capability router for a Claude Code framework.
@@ -168,38 +171,62 @@ def load_capabilities_index(force_reload: bool = False) -> dict[str, Any]:
     return _capabilities_cache
 
 
+def load_compiled_capabilities() -> CompiledIndex | None:
+    """Load the compiled capabilities index (see capability_index).
+
+    Same phase behavior as load_capabilities_index(): no file I/O at
+    CRITICAL, and a previously loaded index is preferred at SIGNALS.
+
+    Returns:
+        CompiledIndex, or None if no index is available
+    """
+    global _compiled_cache
+
+    if PHASE_GATE_AVAILABLE and is_critical():
+        return _compiled_cache
+
+    if PHASE_GATE_AVAILABLE and get_current_phase() >= 3:
+        if _compiled_cache is not None:
+            return _compiled_cache
+
+    _compiled_cache = load_compiled(INDEX_PATH, cached=_compiled_cache)
+    return _compiled_cache
+
+
 def clear_capabilities_cache() -> None:
     """Clear the capabilities index cache (for testing/reset)."""
-    global _capabilities_cache, _capabilities_mtime
+    global _capabilities_cache, _capabilities_mtime, _compiled_cache
     _capabilities_cache = None
     _capabilities_mtime = 0.0
+    _compiled_cache = None
+
+
+def capability_count() -> int:
+    """Number of capabilities in the index (0 if unavailable)."""
+    compiled = load_compiled_capabilities()
+    return len(compiled) if compiled else 0
+
+
+def query_capabilities(
+    tags: list[str] | None = None,
+    stages: list[str] | None = None,
+    risk: dict[str, bool] | None = None,
+) -> list[str]:
+    """IDs of capabilities carrying all tags, covering all stages, and
+    matching the given risk flags (e.g. {"writes_repo": False})."""
+    compiled = load_compiled_capabilities()
+    if not compiled:
+        return []
+    return compiled.query(tags=tags or (), stages=stages or (), risk=risk)
 
 
 def build_compact_index(index: dict[str, Any], max_capabilities: int = 100) -> str:
     """Build a compact version of the index for the prompt.
 
-    Only includes essential fields to save tokens.
+    Only includes essential fields to save tokens. build_routing_prompt()
+    uses the copy pre-rendered in the compiled index instead.
     """
-    capabilities = index.get("capabilities", [])[:max_capabilities]
-
-    compact = []
-    for cap in capabilities:
-        compact.append(
-            {
-                "id": cap.get("id"),
-                "type": cap.get("type"),
-                "name": cap.get("name"),
-                "summary": cap.get("summary", "")[:100],
-                "stages": cap.get("stages", []),
-                "tags": cap.get("tags", [])[:5],
-                "risk": {
-                    "writes_repo": cap.get("risk", {}).get("writes_repo", False),
-                    "network": cap.get("risk", {}).get("network", False),
-                },
-            }
-        )
-
-    return json.dumps(compact, separators=(",", ":"))
+    return render_compact_index(index.get("capabilities", []), max_capabilities)
 
 
 def build_routing_prompt(task: str, task_type: str = "general") -> str:
@@ -212,12 +239,17 @@ def build_routing_prompt(task: str, task_type: str = "general") -> str:
     Returns:
         Complete prompt string to send to PAL MCP chat
     """
-    index = load_capabilities_index()
-    compact_index = build_compact_index(index)
+    compiled = load_compiled_capabilities()
+    if compiled:
+        version, compact_index = compiled.version, compiled.compact_index
+    else:
+        index = load_capabilities_index()
+        version = index.get("inventory_version", "unknown")
+        compact_index = build_compact_index(index)
 
     prompt = f"""{ROUTING_SYSTEM_PROMPT}
 
-## Available Capabilities (version: {index.get("inventory_version", "unknown")})
+## Available Capabilities (version: {version})
 {compact_index}
 
 ## Task Classification
@@ -364,11 +396,8 @@ def format_toolchain_injection(recommendation: ToolchainRecommendation) -> str:
 
 def get_capability_by_id(capability_id: str) -> dict[str, Any] | None:
     """Look up a capability by ID from the index."""
-    index = load_capabilities_index()
-    for cap in index.get("capabilities", []):
-        if cap.get("id") == capability_id:
-            return cap
-    return None
+    compiled = load_compiled_capabilities()
+    return compiled.get(capability_id) if compiled else None
 
 
 def validate_toolchain(recommendation: ToolchainRecommendation) -> list[str]:
@@ -377,8 +406,8 @@ def validate_toolchain(recommendation: ToolchainRecommendation) -> list[str]:
     Returns list of validation errors (empty if valid).
     """
     errors = []
-    index = load_capabilities_index()
-    valid_ids = {cap.get("id") for cap in index.get("capabilities", [])}
+    compiled = load_compiled_capabilities()
+    valid_ids = compiled if compiled is not None else ()
 
     for step in recommendation.steps:
         if step.capability_id not in valid_ids:
@@ -2,15 +2,35 @@
 
 Logs structured events to JSONL per session.
 Events: router_decision, planner_called, escalation_triggered, etc.
+
+Events are buffered in-process and flushed once at interpreter exit (or
+every BUFFER_MAX_EVENTS events), so a hook that logs several events costs
+one append per session file rather than an open() per event.
+
+Storage (TELEMETRY_DIR):
+- <session>.jsonl: raw events. Moved to archive/ once it reaches
+  ROTATE_MAX_BYTES or its first event is ROTATE_MAX_AGE_HOURS old;
+  prune_telemetry() deletes raw files idle for RAW_RETENTION_DAYS.
+- rollup/<YYYY-MM-DD>.json: per-day (UTC) aggregates - event counts, router
+  classifications, signal correlations, confidence sums, circuit breaker
+  fires and PAL continuation events - folded in as each flush lands.
+
+Fleet-wide reports (no session_id) read only the rollups. Per-session
+reports replay that session's raw events through the same aggregation.
 """
 
 from __future__ import annotations
 
+import atexit
 import json
+import os
 import time
+from contextlib import contextmanager
 from dataclasses import dataclass, asdict
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterable, Iterator
+
+from _atomic_io import locked, write_json_atomic
 
 from .config import get_config
 
@@ -21,6 +41,14 @@ TELEMETRY_DIR = Path.home() / ".claude" / "tmp" / "mastermind_telemetry"
 CONTINUATION_GRADE_A_THRESHOLD = 80  # 80%+ reuse = Grade A
 CONTINUATION_GRADE_B_THRESHOLD = 50  # 50%+ reuse = Grade B, else C
 
+# Buffering, rotation and retention
+BUFFER_MAX_EVENTS = 100  # Flush early if a long-lived process logs this many
+ROTATE_MAX_BYTES = 2 * 1024 * 1024
+ROTATE_MAX_AGE_HOURS = 24
+RAW_RETENTION_DAYS = 30  # Rollups are kept; raw events are not
+
+ROUTER_CLASSES = ("trivial", "medium", "complex")
+
 
 @dataclass
 class TelemetryEvent:
@@ -39,13 +67,20 @@ def get_telemetry_path(session_id: str) -> Path:
     return TELEMETRY_DIR / f"{session_id}.jsonl"
 
 
+# Buffered events by destination file (resolved at log time)
+_buffer: dict[Path, list[dict[str, Any]]] = {}
+_buffered_count = 0
+_flush_registered = False
+
+
 def log_event(
     event_type: str,
     session_id: str,
     turn: int,
     data: dict[str, Any],
 ) -> None:
-    """Log a telemetry event to session JSONL file."""
+    """Buffer a telemetry event for the session JSONL file."""
+    global _buffered_count, _flush_registered
     config = get_config()
 
     if not config.telemetry.enabled:
@@ -59,9 +94,301 @@ def log_event(
         data=data,
     )
 
-    path = get_telemetry_path(session_id)
-    with open(path, "a") as f:
-        f.write(json.dumps(asdict(event)) + "\n")
+    _buffer.setdefault(get_telemetry_path(session_id), []).append(asdict(event))
+    _buffered_count += 1
+    if not _flush_registered:
+        atexit.register(flush)
+        _flush_registered = True
+    if _buffered_count >= BUFFER_MAX_EVENTS:
+        flush()
+
+
+# =============================================================================
+# FLUSH, ROTATION AND ROLLUPS
+# =============================================================================
+
+
+@contextmanager
+def _locked(directory: Path) -> Iterator[None]:
+    """Exclusive lock over a telemetry directory's files and rollups."""
+    with locked(directory / ".lock"):
+        yield
+
+
+def flush() -> None:
+    """Write buffered events and fold them into the daily rollups.
+
+    Registered with atexit by the first log_event(). Errors are swallowed:
+    telemetry must never fail a hook.
+    """
+    global _buffered_count
+    pending = dict(_buffer)
+    _buffer.clear()
+    _buffered_count = 0
+
+    by_dir: dict[Path, dict[Path, list[dict[str, Any]]]] = {}
+    for path, events in pending.items():
+        by_dir.setdefault(path.parent, {})[path] = events
+
+    for directory, files in by_dir.items():
+        try:
+            with _locked(directory):
+                if not (directory / "rollup").exists():
+                    _rebuild_rollups(directory)  # Backfill before appending
+                written: list[dict[str, Any]] = []
+                for path, events in files.items():
+                    _rotate_if_needed(path)
+                    with open(path, "a") as f:
+                        f.write("".join(json.dumps(e) + "\n" for e in events))
+                    written.extend(events)
+                _update_rollups(directory, written)
+        except OSError:
+            continue
+
+
+def _first_timestamp(path: Path) -> float | None:
+    try:
+        with open(path) as f:
+            return float(json.loads(f.readline())["timestamp"])
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def _rotate_if_needed(path: Path) -> None:
+    """Move a session file to archive/ if it is too large or too old."""
+    try:
+        size = path.stat().st_size
+    except OSError:
+        return
+    if size < ROTATE_MAX_BYTES:
+        first = _first_timestamp(path)
+        if first is None or time.time() - first < ROTATE_MAX_AGE_HOURS * 3600:
+            return
+    archive = path.parent / "archive"
+    archive.mkdir(exist_ok=True)
+    os.replace(path, archive / f"{path.stem}.{int(time.time() * 1000)}.jsonl")
+
+
+def _session_files(path: Path) -> list[Path]:
+    """A session's rotated segments (oldest first) followed by its live file."""
+    archive = path.parent / "archive"
+    segments = sorted(archive.glob(f"{path.stem}.*.jsonl")) if archive.exists() else []
+    return segments + [path]
+
+
+def _read_events(path: Path) -> Iterator[dict[str, Any]]:
+    try:
+        with open(path) as f:
+            for line in f:
+                if line.strip():
+                    try:
+                        yield json.loads(line)
+                    except json.JSONDecodeError:
+                        continue  # Torn write from a killed process
+    except OSError:
+        return
+
+
+def _day(timestamp: float) -> str:
+    return time.strftime("%Y-%m-%d", time.gmtime(timestamp))
+
+
+def _empty_rollup() -> dict[str, Any]:
+    return {
+        "events": {},
+        "sessions": [],
+        "router": {
+            "count": 0,
+            "classifications": {},
+            "signals": {
+                cls: {"stuck_loop": 0, "has_errors": 0, "low_confidence": 0}
+                for cls in ROUTER_CLASSES
+            },
+            "confidence": {cls: {"sum": 0.0, "count": 0} for cls in ROUTER_CLASSES},
+        },
+        "circuit_breaker": {
+            "count": 0,
+            "by_breaker": {},
+            "by_action": {"block": 0, "warn": 0, "bypass": 0},
+            "tools_blocked": {},
+        },
+        "pal_continuation": {
+            "count": 0,
+            "by_event": {"captured": 0, "reused": 0, "wasted": 0},
+            "by_tool": {},
+        },
+    }
+
+
+def _fold(rollup: dict[str, Any], event: dict[str, Any]) -> None:
+    """Add one raw event to a rollup."""
+    event_type = event.get("event_type", "unknown")
+    data = event.get("data") or {}
+    rollup["events"][event_type] = rollup["events"].get(event_type, 0) + 1
+    session_id = event.get("session_id")
+    if session_id and session_id not in rollup["sessions"]:
+        rollup["sessions"].append(session_id)
+
+    if event_type == "router_decision":
+        router = rollup["router"]
+        router["count"] += 1
+        cls = data.get("classification", "unknown")
+        router["classifications"][cls] = router["classifications"].get(cls, 0) + 1
+        if cls not in router["signals"]:
+            return
+        signals = data.get("context_signals", {})
+        if signals.get("stuck_loop"):
+            router["signals"][cls]["stuck_loop"] += 1
+        if signals.get("has_errors"):
+            router["signals"][cls]["has_errors"] += 1
+        if signals.get("agent_confidence", 100) < 70:
+            router["signals"][cls]["low_confidence"] += 1
+        router["confidence"][cls]["sum"] += data.get("confidence", 0)
+        router["confidence"][cls]["count"] += 1
+
+    elif event_type == "circuit_breaker":
+        cb = rollup["circuit_breaker"]
+        cb["count"] += 1
+        breaker = data.get("breaker_name", "unknown")
+        action = data.get("action", "unknown")
+        tool = data.get("tool_blocked", "")
+        counts = cb["by_breaker"].setdefault(
+            breaker, {"block": 0, "warn": 0, "bypass": 0}
+        )
+        counts[action] = counts.get(action, 0) + 1
+        cb["by_action"][action] = cb["by_action"].get(action, 0) + 1
+        if tool:
+            cb["tools_blocked"][tool] = cb["tools_blocked"].get(tool, 0) + 1
+
+    elif event_type == "pal_continuation":
+        pal = rollup["pal_continuation"]
+        pal["count"] += 1
+        kind = data.get("event", "unknown")
+        tool_type = data.get("tool_type", "unknown")
+        pal["by_event"][kind] = pal["by_event"].get(kind, 0) + 1
+        counts = pal["by_tool"].setdefault(
+            tool_type, {"captured": 0, "reused": 0, "wasted": 0}
+        )
+        counts[kind] = counts.get(kind, 0) + 1
+
+
+def _merge(into: dict[str, Any], other: dict[str, Any]) -> None:
+    """Add other's counts into into (nested dicts of numbers)."""
+    for key, value in other.items():
+        if isinstance(value, dict):
+            _merge(into.setdefault(key, {}), value)
+        elif isinstance(value, list):
+            seen = into.setdefault(key, [])
+            seen.extend(v for v in value if v not in seen)
+        else:
+            into[key] = into.get(key, 0) + value
+
+
+def _aggregate(events: Iterable[dict[str, Any]]) -> dict[str, Any]:
+    rollup = _empty_rollup()
+    for event in events:
+        _fold(rollup, event)
+    return rollup
+
+
+def _rollup_path(directory: Path, day: str) -> Path:
+    return directory / "rollup" / f"{day}.json"
+
+
+def _load_rollup(path: Path) -> dict[str, Any]:
+    try:
+        data = json.loads(path.read_text())
+        if isinstance(data, dict):
+            return data
+    except (OSError, ValueError):
+        pass
+    return _empty_rollup()
+
+
+def _save_rollup(path: Path, rollup: dict[str, Any]) -> None:
+    write_json_atomic(path, rollup, separators=(",", ":"))
+
+
+def _update_rollups(directory: Path, events: list[dict[str, Any]]) -> None:
+    """Fold events into their days' rollup files (caller holds the lock)."""
+    by_day: dict[str, list[dict[str, Any]]] = {}
+    for event in events:
+        by_day.setdefault(_day(event.get("timestamp", 0)), []).append(event)
+    (directory / "rollup").mkdir(exist_ok=True)
+    for day, day_events in by_day.items():
+        path = _rollup_path(directory, day)
+        rollup = _load_rollup(path)
+        for event in day_events:
+            _fold(rollup, event)
+        _save_rollup(path, rollup)
+
+
+def _raw_files(directory: Path) -> list[Path]:
+    files = list(directory.glob("*.jsonl"))
+    archive = directory / "archive"
+    if archive.exists():
+        files.extend(archive.glob("*.jsonl"))
+    return files
+
+
+def _rebuild_rollups(directory: Path) -> None:
+    """Build rollups from every raw file on disk (caller holds the lock)."""
+    by_day: dict[str, dict[str, Any]] = {}
+    for path in _raw_files(directory):
+        for event in _read_events(path):
+            day = _day(event.get("timestamp", 0))
+            _fold(by_day.setdefault(day, _empty_rollup()), event)
+    (directory / "rollup").mkdir(exist_ok=True)
+    for day, rollup in by_day.items():
+        _save_rollup(_rollup_path(directory, day), rollup)
+
+
+def load_rollups(days: int | None = None) -> dict[str, Any]:
+    """Merged daily rollups for the last `days` days (all days if None).
+
+    Flushes this process's buffer first. A telemetry directory that predates
+    rollups is backfilled from its raw events on first use.
+    """
+    flush()
+    merged = _empty_rollup()
+    if not TELEMETRY_DIR.exists():
+        return merged
+    rollup_dir = TELEMETRY_DIR / "rollup"
+    if not rollup_dir.exists():
+        try:
+            with _locked(TELEMETRY_DIR):
+                if not rollup_dir.exists():
+                    _rebuild_rollups(TELEMETRY_DIR)
+        except OSError:
+            return merged
+    oldest = _day(time.time() - (days - 1) * 86400) if days else ""
+    for path in rollup_dir.glob("*.json"):
+        if path.stem >= oldest:
+            _merge(merged, _load_rollup(path))
+    return merged
+
+
+def prune_telemetry(max_age_days: float = RAW_RETENTION_DAYS) -> int:
+    """Delete raw event files idle for max_age_days (rollups are kept).
+
+    Returns:
+        Number of files deleted
+    """
+    if not TELEMETRY_DIR.exists():
+        return 0
+    cutoff = time.time() - max_age_days * 86400
+    deleted = 0
+    with _locked(TELEMETRY_DIR):
+        if not (TELEMETRY_DIR / "rollup").exists():
+            _rebuild_rollups(TELEMETRY_DIR)  # Don't lose what isn't rolled up
+        for path in _raw_files(TELEMETRY_DIR):
+            try:
+                if path.stat().st_mtime < cutoff:
+                    path.unlink()
+                    deleted += 1
+            except OSError:
+                continue
+    return deleted
 
 
 def log_router_decision(
@@ -161,20 +488,15 @@ def log_escalation(
 
 
 def read_session_telemetry(session_id: str) -> list[TelemetryEvent]:
-    """Read all telemetry events for a session."""
+    """Read all telemetry events for a session (rotated segments included)."""
+    flush()
     path = get_telemetry_path(session_id)
 
-    if not path.exists():
-        return []
-
-    events = []
-    with open(path) as f:
-        for line in f:
-            if line.strip():
-                data = json.loads(line)
-                events.append(TelemetryEvent(**data))
-
-    return events
+    return [
+        TelemetryEvent(**data)
+        for segment in _session_files(path)
+        for data in _read_events(segment)
+    ]
 
 
 def get_session_summary(session_id: str) -> dict[str, Any]:
@@ -264,11 +586,13 @@ def log_threshold_update(
     )
 
 
-def get_routing_analysis(session_id: str | None = None) -> dict[str, Any]:
+def get_routing_analysis(
+    session_id: str | None = None, days: int | None = None
+) -> dict[str, Any]:
     """Analyze Groq routing decisions for threshold tuning (v4.26).
 
-    If session_id provided, analyzes that session.
-    Otherwise, analyzes all sessions in telemetry directory.
+    If session_id provided, analyzes that session's raw events.
+    Otherwise, analyzes the daily rollups (the last `days` days, or all).
 
     Returns:
         Analysis of routing patterns including:
@@ -278,61 +602,26 @@ def get_routing_analysis(session_id: str | None = None) -> dict[str, Any]:
         - suggested_adjustments: threshold tuning recommendations
     """
     if session_id:
-        events = read_session_telemetry(session_id)
+        rollup = _aggregate(asdict(e) for e in read_session_telemetry(session_id))
     else:
-        # Aggregate across all sessions
-        events = []
-        for path in TELEMETRY_DIR.glob("*.jsonl"):
-            events.extend(read_session_telemetry(path.stem))
-
-    router_events = [e for e in events if e.event_type == "router_decision"]
+        rollup = load_rollups(days)
+    router = rollup["router"]
 
-    if not router_events:
+    if not router["count"]:
         return {"error": "No routing decisions found", "event_count": 0}
 
-    # Classification distribution
-    classification_counts: dict[str, int] = {}
-    for e in router_events:
-        cls = e.data.get("classification", "unknown")
-        classification_counts[cls] = classification_counts.get(cls, 0) + 1
-
-    # Context signal correlation
-    signal_by_classification: dict[str, dict[str, int]] = {
-        "trivial": {"stuck_loop": 0, "has_errors": 0, "low_confidence": 0},
-        "medium": {"stuck_loop": 0, "has_errors": 0, "low_confidence": 0},
-        "complex": {"stuck_loop": 0, "has_errors": 0, "low_confidence": 0},
-    }
-
-    confidence_accuracy: dict[str, list[float]] = {
-        "trivial": [],
-        "medium": [],
-        "complex": [],
-    }
-
-    for e in router_events:
-        cls = e.data.get("classification", "unknown")
-        if cls not in signal_by_classification:
-            continue
-
-        signals = e.data.get("context_signals", {})
-        if signals.get("stuck_loop"):
-            signal_by_classification[cls]["stuck_loop"] += 1
-        if signals.get("has_errors"):
-            signal_by_classification[cls]["has_errors"] += 1
-        if signals.get("agent_confidence", 100) < 70:
-            signal_by_classification[cls]["low_confidence"] += 1
-
-        confidence_accuracy[cls].append(e.data.get("confidence", 0))
+    classification_counts: dict[str, int] = router["classifications"]
+    signal_by_classification: dict[str, dict[str, int]] = router["signals"]
 
     # Calculate average confidence per classification
     avg_confidence = {}
-    for cls, confidences in confidence_accuracy.items():
-        if confidences:
-            avg_confidence[cls] = sum(confidences) / len(confidences)
+    for cls, confidence in router["confidence"].items():
+        if confidence["count"]:
+            avg_confidence[cls] = confidence["sum"] / confidence["count"]
 
     # Generate suggestions
     suggestions = []
-    total = len(router_events)
+    total = router["count"]
 
     # Check if stuck_loop correlates with classification
     if signal_by_classification.get("trivial", {}).get("stuck_loop", 0) > 0:
@@ -354,7 +643,7 @@ def get_routing_analysis(session_id: str | None = None) -> dict[str, Any]:
         )
 
     return {
-        "event_count": len(router_events),
+        "event_count": total,
         "classification_distribution": classification_counts,
         "context_signal_correlation": signal_by_classification,
         "average_confidence_by_class": avg_confidence,
@@ -491,9 +780,14 @@ def log_circuit_breaker_fire(
     )
 
 
-def get_circuit_breaker_stats(session_id: str | None = None) -> dict[str, Any]:
+def get_circuit_breaker_stats(
+    session_id: str | None = None, days: int | None = None
+) -> dict[str, Any]:
     """Get circuit breaker effectiveness statistics.
 
+    Reads the session's raw events if session_id is given, else the daily
+    rollups (the last `days` days, or all).
+
     Returns breakdown of:
     - Fire counts by breaker type
     - Block vs warn vs bypass ratios
@@ -501,34 +795,17 @@ def get_circuit_breaker_stats(session_id: str | None = None) -> dict[str, Any]:
     - Suggestions for threshold tuning
     """
     if session_id:
-        events = read_session_telemetry(session_id)
+        rollup = _aggregate(asdict(e) for e in read_session_telemetry(session_id))
     else:
-        events = []
-        for path in TELEMETRY_DIR.glob("*.jsonl"):
-            events.extend(read_session_telemetry(path.stem))
+        rollup = load_rollups(days)
+    cb = rollup["circuit_breaker"]
 
-    cb_events = [e for e in events if e.event_type == "circuit_breaker"]
-
-    if not cb_events:
+    if not cb["count"]:
         return {"total_events": 0, "message": "No circuit breaker events found"}
 
-    by_breaker: dict[str, dict[str, int]] = {}
-    by_action: dict[str, int] = {"block": 0, "warn": 0, "bypass": 0}
-    tools_blocked: dict[str, int] = {}
-
-    for e in cb_events:
-        breaker = e.data.get("breaker_name", "unknown")
-        action = e.data.get("action", "unknown")
-        tool = e.data.get("tool_blocked", "")
-
-        if breaker not in by_breaker:
-            by_breaker[breaker] = {"block": 0, "warn": 0, "bypass": 0}
-        by_breaker[breaker][action] = by_breaker[breaker].get(action, 0) + 1
-
-        by_action[action] = by_action.get(action, 0) + 1
-
-        if tool:
-            tools_blocked[tool] = tools_blocked.get(tool, 0) + 1
+    by_breaker: dict[str, dict[str, int]] = cb["by_breaker"]
+    by_action: dict[str, int] = cb["by_action"]
+    tools_blocked: dict[str, int] = cb["tools_blocked"]
 
     # Effectiveness score: blocks / (blocks + bypasses)
     total_enforcement = by_action["block"] + by_action["bypass"]
@@ -549,7 +826,7 @@ def get_circuit_breaker_stats(session_id: str | None = None) -> dict[str, Any]:
             )
 
     return {
-        "total_events": len(cb_events),
+        "total_events": cb["count"],
         "by_breaker": by_breaker,
         "by_action": by_action,
         "tools_blocked": tools_blocked,
@@ -558,37 +835,35 @@ def get_circuit_breaker_stats(session_id: str | None = None) -> dict[str, Any]:
     }
 
 
-def get_continuation_reuse_stats(session_id: str) -> dict[str, Any]:
-    """Get continuation_id reuse statistics for a session.
+def get_continuation_reuse_stats(
+    session_id: str | None = None, days: int | None = None
+) -> dict[str, Any]:
+    """Get continuation_id reuse statistics.
+
+    For one session's raw events if session_id is given, else across all
+    sessions from the daily rollups (the last `days` days, or all).
 
     Returns:
         Dict with reuse_rate, waste_count, capture_count, by_tool breakdown
     """
-    events = read_session_telemetry(session_id)
-    cont_events = [e for e in events if e.event_type == "pal_continuation"]
+    if session_id:
+        rollup = _aggregate(asdict(e) for e in read_session_telemetry(session_id))
+    else:
+        rollup = load_rollups(days)
+    pal = rollup["pal_continuation"]
 
-    if not cont_events:
+    if not pal["count"]:
         return {"session_id": session_id, "total_events": 0}
 
-    by_event = {"captured": 0, "reused": 0, "wasted": 0}
-    by_tool: dict[str, dict[str, int]] = {}
-
-    for e in cont_events:
-        event_type = e.data.get("event", "unknown")
-        tool_type = e.data.get("tool_type", "unknown")
-
-        by_event[event_type] = by_event.get(event_type, 0) + 1
-
-        if tool_type not in by_tool:
-            by_tool[tool_type] = {"captured": 0, "reused": 0, "wasted": 0}
-        by_tool[tool_type][event_type] = by_tool[tool_type].get(event_type, 0) + 1
+    by_event: dict[str, int] = pal["by_event"]
+    by_tool: dict[str, dict[str, int]] = pal["by_tool"]
 
     total_calls = by_event["reused"] + by_event["wasted"]
     reuse_rate = by_event["reused"] / total_calls * 100 if total_calls > 0 else 0
 
-    return {
+    stats = {
         "session_id": session_id,
-        "total_events": len(cont_events),
+        "total_events": pal["count"],
         "by_event": by_event,
         "by_tool": by_tool,
         "reuse_rate_pct": round(reuse_rate, 1),
@@ -599,3 +874,6 @@ def get_continuation_reuse_stats(session_id: str) -> dict[str, Any]:
         if reuse_rate >= CONTINUATION_GRADE_B_THRESHOLD
         else "C",
     }
+    if not session_id:
+        stats["session_count"] = len(rollup["sessions"])
+    return stats
@@ -17,7 +17,8 @@ Project Types:
 
 Design Principles:
 - Zero human declaration required
-- Fast detection (<10ms)
+- Fast detection (<10ms); results cached on disk per cwd and shared by all
+  runners and ops scripts (~/.claude/tmp/project_detect/)
 - Stable IDs across sessions
 - Graceful fallback chain
 """
@@ -26,12 +27,14 @@ import os
 import re
 import json
 import hashlib
-import subprocess
 import time
 from pathlib import Path
 from dataclasses import dataclass, asdict
 from typing import Optional
 
+import git_probe
+from _atomic_io import write_json_atomic
+
 # =============================================================================
 # SESSION-SCOPED CACHES (Performance optimization)
 # Git operations are expensive (~50-100ms each). Cache for session lifetime.
@@ -66,11 +69,10 @@ class ProjectContext:
 # =============================================================================
 
 
-# SUDO SECURITY: Adding caching to existing subprocess calls - no new security surface
 def get_git_root() -> Optional[str]:
     """Get git repository root path.
 
-    Cached per working directory - eliminates ~50ms subprocess overhead.
+    Read from .git via git_probe (no subprocess); cached per working directory.
     """
     global _GIT_ROOT_CACHE, _GIT_ROOT_CACHE_CWD
 
@@ -78,31 +80,17 @@ def get_git_root() -> Optional[str]:
     if _GIT_ROOT_CACHE_CWD == cwd and _GIT_ROOT_CACHE is not None:
         return _GIT_ROOT_CACHE if _GIT_ROOT_CACHE else None
 
-    try:
-        result = subprocess.run(
-            ["git", "rev-parse", "--show-toplevel"],
-            capture_output=True,
-            text=True,
-            timeout=2,
-            cwd=cwd,
-        )
-        if result.returncode == 0:
-            _GIT_ROOT_CACHE = result.stdout.strip()
-            _GIT_ROOT_CACHE_CWD = cwd
-            return _GIT_ROOT_CACHE
-    except (subprocess.TimeoutExpired, FileNotFoundError, OSError):
-        pass
-
     # Cache negative result too
-    _GIT_ROOT_CACHE = ""
+    _GIT_ROOT_CACHE = git_probe.repo_root(cwd) or ""
     _GIT_ROOT_CACHE_CWD = cwd
-    return None
+    return _GIT_ROOT_CACHE or None
 
 
 def get_git_remote() -> Optional[str]:
     """Get git remote origin URL.
 
-    Cached per working directory - eliminates ~50ms subprocess overhead.
+    Read from .git/config via git_probe (no subprocess); cached per working
+    directory.
     """
     global _GIT_REMOTE_CACHE, _GIT_REMOTE_CACHE_CWD
 
@@ -110,25 +98,10 @@ def get_git_remote() -> Optional[str]:
     if _GIT_REMOTE_CACHE_CWD == cwd and _GIT_REMOTE_CACHE is not None:
         return _GIT_REMOTE_CACHE if _GIT_REMOTE_CACHE else None
 
-    try:
-        result = subprocess.run(
-            ["git", "remote", "get-url", "origin"],
-            capture_output=True,
-            text=True,
-            timeout=2,
-            cwd=cwd,
-        )
-        if result.returncode == 0:
-            _GIT_REMOTE_CACHE = result.stdout.strip()
-            _GIT_REMOTE_CACHE_CWD = cwd
-            return _GIT_REMOTE_CACHE
-    except (subprocess.TimeoutExpired, FileNotFoundError, OSError):
-        pass
-
     # Cache negative result too
-    _GIT_REMOTE_CACHE = ""
+    _GIT_REMOTE_CACHE = git_probe.remote_url(cwd) or ""
     _GIT_REMOTE_CACHE_CWD = cwd
-    return None
+    return _GIT_REMOTE_CACHE or None
 
 
 def extract_repo_name(remote_url: str) -> str:
@@ -342,6 +315,7 @@ def _detect_from_git(git_root: str, git_remote: str) -> ProjectContext:
         name = Path(git_root).name
         detection_method = "git_dirname"
 
+    language = detect_language(git_root)
     return ProjectContext(
         project_id=generate_project_id(name, git_remote, git_root),
         project_name=name,
@@ -349,8 +323,8 @@ def _detect_from_git(git_root: str, git_remote: str) -> ProjectContext:
         root_path=git_root,
         detection_method=detection_method,
         git_remote=git_remote,
-        language=detect_language(git_root),
-        framework=detect_framework(git_root, detect_language(git_root)),
+        language=language,
+        framework=detect_framework(git_root, language),
     )
 
 
@@ -411,36 +385,126 @@ def _cache_and_return(result: ProjectContext, cwd: str) -> ProjectContext:
     return result
 
 
-def detect_project() -> ProjectContext:
-    """Detect current project context.
+# =============================================================================
+# PERSISTENT DETECTION CACHE (shared by all hook and ops processes)
+# =============================================================================
 
-    Returns ProjectContext with detected information.
-    Detection takes <10ms in typical cases (cached after first call).
+DETECTION_CACHE_DIR = Path(__file__).resolve().parent.parent / "tmp" / "project_detect"
+_DETECTION_CACHE_VERSION = 1
+
+# Safety net for changes the fingerprint can't see (e.g. files two levels deep
+# shifting the language counts)
+_DETECTION_MAX_AGE = 3600.0
+
+# Files read by detection besides the git metadata
+_FINGERPRINT_FILES = tuple(f[0] for f in _PROJECT_FILES) + ("requirements.txt",)
+
+
+def _detection_fingerprint(cwd: str) -> list[str]:
+    """Stats of everything detect_project() reads for this cwd.
+
+    Covers .git/HEAD and the repo config (remote), the project files and the
+    root and src/ directory mtimes (files added or removed at the top level).
     """
-    cwd = os.getcwd()
+    repo = git_probe.find_repo(cwd)
+    root = repo.root if repo else cwd
+    paths = [root, os.path.join(root, "src")]
+    if repo:
+        paths.append(os.path.join(repo.git_dir, "HEAD"))
+        paths.append(os.path.join(repo.common_dir, "config"))
+    paths.extend(os.path.join(root, name) for name in _FINGERPRINT_FILES)
+
+    fingerprint = []
+    for path in paths:
+        try:
+            st = os.stat(path)
+            fingerprint.append(f"{path}:{st.st_mtime_ns}:{st.st_size}")
+        except OSError:
+            fingerprint.append(f"{path}:-")
+    return fingerprint
 
-    # Return cached result if cwd hasn't changed
-    if _PROJECT_CACHE_CWD == cwd and _PROJECT_CACHE is not None:
-        return _PROJECT_CACHE
 
+def _detection_cache_path(cwd: str) -> Path:
+    return DETECTION_CACHE_DIR / f"{hashlib.sha256(cwd.encode()).hexdigest()[:16]}.json"
+
+
+def _load_detection(cwd: str, fingerprint: list[str]) -> Optional[ProjectContext]:
+    """Cached detection for cwd if still valid."""
+    try:
+        with open(_detection_cache_path(cwd)) as f:
+            data = json.load(f)
+        if (
+            data.get("version") != _DETECTION_CACHE_VERSION
+            or data.get("cwd") != cwd
+            or data.get("fingerprint") != fingerprint
+            or time.time() - data.get("detected_at", 0) > _DETECTION_MAX_AGE
+        ):
+            return None
+        return ProjectContext(**data["context"])
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def _store_detection(cwd: str, fingerprint: list[str], ctx: ProjectContext) -> None:
+    """Persist detection (atomic tmp + rename, best effort)."""
+    path = _detection_cache_path(cwd)
+    data = {
+        "version": _DETECTION_CACHE_VERSION,
+        "cwd": cwd,
+        "fingerprint": fingerprint,
+        "detected_at": time.time(),
+        "context": asdict(ctx),
+    }
+    try:
+        write_json_atomic(path, data)
+    except OSError:
+        pass
+
+
+def _detect_uncached(cwd: str) -> ProjectContext:
+    """Run the detection chain: git, project file, code files, ephemeral."""
     # Try git detection first (most reliable)
     git_root = get_git_root()
     if git_root:
         git_remote = get_git_remote() or ""
-        return _cache_and_return(_detect_from_git(git_root, git_remote), cwd)
+        return _detect_from_git(git_root, git_remote)
 
     # Try project file detection
     result = _detect_from_project_file(cwd)
     if result:
-        return _cache_and_return(result, cwd)
+        return result
 
     # Try code file detection
     result = _detect_from_code_files(cwd)
     if result:
-        return _cache_and_return(result, cwd)
+        return result
 
     # Fallback to ephemeral
-    return _cache_and_return(_make_ephemeral_context(cwd), cwd)
+    return _make_ephemeral_context(cwd)
+
+
+def detect_project() -> ProjectContext:
+    """Detect current project context.
+
+    Returns ProjectContext with detected information.
+    Cached in-process per cwd and on disk across processes; the disk entry
+    is reused while .git/HEAD, the repo config and project files are
+    unchanged (a stat check, well under 1ms).
+    """
+    cwd = os.getcwd()
+
+    # Return cached result if cwd hasn't changed
+    if _PROJECT_CACHE_CWD == cwd and _PROJECT_CACHE is not None:
+        return _PROJECT_CACHE
+
+    fingerprint = _detection_fingerprint(cwd)
+    cached = _load_detection(cwd, fingerprint)
+    if cached is not None:
+        return _cache_and_return(cached, cwd)
+
+    result = _detect_uncached(cwd)
+    _store_detection(cwd, fingerprint, result)
+    return _cache_and_return(result, cwd)
 
 
 def get_project_memory_dir(project_id: str) -> Path:
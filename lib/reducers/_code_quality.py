@@ -5,6 +5,8 @@ import re
 from dataclasses import dataclass, field
 from typing import TYPE_CHECKING
 
+from ast_cache import get_facts, parse
+
 from ._base import ConfidenceReducer, IMPACT_BEHAVIORAL
 
 if TYPE_CHECKING:
@@ -290,8 +292,6 @@ class DeepNestingReducer(ConfidenceReducer):
     def should_trigger(
         self, context: dict, state: "SessionState", last_trigger_turn: int
     ) -> bool:
-        import ast
-
         if state.turn_count - last_trigger_turn < self.get_effective_cooldown(state):
             return False
         content = context.get("new_string", "") or context.get("content", "")
@@ -300,11 +300,8 @@ class DeepNestingReducer(ConfidenceReducer):
             return False
         if context.get("tool_name", "") not in ("Write", "Edit"):
             return False
-        try:
-            tree = ast.parse(content)
-            return self._get_max_depth(tree) > self.max_depth
-        except SyntaxError:
-            return False
+        tree = parse(content)
+        return tree is not None and self._get_max_depth(tree) > self.max_depth
 
 
 @dataclass
@@ -324,8 +321,6 @@ class LongFunctionReducer(ConfidenceReducer):
     def should_trigger(
         self, context: dict, state: "SessionState", last_trigger_turn: int
     ) -> bool:
-        import ast
-
         if state.turn_count - last_trigger_turn < self.get_effective_cooldown(state):
             return False
         content = context.get("new_string", "") or context.get("content", "")
@@ -334,17 +329,10 @@ class LongFunctionReducer(ConfidenceReducer):
             return False
         if context.get("tool_name", "") not in ("Write", "Edit"):
             return False
-        try:
-            tree = ast.parse(content)
-            for node in ast.walk(tree):
-                if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
-                    if hasattr(node, "end_lineno") and node.end_lineno:
-                        func_lines = node.end_lineno - node.lineno + 1
-                        if func_lines > self.max_lines:
-                            return True
-            return False
-        except SyntaxError:
-            return False
+        return any(
+            end and end - start + 1 > self.max_lines
+            for _, start, end in get_facts(content)["functions"]
+        )
 
 
 @dataclass
@@ -363,8 +351,6 @@ class MutableDefaultArgReducer(ConfidenceReducer):
     def should_trigger(
         self, context: dict, state: "SessionState", last_trigger_turn: int
     ) -> bool:
-        import ast
-
         if state.turn_count - last_trigger_turn < self.get_effective_cooldown(state):
             return False
         content = context.get("new_string", "") or context.get("content", "")
@@ -373,17 +359,12 @@ class MutableDefaultArgReducer(ConfidenceReducer):
             return False
         if context.get("tool_name", "") not in ("Write", "Edit"):
             return False
-        try:
-            tree = ast.parse(content)
-            mutable_types = (ast.List, ast.Dict, ast.Set)
-            for node in ast.walk(tree):
-                if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
-                    for default in node.args.defaults + node.args.kw_defaults:
-                        if isinstance(default, mutable_types):
-                            return True
-            return False
-        except SyntaxError:
-            return False
+        # Literal defaults only; list()/dict()/set() calls are left to the gate
+        literal_types = ("[]", "{}", "set literal")
+        return any(
+            kind in literal_types
+            for _, _, kind in get_facts(content)["mutable_defaults"]
+        )
 
 
 @dataclass
@@ -402,8 +383,6 @@ class ImportStarReducer(ConfidenceReducer):
     def should_trigger(
         self, context: dict, state: "SessionState", last_trigger_turn: int
     ) -> bool:
-        import ast
-
         if state.turn_count - last_trigger_turn < self.get_effective_cooldown(state):
             return False
         content = context.get("new_string", "") or context.get("content", "")
@@ -412,15 +391,7 @@ class ImportStarReducer(ConfidenceReducer):
             return False
         if context.get("tool_name", "") not in ("Write", "Edit"):
             return False
-        try:
-            tree = ast.parse(content)
-            for node in ast.walk(tree):
-                if isinstance(node, ast.ImportFrom):
-                    if node.names and node.names[0].name == "*":
-                        return True
-            return False
-        except SyntaxError:
-            return False
+        return bool(get_facts(content)["star_imports"])
 
 
 @dataclass
@@ -449,18 +420,17 @@ class BareRaiseReducer(ConfidenceReducer):
             return False
         if context.get("tool_name", "") not in ("Write", "Edit"):
             return False
-        try:
-            tree = ast.parse(content)
-            # Find bare raises not inside except handlers
-            for node in ast.walk(tree):
-                if isinstance(node, ast.Raise) and node.exc is None:
-                    # Check if inside an except handler by walking parents
-                    # Simple heuristic: check if any ExceptHandler contains this raise
-                    # This is imperfect but catches most cases
-                    return True  # Conservative: flag for review
-            return False
-        except SyntaxError:
+        tree = parse(content)
+        if tree is None:
             return False
+        # Find bare raises not inside except handlers
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Raise) and node.exc is None:
+                # Check if inside an except handler by walking parents
+                # Simple heuristic: check if any ExceptHandler contains this raise
+                # This is imperfect but catches most cases
+                return True  # Conservative: flag for review
+        return False
 
 
 @dataclass
@@ -680,45 +650,42 @@ class MagicNumbersReducer(ConfidenceReducer):
         # Pattern for SCREAMING_SNAKE_CASE constant names
         constant_pattern = re.compile(r"^[A-Z][A-Z0-9_]*$")
 
-        try:
-            tree = ast.parse(new_content)
+        tree = parse(new_content)
+        if tree is None:
+            return False
+
+        # First, collect all constant definition targets
+        constant_assignments = set()
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Assign):
+                for target in node.targets:
+                    if isinstance(target, ast.Name) and constant_pattern.match(
+                        target.id
+                    ):
+                        # This is a constant definition - mark its value location
+                        if hasattr(node.value, "lineno"):
+                            constant_assignments.add(
+                                (node.value.lineno, node.value.col_offset)
+                            )
 
-            # First, collect all constant definition targets
-            constant_assignments = set()
-            for node in ast.walk(tree):
-                if isinstance(node, ast.Assign):
-                    for target in node.targets:
-                        if isinstance(target, ast.Name) and constant_pattern.match(
-                            target.id
-                        ):
-                            # This is a constant definition - mark its value location
-                            if hasattr(node.value, "lineno"):
-                                constant_assignments.add(
-                                    (node.value.lineno, node.value.col_offset)
-                                )
-
-            for node in ast.walk(tree):
-                # Look for numeric literals
-                if isinstance(node, ast.Constant) and isinstance(
-                    node.value, (int, float)
-                ):
-                    val = node.value
-                    # Skip small/common numbers
-                    if val in self.allowed_numbers:
-                        continue
-                    # Skip numbers <= 100 (too many false positives)
-                    if isinstance(val, int) and abs(val) <= 100:
-                        continue
-                    if isinstance(val, float) and abs(val) <= 100:
-                        continue
-                    # Skip if this is a constant definition (SCREAMING_SNAKE_CASE = value)
-                    if (node.lineno, node.col_offset) in constant_assignments:
-                        continue
-                    # Found a magic number
-                    return True
-            return False
-        except SyntaxError:
-            return False
+        for node in ast.walk(tree):
+            # Look for numeric literals
+            if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)):
+                val = node.value
+                # Skip small/common numbers
+                if val in self.allowed_numbers:
+                    continue
+                # Skip numbers <= 100 (too many false positives)
+                if isinstance(val, int) and abs(val) <= 100:
+                    continue
+                if isinstance(val, float) and abs(val) <= 100:
+                    continue
+                # Skip if this is a constant definition (SCREAMING_SNAKE_CASE = value)
+                if (node.lineno, node.col_offset) in constant_assignments:
+                    continue
+                # Found a magic number
+                return True
+        return False
 
 
 @dataclass
@@ -757,52 +724,51 @@ class EmptyTestReducer(ConfidenceReducer):
         ):
             return False
 
-        try:
-            tree = ast.parse(new_content)
-            for node in ast.walk(tree):
-                if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
-                    # Check if it's a test function
-                    if not node.name.startswith("test_"):
-                        continue
+        tree = parse(new_content)
+        if tree is None:
+            return False
+        for node in ast.walk(tree):
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                # Check if it's a test function
+                if not node.name.startswith("test_"):
+                    continue
 
-                    # Check function body for assertions
-                    has_assertion = False
-                    for child in ast.walk(node):
-                        # assert statement
-                        if isinstance(child, ast.Assert):
-                            has_assertion = True
-                            break
-                        # pytest.raises or similar context managers
-                        if isinstance(child, ast.With):
-                            has_assertion = (
-                                True  # Assume with blocks in tests are assertions
-                            )
-                            break
-                        # Method calls that look like assertions
-                        if isinstance(child, ast.Call):
-                            if isinstance(child.func, ast.Attribute):
-                                if child.func.attr.startswith(
-                                    ("assert", "expect", "should")
-                                ):
-                                    has_assertion = True
-                                    break
-
-                    if not has_assertion:
-                        # Check if it's just a pass or docstring
-                        body = node.body
-                        if len(body) == 1:
-                            if isinstance(body[0], ast.Pass):
-                                return True
-                            if isinstance(body[0], ast.Expr) and isinstance(
-                                body[0].value, ast.Constant
+                # Check function body for assertions
+                has_assertion = False
+                for child in ast.walk(node):
+                    # assert statement
+                    if isinstance(child, ast.Assert):
+                        has_assertion = True
+                        break
+                    # pytest.raises or similar context managers
+                    if isinstance(child, ast.With):
+                        has_assertion = (
+                            True  # Assume with blocks in tests are assertions
+                        )
+                        break
+                    # Method calls that look like assertions
+                    if isinstance(child, ast.Call):
+                        if isinstance(child.func, ast.Attribute):
+                            if child.func.attr.startswith(
+                                ("assert", "expect", "should")
                             ):
-                                return True  # Just a docstring
-                        elif len(body) == 0:
+                                has_assertion = True
+                                break
+
+                if not has_assertion:
+                    # Check if it's just a pass or docstring
+                    body = node.body
+                    if len(body) == 1:
+                        if isinstance(body[0], ast.Pass):
                             return True
+                        if isinstance(body[0], ast.Expr) and isinstance(
+                            body[0].value, ast.Constant
+                        ):
+                            return True  # Just a docstring
+                    elif len(body) == 0:
+                        return True
 
-            return False
-        except SyntaxError:
-            return False
+        return False
 
 
 @dataclass
@@ -0,0 +1,235 @@
+"""
+Scan Pipeline: Shared parallel, cached multi-file scanning for ops tools.
+
+audit.py, void.py and gaps.py each looped over files one at a time and
+re-ran every check (including a subprocess per external linter per file)
+on every invocation. This module gives them one pipeline:
+
+- Per-file results are cached keyed on path + content hash + a version
+  string that covers the checker and the external tool, so re-scanning a
+  mostly unchanged tree only does work for the files that changed.
+- In-process checks fan out over a process pool.
+- External linters run once per tool over all cache-missing files
+  (ruff and bandit accept many paths) via a batch callable.
+- Every scan reports throughput (files/sec) and cache hits.
+
+Storage: ~/.claude/tmp/scan_cache/<name>.json
+
+Usage:
+    from scan_pipeline import scan_files, tool_fingerprint
+
+    results, stats = scan_files(paths, name="void", version="1", worker=hunt)
+    results, stats = scan_files(
+        paths, name="ruff", version=tool_fingerprint("ruff"), batch=run_ruff
+    )
+    print(stats.summary())
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Iterable
+
+from _atomic_io import write_json_atomic
+
+CACHE_DIR = Path(__file__).resolve().parent.parent / "tmp" / "scan_cache"
+
+# Entries kept per cache file (least recently stored are dropped first)
+MAX_ENTRIES = 20000
+
+# Below this many cache misses a process pool costs more than it saves
+PARALLEL_MIN_FILES = 16
+
+
+@dataclass
+class ScanStats:
+    """Counters for one scan."""
+
+    files: int = 0
+    cached: int = 0
+    scanned: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def files_per_sec(self) -> float:
+        return self.files / self.elapsed if self.elapsed > 0 else float(self.files)
+
+    def summary(self) -> str:
+        return (
+            f"{self.files} file(s) in {self.elapsed * 1000:.0f}ms "
+            f"({self.files_per_sec:.0f} files/sec, {self.cached} cached, "
+            f"{self.scanned} scanned)"
+        )
+
+
+def file_digest(path: str) -> str | None:
+    """sha256 of a file's bytes (None if unreadable)."""
+    try:
+        with open(path, "rb") as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except OSError:
+        return None
+
+
+def tool_fingerprint(executable: str) -> str | None:
+    """Cheap version key for an external tool (resolved path + mtime + size).
+
+    Avoids spawning `<tool> --version`; an upgrade replaces the binary and
+    so changes the key. Returns None when the tool is not installed.
+    """
+    found = shutil.which(executable)
+    if not found:
+        return None
+    real = os.path.realpath(found)
+    try:
+        st = os.stat(real)
+    except OSError:
+        return None
+    return f"{real}:{st.st_mtime_ns}:{st.st_size}"
+
+
+def module_version(name: str) -> str | None:
+    """Installed distribution version of a Python package (None if absent)."""
+    from importlib import metadata
+
+    try:
+        return metadata.version(name)
+    except metadata.PackageNotFoundError:
+        return None
+
+
+class ScanCache:
+    """Per-file result cache for one scanner (path + content hash + version)."""
+
+    def __init__(self, name: str, version: str, cache_dir: Path | None = None):
+        self.path = (cache_dir or CACHE_DIR) / f"{name}.json"
+        self.version = version
+        # abs path -> {"sha": str, "result": Any}
+        self.entries: dict[str, dict[str, Any]] = {}
+        self._dirty = False
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+            if data.get("version") == version:
+                self.entries = data.get("entries", {})
+        except (OSError, ValueError, AttributeError):
+            pass
+
+    def get(self, path: str, sha: str | None) -> tuple[bool, Any]:
+        """Return (hit, result)."""
+        entry = self.entries.get(path)
+        if sha is None or entry is None or entry.get("sha") != sha:
+            return False, None
+        return True, entry["result"]
+
+    def put(self, path: str, sha: str | None, result: Any) -> None:
+        if sha is None:
+            return
+        self.entries.pop(path, None)
+        self.entries[path] = {"sha": sha, "result": result}
+        self._dirty = True
+
+    def save(self) -> None:
+        """Persist if changed (atomic tmp + rename, best effort)."""
+        if not self._dirty:
+            return
+        while len(self.entries) > MAX_ENTRIES:
+            self.entries.pop(next(iter(self.entries)))
+        data = {"version": self.version, "entries": self.entries}
+        try:
+            write_json_atomic(self.path, data, separators=(",", ":"))
+            self._dirty = False
+        except (OSError, TypeError, ValueError):
+            pass
+
+
+def _run_workers(
+    worker: Callable[[str], Any], paths: list[str], parallel: bool
+) -> list[Any]:
+    workers = min(os.cpu_count() or 1, 8)
+    if not parallel or workers < 2 or len(paths) < PARALLEL_MIN_FILES:
+        return [worker(p) for p in paths]
+    from concurrent.futures import ProcessPoolExecutor
+
+    chunksize = max(1, len(paths) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(worker, paths, chunksize=chunksize))
+
+
+def scan_files(
+    paths: Iterable[str],
+    *,
+    name: str,
+    version: str,
+    worker: Callable[[str], Any] | None = None,
+    batch: Callable[[list[str]], dict[str, Any]] | None = None,
+    parallel: bool = True,
+    use_cache: bool = True,
+    cache_dir: Path | None = None,
+) -> tuple[dict[str, Any], ScanStats]:
+    """Scan files, reusing cached results for unchanged content.
+
+    Exactly one of worker/batch is used for cache misses.
+
+    Args:
+        paths: Files to scan
+        name: Cache namespace (one per scanner/tool)
+        version: Checker + tool version; a change invalidates the cache
+        worker: Top-level (picklable) fn(path) -> JSON-serializable result,
+            run over a process pool for large batches
+        batch: fn(paths) -> {path: result} for tools that take many paths in
+            one invocation; paths it omits are treated as having no result.
+            Returning None (tool failed) yields None results, not cached
+        parallel: Allow the process pool
+        use_cache: Read and write the on-disk cache
+        cache_dir: Override cache location (tests)
+
+    Returns:
+        ({abs_path: result}, ScanStats)
+    """
+    if (worker is None) == (batch is None):
+        raise ValueError("scan_files needs exactly one of worker or batch")
+
+    start = time.perf_counter()
+    files = list(dict.fromkeys(os.path.abspath(p) for p in paths))
+    cache = ScanCache(name, version, cache_dir) if use_cache else None
+    results: dict[str, Any] = {}
+    digests: dict[str, str | None] = {}
+    misses: list[str] = []
+
+    for path in files:
+        digests[path] = sha = file_digest(path)
+        hit, result = cache.get(path, sha) if cache else (False, None)
+        if hit:
+            results[path] = result
+        else:
+            misses.append(path)
+
+    if misses:
+        cacheable = True
+        if batch is not None:
+            produced = batch(misses)
+            cacheable = produced is not None
+            fresh = [(produced or {}).get(p) for p in misses]
+        else:
+            fresh = _run_workers(worker, misses, parallel)
+        for path, result in zip(misses, fresh):
+            results[path] = result
+            if cache is not None and cacheable:
+                cache.put(path, digests[path], result)
+        if cache is not None:
+            cache.save()
+
+    stats = ScanStats(
+        files=len(files),
+        cached=len(files) - len(misses),
+        scanned=len(misses),
+        elapsed=time.perf_counter() - start,
+    )
+    return results, stats
@@ -9,15 +9,29 @@ Implements tiered state management:
 
 Uses PAL continuation_id as cross-session state store.
 
+Storage (CHECKPOINT_DIR):
+- objects/<sha256>.z: zlib-compressed, content-addressed blobs holding
+  either a full snapshot (base) or a patch against the session's previous
+  checkpoint (delta). Chains restart with a base every DELTA_CHAIN_MAX.
+- index.json: checkpoints by session and time plus the latest pointer, so
+  find_latest_checkpoint() never scans the directory.
+- cp_*.json: legacy full snapshots, still readable.
+
 v1.0: Initial implementation
 v1.1: Add schema version validation and migration infrastructure
+v1.2: Delta-encoded, compressed, indexed checkpoint storage
 """
 
+import hashlib
 import json
 import time
+import zlib
+from contextlib import contextmanager
 from dataclasses import dataclass, field, asdict
 from pathlib import Path
-from typing import Optional, Callable
+from typing import Any, Iterator, Optional, Callable
+
+from _atomic_io import locked, write_atomic, write_json_atomic
 
 # Current schema version - increment when checkpoint format changes
 CURRENT_SCHEMA_VERSION = "1.0"
@@ -29,6 +43,8 @@ _MIGRATIONS: dict[str, tuple[str, Callable[[dict], dict]]] = {}
 # Checkpoint storage constants
 CHECKPOINT_DIR = Path.home() / ".claude/tmp/checkpoints"
 CHECKPOINT_DIR.mkdir(parents=True, exist_ok=True)
+INDEX_VERSION = 1
+DELTA_CHAIN_MAX = 16  # Deltas before a new base (bounds replay cost)
 
 # State retention limits
 MAX_FILES_READ_HISTORY = 50
@@ -345,14 +361,126 @@ def create_checkpoint(
     return checkpoint
 
 
-def save_checkpoint_local(checkpoint: SessionCheckpoint) -> Path:
-    """Save checkpoint to local JSON file."""
-    checkpoint_id = f"cp_{int(time.time())}_{checkpoint.tier1.session_id[:8]}"
-    checkpoint.tier1.checkpoint_id = checkpoint_id
+# =============================================================================
+# DELTA ENCODING
+# =============================================================================
+# Patches are explicit ops so literal values can't be mistaken for them:
+#   {"$set": value}                      replace
+#   {"$dict": {key: patch}, "$del": [k]}  recurse into a dict
+#   {"$list": [drop, appended]}          old[drop:] + appended (sliding windows)
 
-    path = CHECKPOINT_DIR / f"{checkpoint_id}.json"
 
-    data = {
+def diff_values(old: Any, new: Any) -> Optional[dict]:
+    """Patch turning old into new, or None if they are equal."""
+    if old == new:
+        return None
+    if isinstance(old, dict) and isinstance(new, dict):
+        changed = {}
+        for key, value in new.items():
+            if key in old:
+                sub = diff_values(old[key], value)
+                if sub is not None:
+                    changed[key] = sub
+            else:
+                changed[key] = {"$set": value}
+        patch: dict = {"$dict": changed}
+        removed = [key for key in old if key not in new]
+        if removed:
+            patch["$del"] = removed
+        return patch
+    if isinstance(old, list) and isinstance(new, list):
+        # History lists only grow at the end and get trimmed at the front
+        for drop in range(len(old) + 1):
+            kept = len(old) - drop
+            if kept <= len(new) and old[drop:] == new[:kept]:
+                if kept:
+                    return {"$list": [drop, new[kept:]]}
+                break
+    return {"$set": new}
+
+
+def apply_patch(old: Any, patch: dict) -> Any:
+    """Apply a diff_values() patch."""
+    if "$set" in patch:
+        return patch["$set"]
+    if "$list" in patch:
+        drop, appended = patch["$list"]
+        return list(old)[drop:] + appended
+    result = dict(old)
+    for key, sub in patch.get("$dict", {}).items():
+        result[key] = apply_patch(result.get(key), sub)
+    for key in patch.get("$del", []):
+        result.pop(key, None)
+    return result
+
+
+# =============================================================================
+# STORAGE (content-addressed blobs + index)
+# =============================================================================
+
+
+def _index_path() -> Path:
+    return CHECKPOINT_DIR / "index.json"
+
+
+def _objects_dir() -> Path:
+    return CHECKPOINT_DIR / "objects"
+
+
+def _empty_index() -> dict:
+    return {"version": INDEX_VERSION, "checkpoints": [], "latest": None, "sessions": {}}
+
+
+def _load_index() -> dict:
+    try:
+        index = json.loads(_index_path().read_text())
+        if index.get("version") == INDEX_VERSION:
+            return index
+    except (OSError, ValueError, AttributeError):
+        pass
+    return _empty_index()
+
+
+def _save_index(index: dict) -> None:
+    write_json_atomic(_index_path(), index)
+
+
+@contextmanager
+def _index_lock() -> Iterator[None]:
+    """Exclusive lock for index read-modify-write across processes."""
+    with locked(CHECKPOINT_DIR / "index.lock"):
+        yield
+
+
+def _put_blob(payload: Any) -> str:
+    """Store a payload compressed under its content hash (deduplicated)."""
+    raw = json.dumps(payload, sort_keys=True, separators=(",", ":")).encode()
+    digest = hashlib.sha256(raw).hexdigest()
+    path = _objects_dir() / f"{digest}.z"
+    if not path.exists():
+        write_atomic(path, zlib.compress(raw, 6))
+    return digest
+
+
+def _get_blob(digest: str) -> Any:
+    return json.loads(zlib.decompress((_objects_dir() / f"{digest}.z").read_bytes()))
+
+
+def _materialize(entries: dict[str, dict], checkpoint_id: str) -> dict:
+    """Full checkpoint data: the chain's base plus its deltas in order."""
+    chain = []
+    entry = entries[checkpoint_id]
+    while entry["kind"] == "delta":
+        chain.append(entry)
+        entry = entries[entry["parent"]]
+    data = _get_blob(entry["blob"])
+    for delta in reversed(chain):
+        data = apply_patch(data, _get_blob(delta["blob"]))
+    return data
+
+
+def _checkpoint_to_dict(checkpoint: SessionCheckpoint) -> dict:
+    return {
         "version": checkpoint.version,
         "tier1": asdict(checkpoint.tier1),
         "tier2": asdict(checkpoint.tier2) if checkpoint.tier2 else None,
@@ -363,23 +491,77 @@ def save_checkpoint_local(checkpoint: SessionCheckpoint) -> Path:
         "phase_at_checkpoint": checkpoint.phase_at_checkpoint,
     }
 
-    path.write_text(json.dumps(data, indent=2))
-    return path
+
+def save_checkpoint_local(checkpoint: SessionCheckpoint) -> Path:
+    """Save checkpoint as a delta against the session's previous one.
+
+    Starts a new base when the session has no checkpoint yet or its chain
+    reached DELTA_CHAIN_MAX. Returns the path of the stored blob.
+    """
+    session_id = checkpoint.tier1.session_id
+    checkpoint_id = f"cp_{int(time.time())}_{session_id[:8]}"
+
+    with _index_lock():
+        index = _load_index()
+        entries = {e["id"]: e for e in index["checkpoints"]}
+        suffix = 1
+        base_id = checkpoint_id
+        while checkpoint_id in entries:
+            checkpoint_id = f"{base_id}_{suffix}"
+            suffix += 1
+        checkpoint.tier1.checkpoint_id = checkpoint_id
+        data = _checkpoint_to_dict(checkpoint)
+
+        parent_id = index["sessions"].get(session_id)
+        parent = entries.get(parent_id) if parent_id else None
+        entry = {
+            "id": checkpoint_id,
+            "session_id": session_id,
+            "created_at": checkpoint.created_at,
+            "kind": "base",
+            "parent": None,
+            "chain": 0,
+        }
+        if parent and parent["chain"] < DELTA_CHAIN_MAX:
+            try:
+                patch = diff_values(_materialize(entries, parent_id), data)
+                entry.update(kind="delta", parent=parent_id, chain=parent["chain"] + 1)
+                entry["blob"] = _put_blob(patch or {})
+            except (OSError, ValueError, KeyError, zlib.error):
+                pass  # Broken chain: fall back to a base
+        if entry["kind"] == "base":
+            entry["blob"] = _put_blob(data)
+
+        index["checkpoints"].append(entry)
+        index["latest"] = checkpoint_id
+        index["sessions"][session_id] = checkpoint_id
+        _save_index(index)
+
+    return _objects_dir() / f"{entry['blob']}.z"
+
+
+def _read_checkpoint_data(checkpoint_id: str) -> Optional[dict]:
+    """Raw checkpoint dict from the index (or a legacy cp_*.json file)."""
+    entries = {e["id"]: e for e in _load_index()["checkpoints"]}
+    if checkpoint_id in entries:
+        return _materialize(entries, checkpoint_id)
+    path = CHECKPOINT_DIR / f"{checkpoint_id}.json"
+    if not path.exists():
+        return None
+    return json.loads(path.read_text())
 
 
 def load_checkpoint_local(checkpoint_id: str) -> Optional[SessionCheckpoint]:
-    """Load checkpoint from local JSON file with schema validation.
+    """Load checkpoint (replaying base + deltas) with schema validation.
 
     Schema versioning prevents stale state injection:
     - Version mismatch → discard checkpoint (incompatible schema)
     - Age > MAX_CHECKPOINT_AGE_HOURS → discard Tier2/Tier3
     """
-    path = CHECKPOINT_DIR / f"{checkpoint_id}.json"
-    if not path.exists():
-        return None
-
     try:
-        data = json.loads(path.read_text())
+        data = _read_checkpoint_data(checkpoint_id)
+        if data is None:
+            return None
 
         # Schema version validation with migration support
         checkpoint_version = data.get("version", "1.0")
@@ -431,8 +613,18 @@ def load_checkpoint_local(checkpoint_id: str) -> Optional[SessionCheckpoint]:
         return None
 
 
-def find_latest_checkpoint() -> Optional[str]:
-    """Find the most recent checkpoint ID."""
+def find_latest_checkpoint(session_id: Optional[str] = None) -> Optional[str]:
+    """Find the most recent checkpoint ID (optionally for one session).
+
+    Reads the index pointer; only falls back to scanning for legacy
+    cp_*.json files when nothing has been indexed yet.
+    """
+    index = _load_index()
+    if session_id is not None:
+        return index["sessions"].get(session_id)
+    if index["latest"]:
+        return index["latest"]
+
     checkpoints = list(CHECKPOINT_DIR.glob("cp_*.json"))
     if not checkpoints:
         return None
@@ -442,22 +634,80 @@ def find_latest_checkpoint() -> Optional[str]:
     return latest.stem
 
 
+def list_checkpoints(session_id: Optional[str] = None) -> list[dict]:
+    """Index entries (id, session_id, created_at, kind, chain), oldest first."""
+    return [
+        entry
+        for entry in _load_index()["checkpoints"]
+        if session_id is None or entry["session_id"] == session_id
+    ]
+
+
 def cleanup_old_checkpoints(max_age_hours: int = 24, max_count: int = 10) -> int:
-    """Remove old checkpoints to prevent disk bloat."""
-    checkpoints = list(CHECKPOINT_DIR.glob("cp_*.json"))
+    """Remove old checkpoints to prevent disk bloat.
+
+    Works from the index. A kept checkpoint whose chain loses its base is
+    rebased (stored as a full snapshot) first; blobs nothing references any
+    more are then deleted. Legacy cp_*.json files are aged out as before.
+    """
     now = time.time()
     max_age_seconds = max_age_hours * 3600
     removed = 0
 
-    # Sort by age (oldest first)
-    checkpoints.sort(key=lambda p: p.stat().st_mtime)
-
-    for cp in checkpoints:
-        age = now - cp.stat().st_mtime
-        # Remove if too old OR if we have too many
-        if age > max_age_seconds or len(checkpoints) - removed > max_count:
-            cp.unlink()
-            removed += 1
+    with _index_lock():
+        index = _load_index()
+        checkpoints = index["checkpoints"]
+        entries = {e["id"]: e for e in checkpoints}
+        keep_from = max(0, len(checkpoints) - max_count)
+        kept = [
+            e
+            for i, e in enumerate(checkpoints)
+            if i >= keep_from and now - e["created_at"] <= max_age_seconds
+        ]
+        dropped = len(checkpoints) - len(kept)
+
+        if dropped:
+            kept_ids = {e["id"] for e in kept}
+            rebased = {}
+            for entry in kept:
+                parent = entry["parent"]
+                if entry["kind"] == "delta" and parent not in kept_ids:
+                    # Materialize before any ancestor blob can go
+                    rebased[entry["id"]] = _materialize(entries, entry["id"])
+            for entry in kept:
+                if entry["id"] in rebased:
+                    entry.update(
+                        kind="base",
+                        parent=None,
+                        blob=_put_blob(rebased[entry["id"]]),
+                    )
+                elif entry["kind"] == "delta":
+                    entry["chain"] = entries[entry["parent"]]["chain"] + 1
+                if entry["kind"] == "base":
+                    entry["chain"] = 0
+
+            index["checkpoints"] = kept
+            index["sessions"] = {
+                sid: cid for sid, cid in index["sessions"].items() if cid in kept_ids
+            }
+            if index["latest"] not in kept_ids:
+                index["latest"] = kept[-1]["id"] if kept else None
+            _save_index(index)
+
+            live = {e["blob"] for e in kept}
+            for blob in _objects_dir().glob("*.z"):
+                if blob.stem not in live:
+                    blob.unlink(missing_ok=True)
+            removed += dropped
+
+    # Legacy full snapshots from before the index
+    for cp in CHECKPOINT_DIR.glob("cp_*.json"):
+        try:
+            if now - cp.stat().st_mtime > max_age_seconds:
+                cp.unlink()
+                removed += 1
+        except OSError:
+            pass
 
     return removed
 
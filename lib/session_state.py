@@ -148,6 +148,7 @@ from _session_batch import (
     add_pending_integration_grep,
     clear_integration_grep,
     get_pending_integration_greps,
+    resolve_integration_callers,
     check_integration_blindness,
 )
 
@@ -267,6 +268,7 @@ __all__ = [
     "add_pending_integration_grep",
     "clear_integration_grep",
     "get_pending_integration_greps",
+    "resolve_integration_callers",
     "check_integration_blindness",
     # Workflow
     "NUDGE_COOLDOWNS",
@@ -0,0 +1,590 @@
+"""
+Symbol Index: Persistent, incremental per-project Python symbol index.
+
+xray (and anything else that needs "where is X defined / called") used to
+os.walk the tree and ast.parse every file on each query. This module keeps
+one index per project root recording, per file, its classes, functions,
+decorators, imports and call sites with line spans.
+
+Files are keyed by relative path and validated by (mtime_ns, size); when
+those change the content hash decides whether a re-parse is needed, so
+touch/checkout churn does not trigger work. Only changed files are parsed
+on refresh - the first build fans out over a process pool.
+
+Single-file updates (hooks, after every Edit/Write) never rewrite the index:
+they append the file's new entry to a per-root journal, which loading
+replays on top of the index and the next refresh() folds back in.
+
+Storage: ~/.claude/tmp/symbol_index/<root_hash>.json (+ .jsonl journal)
+
+Usage:
+    from symbol_index import get_index
+
+    index = get_index("/path/to/project")      # loaded + refreshed
+    for hit in index.query("function", r"^load_"):
+        print(hit["filepath"], hit["lineno"])
+"""
+
+from __future__ import annotations
+
+import ast
+import hashlib
+import json
+import os
+import re
+import time
+from pathlib import Path
+from typing import Any, Iterator
+
+from _atomic_io import locked, write_atomic, write_json_atomic
+
+CACHE_DIR = Path(__file__).resolve().parent.parent / "tmp" / "symbol_index"
+
+# Bump when symbol records change shape
+INDEX_VERSION = 1
+
+# Directories never indexed
+SKIP_DIRS = frozenset({".git", "__pycache__", "node_modules", ".venv", "venv"})
+
+# Below this many changed files a process pool costs more than it saves
+PARALLEL_MIN_FILES = 32
+
+# Query types (xray --type values) -> symbol record types
+TYPE_FILTERS: dict[str, tuple[str, ...]] = {
+    "def": ("function",),
+    "function": ("function",),
+    "class": ("class",),
+    "import": ("import", "import_from"),
+    "call": ("call",),
+    "decorator": ("function", "class"),
+    "all": ("function", "class", "import", "import_from", "call"),
+}
+
+
+# =============================================================================
+# EXTRACTION
+# =============================================================================
+
+
+def _dotted(node: ast.expr) -> str:
+    """Name.attr rendering used for decorators and bases (xray format)."""
+    if isinstance(node, ast.Attribute):
+        return (
+            f"{node.value.id}.{node.attr}" if hasattr(node.value, "id") else node.attr
+        )
+    return node.id if isinstance(node, ast.Name) else ""
+
+
+def _decorator_names(node: ast.AST) -> list[str]:
+    names = []
+    for dec in node.decorator_list:
+        if isinstance(dec, ast.Call) and isinstance(dec.func, ast.Name):
+            names.append(dec.func.id)
+        elif isinstance(dec, (ast.Name, ast.Attribute)):
+            names.append(_dotted(dec))
+    return names
+
+
+def _doc_line(node: ast.AST) -> str | None:
+    doc = ast.get_docstring(node)
+    return doc.strip().split("\n")[0] if doc else None
+
+
+class _SymbolExtractor(ast.NodeVisitor):
+    """Collect symbol records in source (pre-order) traversal order."""
+
+    def __init__(self) -> None:
+        self.symbols: list[dict[str, Any]] = []
+        self._scope: list[str] = []
+
+    def _qualname(self, name: str) -> str:
+        return ".".join([*self._scope, name])
+
+    def visit_FunctionDef(self, node: ast.FunctionDef | ast.AsyncFunctionDef):
+        args = [arg.arg for arg in node.args.args]
+        if node.args.vararg:
+            args.append(f"*{node.args.vararg.arg}")
+        if node.args.kwarg:
+            args.append(f"**{node.args.kwarg.arg}")
+        self.symbols.append(
+            {
+                "type": "function",
+                "name": node.name,
+                "qualname": self._qualname(node.name),
+                "args": args,
+                "decorators": _decorator_names(node),
+                "lineno": node.lineno,
+                "end_lineno": getattr(node, "end_lineno", node.lineno),
+                "docstring": _doc_line(node),
+            }
+        )
+        self._scope.append(node.name)
+        self.generic_visit(node)
+        self._scope.pop()
+
+    visit_AsyncFunctionDef = visit_FunctionDef
+
+    def visit_ClassDef(self, node: ast.ClassDef):
+        self.symbols.append(
+            {
+                "type": "class",
+                "name": node.name,
+                "qualname": self._qualname(node.name),
+                "bases": [
+                    _dotted(b)
+                    for b in node.bases
+                    if isinstance(b, (ast.Name, ast.Attribute))
+                ],
+                "decorators": _decorator_names(node),
+                "lineno": node.lineno,
+                "end_lineno": getattr(node, "end_lineno", node.lineno),
+                "docstring": _doc_line(node),
+            }
+        )
+        self._scope.append(node.name)
+        self.generic_visit(node)
+        self._scope.pop()
+
+    def visit_Import(self, node: ast.Import):
+        for alias in node.names:
+            self.symbols.append(
+                {
+                    "type": "import",
+                    "name": alias.name,
+                    "alias": alias.asname,
+                    "lineno": node.lineno,
+                }
+            )
+
+    def visit_ImportFrom(self, node: ast.ImportFrom):
+        for alias in node.names:
+            self.symbols.append(
+                {
+                    "type": "import_from",
+                    "module": node.module or "",
+                    "name": alias.name,
+                    "alias": alias.asname,
+                    "lineno": node.lineno,
+                }
+            )
+
+    def visit_Call(self, node: ast.Call):
+        func = node.func
+        name = None
+        if isinstance(func, ast.Name):
+            name = func.id
+        elif isinstance(func, ast.Attribute):
+            if isinstance(func.value, ast.Name):
+                name = f"{func.value.id}.{func.attr}"
+            else:
+                name = func.attr
+        if name:
+            self.symbols.append(
+                {
+                    "type": "call",
+                    "name": name,
+                    "lineno": node.lineno,
+                    "caller": ".".join(self._scope) or None,
+                }
+            )
+        self.generic_visit(node)
+
+
+def extract_symbols(source: str, filename: str = "<unknown>") -> list[dict[str, Any]]:
+    """Symbol records for one source file (empty on syntax error)."""
+    try:
+        tree = ast.parse(source, filename=filename)
+    except (SyntaxError, ValueError):
+        return []
+    extractor = _SymbolExtractor()
+    extractor.visit(tree)
+    return extractor.symbols
+
+
+def _index_file(path: str) -> tuple[str, list[dict[str, Any]]] | None:
+    """Read, hash and extract one file (process-pool worker)."""
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except OSError:
+        return None
+    sha = hashlib.sha256(data).hexdigest()
+    return sha, extract_symbols(data.decode("utf-8", "replace"), path)
+
+
+# =============================================================================
+# INDEX
+# =============================================================================
+
+
+class SymbolIndex:
+    """Symbol index for one project root."""
+
+    def __init__(
+        self, root: str | Path, cache_dir: Path | None = None, load: bool = True
+    ) -> None:
+        self.root = Path(root).resolve()
+        key = hashlib.sha256(str(self.root).encode()).hexdigest()[:16]
+        self.path = (cache_dir or CACHE_DIR) / f"{key}.json"
+        self.journal_path = self.path.with_suffix(".jsonl")
+        self._lock_path = self.path.with_suffix(".lock")
+        # relpath -> {"mtime_ns", "size", "sha", "symbols"}
+        self.files: dict[str, dict[str, Any]] = {}
+        self._dirty = False
+        # callee short name -> call records (built lazily by callers())
+        self._by_callee: dict[str, list[tuple[str, dict]]] | None = None
+        self._loaded = load
+        if load:
+            self._load()
+
+    def _load(self) -> None:
+        # Journal before index: a refresh() landing in between has folded
+        # the records we read into the index we then read, so none is lost
+        journal = self._read_journal()
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if (
+            isinstance(data, dict)
+            and data.get("version") == INDEX_VERSION
+            and data.get("root") == str(self.root)
+        ):
+            self.files = data.get("files", {})
+            self._replay(journal)
+
+    # -- journal -----------------------------------------------------------
+
+    def _read_journal(self) -> bytes:
+        try:
+            with open(self.journal_path, "rb") as f:
+                return f.read()
+        except OSError:
+            return b""
+
+    def _replay(self, journal: bytes) -> None:
+        """Apply journal records not already superseded by a newer index entry."""
+        for line in journal.splitlines():
+            try:
+                record = json.loads(line)
+                rel, entry = record["rel"], record["entry"]
+                mtime_ns = record["mtime_ns"]
+            except (ValueError, KeyError, TypeError):
+                continue  # Torn or foreign line
+            current = self.files.get(rel)
+            if current is not None and current["mtime_ns"] > mtime_ns:
+                continue  # A later refresh() saw a newer version
+            if entry is None:
+                if self.files.pop(rel, None) is None:
+                    continue
+            elif current == entry:
+                continue
+            else:
+                self.files[rel] = entry
+            self._dirty = True
+            self._by_callee = None
+
+    def _append_journal(self, rel: str, entry: dict[str, Any] | None) -> None:
+        """Record one file's new entry (None: deleted), best effort."""
+        record = {
+            "rel": rel,
+            "mtime_ns": entry["mtime_ns"] if entry else time.time_ns(),
+            "entry": entry,
+        }
+        try:
+            with locked(self._lock_path):
+                with open(self.journal_path, "a") as f:
+                    f.write(json.dumps(record, separators=(",", ":")) + "\n")
+        except OSError:
+            pass
+
+    def _fold_journal(self) -> int:
+        """Replay the journal as it is now; returns the bytes consumed."""
+        with locked(self._lock_path):
+            journal = self._read_journal()
+        self._replay(journal)
+        return len(journal)
+
+    def _truncate_journal(self, consumed: int) -> None:
+        """Drop the first consumed bytes (now saved in the index)."""
+        try:
+            with locked(self._lock_path):
+                rest = self._read_journal()[consumed:]
+                if rest:
+                    write_atomic(self.journal_path, rest)
+                else:
+                    self.journal_path.unlink(missing_ok=True)
+        except OSError:
+            pass
+
+    def save(self) -> None:
+        """Persist if changed (atomic tmp + rename, best effort)."""
+        if not self._dirty:
+            return
+        data = {
+            "version": INDEX_VERSION,
+            "root": str(self.root),
+            "built_at": time.time(),
+            "files": self.files,
+        }
+        try:
+            write_json_atomic(self.path, data, separators=(",", ":"))
+            self._dirty = False
+        except OSError:
+            pass
+
+    def _walk(self) -> dict[str, os.stat_result]:
+        """Stat every indexable .py file under root."""
+        found = {}
+        for dirpath, dirs, files in os.walk(self.root):
+            dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
+            for name in files:
+                if name.endswith(".py"):
+                    full = os.path.join(dirpath, name)
+                    try:
+                        found[os.path.relpath(full, self.root)] = os.stat(full)
+                    except OSError:
+                        continue
+        return found
+
+    def _apply(self, rel: str, st: os.stat_result, parsed) -> None:
+        self._by_callee = None
+        if parsed is None:
+            if self.files.pop(rel, None) is not None:
+                self._dirty = True
+            return
+        sha, symbols = parsed
+        self.files[rel] = {
+            "mtime_ns": st.st_mtime_ns,
+            "size": st.st_size,
+            "sha": sha,
+            "symbols": symbols,
+        }
+        self._dirty = True
+
+    def _changed(self, rel: str, st: os.stat_result) -> bool:
+        entry = self.files.get(rel)
+        return (
+            entry is None
+            or entry["mtime_ns"] != st.st_mtime_ns
+            or entry["size"] != st.st_size
+        )
+
+    def refresh(
+        self, parallel: bool = True, max_parse: int | None = None
+    ) -> dict[str, int]:
+        """Re-index changed files and drop deleted ones.
+
+        Args:
+            parallel: Use a process pool for large batches
+            max_parse: Leave the index stale if more files than this changed
+                (hooks pass a limit so a first build never stalls a tool call)
+
+        Returns:
+            Counts: files seen, files (re)parsed, files removed, files
+            deferred by max_parse
+        """
+        consumed = self._fold_journal()
+        current = self._walk()
+        removed = [rel for rel in self.files if rel not in current]
+        for rel in removed:
+            del self.files[rel]
+            self._dirty = True
+            self._by_callee = None
+
+        stale = [rel for rel, st in current.items() if self._changed(rel, st)]
+        parsed = deferred = 0
+        if max_parse is not None and len(stale) > max_parse:
+            stale, deferred = [], len(stale)
+        if stale:
+            paths = [str(self.root / rel) for rel in stale]
+            workers = min(os.cpu_count() or 1, 8)
+            if parallel and workers > 1 and len(stale) >= PARALLEL_MIN_FILES:
+                from concurrent.futures import ProcessPoolExecutor
+
+                with ProcessPoolExecutor(max_workers=workers) as pool:
+                    outputs = list(pool.map(_index_file, paths, chunksize=16))
+            else:
+                outputs = [
+                    self._hash_or_parse(rel, path) for rel, path in zip(stale, paths)
+                ]
+            for rel, output in zip(stale, outputs):
+                entry = self.files.get(rel)
+                if output is not None and entry and entry.get("sha") == output[0]:
+                    # Touched but identical: keep symbols, refresh the stat key
+                    entry["mtime_ns"] = current[rel].st_mtime_ns
+                    entry["size"] = current[rel].st_size
+                    self._dirty = True
+                    continue
+                self._apply(rel, current[rel], output)
+                parsed += 1
+
+        self.save()
+        if consumed and not self._dirty:
+            self._truncate_journal(consumed)
+        return {
+            "files": len(current),
+            "parsed": parsed,
+            "removed": len(removed),
+            "deferred": deferred,
+        }
+
+    def _hash_or_parse(self, rel: str, path: str):
+        """Serial path: skip the parse when the content hash is unchanged."""
+        entry = self.files.get(rel)
+        if entry is None:
+            return _index_file(path)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except OSError:
+            return None
+        sha = hashlib.sha256(data).hexdigest()
+        if sha == entry.get("sha"):
+            return sha, entry["symbols"]
+        return sha, extract_symbols(data.decode("utf-8", "replace"), path)
+
+    def update_file(self, path: str | Path) -> bool:
+        """Re-index a single file now (e.g. after an Edit/Write).
+
+        The new entry is appended to the journal rather than saved, so the
+        cost is one parse and one line regardless of index size. On an
+        index created with load=False the file is always re-parsed.
+
+        Returns:
+            True if the file is inside root and the index changed
+        """
+        full = Path(path).resolve()
+        try:
+            rel = str(full.relative_to(self.root))
+        except ValueError:
+            return False
+        if not rel.endswith(".py") or SKIP_DIRS.intersection(Path(rel).parts):
+            return False
+        try:
+            st = os.stat(full)
+        except OSError:
+            st = None
+        if st is not None and not self._changed(rel, st):
+            return False
+        parsed = self._hash_or_parse(rel, str(full)) if st is not None else None
+        if parsed is None:
+            # Gone; unless it was indexed, a loaded index needn't hear of it
+            if self.files.pop(rel, None) is None and self._loaded:
+                return False
+            self._by_callee = None
+            self._append_journal(rel, None)
+            return True
+        self._apply(rel, st, parsed)
+        self._append_journal(rel, self.files[rel])
+        return True
+
+    # -- queries -----------------------------------------------------------
+
+    def iter_symbols(
+        self, types: tuple[str, ...] | None = None
+    ) -> Iterator[tuple[str, dict]]:
+        """Yield (relpath, symbol) pairs, optionally filtered by record type."""
+        for rel in sorted(self.files):
+            for symbol in self.files[rel]["symbols"]:
+                if types is None or symbol["type"] in types:
+                    yield rel, symbol
+
+    def query(
+        self,
+        target_type: str = "all",
+        name: str | None = None,
+        under: str | Path | None = None,
+    ) -> list[dict[str, Any]]:
+        """Symbols matching an xray-style query.
+
+        Args:
+            target_type: One of TYPE_FILTERS keys
+            name: Case-insensitive regex (for "decorator", matched against
+                decorator names; for from-imports, module.name or name)
+            under: Restrict to files below this path
+
+        Returns:
+            Symbol dicts with an added "filepath" (absolute path)
+        """
+        pattern = re.compile(name, re.IGNORECASE) if name else None
+        prefix = None
+        if under is not None:
+            prefix = os.path.relpath(Path(under).resolve(), self.root)
+            prefix = "" if prefix == "." else prefix
+
+        results = []
+        for rel, symbol in self.iter_symbols(TYPE_FILTERS.get(target_type, ())):
+            if prefix and rel != prefix and not rel.startswith(prefix + os.sep):
+                continue
+            if target_type == "decorator" and not symbol["decorators"]:
+                continue
+            if pattern is not None and not self._matches(symbol, pattern, target_type):
+                continue
+            results.append({**symbol, "filepath": str(self.root / rel)})
+        return results
+
+    @staticmethod
+    def _matches(symbol: dict, pattern: re.Pattern, target_type: str) -> bool:
+        if target_type == "decorator":
+            return any(pattern.search(d) for d in symbol.get("decorators", ()))
+        if symbol["type"] == "import_from":
+            module = symbol["module"]
+            full = f"{module}.{symbol['name']}" if module else symbol["name"]
+            return bool(pattern.search(full) or pattern.search(symbol["name"]))
+        return bool(pattern.search(symbol["name"]))
+
+    def callers(self, function: str) -> list[dict[str, Any]]:
+        """Call sites of a function name across the project (reverse call graph).
+
+        Matches bare calls (``name()``) and attribute calls (``obj.name()``);
+        the graph is name-based, so same-named methods share callers.
+
+        Returns:
+            Dicts with filepath (relative to root), lineno, name and caller
+            (enclosing qualname, None at module level)
+        """
+        if self._by_callee is None:
+            graph: dict[str, list[tuple[str, dict]]] = {}
+            for rel, call in self.iter_symbols(("call",)):
+                graph.setdefault(call["name"].rsplit(".", 1)[-1], []).append(
+                    (rel, call)
+                )
+            self._by_callee = graph
+        return [
+            {**call, "filepath": rel}
+            for rel, call in self._by_callee.get(function.rsplit(".", 1)[-1], ())
+        ]
+
+
+def find_root(path: str | Path) -> Path:
+    """Project root for a file or directory: enclosing git repo, else the directory."""
+    path = Path(path).resolve()
+    start = path if path.is_dir() else path.parent
+    for candidate in (start, *start.parents):
+        if (candidate / ".git").exists():
+            return candidate
+    return start
+
+
+def record_write(path: str | Path, cache_dir: Path | None = None) -> bool:
+    """Journal a written file's symbols without loading its project's index.
+
+    Hook entry point: a no-op until the index has been built once.
+
+    Returns:
+        True if a journal record was written
+    """
+    index = SymbolIndex(find_root(path), cache_dir=cache_dir, load=False)
+    if not index.path.exists():
+        return False
+    return index.update_file(path)
+
+
+def get_index(root: str | Path, refresh: bool = True) -> SymbolIndex:
+    """Load the index for a project root, refreshing changed files."""
+    index = SymbolIndex(root)
+    if refresh:
+        index.refresh()
+    return index
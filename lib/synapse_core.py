@@ -23,7 +23,6 @@ import re
 import time as _time_module
 from dataclasses import dataclass
 from enum import Enum
-from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
 # =============================================================================
@@ -441,13 +440,12 @@ def log_block(
 ):
     """Log a hook block for later reflection.
 
-    Blocks are logged to .claude/memory/block_log.jsonl with metadata
-    for post-session analysis.
+    Blocks are logged to the session's shard under .claude/memory/block_log/
+    (see block_log) with metadata for post-session analysis.
     """
     import time
     import os
-
-    log_file = Path(__file__).parent.parent / "memory" / "block_log.jsonl"
+    from block_log import append_block
 
     entry = {
         "timestamp": time.time(),
@@ -459,9 +457,7 @@ def log_block(
     }
 
     try:
-        log_file.parent.mkdir(parents=True, exist_ok=True)
-        with open(log_file, "a") as f:
-            f.write(json.dumps(entry) + "\n")
+        append_block(entry)
     except (IOError, OSError):
         pass  # Don't fail hook on logging error
 
@@ -484,33 +480,13 @@ def clear_acknowledged_block(hook_name: str, session_id: str = None):
     Called when Claude admits the block was valid (no need for Stop reflection).
     """
     import os
+    from block_log import clear_blocks
 
     if session_id is None:
         session_id = os.environ.get("CLAUDE_SESSION_ID", "unknown")
 
-    log_file = Path(__file__).parent.parent / "memory" / "block_log.jsonl"
-
-    if not log_file.exists():
-        return
-
     try:
-        # Read all entries, filter out acknowledged hook for this session
-        remaining = []
-        with open(log_file) as f:
-            for line in f:
-                try:
-                    entry = json.loads(line.strip())
-                    # Keep if different session or different hook
-                    if (
-                        entry.get("session_id") != session_id
-                        or entry.get("hook") != hook_name
-                    ):
-                        remaining.append(line)
-                except json.JSONDecodeError:
-                    remaining.append(line)
-
-        with open(log_file, "w") as f:
-            f.writelines(remaining)
+        clear_blocks(session_id, hook=hook_name)
     except (IOError, OSError):
         pass
 
@@ -518,29 +494,15 @@ def clear_acknowledged_block(hook_name: str, session_id: str = None):
 def get_session_blocks(session_id: str = None) -> list[dict]:
     """Get all blocks for current or specified session."""
     import os
+    from block_log import session_blocks
 
     if session_id is None:
         session_id = os.environ.get("CLAUDE_SESSION_ID", "unknown")
 
-    log_file = Path(__file__).parent.parent / "memory" / "block_log.jsonl"
-    blocks = []
-
-    if not log_file.exists():
-        return blocks
-
     try:
-        with open(log_file) as f:
-            for line in f:
-                try:
-                    entry = json.loads(line.strip())
-                    if entry.get("session_id") == session_id:
-                        blocks.append(entry)
-                except json.JSONDecodeError:
-                    continue
+        return session_blocks(session_id)
     except (IOError, OSError):
-        pass
-
-    return blocks
+        return []
 
 
 def clear_session_blocks(session_id: str = None):
@@ -550,30 +512,13 @@ def clear_session_blocks(session_id: str = None):
     for the same blocks.
     """
     import os
+    from block_log import clear_blocks
 
     if session_id is None:
         session_id = os.environ.get("CLAUDE_SESSION_ID", "unknown")
 
-    log_file = Path(__file__).parent.parent / "memory" / "block_log.jsonl"
-
-    if not log_file.exists():
-        return
-
     try:
-        # Read all entries, filter out current session
-        remaining = []
-        with open(log_file) as f:
-            for line in f:
-                try:
-                    entry = json.loads(line.strip())
-                    if entry.get("session_id") != session_id:
-                        remaining.append(line)
-                except json.JSONDecodeError:
-                    remaining.append(line)  # Keep malformed lines
-
-        # Write back filtered entries
-        with open(log_file, "w") as f:
-            f.writelines(remaining)
+        clear_blocks(session_id)
     except (IOError, OSError):
         pass
 
@@ -1,233 +1,372 @@
 #!/usr/bin/env python3
 """
 The Sentinel: Runs static analysis and anti-pattern detection on target files
+
+Targets may be files or directories. Ruff and Bandit run once over all
+changed files, the in-process checks (complexity, anti-patterns, SDK
+compliance) fan out over a process pool, and per-file results are cached
+by content hash + tool version - re-auditing an unchanged tree is instant.
 """
 import sys
 import os
 import subprocess
 import re
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
 
 # Add .claude/lib to path (minimal bootstrap)
 sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'lib'))
 from core import setup_script, finalize, logger, handle_debug  # noqa: E402
-
-
-def check_ruff(filepath):
-    """Run Ruff linter on the file."""
+from scan_pipeline import (  # noqa: E402
+    file_digest,
+    module_version,
+    scan_files,
+    tool_fingerprint,
+)
+
+# Bump when the in-process checks below change (invalidates cached results)
+CHECKS_VERSION = "1"
+
+SKIP_DIRS = {".git", "__pycache__", "node_modules", ".venv", "venv"}
+
+MAX_COMPLEXITY = 10
+
+# Anti-patterns with severity levels: (pattern, message, is_critical)
+ANTI_PATTERNS = [
+    # Critical security issues
+    (
+        r'sk-proj-|ghp_|AWS_SECRET|api[_-]?key\s*=\s*["\'](?!.*getenv)',
+        "🔴 CRITICAL: Hardcoded secret detected",
+        True,
+    ),
+    (r"shell\s*=\s*True", "🔴 CRITICAL: Shell injection risk (shell=True)", True),
+    (
+        r'cursor\.execute\([^?]*f["\']',
+        "🔴 CRITICAL: SQL injection risk (f-string in query)",
+        True,
+    ),
+    # Warning-level issues
+    (r"except\s*:", "🟡 WARNING: Blind exception catching", False),
+    (r"except\s+Exception\s*:", "🟡 WARNING: Catching Exception too broad", False),
+    (r"global\s+\w+", "🟡 WARNING: Global variable mutation", False),
+    (r"print\s*\(", "🟡 WARNING: Use logger.info instead of print", False),
+    (
+        r"pdb\.set_trace\(\)|breakpoint\(\)",
+        "🟡 WARNING: Debug breakpoint left in code",
+        False,
+    ),
+    (
+        r"from\s+\w+\s+import\s+\*",
+        "🟡 WARNING: Wildcard import (from X import *)",
+        False,
+    ),
+    # Info-level issues
+    (r"TODO:", "🔵 INFO: TODO comment found", False),
+    (r"#\s*[^#\n]{50,}\n\s*#", "🔵 INFO: Large commented-out code block", False),
+]
+
+
+def _header(title):
     print("\n" + "=" * 70)
-    print("🔍 [SENTINEL] Running Ruff Linter...")
+    print(title)
     print("=" * 70)
 
-    try:
-        result = subprocess.run(
-            ["ruff", "check", filepath], capture_output=True, text=True
-        ,
-        timeout=10)
 
-        if result.returncode == 0:
-            print("  ✅ Ruff: No linting errors")
-            return True
-        else:
-            print("  ❌ Ruff found issues:")
-            print(result.stdout)
-            return False
+def _rel(path):
+    return os.path.relpath(path)
 
-    except FileNotFoundError:
-        logger.warning("  ⚠️  Ruff not installed - skipping")
-        return True
-    except Exception as e:
-        logger.warning(f"  ⚠️  Ruff check failed: {e}")
-        return True
 
+def collect_python_files(targets):
+    """Expand files and directories into a sorted list of .py files."""
+    files = []
+    for target in targets:
+        if os.path.isfile(target):
+            if target.endswith(".py"):
+                files.append(os.path.abspath(target))
+            continue
+        for root, dirs, names in os.walk(target):
+            dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
+            files.extend(
+                os.path.abspath(os.path.join(root, n)) for n in names if n.endswith(".py")
+            )
+    return sorted(set(files))
 
-def check_bandit(filepath):
-    """Run Bandit security scanner on the file."""
-    print("\n" + "=" * 70)
-    print("🛡️  [SENTINEL] Running Bandit Security Scanner...")
-    print("=" * 70)
 
+# =============================================================================
+# EXTERNAL LINTERS (one invocation per tool)
+# =============================================================================
+
+
+def _ruff_config_key():
+    """Content key for ruff config in the working directory."""
+    digests = [
+        file_digest(name) or ""
+        for name in ("ruff.toml", ".ruff.toml", "pyproject.toml")
+    ]
+    return ":".join(d[:12] for d in digests)
+
+
+def run_ruff(paths):
+    """Ruff over many files. Returns {path: [[row, col, code, message]]} or None."""
     try:
         result = subprocess.run(
-            ["bandit", "-r", filepath, "-f", "txt"], capture_output=True, text=True
-        ,
-        timeout=10)
-
-        # Bandit returns 0 if no issues, 1 if issues found
-        if result.returncode == 0:
-            print("  ✅ Bandit: No security issues")
-            return True
-        else:
-            print("  ❌ Bandit found security issues:")
-            print(result.stdout)
-            return False
-
+            ["ruff", "check", "--output-format", "json", *paths],
+            capture_output=True,
+            text=True,
+            timeout=60 + len(paths) // 10,
+        )
+        items = json.loads(result.stdout or "[]")
     except FileNotFoundError:
-        logger.warning("  ⚠️  Bandit not installed - skipping")
-        return True
-    except Exception as e:
-        logger.warning(f"  ⚠️  Bandit check failed: {e}")
-        return True
+        return None
+    except (subprocess.TimeoutExpired, ValueError) as e:
+        logger.warning(f"  ⚠️  Ruff check failed: {e}")
+        return None
 
+    findings = {p: [] for p in paths}
+    for item in items:
+        loc = item.get("location") or {}
+        findings.setdefault(os.path.abspath(item["filename"]), []).append(
+            [loc.get("row", 0), loc.get("column", 0), item.get("code") or "", item["message"]]
+        )
+    return findings
 
-def check_complexity(filepath):
-    """Check cyclomatic complexity using Radon."""
-    print("\n" + "=" * 70)
-    print("📊 [SENTINEL] Checking Cyclomatic Complexity...")
-    print("=" * 70)
 
+def run_bandit(paths):
+    """Bandit over many files. Returns {path: [[line, severity, test_id, text]]} or None."""
     try:
-        # Import radon here to avoid hard dependency
-        from radon.complexity import cc_visit
+        result = subprocess.run(
+            ["bandit", "-f", "json", "-q", *paths],
+            capture_output=True,
+            text=True,
+            timeout=60 + len(paths) // 10,
+        )
+        report = json.loads(result.stdout or "{}")
+    except FileNotFoundError:
+        return None
+    except (subprocess.TimeoutExpired, ValueError) as e:
+        logger.warning(f"  ⚠️  Bandit check failed: {e}")
+        return None
 
-        with open(filepath, "r") as f:
-            code = f.read()
+    findings = {p: [] for p in paths}
+    for item in report.get("results", []):
+        findings.setdefault(os.path.abspath(item["filename"]), []).append(
+            [
+                item.get("line_number", 0),
+                item.get("issue_severity", ""),
+                item.get("test_id", ""),
+                item.get("issue_text", ""),
+            ]
+        )
+    return findings
 
-        complexity_scores = cc_visit(code)
-        max_complexity = 10
-        violations = []
 
-        for block in complexity_scores:
-            if block.complexity > max_complexity:
-                violations.append((block.name, block.complexity, block.lineno))
+# =============================================================================
+# IN-PROCESS CHECKS (one read per file, process pool)
+# =============================================================================
 
-        if violations:
-            print(f"  ❌ Complexity violations (max allowed: {max_complexity}):")
-            for name, score, lineno in violations:
-                print(f"     Line {lineno}: {name} has complexity {score}")
-            return False
-        else:
-            print(f"  ✅ All functions have complexity ≤ {max_complexity}")
-            return True
 
+def check_complexity(code):
+    """Functions above MAX_COMPLEXITY via Radon (None if Radon is missing)."""
+    try:
+        from radon.complexity import cc_visit
     except ImportError:
-        logger.warning("  ⚠️  Radon not installed - skipping")
-        return True
+        return None
+    try:
+        blocks = cc_visit(code)
     except Exception as e:
-        logger.warning(f"  ⚠️  Complexity check failed: {e}")
-        return True
+        logger.debug(f"Complexity check failed: {e}")
+        return []
+    return [
+        [block.name, block.complexity, block.lineno]
+        for block in blocks
+        if block.complexity > MAX_COMPLEXITY
+    ]
 
 
-def check_custom_anti_patterns(filepath, strict=False):
-    """Check for custom anti-patterns defined in anti_patterns.md."""
-    print("\n" + "=" * 70)
-    print("🚫 [SENTINEL] Checking Custom Anti-Patterns...")
-    print("=" * 70)
+def check_custom_anti_patterns(content):
+    """Anti-pattern matches as [lineno, message, is_critical]."""
+    violations = []
+    for pattern, message, is_critical in ANTI_PATTERNS:
+        for match in re.finditer(pattern, content, re.MULTILINE):
+            lineno = content.count("\n", 0, match.start()) + 1
+            violations.append([lineno, message, is_critical])
+    return sorted(violations)
 
-    # Define anti-patterns with severity levels
-    anti_patterns = [
-        # Critical security issues
-        (
-            r'sk-proj-|ghp_|AWS_SECRET|api[_-]?key\s*=\s*["\'](?!.*getenv)',
-            "🔴 CRITICAL: Hardcoded secret detected",
-            True,
-        ),
-        (r"shell\s*=\s*True", "🔴 CRITICAL: Shell injection risk (shell=True)", True),
-        (
-            r'cursor\.execute\([^?]*f["\']',
-            "🔴 CRITICAL: SQL injection risk (f-string in query)",
-            True,
-        ),
-        # Warning-level issues
-        (r"except\s*:", "🟡 WARNING: Blind exception catching", False),
-        (r"except\s+Exception\s*:", "🟡 WARNING: Catching Exception too broad", False),
-        (r"global\s+\w+", "🟡 WARNING: Global variable mutation", False),
-        (r"print\s*\(", "🟡 WARNING: Use logger.info instead of print", False),
-        (
-            r"pdb\.set_trace\(\)|breakpoint\(\)",
-            "🟡 WARNING: Debug breakpoint left in code",
-            False,
-        ),
-        (
-            r"from\s+\w+\s+import\s+\*",
-            "🟡 WARNING: Wildcard import (from X import *)",
-            False,
-        ),
-        # Info-level issues
-        (r"TODO:", "🔵 INFO: TODO comment found", False),
-        (r"#\s*[^#\n]{50,}\n\s*#", "🔵 INFO: Large commented-out code block", False),
-    ]
 
-    try:
-        with open(filepath, "r") as f:
-            content = f.read()
+def check_sdk_compliance(content):
+    """Whitebox SDK standard violations for a script."""
+    violations = []
 
-        violations = []
-        critical_found = False
-
-        for pattern, message, is_critical in anti_patterns:
-            matches = list(re.finditer(pattern, content, re.MULTILINE))
-            if matches:
-                for match in matches:
-                    # Find line number
-                    lineno = content[: match.start()].count("\n") + 1
-                    violations.append((lineno, message, is_critical))
-                    if is_critical:
-                        critical_found = True
-
-        if violations:
-            print(f"  Found {len(violations)} anti-pattern(s):")
-            for lineno, message, is_critical in sorted(violations):
-                print(f"     Line {lineno}: {message}")
-
-            if critical_found:
-                print("\n  🔴 CRITICAL issues must be fixed immediately!")
-                return False
-            else:
-                print("\n  ⚠️  Warnings should be addressed")
-                if strict:
-                    print("  ⚠️  STRICT MODE: Warnings cause failure")
-                    return False
-                return True  # Warnings don't fail the audit in normal mode
-        else:
-            print("  ✅ No anti-patterns detected")
-            return True
+    # Check for required imports
+    if "from core import" not in content:
+        violations.append("Missing SDK imports (from core import ...)")
 
-    except Exception as e:
-        logger.error(f"  ❌ Anti-pattern check failed: {e}")
-        return False
+    if "setup_script" not in content:
+        violations.append("Missing setup_script() call")
 
+    if "finalize" not in content:
+        violations.append("Missing finalize() call")
 
-def check_sdk_compliance(filepath):
-    """Check if the script follows Whitebox SDK standards."""
-    print("\n" + "=" * 70)
-    print("📋 [SENTINEL] Checking SDK Compliance...")
-    print("=" * 70)
+    if "--dry-run" not in content and "dry_run" not in content:
+        violations.append("Missing dry-run support")
+
+    # Check for docstring
+    if not content.strip().startswith('#!/usr/bin/env python3\n"""'):
+        violations.append("Missing module docstring")
 
+    return violations
+
+
+def local_checks(filepath):
+    """All in-process checks for one file (process-pool worker)."""
     try:
         with open(filepath, "r") as f:
             content = f.read()
+    except (OSError, UnicodeDecodeError) as e:
+        return {"error": str(e)}
+    return {
+        "complexity": check_complexity(content),
+        "anti_patterns": check_custom_anti_patterns(content),
+        "sdk": check_sdk_compliance(content),
+    }
 
-        violations = []
 
-        # Check for required imports
-        if "from core import" not in content:
-            violations.append("Missing SDK imports (from core import ...)")
+# =============================================================================
+# REPORTING
+# =============================================================================
 
-        if "setup_script" not in content:
-            violations.append("Missing setup_script() call")
 
-        if "finalize" not in content:
-            violations.append("Missing finalize() call")
+def report_ruff(results):
+    _header("🔍 [SENTINEL] Running Ruff Linter...")
+    if any(v is None for v in results.values()):
+        logger.warning("  ⚠️  Ruff not installed or failed - skipping")
+        return True
+    issues = {p: f for p, f in results.items() if f}
+    if not issues:
+        print("  ✅ Ruff: No linting errors")
+        return True
+    print("  ❌ Ruff found issues:")
+    for path, findings in sorted(issues.items()):
+        for row, col, code, message in findings:
+            print(f"     {_rel(path)}:{row}:{col}: {code} {message}")
+    return False
 
-        if "--dry-run" not in content and "dry_run" not in content:
-            violations.append("Missing dry-run support")
 
-        # Check for docstring
-        if not content.strip().startswith('#!/usr/bin/env python3\n"""'):
-            violations.append("Missing module docstring")
+def report_bandit(results):
+    _header("🛡️  [SENTINEL] Running Bandit Security Scanner...")
+    if any(v is None for v in results.values()):
+        logger.warning("  ⚠️  Bandit not installed or failed - skipping")
+        return True
+    issues = {p: f for p, f in results.items() if f}
+    if not issues:
+        print("  ✅ Bandit: No security issues")
+        return True
+    print("  ❌ Bandit found security issues:")
+    for path, findings in sorted(issues.items()):
+        for line, severity, test_id, text in findings:
+            print(f"     {_rel(path)}:{line}: [{severity}] {test_id} {text}")
+    return False
 
-        if violations:
-            print("  ⚠️  SDK compliance issues:")
-            for violation in violations:
-                print(f"     - {violation}")
-            return False
-        else:
-            print("  ✅ SDK compliant")
-            return True
 
-    except Exception as e:
-        logger.error(f"  ❌ SDK compliance check failed: {e}")
-        return True  # Don't fail on check error
+def report_complexity(results):
+    _header("📊 [SENTINEL] Checking Cyclomatic Complexity...")
+    if any(r.get("complexity", []) is None for r in results.values()):
+        logger.warning("  ⚠️  Radon not installed - skipping")
+        return True
+    issues = {p: r["complexity"] for p, r in results.items() if r.get("complexity")}
+    if not issues:
+        print(f"  ✅ All functions have complexity ≤ {MAX_COMPLEXITY}")
+        return True
+    print(f"  ❌ Complexity violations (max allowed: {MAX_COMPLEXITY}):")
+    for path, violations in sorted(issues.items()):
+        for name, score, lineno in violations:
+            print(f"     {_rel(path)} line {lineno}: {name} has complexity {score}")
+    return False
+
+
+def report_anti_patterns(results, strict=False):
+    _header("🚫 [SENTINEL] Checking Custom Anti-Patterns...")
+    failed = [p for p, r in results.items() if "error" in r]
+    for path in failed:
+        logger.error(f"  ❌ Anti-pattern check failed for {_rel(path)}: {results[path]['error']}")
+    issues = {p: r["anti_patterns"] for p, r in results.items() if r.get("anti_patterns")}
+    if not issues:
+        if not failed:
+            print("  ✅ No anti-patterns detected")
+        return not failed
+
+    total = sum(len(v) for v in issues.values())
+    print(f"  Found {total} anti-pattern(s):")
+    critical_found = False
+    for path, violations in sorted(issues.items()):
+        if len(results) > 1:
+            print(f"   📄 {_rel(path)}")
+        for lineno, message, is_critical in violations:
+            print(f"     Line {lineno}: {message}")
+            critical_found = critical_found or is_critical
+
+    if critical_found:
+        print("\n  🔴 CRITICAL issues must be fixed immediately!")
+        return False
+    print("\n  ⚠️  Warnings should be addressed")
+    if strict:
+        print("  ⚠️  STRICT MODE: Warnings cause failure")
+        return False
+    return not failed  # Warnings don't fail the audit in normal mode
+
+
+def report_sdk_compliance(results):
+    _header("📋 [SENTINEL] Checking SDK Compliance...")
+    issues = {p: r["sdk"] for p, r in results.items() if r.get("sdk")}
+    if not issues:
+        print("  ✅ SDK compliant")
+        return True
+    print("  ⚠️  SDK compliance issues:")
+    for path, violations in sorted(issues.items()):
+        if len(results) > 1:
+            print(f"   📄 {_rel(path)}")
+        for violation in violations:
+            print(f"     - {violation}")
+    return False
+
+
+def run_scans(paths, use_cache=True):
+    """Run all three scanners. Returns ({scanner: results}, {scanner: stats})."""
+    ruff_version = tool_fingerprint("ruff")
+    bandit_version = tool_fingerprint("bandit")
+    scans = {
+        "ruff": dict(
+            name="audit_ruff",
+            version=f"{ruff_version}:{_ruff_config_key()}",
+            batch=run_ruff,
+            use_cache=use_cache,
+        ),
+        "bandit": dict(
+            name="audit_bandit",
+            version=bandit_version,
+            batch=run_bandit,
+            use_cache=use_cache,
+        ),
+        "local": dict(
+            name="audit_local",
+            version=f"{CHECKS_VERSION}:radon={module_version('radon')}",
+            worker=local_checks,
+            use_cache=use_cache,
+        ),
+    }
+    # Process pool first (forking with live threads is unsafe), then the two
+    # external linters side by side - they are subprocesses, so threads suffice
+    done = {"local": scan_files(paths, **scans.pop("local"))}
+    # Tools that are not installed report None per file (skipped)
+    missing = {"ruff": ruff_version, "bandit": bandit_version}
+    results = {k: {p: None for p in paths} for k, v in missing.items() if v is None}
+    scans = {k: kw for k, kw in scans.items() if k not in results}
+    with ThreadPoolExecutor(max_workers=max(1, len(scans))) as pool:
+        futures = {k: pool.submit(scan_files, paths, **kw) for k, kw in scans.items()}
+        done.update((k, f.result()) for k, f in futures.items())
+    results.update((k, v[0]) for k, v in done.items())
+    return results, {k: v[1] for k, v in done.items()}
 
 
 def main():
@@ -235,30 +374,40 @@ def main():
         "The Sentinel: Runs static analysis and anti-pattern detection on target files"
     )
 
-    parser.add_argument("target", help="Python file to audit")
+    parser.add_argument(
+        "targets", nargs="+", help="Python file(s) or directories to audit"
+    )
     parser.add_argument(
         "--strict",
         action="store_true",
         help="Fail on warnings (not just critical issues)",
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Ignore cached per-file results and re-run every check",
+    )
 
     args = parser.parse_args()
     handle_debug(args)
 
-    target_path = os.path.abspath(args.target)
-
-    if not os.path.exists(target_path):
-        logger.error(f"File not found: {target_path}")
-        finalize(success=False)
+    for target in args.targets:
+        if not os.path.exists(target):
+            logger.error(f"File not found: {os.path.abspath(target)}")
+            finalize(success=False)
 
-    if not target_path.endswith(".py"):
-        logger.error("Target must be a Python file (.py)")
+    files = collect_python_files(args.targets)
+    if not files:
+        logger.error("Target must be a Python file (.py) or contain Python files")
         finalize(success=False)
 
     print("\n" + "=" * 70)
     print("🛡️  THE SENTINEL: Code Quality Gate")
     print("=" * 70)
-    print(f"  Target: {target_path}")
+    if len(files) == 1:
+        print(f"  Target: {files[0]}")
+    else:
+        print(f"  Targets: {', '.join(args.targets)} ({len(files)} Python files)")
     print(f"  Strict Mode: {args.strict}")
     print("=" * 70)
 
@@ -267,14 +416,17 @@ def main():
         finalize(success=True)
 
     try:
+        start = time.perf_counter()
+        scanned, stats = run_scans(files, use_cache=not args.no_cache)
+        elapsed = time.perf_counter() - start
+
+        local = scanned["local"]
         results = {
-            "ruff": check_ruff(target_path),
-            "bandit": check_bandit(target_path),
-            "complexity": check_complexity(target_path),
-            "anti_patterns": check_custom_anti_patterns(
-                target_path, strict=args.strict
-            ),
-            "sdk_compliance": check_sdk_compliance(target_path),
+            "ruff": report_ruff(scanned["ruff"]),
+            "bandit": report_bandit(scanned["bandit"]),
+            "complexity": report_complexity(local),
+            "anti_patterns": report_anti_patterns(local, strict=args.strict),
+            "sdk_compliance": report_sdk_compliance(local),
         }
 
         # Summary
@@ -289,6 +441,13 @@ def main():
             status = "✅ PASS" if result else "❌ FAIL"
             print(f"  {status}: {check}")
 
+        print("-" * 70)
+        for name, stat in stats.items():
+            print(f"  ⚡ {name}: {stat.summary()}")
+        print(
+            f"  ⚡ total: {len(files)} file(s) in {elapsed * 1000:.0f}ms "
+            f"({len(files) / max(elapsed, 1e-9):.0f} files/sec)"
+        )
         print("=" * 70)
 
         # Determine overall result
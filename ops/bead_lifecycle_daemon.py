@@ -5,15 +5,24 @@ Bead Lifecycle Daemon
 Background service that monitors agent↔bead assignments across ALL projects
 and auto-reverts orphaned beads when agents crash or timeout.
 
-Scan interval: 5 minutes
+Event-driven: each project's .beads/ directory (agent assignments + beads DB)
+is watched with inotify (via ctypes, Linux only). Changed projects are
+reloaded and every active assignment gets a heartbeat deadline in an
+in-memory heap, so the daemon sleeps until the next deadline or file event
+and acts within seconds of a threshold passing. Falls back to stat polling
+when inotify is unavailable.
+
+Project rediscovery: every 5 minutes
 Stale threshold: 30 minutes (no heartbeat)
 Stalled threshold: 60 minutes (marked as stalled)
 Orphan threshold: 120 minutes (auto-reverted to open)
 
 Logs to: ~/.claude/.beads/lifecycle.log (global log)
+Metrics: ~/.claude/.beads/lifecycle_metrics.json (watched projects, queue size)
 
 Usage:
     bead_lifecycle_daemon.py              # Run as daemon (blocking)
+    bead_lifecycle_daemon.py --daemon     # Same (explicit, used by systemd unit)
     bead_lifecycle_daemon.py --once       # Single scan then exit
     bead_lifecycle_daemon.py --status     # Show daemon status
     bead_lifecycle_daemon.py --project PATH  # Scan specific project only
@@ -22,7 +31,13 @@ Usage:
 from __future__ import annotations
 
 import argparse
+import ctypes
+import ctypes.util
+import heapq
+import json
 import os
+import select
+import struct
 import subprocess
 import sys
 import time
@@ -31,6 +46,7 @@ from pathlib import Path
 
 # Add lib to path for agent_registry
 sys.path.insert(0, str(Path.home() / ".claude" / "lib"))
+from _atomic_io import write_json_atomic
 from agent_registry import (
     release_bead,
     get_active_assignments,
@@ -42,7 +58,8 @@ from project_context import (
 )
 
 # Configuration
-SCAN_INTERVAL_SECONDS = 300  # 5 minutes
+RESCAN_INTERVAL_SECONDS = 300  # 5 minutes - rediscover projects
+POLL_FALLBACK_SECONDS = 15  # stat polling interval when inotify unavailable
 STALE_THRESHOLD_MINUTES = 30  # No heartbeat for 30 min = stale
 STALLED_THRESHOLD_MINUTES = 60  # 60 min = marked stalled
 ORPHAN_THRESHOLD_MINUTES = 120  # 120 min = auto-revert
@@ -50,6 +67,18 @@ ORPHAN_THRESHOLD_MINUTES = 120  # 120 min = auto-revert
 # Global log for daemon status
 GLOBAL_LOG_FILE = Path.home() / ".claude" / ".beads" / "lifecycle.log"
 PID_FILE = Path.home() / ".claude" / ".beads" / "lifecycle.pid"
+METRICS_FILE = Path.home() / ".claude" / ".beads" / "lifecycle_metrics.json"
+
+# Files in .beads/ whose changes require reloading a project's deadlines
+WATCHED_SUFFIXES = (".jsonl", ".db", ".db-wal")
+
+# Lifecycle stages, ordered by idle threshold
+STAGE_NONE, STAGE_STALE, STAGE_STALLED, STAGE_ORPHAN = 0, 1, 2, 3
+STAGE_THRESHOLDS = {
+    STAGE_STALE: STALE_THRESHOLD_MINUTES,
+    STAGE_STALLED: STALLED_THRESHOLD_MINUTES,
+    STAGE_ORPHAN: ORPHAN_THRESHOLD_MINUTES,
+}
 
 
 def log(message: str, level: str = "INFO", project_root: Path | None = None) -> None:
@@ -87,12 +116,97 @@ def run_bd(*args: str, cwd: Path | None = None) -> subprocess.CompletedProcess:
     )
 
 
+def _bead_is_closed(bead_id: str, project_root: Path | None = None) -> bool:
+    """Check whether a bead was already closed (so it must not be reopened)."""
+    result = run_bd("show", bead_id, "--json", cwd=project_root)
+    if result.returncode != 0:
+        return False
+    try:
+        data = json.loads(result.stdout)
+    except json.JSONDecodeError:
+        return False
+    if isinstance(data, list):
+        data = data[0] if data else {}
+    return isinstance(data, dict) and data.get("status") == "closed"
+
+
 def revert_bead_to_open(bead_id: str, project_root: Path | None = None) -> bool:
     """Revert a bead to open status via bd CLI."""
     result = run_bd("update", bead_id, "--status=open", cwd=project_root)
     return result.returncode == 0
 
 
+def _heartbeat_time(assignment: dict) -> datetime | None:
+    """Parse an assignment's last heartbeat (falls back to claim time)."""
+    last_hb = assignment.get("last_heartbeat", assignment.get("claimed_at", ""))
+    if not last_hb:
+        return None
+    try:
+        return datetime.fromisoformat(last_hb.replace("Z", "+00:00"))
+    except (ValueError, TypeError):
+        return None
+
+
+def stage_for(elapsed_minutes: float) -> int:
+    """Highest lifecycle stage reached after elapsed_minutes without heartbeat."""
+    stage = STAGE_NONE
+    for candidate, threshold in STAGE_THRESHOLDS.items():
+        if elapsed_minutes > threshold:
+            stage = candidate
+    return stage
+
+
+def handle_stage(
+    stage: int,
+    assignment: dict,
+    project_root: Path,
+    elapsed_minutes: float,
+) -> str | None:
+    """
+    Act on an assignment that reached a lifecycle stage.
+
+    Returns:
+        Stats key for the action taken (warnings, stalled, reverted, errors)
+    """
+    project_name = get_project_name(project_root)
+    bead_id = assignment.get("bead_id", "")
+    agent_id = assignment.get("agent_session_id", "")[:8]
+
+    if stage == STAGE_ORPHAN:
+        if _bead_is_closed(bead_id, project_root):
+            # Closed directly via bd without a release - just retire the claim
+            release_bead(bead_id, status="completed", project_root=project_root)
+            return None
+        log(
+            f"[{project_name}] ORPHAN: {bead_id} (agent {agent_id}) - {elapsed_minutes:.0f}min idle, reverting",
+            "INFO",
+            project_root,
+        )
+        if revert_bead_to_open(bead_id, project_root):
+            release_bead(bead_id, status="timed_out", project_root=project_root)
+            return "reverted"
+        log(f"[{project_name}] Failed to revert {bead_id}", "ERROR", project_root)
+        return "errors"
+
+    if stage == STAGE_STALLED:
+        log(
+            f"[{project_name}] STALLED: {bead_id} (agent {agent_id}) - {elapsed_minutes:.0f}min idle",
+            "WARN",
+            project_root,
+        )
+        return "stalled"
+
+    if stage == STAGE_STALE:
+        log(
+            f"[{project_name}] STALE: {bead_id} (agent {agent_id}) - {elapsed_minutes:.0f}min since heartbeat",
+            "WARN",
+            project_root,
+        )
+        return "warnings"
+
+    return None
+
+
 def scan_project(project_root: Path) -> dict[str, int]:
     """
     Scan a single project for stale assignments.
@@ -111,59 +225,24 @@ def scan_project(project_root: Path) -> dict[str, int]:
     now = datetime.now(timezone.utc)
 
     for assignment in active:
-        bead_id = assignment.get("bead_id", "")
-        agent_id = assignment.get("agent_session_id", "")[:8]
-
-        # Calculate elapsed time
-        last_hb = assignment.get("last_heartbeat", assignment.get("claimed_at", ""))
-        if not last_hb:
+        if not assignment.get("last_heartbeat", assignment.get("claimed_at", "")):
             continue
 
-        try:
-            hb_time = datetime.fromisoformat(last_hb.replace("Z", "+00:00"))
-            elapsed_minutes = (now - hb_time).total_seconds() / 60
-        except (ValueError, TypeError):
+        hb_time = _heartbeat_time(assignment)
+        if hb_time is None:
             log(
-                f"[{project_name}] Cannot parse timestamp for {bead_id}",
+                f"[{project_name}] Cannot parse timestamp for {assignment.get('bead_id', '')}",
                 "WARN",
                 project_root,
             )
             continue
 
-        # Determine action based on elapsed time
-        if elapsed_minutes > ORPHAN_THRESHOLD_MINUTES:
-            # Auto-revert to open
-            log(
-                f"[{project_name}] ORPHAN: {bead_id} (agent {agent_id}) - {elapsed_minutes:.0f}min idle, reverting",
-                "INFO",
-                project_root,
-            )
-            if revert_bead_to_open(bead_id, project_root):
-                release_bead(bead_id, status="timed_out", project_root=project_root)
-                stats["reverted"] += 1
-            else:
-                log(
-                    f"[{project_name}] Failed to revert {bead_id}",
-                    "ERROR",
-                    project_root,
-                )
-                stats["errors"] += 1
-
-        elif elapsed_minutes > STALLED_THRESHOLD_MINUTES:
-            log(
-                f"[{project_name}] STALLED: {bead_id} (agent {agent_id}) - {elapsed_minutes:.0f}min idle",
-                "WARN",
-                project_root,
-            )
-            stats["stalled"] += 1
-
-        elif elapsed_minutes > STALE_THRESHOLD_MINUTES:
-            log(
-                f"[{project_name}] STALE: {bead_id} (agent {agent_id}) - {elapsed_minutes:.0f}min since heartbeat",
-                "WARN",
-                project_root,
-            )
-            stats["warnings"] += 1
+        elapsed_minutes = (now - hb_time).total_seconds() / 60
+        key = handle_stage(
+            stage_for(elapsed_minutes), assignment, project_root, elapsed_minutes
+        )
+        if key:
+            stats[key] += 1
 
     return stats
 
@@ -183,6 +262,321 @@ def scan_all_projects() -> dict[str, int]:
     return totals
 
 
+# =============================================================================
+# INOTIFY (ctypes - no extra dependencies)
+# =============================================================================
+
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+_WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_DELETE
+_EVENT_HEADER = struct.Struct("iIII")  # wd, mask, cookie, len
+
+
+class Inotify:
+    """Minimal inotify wrapper over libc via ctypes."""
+
+    def __init__(self) -> None:
+        libc_name = ctypes.util.find_library("c") or "libc.so.6"
+        self._libc = ctypes.CDLL(libc_name, use_errno=True)
+        fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.fd = fd
+        self._watches: dict[int, Path] = {}
+
+    def add_watch(self, path: Path, mask: int = _WATCH_MASK) -> int:
+        """Watch a directory; returns the watch descriptor."""
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(str(path)), mask)
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), f"inotify_add_watch failed: {path}")
+        self._watches[wd] = path
+        return wd
+
+    def read_events(self) -> list[tuple[Path, str]]:
+        """Drain pending events as (watched_dir, filename) pairs."""
+        events = []
+        while True:
+            try:
+                buf = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            offset = 0
+            while offset + _EVENT_HEADER.size <= len(buf):
+                wd, _mask, _cookie, length = _EVENT_HEADER.unpack_from(buf, offset)
+                start = offset + _EVENT_HEADER.size
+                name = (
+                    buf[start : start + length].rstrip(b"\0").decode(errors="replace")
+                )
+                offset = start + length
+                if wd in self._watches:
+                    events.append((self._watches[wd], name))
+        return events
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+# =============================================================================
+# EVENT-DRIVEN WATCHER
+# =============================================================================
+
+
+class LifecycleWatcher:
+    """
+    Deadline-driven orphan detection across projects.
+
+    Each active assignment has one live heap entry: the time its next
+    lifecycle stage is reached, and that stage. Popping the entry reports
+    at least that stage, so a deadline always advances the assignment even
+    when float rounding puts "now" exactly on the threshold. `pending` maps the assignment to that
+    entry's sequence number; rescheduling or releasing an assignment
+    supersedes its old entry, which is skipped when popped. The heap is
+    compacted once superseded entries outnumber live ones, so frequent
+    reloads can't grow it without bound.
+    """
+
+    # Compact when the heap exceeds this multiple of live entries (+ slack)
+    COMPACT_FACTOR = 2
+    COMPACT_SLACK = 64
+
+    def __init__(self) -> None:
+        self.heap: list[tuple[float, int, str, str, str, int]] = []
+        self.pending: dict[tuple[Path, str, str], int] = {}
+        self.projects: set[Path] = set()
+        self.watched: set[Path] = set()
+        self.assignments: dict[tuple[Path, str, str], dict] = {}
+        self.notified: dict[tuple[Path, str, str, str], int] = {}
+        self.fingerprints: dict[Path, tuple] = {}
+        self._seq = 0
+        self.metrics: dict[str, float | int | str] = {
+            "mode": "poll",
+            "events": 0,
+            "reloads": 0,
+            "warnings": 0,
+            "stalled": 0,
+            "reverted": 0,
+            "errors": 0,
+            "max_action_lag_seconds": 0.0,
+        }
+        self.inotify: Inotify | None = None
+        try:
+            self.inotify = Inotify()
+            self.metrics["mode"] = "inotify"
+        except (OSError, AttributeError) as e:
+            log(f"inotify unavailable ({e}), falling back to stat polling", "WARN")
+
+    # -- project tracking --------------------------------------------------
+
+    def refresh_projects(self) -> None:
+        """Discover projects and watch any not yet watched.
+
+        A project whose .beads/ can't be watched yet (e.g. not created) is
+        retried on every refresh and reloaded once the watch is in place.
+        """
+        for root in get_all_project_roots():
+            new = root not in self.projects
+            self.projects.add(root)
+            if self.inotify and root not in self.watched:
+                try:
+                    self.inotify.add_watch(root / ".beads")
+                    self.watched.add(root)
+                    new = True  # Changes before the watch went unseen
+                except OSError as e:
+                    if new:
+                        log(f"Cannot watch {root}: {e}", "WARN")
+            if new:
+                self.reload_project(root)
+
+    def _fingerprint(self, root: Path) -> tuple:
+        """Stat fingerprint of watched files (poll mode change detection)."""
+        entries = []
+        try:
+            with os.scandir(root / ".beads") as it:
+                for entry in it:
+                    if entry.name.endswith(WATCHED_SUFFIXES):
+                        st = entry.stat()
+                        entries.append((entry.name, st.st_mtime_ns, st.st_size))
+        except OSError:
+            pass
+        return tuple(sorted(entries))
+
+    def reload_project(self, root: Path) -> None:
+        """Re-read a project's active assignments and reschedule deadlines."""
+        self.fingerprints[root] = self._fingerprint(root)
+        self.metrics["reloads"] = int(self.metrics["reloads"]) + 1
+
+        for key in [k for k in self.assignments if k[0] == root]:
+            del self.assignments[key]
+            self.pending.pop(key, None)
+
+        try:
+            active = get_active_assignments(root)
+        except Exception as e:
+            log(f"Cannot read assignments for {root}: {e}", "ERROR")
+            return
+
+        live = set()
+        for assignment in active:
+            bead_id = assignment.get("bead_id", "")
+            agent_id = assignment.get("agent_session_id", "")
+            self.assignments[(root, bead_id, agent_id)] = assignment
+            live.add((root, bead_id, agent_id, assignment.get("last_heartbeat", "")))
+            self._schedule(root, assignment)
+
+        # Forget notifications for released or re-heartbeated assignments
+        for key in [k for k in self.notified if k[0] == root and k not in live]:
+            del self.notified[key]
+
+    def _schedule(self, root: Path, assignment: dict) -> None:
+        """Push the deadline of the assignment's next unreported stage."""
+        hb_time = _heartbeat_time(assignment)
+        if hb_time is None:
+            return
+        bead_id = assignment.get("bead_id", "")
+        agent_id = assignment.get("agent_session_id", "")
+        notified = self.notified.get(
+            (root, bead_id, agent_id, assignment.get("last_heartbeat", "")),
+            STAGE_NONE,
+        )
+        for stage, threshold in STAGE_THRESHOLDS.items():
+            if stage > notified:
+                due = hb_time.timestamp() + threshold * 60
+                self._seq += 1
+                self.pending[(root, bead_id, agent_id)] = self._seq
+                heapq.heappush(
+                    self.heap, (due, self._seq, str(root), bead_id, agent_id, stage)
+                )
+                if (
+                    len(self.heap)
+                    > self.COMPACT_FACTOR * len(self.pending) + self.COMPACT_SLACK
+                ):
+                    self._compact()
+                return
+
+    def _is_live(self, entry: tuple[float, int, str, str, str, int]) -> bool:
+        _due, seq, root_str, bead_id, agent_id, _stage = entry
+        return self.pending.get((Path(root_str), bead_id, agent_id)) == seq
+
+    def _compact(self) -> None:
+        """Drop superseded heap entries."""
+        self.heap = [e for e in self.heap if self._is_live(e)]
+        heapq.heapify(self.heap)
+
+    def _drop_superseded_head(self) -> None:
+        while self.heap and not self._is_live(self.heap[0]):
+            heapq.heappop(self.heap)
+
+    # -- event handling ----------------------------------------------------
+
+    def handle_events(self, events: list[tuple[Path, str]]) -> None:
+        """Reload projects whose assignment or beads DB files changed."""
+        changed = set()
+        for watched_dir, name in events:
+            if name.endswith(WATCHED_SUFFIXES):
+                changed.add(watched_dir.parent)
+        self.metrics["events"] = int(self.metrics["events"]) + len(events)
+        for root in changed:
+            self.reload_project(root)
+
+    def poll_changes(self) -> None:
+        """Poll-mode substitute for inotify events."""
+        for root in list(self.projects):
+            if self._fingerprint(root) != self.fingerprints.get(root):
+                self.reload_project(root)
+
+    def process_due(self, now: float | None = None) -> int:
+        """Act on all deadlines that have passed. Returns actions taken."""
+        now = time.time() if now is None else now
+        actions = 0
+        while self.heap and self.heap[0][0] <= now:
+            entry = heapq.heappop(self.heap)
+            if not self._is_live(entry):
+                continue  # Superseded by a reload or reschedule
+            due, _seq, root_str, bead_id, agent_id, target = entry
+            root = Path(root_str)
+            del self.pending[(root, bead_id, agent_id)]
+            assignment = self.assignments.get((root, bead_id, agent_id))
+            hb_time = _heartbeat_time(assignment) if assignment else None
+            if assignment is None or hb_time is None:
+                continue
+
+            elapsed = (now - hb_time.timestamp()) / 60
+            stage = max(target, stage_for(elapsed))
+            notify_key = (root, bead_id, agent_id, assignment.get("last_heartbeat", ""))
+            if stage > self.notified.get(notify_key, STAGE_NONE):
+                self.notified[notify_key] = stage
+                result = handle_stage(stage, assignment, root, elapsed)
+                if result:
+                    self.metrics[result] = int(self.metrics[result]) + 1
+                    actions += 1
+                lag = now - due
+                if lag > float(self.metrics["max_action_lag_seconds"]):
+                    self.metrics["max_action_lag_seconds"] = round(lag, 3)
+            if stage < STAGE_ORPHAN:
+                self._schedule(root, assignment)
+        return actions
+
+    def next_timeout(self, now: float, cap: float) -> float:
+        """Seconds until the next deadline (bounded by cap)."""
+        self._drop_superseded_head()
+        if not self.heap:
+            return cap
+        return max(0.0, min(cap, self.heap[0][0] - now))
+
+    # -- metrics -----------------------------------------------------------
+
+    def write_metrics(self) -> None:
+        """Persist metrics for --status (watched projects, queue size)."""
+        self._drop_superseded_head()
+        snapshot = {
+            **self.metrics,
+            "watched_projects": len(self.projects),
+            "active_assignments": len(self.assignments),
+            "queue_size": len(self.pending),
+            "next_deadline": self.heap[0][0] if self.heap else None,
+            "updated_at": datetime.now(timezone.utc).isoformat(),
+            "pid": os.getpid(),
+        }
+        try:
+            write_json_atomic(METRICS_FILE, snapshot, indent=2)
+        except OSError:
+            pass
+
+    # -- main loop ---------------------------------------------------------
+
+    def run(self) -> None:
+        """Block forever, waking on file events, deadlines or rescans."""
+        self.refresh_projects()
+        self.write_metrics()
+        next_rescan = time.time() + RESCAN_INTERVAL_SECONDS
+        cap = RESCAN_INTERVAL_SECONDS if self.inotify else POLL_FALLBACK_SECONDS
+
+        while True:
+            now = time.time()
+            timeout = min(self.next_timeout(now, cap), max(0.0, next_rescan - now))
+
+            if self.inotify:
+                ready, _, _ = select.select([self.inotify.fd], [], [], timeout)
+                if ready:
+                    self.handle_events(self.inotify.read_events())
+            else:
+                time.sleep(timeout)
+                self.poll_changes()
+
+            now = time.time()
+            if now >= next_rescan:
+                self.refresh_projects()
+                next_rescan = now + RESCAN_INTERVAL_SECONDS
+
+            self.process_due(now)
+            self.write_metrics()
+
+
 def write_pid() -> None:
     """Write PID file for status checking."""
     PID_FILE.parent.mkdir(parents=True, exist_ok=True)
@@ -219,6 +613,19 @@ def show_status() -> int:
     else:
         print("✗ Daemon not running")
 
+    if METRICS_FILE.exists():
+        try:
+            metrics = json.loads(METRICS_FILE.read_text())
+            print(
+                f"  Mode: {metrics.get('mode')} | "
+                f"watched projects: {metrics.get('watched_projects', 0)} | "
+                f"queue size: {metrics.get('queue_size', 0)} | "
+                f"reverted: {metrics.get('reverted', 0)} | "
+                f"max action lag: {metrics.get('max_action_lag_seconds', 0)}s"
+            )
+        except (OSError, json.JSONDecodeError):
+            pass
+
     # Show recent global log entries
     if GLOBAL_LOG_FILE.exists():
         print(f"\nRecent log ({GLOBAL_LOG_FILE}):")
@@ -261,24 +668,16 @@ def run_daemon() -> None:
         sys.exit(1)
 
     write_pid()
-    log("Daemon started - scanning all projects")
+    watcher = LifecycleWatcher()
+    log(f"Daemon started ({watcher.metrics['mode']}) - watching all projects")
 
     try:
-        while True:
-            stats = scan_all_projects()
-
-            total = stats["warnings"] + stats["stalled"] + stats["reverted"]
-            if total > 0:
-                log(
-                    f"Scan complete ({stats['projects']} projects): "
-                    f"{stats['warnings']} warnings, {stats['stalled']} stalled, {stats['reverted']} reverted"
-                )
-
-            time.sleep(SCAN_INTERVAL_SECONDS)
-
+        watcher.run()
     except KeyboardInterrupt:
         log("Daemon stopped (SIGINT)")
     finally:
+        if watcher.inotify:
+            watcher.inotify.close()
         remove_pid()
 
 
@@ -308,6 +707,7 @@ def main() -> int:
     parser = argparse.ArgumentParser(
         description="Bead lifecycle daemon - monitors and cleans up orphaned beads across all projects"
     )
+    parser.add_argument("--daemon", action="store_true", help="Run as daemon (default)")
     parser.add_argument("--once", action="store_true", help="Run single scan then exit")
     parser.add_argument("--status", action="store_true", help="Show daemon status")
     parser.add_argument("--project", type=Path, help="Scan specific project only")
@@ -7,11 +7,17 @@ Generates capabilities_index.json from:
 2. ~/.claude/commands/*.md - Parse YAML frontmatter
 3. ~/.claude/capabilities/registry.yaml - Agents + MCPs
 
+Also writes the compiled form next to the output (see lib/capability_index)
+so the router can query capabilities without parsing the JSON.
+
+Regeneration is incremental: each card records its source file fingerprint
+and is reused while that file (and the tag vocabulary) is unchanged.
+
 Usage:
     capability_inventory.py [--refresh] [--validate] [--output PATH]
 
 Options:
-    --refresh    Force regeneration even if sources unchanged
+    --refresh    Force regeneration of every card even if sources unchanged
     --validate   Validate output against schema (no write)
     --output     Output path (default: ~/.claude/capabilities/capabilities_index.json)
 """
@@ -29,6 +35,8 @@ from typing import Any
 # Add lib to path
 sys.path.insert(0, str(Path(__file__).parent.parent / "lib"))
 
+from capability_index import compile_index, compiled_path_for, write_compiled  # noqa: E402
+
 try:
     import yaml
 except ImportError:
@@ -245,8 +253,23 @@ def extract_summary(docstring: str, max_len: int = 140) -> str:
 # PARSERS
 # =============================================================================
 
-def parse_ops_scripts(valid_tags: set[str]) -> list[dict[str, Any]]:
-    """Parse ops scripts into capability cards."""
+def reuse_card(path: Path, previous: dict[str, dict]) -> tuple[str, dict | None]:
+    """Fingerprint a source file and return its previous card if unchanged."""
+    fingerprint = compute_fingerprint(path)
+    card = previous.get(str(path))
+    if card and card.get("source", {}).get("fingerprint") == fingerprint:
+        return fingerprint, card
+    return fingerprint, None
+
+
+def parse_ops_scripts(
+    valid_tags: set[str], previous: dict[str, dict] | None = None
+) -> list[dict[str, Any]]:
+    """Parse ops scripts into capability cards.
+
+    previous maps source paths to cards from the last run; unchanged files
+    reuse them instead of being re-read.
+    """
     cards = []
     
     if not OPS_DIR.exists():
@@ -256,6 +279,11 @@ def parse_ops_scripts(valid_tags: set[str]) -> list[dict[str, Any]]:
         if path.name.startswith("_") or path.name.startswith("."):
             continue
         
+        fingerprint, card = reuse_card(path, previous or {})
+        if card:
+            cards.append(card)
+            continue
+        
         try:
             content = path.read_text()
         except Exception:
@@ -281,6 +309,7 @@ def parse_ops_scripts(valid_tags: set[str]) -> list[dict[str, Any]]:
             "source": {
                 "source_type": "ops",
                 "path": str(path),
+                "fingerprint": fingerprint,
             },
         }
         
@@ -289,8 +318,10 @@ def parse_ops_scripts(valid_tags: set[str]) -> list[dict[str, Any]]:
     return cards
 
 
-def parse_slash_commands(valid_tags: set[str]) -> list[dict[str, Any]]:
-    """Parse slash commands into capability cards."""
+def parse_slash_commands(
+    valid_tags: set[str], previous: dict[str, dict] | None = None
+) -> list[dict[str, Any]]:
+    """Parse slash commands into capability cards (reusing unchanged ones)."""
     cards = []
     
     if not COMMANDS_DIR.exists():
@@ -300,6 +331,11 @@ def parse_slash_commands(valid_tags: set[str]) -> list[dict[str, Any]]:
         if path.name.startswith("_") or path.name.startswith("."):
             continue
         
+        fingerprint, card = reuse_card(path, previous or {})
+        if card:
+            cards.append(card)
+            continue
+        
         try:
             content = path.read_text()
         except Exception:
@@ -348,6 +384,7 @@ def parse_slash_commands(valid_tags: set[str]) -> list[dict[str, Any]]:
             "source": {
                 "source_type": "commands",
                 "path": str(path),
+                "fingerprint": fingerprint,
             },
         }
         
@@ -416,9 +453,11 @@ def generate_inventory(refresh: bool = False) -> dict[str, Any]:
         {"source_type": "ops_dir", "path": str(OPS_DIR), "fingerprint": compute_fingerprint(OPS_DIR)},
         {"source_type": "commands_dir", "path": str(COMMANDS_DIR), "fingerprint": compute_fingerprint(COMMANDS_DIR)},
         {"source_type": "registry", "path": str(REGISTRY_PATH), "fingerprint": compute_fingerprint(REGISTRY_PATH)},
+        {"source_type": "tag_vocab", "path": str(TAG_VOCAB_PATH), "fingerprint": compute_fingerprint(TAG_VOCAB_PATH)},
     ]
     
     # Check if regeneration needed
+    existing = {}
     if not refresh and OUTPUT_PATH.exists():
         try:
             with open(OUTPUT_PATH) as f:
@@ -427,12 +466,27 @@ def generate_inventory(refresh: bool = False) -> dict[str, Any]:
                 print("Sources unchanged, skipping regeneration")
                 return existing
         except Exception:
-            pass
+            existing = {}
+    
+    # Cards from the last run, reusable per source file. Tags depend on the
+    # vocabulary, so a vocabulary change invalidates all of them.
+    old_sources = {s["source_type"]: s for s in existing.get("sources", [])}
+    new_sources = {s["source_type"]: s for s in sources}
+    previous: dict[str, dict] = {}
+    if old_sources.get("tag_vocab") == new_sources["tag_vocab"]:
+        for cap in existing.get("capabilities", []):
+            path = cap.get("source", {}).get("path")
+            if path:
+                previous[path] = cap
     
     # Parse all sources
-    ops_cards = parse_ops_scripts(valid_tags)
-    cmd_cards = parse_slash_commands(valid_tags)
-    agents, mcp_tools = parse_registry()
+    ops_cards = parse_ops_scripts(valid_tags, previous)
+    cmd_cards = parse_slash_commands(valid_tags, previous)
+    if old_sources.get("registry") == new_sources["registry"]:
+        agents = [c for c in existing["capabilities"] if c["type"] == "agent"]
+        mcp_tools = [c for c in existing["capabilities"] if c["type"] == "mcp_tool"]
+    else:
+        agents, mcp_tools = parse_registry()
     
     # Combine all capabilities
     capabilities = agents + mcp_tools + ops_cards + cmd_cards
@@ -526,11 +580,14 @@ def main():
         print(f"Validation passed: {len(index['capabilities'])} capabilities")
         return
     
-    # Write output
+    # Write output, then its compiled form (stamped with the written file)
     with open(args.output, "w") as f:
         json.dump(index, f, indent=2)
+    compiled_path = compiled_path_for(args.output)
+    write_compiled(compile_index(index, args.output), compiled_path)
     
     print(f"Generated {args.output}")
+    print(f"Compiled {compiled_path}")
     print(f"  - {sum(1 for c in index['capabilities'] if c['type'] == 'agent')} agents")
     print(f"  - {sum(1 for c in index['capabilities'] if c['type'] == 'mcp_tool')} MCP tools")
     print(f"  - {sum(1 for c in index['capabilities'] if c['type'] == 'ops_script')} ops scripts")
@@ -15,6 +15,7 @@ Usage:
     codemode_demo.py --plan         # Demo PlanExecutor
     codemode_demo.py --handoff      # Demo HandoffState protocol
     codemode_demo.py --hook         # Demo hook integration
+    codemode_demo.py --bench        # Benchmark plan scheduling (makespan)
     codemode_demo.py --status       # Show system status
 """
 
@@ -22,7 +23,9 @@ from __future__ import annotations
 
 import argparse
 import json
+import shutil
 import sys
+import tempfile
 import time
 from pathlib import Path
 
@@ -41,8 +44,10 @@ from _codemode_executor import (  # noqa: E402
     read_handoff_state,
     record_tool_result,
     submit_tool_call,
-    HANDOFF_STATE,
+    wait_for_result,
+    HANDOFF_DIR,
     EXECUTION_LOG,
+    RESULT_CACHE_LOG,
 )
 from _codemode_planner import (
     CodeModePlanner,
@@ -59,6 +64,14 @@ DEMO_CACHE_MAX_ENTRIES = 5
 MOCK_LATENCY_SECONDS = 0.05
 PARALLEL_CACHE_TTL_SECONDS = 60
 
+# Scheduler benchmark constants
+BENCH_SEEDS = (1, 2, 3, 4, 5)
+BENCH_PLAN_SIZE = 24
+BENCH_MAX_WORKERS = 4
+BENCH_LATENCY_MS = (5, 60)  # Typical call latency range
+BENCH_SLOW_MS = 200  # Occasional slow call (e.g. a PAL consult)
+BENCH_SLOW_RATE = 0.1
+
 
 def print_header(title: str) -> None:
     """Print a formatted section header."""
@@ -104,6 +117,29 @@ def demo_status() -> None:
     else:
         print("  📭 No active handoff state")
 
+    # Result cache
+    print_subheader("Result Cache")
+    if RESULT_CACHE_LOG.exists():
+        stats = ResultCache().stats()
+        print(f"  💾 Entries: {stats['entries']} ({stats['bytes'] / 1024:.1f} KiB)")
+        plans = cached = calls = 0
+        try:
+            for line in EXECUTION_LOG.read_text().splitlines():
+                entry = json.loads(line)
+                if entry.get("type") == "plan_execution" and "cached_count" in entry:
+                    plans += 1
+                    calls += entry.get("call_count", 0)
+                    cached += entry["cached_count"]
+        except (json.JSONDecodeError, OSError):
+            pass
+        if calls:
+            print(
+                f"  🎯 Plan hit rate: {cached / calls:.0%} "
+                f"({cached}/{calls} calls over {plans} plans)"
+            )
+    else:
+        print("  📭 No cached results yet")
+
     # Execution log
     print_subheader("Execution Log")
     if EXECUTION_LOG.exists():
@@ -123,8 +159,13 @@ def demo_cache() -> None:
     """Demonstrate ResultCache functionality."""
     print_header("ResultCache Demo")
 
+    demo_dir = Path(tempfile.mkdtemp(prefix="codemode_cache_demo_"))
+    demo_log = demo_dir / "results.jsonl"
     cache = ResultCache(
-        ttl_seconds=DEMO_CACHE_TTL_SECONDS, max_entries=DEMO_CACHE_MAX_ENTRIES
+        ttl_seconds=DEMO_CACHE_TTL_SECONDS,
+        max_entries=DEMO_CACHE_MAX_ENTRIES,
+        path=demo_log,
+        tool_ttls={"mcp__pal__chat": 0},
     )
 
     print_subheader("1. Cache Miss (First Call)")
@@ -154,7 +195,21 @@ def demo_cache() -> None:
         cache.set(f"tool_{i}", {"arg": i}, {"result": i})
     print("  Added 6 entries to cache with max 5")
     print(f"  Stats: {cache.stats()}")
-    print("  Oldest entry evicted")
+    print("  Least recently used entry evicted")
+
+    print_subheader("6. Per-Tool TTL Policy")
+    cache.set("mcp__pal__chat", {"prompt": "hi"}, {"reply": "hello"})
+    hit, _ = cache.get("mcp__pal__chat", {"prompt": "hi"})
+    print(f"  mcp__pal__chat TTL: {cache.ttl_for('mcp__pal__chat')}s -> hit: {hit}")
+    print("  (TTLs come from 'cache_ttl' in the schema cache unless overridden)")
+
+    print_subheader("7. Persistence Across Processes")
+    reopened = ResultCache(path=demo_log, tool_ttls={})
+    hit, result = reopened.get("tool_5", {"arg": 5})
+    print(f"  Fresh instance, same log -> hit: {hit}, result: {result}")
+    print(f"  Hit rates: {json.dumps(reopened.stats()['by_tool'], indent=4)}")
+
+    shutil.rmtree(demo_dir, ignore_errors=True)
 
 
 def demo_plan() -> None:
@@ -244,7 +299,8 @@ def demo_plan() -> None:
     print("  3 calls × 50ms each = ~50ms total (not 150ms)")
 
     print_subheader("4. Execute with Cache")
-    cache = ResultCache(ttl_seconds=PARALLEL_CACHE_TTL_SECONDS)
+    # Memory-only so mock results never reach the persistent cache
+    cache = ResultCache(ttl_seconds=PARALLEL_CACHE_TTL_SECONDS, path=None)
     executor3 = PlanExecutor(tool_invoker=mock_invoker, cache=cache)
 
     # First execution (populate cache)
@@ -319,13 +375,32 @@ def demo_handoff() -> None:
     print(f"  demo-01 result: {result1.success if result1 else 'not found'}")
     print(f"  demo-02 result: {result2.success if result2 else 'not found'}")
 
-    print_subheader("5. View Handoff File")
+    print_subheader("5. View Handoff Store")
     state = read_handoff_state()
     if state:
-        print(f"  File: {HANDOFF_STATE}")
+        print(f"  Dir: {HANDOFF_DIR}")
         print(f"  Age: {time.time() - state.created_at:.1f}s")
         print(f"  Pending: {len(state.pending)}, Completed: {len(state.completed)}")
 
+    print_subheader("6. Executor Waits on FIFO Notification")
+    import threading
+
+    submit_tool_call(
+        ToolCallRequest(id="demo-03", tool="mcp__serena__list_dir", args={})
+    )
+    recorded_at = []
+
+    def claude_side() -> None:
+        time.sleep(MOCK_LATENCY_SECONDS)
+        recorded_at.append(time.perf_counter())
+        record_tool_result(call_id="demo-03", success=True, result={"dirs": []})
+
+    threading.Thread(target=claude_side).start()
+    response = wait_for_result("demo-03", timeout=5)
+    woke_ms = (time.perf_counter() - recorded_at[0]) * 1000 if recorded_at else 0
+    print(f"  Result: {response.result if response else 'timed out'}")
+    print(f"  Wake-up latency after record: {woke_ms:.2f}ms")
+
     # Cleanup
     clear_handoff_state()
     print("\n  Cleaned up handoff state")
@@ -407,6 +482,90 @@ def demo_hook() -> None:
     clear_handoff_state()
 
 
+def _synthetic_plan(seed: int, size: int = BENCH_PLAN_SIZE) -> ExecutionPlan:
+    """Random DAG plan; each call sleeps for args["ms"] in the bench invoker."""
+    import random
+
+    rng = random.Random(seed)
+    calls = []
+    for i in range(size):
+        earlier = [c.id for c in calls[max(0, i - 8) : i]]
+        deps = rng.sample(earlier, k=min(len(earlier), rng.choice((0, 1, 1, 2))))
+        slow = rng.random() < BENCH_SLOW_RATE
+        ms = BENCH_SLOW_MS if slow else rng.randint(*BENCH_LATENCY_MS)
+        tool = "mcp__pal__chat" if slow else f"mcp__bench__tool{i % 3}"
+        calls.append(
+            ToolCallSpec(
+                id=f"call-{i:02d}", tool=tool, args={"ms": ms}, depends_on=deps
+            )
+        )
+    return ExecutionPlan(run_id=f"bench-{seed}", calls=calls)
+
+
+def _bench_invoker(tool: str, args: dict) -> dict:
+    time.sleep(args["ms"] / 1000)
+    return {"ok": True}
+
+
+def _critical_path_ms(plan: ExecutionPlan) -> float:
+    """Lower bound on makespan: the longest dependency chain."""
+    finish: dict[str, float] = {}
+    for call in plan.calls:  # Synthetic plans are topologically ordered
+        start = max((finish[d] for d in call.depends_on), default=0.0)
+        finish[call.id] = start + call.args["ms"]
+    return max(finish.values(), default=0.0)
+
+
+def _run_waves(plan: ExecutionPlan, max_workers: int) -> float:
+    """Baseline: the previous wave scheduler (fresh pool, wait for whole wave)."""
+    from concurrent.futures import ThreadPoolExecutor
+
+    executor = PlanExecutor(tool_invoker=_bench_invoker, log_executions=False)
+    pending = {call.id: call for call in plan.calls}
+    done: set[str] = set()
+    start = time.time()
+    while pending:
+        ready = [c for c in pending.values() if all(d in done for d in c.depends_on)]
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            for call in ready:
+                pool.submit(executor._execute_call, call)
+        for call in ready:
+            done.add(call.id)
+            del pending[call.id]
+    return (time.time() - start) * 1000
+
+
+def bench_scheduler() -> None:
+    """Compare makespan of wave scheduling vs the ready-queue scheduler."""
+    print_header("Plan Scheduler Benchmark")
+    print(
+        f"  {BENCH_PLAN_SIZE} calls/plan, {BENCH_MAX_WORKERS} workers, "
+        f"latency {BENCH_LATENCY_MS[0]}-{BENCH_LATENCY_MS[1]}ms "
+        f"({BENCH_SLOW_RATE:.0%} at {BENCH_SLOW_MS}ms)\n"
+    )
+    print(f"  {'seed':>4}  {'critical':>9}  {'waves':>9}  {'ready-q':>9}  speedup")
+
+    totals = [0.0, 0.0]
+    with PlanExecutor(
+        tool_invoker=_bench_invoker,
+        log_executions=False,
+        max_workers=BENCH_MAX_WORKERS,
+    ) as executor:
+        for seed in BENCH_SEEDS:
+            plan = _synthetic_plan(seed)
+            waves_ms = _run_waves(plan, BENCH_MAX_WORKERS)
+            ready_ms = executor.execute(plan).total_duration_ms
+            totals[0] += waves_ms
+            totals[1] += ready_ms
+            print(
+                f"  {seed:>4}  {_critical_path_ms(plan):>7.0f}ms  {waves_ms:>7.0f}ms"
+                f"  {ready_ms:>7.0f}ms  {waves_ms / ready_ms:.2f}x"
+            )
+
+    print(f"\n  Total: waves {totals[0]:.0f}ms, ready-queue {totals[1]:.0f}ms")
+    print(f"  Speedup: {totals[0] / totals[1]:.2f}x")
+
+
 def demo_all() -> None:
     """Run all demos."""
     demo_status()
@@ -444,11 +603,24 @@ def main():
     parser.add_argument("--handoff", action="store_true", help="Demo HandoffState")
     parser.add_argument("--hook", action="store_true", help="Demo hook integration")
     parser.add_argument("--status", action="store_true", help="Show system status")
+    parser.add_argument(
+        "--bench", action="store_true", help="Benchmark plan scheduling makespan"
+    )
 
     args = parser.parse_args()
 
     # Default to status if no args
-    if not any([args.all, args.cache, args.plan, args.handoff, args.hook, args.status]):
+    if not any(
+        [
+            args.all,
+            args.cache,
+            args.plan,
+            args.handoff,
+            args.hook,
+            args.status,
+            args.bench,
+        ]
+    ):
         args.status = True
 
     if args.all:
@@ -464,6 +636,8 @@ def main():
             demo_handoff()
         if args.hook:
             demo_hook()
+        if args.bench:
+            bench_scheduler()
 
 
 if __name__ == "__main__":
@@ -7,6 +7,9 @@ Analyzes ~/.claude/tmp/fp_history.jsonl to detect:
 - Temporal patterns (certain times/workflows)
 - Reason clustering (common false positive scenarios)
 
+Reads the incremental FP rollup (lib/fp_rollup.py), which only parses
+history entries appended since its last checkpoint.
+
 Usage:
     fp_analyze.py              # Full analysis
     fp_analyze.py --summary    # Quick summary
@@ -19,72 +22,31 @@ nerve damage to prevent future misfires.
 
 import argparse
 import json
-from collections import Counter, defaultdict
-from datetime import datetime, timedelta
+import sys
 from pathlib import Path
 
-FP_HISTORY_FILE = Path.home() / ".claude" / "tmp" / "fp_history.jsonl"
+sys.path.insert(0, str(Path(__file__).parent.parent / "lib"))
 
+from fp_rollup import load_rollup, window  # noqa: E402
 
-def load_fp_history(since_days: int | None = None) -> list[dict]:
-    """Load FP history, optionally filtered by time."""
-    if not FP_HISTORY_FILE.exists():
-        return []
 
-    entries = []
-    cutoff = None
-    if since_days:
-        cutoff = datetime.now() - timedelta(days=since_days)
-
-    with FP_HISTORY_FILE.open() as f:
-        for line in f:
-            line = line.strip()
-            if not line:
-                continue
-            try:
-                entry = json.loads(line)
-                if cutoff:
-                    ts = datetime.fromisoformat(entry["timestamp"])
-                    if ts < cutoff:
-                        continue
-                entries.append(entry)
-            except (json.JSONDecodeError, KeyError):
-                continue
-
-    return entries
-
-
-def analyze_patterns(entries: list[dict]) -> dict:
-    """Analyze FP patterns for insights."""
-    if not entries:
-        return {"total": 0, "reducers": {}, "insights": []}
-
-    # Count by reducer
-    reducer_counts = Counter(e["reducer"] for e in entries)
-
-    # Group reasons by reducer
-    reducer_reasons: dict[str, list[str]] = defaultdict(list)
-    for e in entries:
-        if e.get("reason"):
-            reducer_reasons[e["reducer"]].append(e["reason"])
-
-    # Time analysis
-    hourly_counts: dict[int, int] = defaultdict(int)
-    daily_counts: dict[str, int] = defaultdict(int)
-    for e in entries:
-        try:
-            ts = datetime.fromisoformat(e["timestamp"])
-            hourly_counts[ts.hour] += 1
-            daily_counts[ts.strftime("%A")] += 1
-        except (ValueError, KeyError):
-            continue
+def analyze_patterns(rollup: dict, since_days: int | None = None) -> dict:
+    """Analyze FP patterns for insights, optionally over the last since_days."""
+    view = window(rollup, since_days)
+    clamped = {"clamped_days": view["clamped_days"]} if "clamped_days" in view else {}
+    if not view["total"]:
+        return {"total": 0, "reducers": {}, "insights": [], **clamped}
+
+    reducer_counts = view["reducers"]
+    reasons_by_reducer = view["reasons"]
 
     # Generate insights
     insights = []
 
     # High-frequency reducers (potential bugs)
-    total = len(entries)
-    for reducer, count in reducer_counts.most_common(5):
+    total = view["total"]
+    ranked = sorted(reducer_counts.items(), key=lambda x: -x[1])
+    for reducer, count in ranked[:5]:
         pct = (count / total) * 100
         if count >= 3 and pct >= 20:
             insights.append(
@@ -99,9 +61,11 @@ def analyze_patterns(entries: list[dict]) -> dict:
             )
 
     # Recent spike detection
-    if len(entries) >= 5:
-        recent = entries[-5:]
-        recent_reducers = Counter(e["reducer"] for e in recent)
+    if total >= 5:
+        recent_reducers: dict[str, int] = {}
+        for entry in rollup["recent"][-5:]:
+            reducer = entry["reducer"]
+            recent_reducers[reducer] = recent_reducers.get(reducer, 0) + 1
         for reducer, count in recent_reducers.items():
             if count >= 3:
                 insights.append(
@@ -114,40 +78,53 @@ def analyze_patterns(entries: list[dict]) -> dict:
                     }
                 )
 
-    # Common reasons (pattern extraction)
-    for reducer, reasons in reducer_reasons.items():
-        if len(reasons) >= 2:
-            reason_counts = Counter(reasons)
-            common = reason_counts.most_common(1)[0]
-            if common[1] >= 2:
-                insights.append(
-                    {
-                        "type": "common_reason",
-                        "severity": "medium",
-                        "reducer": reducer,
-                        "reason": common[0],
-                        "count": common[1],
-                        "message": f"{reducer}: '{common[0]}' cited {common[1]} times - specific pattern to fix",
-                    }
-                )
+    # Common reasons (clustered)
+    for reducer, clusters in reasons_by_reducer.items():
+        if clusters and clusters[0]["count"] >= 2:
+            common = clusters[0]
+            insights.append(
+                {
+                    "type": "common_reason",
+                    "severity": "medium",
+                    "reducer": reducer,
+                    "reason": common["reason"],
+                    "count": common["count"],
+                    "message": f"{reducer}: '{common['reason']}' cited {common['count']} times - specific pattern to fix",
+                }
+            )
 
     return {
         "total": total,
-        "reducers": dict(reducer_counts),
-        "reasons_by_reducer": dict(reducer_reasons),
-        "hourly_distribution": dict(hourly_counts),
-        "daily_distribution": dict(daily_counts),
+        "reducers": reducer_counts,
+        "reasons_by_reducer": reasons_by_reducer,
+        "hourly_distribution": {int(h): n for h, n in view["hours"].items()},
+        "daily_distribution": view["weekdays"],
         "insights": insights,
+        **clamped,
     }
 
 
+def _clamp_note(analysis: dict) -> list[str]:
+    """Line saying a --since window was cut to the bucket retention."""
+    if "clamped_days" not in analysis:
+        return []
+    days = analysis["clamped_days"]
+    return [f"⚠️ --since capped at {days}d (only {days} days of history are bucketed)"]
+
+
 def format_summary(analysis: dict) -> str:
     """Format a quick summary."""
     if analysis["total"] == 0:
-        return "📊 No false positives recorded yet. Framework nervous system healthy."
+        return "\n".join(
+            [
+                "📊 No false positives recorded yet. Framework nervous system healthy.",
+                *_clamp_note(analysis),
+            ]
+        )
 
     lines = [
         f"📊 **FP Analysis Summary** ({analysis['total']} total FPs)",
+        *_clamp_note(analysis),
         "",
     ]
 
@@ -185,8 +162,8 @@ def format_full_report(analysis: dict) -> str:
         for reducer, reasons in analysis["reasons_by_reducer"].items():
             if reasons:
                 lines.append(f"  {reducer}:")
-                for reason in reasons[-3:]:
-                    lines.append(f"    - {reason}")
+                for cluster in reasons[:3]:
+                    lines.append(f"    - {cluster['reason']} (x{cluster['count']})")
         lines.append("")
 
     # Time patterns
@@ -213,13 +190,14 @@ def format_reducer_focus(analysis: dict, reducer: str) -> str:
         f"📊 **{reducer}** FP Analysis",
         "",
         f"Count: {count} ({pct:.1f}% of all FPs)",
+        *_clamp_note(analysis),
         "",
     ]
 
     if reasons:
         lines.append("**Reasons given:**")
-        for reason in reasons:
-            lines.append(f"  - {reason}")
+        for cluster in reasons:
+            lines.append(f"  - {cluster['reason']} (x{cluster['count']})")
         lines.append("")
 
     # Check for insights about this reducer
@@ -248,8 +226,7 @@ def main():
         else:
             since_days = int(args.since)
 
-    entries = load_fp_history(since_days)
-    analysis = analyze_patterns(entries)
+    analysis = analyze_patterns(load_rollup(), since_days)
 
     if args.json:
         print(json.dumps(analysis, indent=2, default=str))
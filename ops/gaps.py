@@ -21,6 +21,7 @@ else:
     raise RuntimeError("Could not find project root with .claude/lib/core.py")
 sys.path.insert(0, os.path.join(_project_root, ".claude", "lib"))
 from core import setup_script, finalize, logger, handle_debug  # noqa: E402
+from scan_pipeline import scan_files  # noqa: E402
 
 # Stub patterns to detect incomplete code
 STUB_PATTERNS = [
@@ -32,6 +33,11 @@ STUB_PATTERNS = [
     (r"return\s+None\s*#.*stub", "Stub return"),
 ]
 
+# Bump when STUB_PATTERNS change (invalidates cached per-file results)
+STUB_PATTERNS_VERSION = "1"
+
+SKIP_DIRS = {".git", "__pycache__", "node_modules", ".venv", "venv"}
+
 
 def hunt_stubs(file_path):
     """Scan a file for stub patterns."""
@@ -56,6 +62,17 @@ def hunt_stubs(file_path):
     return stubs_found
 
 
+def collect_python_files(target):
+    """Python files under target (a file or directory)."""
+    if os.path.isfile(target):
+        return [target] if target.endswith(".py") else []
+    files = []
+    for root, dirs, names in os.walk(target):
+        dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
+        files.extend(os.path.join(root, n) for n in names if n.endswith(".py"))
+    return sorted(files)
+
+
 def analyze_gaps_via_oracle(file_path, model):
     """Analyze code for logical gaps using The Oracle."""
     api_key = os.getenv("OPENROUTER_API_KEY")
@@ -146,7 +163,7 @@ def main():
     )
 
     # Custom arguments
-    parser.add_argument("target", help="Python file to scan for gaps")
+    parser.add_argument("target", help="Python file or directory to scan for gaps")
     parser.add_argument(
         "--model",
         default="google/gemini-3-pro-preview",
@@ -157,6 +174,11 @@ def main():
         action="store_true",
         help="Only hunt for stubs, skip Oracle analysis",
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Ignore cached per-file stub results and rescan every file",
+    )
 
     args = parser.parse_args()
     handle_debug(args)
@@ -167,31 +189,44 @@ def main():
         logger.error(f"File not found: {args.target}")
         finalize(success=False)
 
-    if not args.target.endswith(".py"):
+    py_files = collect_python_files(args.target)
+    if not py_files:
         logger.error("Only Python files are supported")
         finalize(success=False)
 
     try:
-        # Phase 1: Stub Hunting
+        # Phase 1: Stub Hunting (parallel + cached per file)
         logger.info("🔍 Phase 1: Stub Hunting")
-        stubs = hunt_stubs(args.target)
+        results, stats = scan_files(
+            py_files,
+            name="gaps",
+            version=STUB_PATTERNS_VERSION,
+            worker=hunt_stubs,
+            use_cache=not args.no_cache,
+        )
+        logger.info(f"⚡ Scanned {stats.summary()}")
+        files_with_stubs = [(path, results[path]) for path in sorted(results) if results[path]]
+        total_stubs = sum(len(stubs) for _, stubs in files_with_stubs)
 
-        if stubs:
+        if files_with_stubs:
             print("\n" + "=" * 70)
             print("🚨 STUBS DETECTED")
             print("=" * 70)
-            for stub in stubs:
-                print(f"  Line {stub['line']}: {stub['type']}")
-                print(f"    → {stub['content']}")
+            for file_path, stubs in files_with_stubs:
+                if len(py_files) > 1:
+                    print(f"\n📄 {os.path.relpath(file_path, args.target)}")
+                for stub in stubs:
+                    print(f"  Line {stub['line']}: {stub['type']}")
+                    print(f"    → {stub['content']}")
             print("=" * 70)
-            print(f"Total stubs: {len(stubs)}\n")
+            print(f"Total stubs: {total_stubs}\n")
         else:
             logger.info("✅ No stubs detected")
 
-        # Phase 2: Logical Gap Analysis (unless --stub-only)
-        if not args.stub_only:
+        # Phase 2: Logical Gap Analysis (single file only, unless --stub-only)
+        if not args.stub_only and len(py_files) == 1:
             logger.info("🔍 Phase 2: Logical Gap Analysis")
-            gap_analysis = analyze_gaps_via_oracle(args.target, args.model)
+            gap_analysis = analyze_gaps_via_oracle(py_files[0], args.model)
 
             if gap_analysis:
                 print("\n" + "=" * 70)
@@ -201,12 +236,16 @@ def main():
                 print("=" * 70 + "\n")
             else:
                 logger.warning("⚠️  Oracle analysis failed")
+        elif not args.stub_only:
+            logger.info(
+                "ℹ️  Skipping Oracle analysis for multi-file scan (use single file for deep analysis)"
+            )
 
         # Summary
-        has_issues = len(stubs) > 0
+        has_issues = total_stubs > 0
         if has_issues:
             logger.warning(
-                f"⚠️  Completeness check FAILED: {len(stubs)} stub(s) detected"
+                f"⚠️  Completeness check FAILED: {total_stubs} stub(s) detected"
             )
             finalize(success=False)
         else:
@@ -20,15 +20,18 @@ self-diagnosis to catch problems before they cause harm.
 import argparse
 import json
 import sys
-from datetime import datetime, timedelta
+from datetime import datetime
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent / "lib"))
 
 CLAUDE_DIR = Path.home() / ".claude"
-FP_HISTORY_FILE = CLAUDE_DIR / "tmp" / "fp_history.jsonl"
 CONFIDENCE_JOURNAL = CLAUDE_DIR / "tmp" / "confidence_journal.log"
 MEMORY_DIR = CLAUDE_DIR / "memory"
+SESSION_START_TIMINGS = CLAUDE_DIR / "tmp" / "session_start_timings.jsonl"
+
+# Time-to-first-output above this at SessionStart is worth a look (ms)
+SESSION_START_SLOW_MS = 1500
 
 
 def get_state_file() -> Path:
@@ -153,36 +156,19 @@ def check_confidence_system() -> dict:
 
 
 def check_fp_history() -> dict:
-    """Check false positive history for patterns."""
+    """Check false positive history for patterns (from the FP rollup)."""
     result = {"status": "healthy", "issues": [], "metrics": {}}
 
-    if not FP_HISTORY_FILE.exists():
-        result["metrics"]["total_fps"] = 0
-        return result
-
     try:
-        entries = []
-        cutoff = datetime.now() - timedelta(days=14)
-
-        with FP_HISTORY_FILE.open() as f:
-            for line in f:
-                line = line.strip()
-                if not line:
-                    continue
-                try:
-                    entry = json.loads(line)
-                    ts = datetime.fromisoformat(entry["timestamp"])
-                    if ts >= cutoff:
-                        entries.append(entry)
-                except (json.JSONDecodeError, KeyError):
-                    continue
-
-        result["metrics"]["total_fps"] = len(entries)
-
-        if entries:
+        from fp_rollup import load_rollup, window
+
+        recent = window(load_rollup(), days=14)
+        result["metrics"]["total_fps"] = recent["total"]
+
+        if recent["total"]:
             from collections import Counter
 
-            reducer_counts = Counter(e.get("reducer", "unknown") for e in entries)
+            reducer_counts = Counter(recent["reducers"])
             result["metrics"]["by_reducer"] = dict(reducer_counts.most_common(5))
 
             for reducer, count in reducer_counts.items():
@@ -291,6 +277,59 @@ def check_session_state() -> dict:
     return result
 
 
+def check_session_start() -> dict:
+    """Check SessionStart latency from recorded step timings."""
+    result = {"status": "healthy", "issues": [], "metrics": {}}
+
+    if not SESSION_START_TIMINGS.exists():
+        result["status"] = "unknown"
+        result["issues"].append("No SessionStart timings recorded")
+        return result
+
+    try:
+        records = [
+            json.loads(line)
+            for line in SESSION_START_TIMINGS.read_text().splitlines()[-200:]
+            if line.strip()
+        ]
+        foreground = [r for r in records if r.get("phase") == "foreground"][-20:]
+        if not foreground:
+            result["status"] = "unknown"
+            return result
+
+        first_output = sorted(r["first_output_ms"] for r in foreground)
+        median = first_output[len(first_output) // 2]
+        result["metrics"]["first_output_ms_last"] = foreground[-1]["first_output_ms"]
+        result["metrics"]["first_output_ms_median"] = median
+        result["metrics"]["last_steps"] = {
+            step["name"]: f"{step['ms']:.0f}ms ({step['status']})"
+            for step in foreground[-1].get("steps", [])
+        }
+
+        if median > SESSION_START_SLOW_MS:
+            slowest = max(foreground[-1].get("steps", []), key=lambda s: s["ms"])
+            result["status"] = "degraded"
+            result["issues"].append(
+                f"Slow SessionStart: median {median:.0f}ms to first output "
+                f"(slowest step: {slowest['name']})"
+            )
+        timeouts = {
+            step["name"]
+            for r in foreground
+            for step in r.get("steps", [])
+            if step["status"] in ("timeout", "skipped")
+        }
+        if timeouts:
+            result["issues"].append(f"Steps timing out: {', '.join(sorted(timeouts))}")
+            result["status"] = "degraded"
+
+    except Exception as e:
+        result["issues"].append(f"Cannot read SessionStart timings: {e}")
+        result["status"] = "unknown"
+
+    return result
+
+
 def run_health_check(quick: bool = False) -> dict:
     """Run full health check."""
     results = {
@@ -306,6 +345,7 @@ def run_health_check(quick: bool = False) -> dict:
     if not quick:
         results["checks"]["fp_history"] = check_fp_history()
         results["checks"]["session_state"] = check_session_state()
+        results["checks"]["session_start"] = check_session_start()
 
     statuses = [c["status"] for c in results["checks"].values()]
     if "critical" in statuses:
@@ -9,6 +9,7 @@ Usage:
     python3 .claude/ops/hooks.py --test       # Run execution tests
     python3 .claude/ops/hooks.py --fix        # Auto-fix common issues
     python3 .claude/ops/hooks.py --prune      # Archive orphaned hooks
+    python3 .claude/ops/hooks.py --logs --hook stop_runner --level WARN --since 2h
 
 Official Spec: https://docs.anthropic.com/en/hooks-reference
 """
@@ -1669,6 +1670,34 @@ def run_execution_tests(settings: dict, threshold_ms: int = 500) -> dict:
     return results
 
 
+def parse_since(value: str) -> float:
+    """Epoch seconds for a relative window like '30m', '2h', '7d' (or '90s')."""
+    units = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+    match = re.fullmatch(r"(\d+(?:\.\d+)?)([smhd])", value.strip().lower())
+    if not match:
+        raise argparse.ArgumentTypeError(f"invalid window: {value} (use e.g. 30m, 2h, 7d)")
+    return time.time() - float(match.group(1)) * units[match.group(2)]
+
+
+def show_hook_logs(args) -> None:
+    """Print structured hook log records matching the query flags."""
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "hooks"))
+    from _logging import LOG_DIR, query_logs
+
+    records = query_logs(hook=args.hook, level=args.level, since=args.since,
+                         session=args.session, limit=args.limit)
+    if args.json:
+        print(json.dumps(records, indent=2))
+        return
+    if not records:
+        print(f"No matching log records in {LOG_DIR}")
+        return
+    for r in records:
+        stamp = time.strftime("%m-%d %H:%M:%S", time.localtime(r.get("ts", 0)))
+        event = f" {r['event']}" if r.get("event") else ""
+        print(f"{stamp} {r.get('level', '?'):5} [{r.get('hook')}]{event} {r.get('msg', '')}")
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Unified hook audit and testing tool",
@@ -1681,9 +1710,21 @@ def main():
     parser.add_argument("--json", action="store_true", help="Output as JSON")
     parser.add_argument("--strict", action="store_true", help="Treat warnings as errors")
     parser.add_argument("--prune", action="store_true", help="Archive orphaned hooks")
+    parser.add_argument("--logs", action="store_true", help="Query structured hook logs")
+    parser.add_argument("--hook", help="Logs: only this hook")
+    parser.add_argument("--level", choices=["DEBUG", "INFO", "WARN", "ERROR"],
+                        type=str.upper, help="Logs: minimum level")
+    parser.add_argument("--since", type=parse_since, help="Logs: window, e.g. 30m, 2h, 7d")
+    parser.add_argument("--session", help="Logs: only this session ID")
+    parser.add_argument("--limit", type=int, default=50, help="Logs: newest N records (default 50)")
 
     args = parser.parse_args()
 
+    # Log query mode (no settings needed)
+    if args.logs:
+        show_hook_logs(args)
+        sys.exit(0)
+
     # Load settings for both modes
     if not SETTINGS_FILE.exists():
         print(f"❌ Settings not found: {SETTINGS_FILE}", file=sys.stderr)
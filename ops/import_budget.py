@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Import Budget - Fail when a hook runner's import time exceeds its budget.
+
+Every tool call pays the runner's import time. The pre/post runners load
+hook metadata from the manifest (hooks/_hook_manifest.py) and import hook
+modules only when a matching tool arrives; this check keeps it that way.
+
+For each runner it runs `python -X importtime -c "import <runner>"` a few
+times in fresh processes and takes the best cumulative time (least noise).
+It also fails if a lazy runner imports a hook module at load.
+
+Usage:
+    import_budget.py                            # Check all runners
+    import_budget.py --runs 5 --top 15          # More samples, show heaviest imports
+    import_budget.py --budget pre_tool_use_runner=60
+    import_budget.py --json                     # JSON output for CI
+
+Exit codes:
+    0 = all runners within budget
+    1 = budget exceeded or eager hook imports
+"""
+
+import argparse
+import json
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+HOOKS_DIR = Path(__file__).resolve().parent.parent / "hooks"
+
+# Cumulative import time per runner (ms). Headroom over measured values
+# on a slow single-core box; tighten as runners get leaner.
+RUNNER_BUDGETS_MS = {
+    "pre_tool_use_runner": 150,
+    "post_tool_use_runner": 150,
+    "stop_runner": 150,
+    "user_prompt_submit_runner": 450,
+}
+
+# Runners that load hooks through the manifest: no hook module at import
+LAZY_RUNNERS = ("pre_tool_use_runner", "post_tool_use_runner")
+_EAGER_HOOK_MODULE = re.compile(r"^(_hooks_\w+|gates\.(?!_common$)\w+)$")
+
+# "import time:       self |  cumulative | <indent>module"
+_IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| ( *)(\S+)$")
+
+
+def parse_importtime(stderr: str) -> list[dict]:
+    """Parse `-X importtime` output into rows (microseconds).
+
+    Args:
+        stderr: Captured stderr of a `python -X importtime` run
+
+    Returns:
+        List of {"module", "self_us", "cumulative_us", "depth"} dicts
+    """
+    rows = []
+    for line in stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            rows.append(
+                {
+                    "module": module,
+                    "self_us": int(self_us),
+                    "cumulative_us": int(cumulative_us),
+                    "depth": len(indent) // 2,
+                }
+            )
+    return rows
+
+
+def measure(runner: str, runs: int = 3) -> dict:
+    """Import a runner in fresh processes and keep the fastest run.
+
+    Returns:
+        {"runner", "ms", "rows", "error"} for the fastest successful run
+    """
+    best = {"runner": runner, "ms": None, "rows": [], "error": None}
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import _lib_path, {runner}"],
+            cwd=HOOKS_DIR,
+            capture_output=True,
+            text=True,
+            timeout=60,
+        )
+        if result.returncode != 0:
+            tail = result.stderr.strip().splitlines()[-1:] or ["import failed"]
+            best["error"] = tail[0]
+            return best
+        rows = parse_importtime(result.stderr)
+        total = next((r for r in rows if r["module"] == runner), None)
+        if total is None:
+            continue
+        ms = total["cumulative_us"] / 1000
+        if best["ms"] is None or ms < best["ms"]:
+            best.update(ms=ms, rows=rows)
+    return best
+
+
+def eager_hook_modules(rows: list[dict]) -> list[str]:
+    """Hook implementation modules imported at runner load."""
+    return [r["module"] for r in rows if _EAGER_HOOK_MODULE.match(r["module"])]
+
+
+def check(budgets: dict[str, float], runs: int = 3) -> list[dict]:
+    """Measure each runner against its budget."""
+    results = []
+    for runner, budget in budgets.items():
+        result = measure(runner, runs)
+        result["budget_ms"] = budget
+        result["eager"] = (
+            eager_hook_modules(result["rows"]) if runner in LAZY_RUNNERS else []
+        )
+        result["ok"] = (
+            result["error"] is None
+            and result["ms"] is not None
+            and result["ms"] <= budget
+            and not result["eager"]
+        )
+        results.append(result)
+    return results
+
+
+def print_report(results: list[dict], top: int) -> None:
+    for r in results:
+        status = "✅" if r["ok"] else "❌"
+        if r["error"]:
+            print(f"{status} {r['runner']}: {r['error']}")
+            continue
+        if r["ms"] is None:
+            print(f"{status} {r['runner']}: no importtime output")
+            continue
+        print(f"{status} {r['runner']}: {r['ms']:.1f}ms (budget {r['budget_ms']:g}ms)")
+        if r["eager"]:
+            print(f"   eager hook imports: {', '.join(r['eager'])}")
+        if top:
+            heaviest = sorted(r["rows"], key=lambda row: -row["self_us"])[:top]
+            for row in heaviest:
+                print(f"   {row['self_us'] / 1000:7.1f}ms  {row['module']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Check hook runner import times against budgets"
+    )
+    parser.add_argument(
+        "--budget",
+        action="append",
+        default=[],
+        metavar="RUNNER=MS",
+        help="Override a runner's budget (repeatable); limits the check to given runners",
+    )
+    parser.add_argument("--runs", type=int, default=3, help="Samples per runner")
+    parser.add_argument("--top", type=int, default=0, help="Show N heaviest imports")
+    parser.add_argument("--json", action="store_true", help="JSON output")
+    args = parser.parse_args()
+
+    budgets = dict(RUNNER_BUDGETS_MS)
+    if args.budget:
+        budgets = {}
+        for spec in args.budget:
+            runner, _, ms = spec.partition("=")
+            try:
+                budgets[runner] = float(ms)
+            except ValueError:
+                parser.error(f"invalid --budget {spec!r} (expected RUNNER=MS)")
+
+    results = check(budgets, max(1, args.runs))
+
+    if args.json:
+        for r in results:
+            r.pop("rows")
+        print(json.dumps(results, indent=2))
+    else:
+        print_report(results, args.top)
+
+    sys.exit(0 if all(r["ok"] for r in results) else 1)
+
+
+if __name__ == "__main__":
+    main()
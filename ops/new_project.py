@@ -39,6 +39,7 @@ def create_beads_structure(project_root: Path) -> None:
     gitignore.write_text(
         """# Beads local state
 agent_assignments.jsonl
+agent_assignments.lock
 lifecycle.log
 *.db
 *.db-journal
@@ -2,6 +2,7 @@
 """PAL continuation_id efficiency statistics (v4.28.1).
 
 Surfaces continuation_id reuse rates and efficiency grades from telemetry.
+The 'all' aggregate reads the daily telemetry rollups, not raw events.
 """
 
 from __future__ import annotations
@@ -14,12 +15,7 @@ from pathlib import Path
 # Add lib to path
 sys.path.insert(0, str(Path(__file__).parent.parent / "lib"))
 
-from mastermind.telemetry import (
-    CONTINUATION_GRADE_A_THRESHOLD,
-    CONTINUATION_GRADE_B_THRESHOLD,
-    TELEMETRY_DIR,
-    get_continuation_reuse_stats,
-)
+from mastermind.telemetry import TELEMETRY_DIR, get_continuation_reuse_stats
 
 
 def get_grade_emoji(grade: str) -> str:
@@ -67,44 +63,6 @@ def list_sessions() -> list[str]:
     return [p.stem for p in TELEMETRY_DIR.glob("*.jsonl")]
 
 
-def aggregate_stats(session_ids: list[str]) -> dict:
-    """Aggregate stats across multiple sessions."""
-    totals = {"captured": 0, "reused": 0, "wasted": 0}
-    by_tool: dict[str, dict[str, int]] = {}
-
-    for sid in session_ids:
-        stats = get_continuation_reuse_stats(sid)
-        if stats.get("total_events", 0) == 0:
-            continue
-
-        by_event = stats.get("by_event", {})
-        for event_type in ["captured", "reused", "wasted"]:
-            totals[event_type] += by_event.get(event_type, 0)
-
-        for tool, counts in stats.get("by_tool", {}).items():
-            if tool not in by_tool:
-                by_tool[tool] = {"captured": 0, "reused": 0, "wasted": 0}
-            for event_type in ["captured", "reused", "wasted"]:
-                by_tool[tool][event_type] += counts.get(event_type, 0)
-
-    total_calls = totals["reused"] + totals["wasted"]
-    reuse_rate = (totals["reused"] / total_calls * 100) if total_calls > 0 else 0
-
-    return {
-        "session_count": len(session_ids),
-        "total_events": sum(totals.values()),
-        "by_event": totals,
-        "by_tool": by_tool,
-        "reuse_rate_pct": round(reuse_rate, 1),
-        "waste_count": totals["wasted"],
-        "efficiency_grade": "A"
-        if reuse_rate >= CONTINUATION_GRADE_A_THRESHOLD
-        else "B"
-        if reuse_rate >= CONTINUATION_GRADE_B_THRESHOLD
-        else "C",
-    }
-
-
 def main():
     parser = argparse.ArgumentParser(description="PAL continuation_id statistics")
     parser.add_argument(
@@ -112,6 +70,7 @@ def main():
         nargs="?",
         help="Session ID (default: current or 'all' for aggregate)",
     )
+    parser.add_argument("--days", type=int, help="Aggregate: only the last N days")
     parser.add_argument("--json", action="store_true", help="Output as JSON")
     parser.add_argument("--list", action="store_true", help="List available sessions")
     args = parser.parse_args()
@@ -127,11 +86,7 @@ def main():
         return
 
     if args.session_id == "all":
-        sessions = list_sessions()
-        if not sessions:
-            print("No telemetry sessions found.")
-            return
-        stats = aggregate_stats(sessions)
+        stats = get_continuation_reuse_stats(days=args.days)
         stats["scope"] = "aggregate"
     elif args.session_id:
         stats = get_continuation_reuse_stats(args.session_id)
@@ -1,11 +1,14 @@
 #!/usr/bin/env python3
 """Analyze Groq routing decisions for threshold tuning.
 
+Fleet-wide analysis reads the daily telemetry rollups, not raw events.
+
 Usage:
-    routing_analysis.py [--session SESSION_ID] [--json]
+    routing_analysis.py [--session SESSION_ID] [--days N] [--json]
 
 Examples:
     routing_analysis.py                    # Analyze all sessions
+    routing_analysis.py --days 7           # Analyze the last week
     routing_analysis.py --session abc123   # Analyze specific session
     routing_analysis.py --json             # Output as JSON
 """
@@ -68,6 +71,7 @@ def format_analysis(analysis: dict) -> str:
 def main():
     parser = argparse.ArgumentParser(description="Analyze Groq routing decisions")
     parser.add_argument("--session", help="Specific session ID to analyze")
+    parser.add_argument("--days", type=int, help="Only the last N days (fleet-wide)")
     parser.add_argument("--json", action="store_true", help="Output as JSON")
     args = parser.parse_args()
 
@@ -76,7 +80,7 @@ def main():
         print(f"❌ No telemetry directory at {TELEMETRY_DIR}")
         sys.exit(1)
 
-    analysis = get_routing_analysis(args.session)
+    analysis = get_routing_analysis(args.session, days=args.days)
 
     if args.json:
         print(json.dumps(analysis, indent=2))
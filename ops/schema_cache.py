@@ -442,6 +442,28 @@ SCHEMA_MANIFEST: dict[str, dict] = {
     },
 }
 
+# =============================================================================
+# RESULT CACHE TTL POLICY - seconds a tool's results stay in ResultCache
+# =============================================================================
+# Stored as "cache_ttl" on each cached schema. 0 = never cache (side effects
+# or conversational tools). Tools not listed use ResultCache's default TTL.
+
+CACHE_TTL_POLICY: dict[str, int] = {
+    "mcp__serena__list_dir": 60,
+    "mcp__pal__chat": 0,
+    "mcp__pal__debug": 0,
+    "mcp__pal__thinkdeep": 0,
+    "mcp__crawl4ai__crawl": 3600,
+    "mcp__crawl4ai__ddg_search": 3600,
+    "mcp__filesystem__read_text_file": 30,
+    "mcp__filesystem__write_file": 0,
+    "mcp__filesystem__list_directory": 30,
+    "mcp__beads__list_beads": 15,
+    "mcp__beads__create_bead": 0,
+    "mcp__beads__update_bead": 0,
+    "mcp__beads__close_bead": 0,
+}
+
 
 def check_status() -> dict:
     """Check cache status and return info."""
@@ -498,8 +520,14 @@ def populate_cache(ttl_hours: float = 24) -> dict:
     """Populate cache from manifest."""
     ttl_seconds = int(ttl_hours * 3600)
     fingerprint = compute_manifest_fingerprint(SCHEMA_MANIFEST)
+    schemas = {
+        name: {**schema, "cache_ttl": CACHE_TTL_POLICY[name]}
+        if name in CACHE_TTL_POLICY
+        else schema
+        for name, schema in SCHEMA_MANIFEST.items()
+    }
     save_schemas_cache(
-        SCHEMA_MANIFEST,
+        schemas,
         ttl_seconds=ttl_seconds,
         manifest_fingerprint=fingerprint,
     )
@@ -25,6 +25,10 @@ else:
     raise RuntimeError("Could not find project root with .claude/lib/core.py")
 sys.path.insert(0, os.path.join(_project_root, ".claude", "lib"))
 from core import setup_script, finalize, logger, handle_debug  # noqa: E402
+from scan_pipeline import scan_files  # noqa: E402
+
+# Bump when stub detection changes (invalidates cached per-file results)
+STUB_CHECKS_VERSION = "1"
 
 
 def _is_inside_string_literal(line: str, pattern: str) -> bool:
@@ -335,6 +339,11 @@ def main():
         action="store_true",
         help="Only hunt for stubs, skip Oracle analysis",
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Ignore cached per-file stub results and rescan every file",
+    )
 
     args = parser.parse_args()
     handle_debug(args)
@@ -356,11 +365,20 @@ def main():
     files_with_stubs = []
 
     try:
-        # Phase 1: Stub Hunting (all files)
+        # Phase 1: Stub Hunting (all files, parallel + cached)
         logger.info("🔍 Phase 1: Stub Hunting")
 
-        for py_file in py_files:
-            stubs = hunt_stubs(py_file)
+        results, stats = scan_files(
+            py_files,
+            name="void",
+            version=STUB_CHECKS_VERSION,
+            worker=hunt_stubs,
+            use_cache=not args.no_cache,
+        )
+        logger.info(f"⚡ Scanned {stats.summary()}")
+
+        for py_file in sorted(results):
+            stubs = results[py_file]
             if stubs:
                 total_stubs += len(stubs)
                 files_with_stubs.append((py_file, stubs))
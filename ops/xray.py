@@ -60,20 +60,21 @@ class CodeVisitor(ast.NodeVisitor):
                 )
         return decorators
 
+    def match_decorated(self, node):
+        """Check a definition against --name (or its decorators for --type decorator)."""
+        if not self.show_decorators:
+            return self.match(node.name)
+        decorators = self.get_decorator_names(node)
+        return bool(decorators) and any(self.match(d) for d in decorators)
+
     def visit_FunctionDef(self, node):
         """Visit function definitions."""
-        if self.target_type in ["def", "function", "all"]:
-            # Check if name matches
-            if self.match(node.name):
+        if self.target_type in ["def", "function", "decorator", "all"]:
+            # Check if name (or decorator) matches
+            if self.match_decorated(node):
                 # Get decorators
                 decorators = self.get_decorator_names(node)
 
-                # If searching for decorators, only show functions with that decorator
-                if self.show_decorators and self.target_name:
-                    if not any(self.target_name.search(d) for d in decorators):
-                        self.generic_visit(node)
-                        return
-
                 # Get arguments
                 args = []
                 for arg in node.args.args:
@@ -102,8 +103,8 @@ class CodeVisitor(ast.NodeVisitor):
 
     def visit_ClassDef(self, node):
         """Visit class definitions."""
-        if self.target_type in ["class", "all"]:
-            if self.match(node.name):
+        if self.target_type in ["class", "decorator", "all"]:
+            if self.match_decorated(node):
                 # Get decorators
                 decorators = self.get_decorator_names(node)
 
@@ -205,6 +206,19 @@ def scan_file(filepath, target_type, target_name, show_details, show_decorators)
         return []
 
 
+def search_index(search_path, target_type, target_name):
+    """Answer a query from the persistent symbol index (refreshing changed files)."""
+    from symbol_index import SymbolIndex, find_root
+
+    index = SymbolIndex(find_root(search_path))
+    stats = index.refresh()
+    logger.info(
+        f"Symbol index: {stats['files']} file(s), {stats['parsed']} re-parsed, "
+        f"{stats['removed']} removed"
+    )
+    return index.query(target_type, target_name, under=search_path)
+
+
 def print_results(results, show_details):
     """Print search results in a formatted way."""
     if not results:
@@ -306,6 +320,11 @@ def main():
     parser.add_argument(
         "--details", action="store_true", help="Show docstrings and additional details"
     )
+    parser.add_argument(
+        "--no-index",
+        action="store_true",
+        help="Parse every file instead of using the persistent symbol index",
+    )
 
     args = parser.parse_args()
     handle_debug(args)
@@ -331,43 +350,49 @@ def main():
         finalize(success=True)
 
     try:
-        # Collect Python files
-        python_files = []
-
-        if os.path.isfile(search_path):
-            if search_path.endswith(".py"):
-                python_files.append(search_path)
-        else:
-            # Walk directory
-            for root, dirs, files in os.walk(search_path):
-                # Skip common directories
-                dirs[:] = [
-                    d
-                    for d in dirs
-                    if d not in [".git", "__pycache__", "node_modules", ".venv", "venv"]
-                ]
-
-                for file in files:
-                    if file.endswith(".py"):
-                        python_files.append(os.path.join(root, file))
-
-        if not python_files:
-            logger.warning("No Python files found in path")
-            finalize(success=True)
-
-        logger.info(f"Scanning {len(python_files)} Python file(s)...")
-
-        # Scan all files
         all_results = []
         show_decorators = args.search_type == "decorator"
 
-        for filepath in python_files:
-            results = scan_file(
-                filepath, args.search_type, args.name, args.details, show_decorators
-            )
-            for result in results:
-                result["filepath"] = os.path.relpath(filepath, _project_root)
-                all_results.append(result)
+        if os.path.isdir(search_path) and not args.no_index:
+            all_results = search_index(search_path, args.search_type, args.name)
+            for result in all_results:
+                result["filepath"] = os.path.relpath(result["filepath"], _project_root)
+        else:
+            # Collect Python files
+            python_files = []
+
+            if os.path.isfile(search_path):
+                if search_path.endswith(".py"):
+                    python_files.append(search_path)
+            else:
+                # Walk directory
+                for root, dirs, files in os.walk(search_path):
+                    # Skip common directories
+                    dirs[:] = [
+                        d
+                        for d in dirs
+                        if d
+                        not in [".git", "__pycache__", "node_modules", ".venv", "venv"]
+                    ]
+
+                    for file in files:
+                        if file.endswith(".py"):
+                            python_files.append(os.path.join(root, file))
+
+            if not python_files:
+                logger.warning("No Python files found in path")
+                finalize(success=True)
+
+            logger.info(f"Scanning {len(python_files)} Python file(s)...")
+
+            # Scan all files
+            for filepath in python_files:
+                results = scan_file(
+                    filepath, args.search_type, args.name, args.details, show_decorators
+                )
+                for result in results:
+                    result["filepath"] = os.path.relpath(filepath, _project_root)
+                    all_results.append(result)
 
         # Print results
         print_results(all_results, args.details)
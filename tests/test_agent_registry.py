@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""Tests for agent_registry indexed assignment store.
+
+Tests cover:
+- Claim/heartbeat/release lookups by bead and agent
+- Stale-deadline index (per-assignment and override timeouts)
+- Compaction of superseded log lines
+- Legacy full-record logs
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add lib to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "lib"))
+
+import agent_registry as ar  # noqa: E402
+
+
+@pytest.fixture
+def root(tmp_path):
+    project = tmp_path / "proj"
+    (project / ".beads").mkdir(parents=True)
+    return project
+
+
+def _log_lines(root: Path) -> int:
+    with open(root / ".beads" / "agent_assignments.jsonl") as f:
+        return sum(1 for line in f if line.strip())
+
+
+class TestLookups:
+    """Tests for indexed lookups."""
+
+    def test_claim_indexed_by_bead_and_agent(self, root):
+        ar.claim_bead("b-1", agent_session_id="ag1", project_root=root)
+        assert ar.get_assignment_for_bead("b-1", root)["agent_session_id"] == "ag1"
+        assert [a["bead_id"] for a in ar.get_assignments_for_agent("ag1", root)] == [
+            "b-1"
+        ]
+
+    def test_release_removes_from_active(self, root):
+        ar.claim_bead("b-1", agent_session_id="ag1", project_root=root)
+        assert ar.release_bead("b-1", "ag1", project_root=root) is True
+        assert ar.get_assignment_for_bead("b-1", root) is None
+        assert ar.release_bead("b-1", "ag1", project_root=root) is False
+
+    def test_release_other_agent_is_noop(self, root):
+        ar.claim_bead("b-1", agent_session_id="ag1", project_root=root)
+        assert ar.release_bead("b-1", "ag2", project_root=root) is False
+        assert ar.get_assignment_for_bead("b-1", root) is not None
+
+    def test_returned_records_are_copies(self, root):
+        ar.claim_bead("b-1", agent_session_id="ag1", project_root=root)
+        ar.get_active_assignments(root)[0]["status"] = "mutated"
+        assert ar.get_active_assignments(root)[0]["status"] == "active"
+
+
+class TestStaleIndex:
+    """Tests for stale-deadline queries."""
+
+    def _write_legacy(self, root, heartbeat):
+        record = {
+            "assignment_id": "old1",
+            "agent_session_id": "x",
+            "bead_id": "b-old",
+            "claimed_at": heartbeat,
+            "last_heartbeat": heartbeat,
+            "status": "active",
+            "expected_duration_minutes": 30,
+        }
+        path = root / ".beads" / "agent_assignments.jsonl"
+        path.write_text(json.dumps(record) + "\n")
+
+    def test_legacy_record_is_stale(self, root):
+        self._write_legacy(root, "2020-01-01T00:00:00+00:00")
+        stale = ar.get_stale_assignments(project_root=root)
+        assert [a["bead_id"] for a in stale] == ["b-old"]
+        assert stale[0]["elapsed_minutes"] > 30
+
+    def test_fresh_claim_not_stale(self, root):
+        ar.claim_bead("b-1", project_root=root)
+        assert ar.get_stale_assignments(project_root=root) == []
+        assert ar.get_stale_assignments(timeout_minutes=0, project_root=root)
+
+    def test_heartbeat_supersedes_old_deadline(self, root):
+        self._write_legacy(root, "2020-01-01T00:00:00+00:00")
+        assert ar.heartbeat("b-old", project_root=root) is True
+        assert ar.get_stale_assignments(project_root=root) == []
+
+
+class TestCompaction:
+    """Tests for log compaction."""
+
+    def test_heartbeats_are_compacted(self, root, monkeypatch):
+        monkeypatch.setattr(ar, "COMPACT_MIN_SUPERSEDED", 10)
+        ar.claim_bead("b-1", agent_session_id="ag1", project_root=root)
+        for _ in range(50):
+            ar.heartbeat("b-1", project_root=root)
+        assert _log_lines(root) < 15
+        assert ar.get_assignment_for_bead("b-1", root) is not None
+
+    def test_cleanup_old_assignments(self, root):
+        TestStaleIndex()._write_legacy(root, "2020-01-01T00:00:00+00:00")
+        ar.claim_bead("b-1", project_root=root)
+        assert ar.cleanup_old_assignments(days=7, project_root=root) == 1
+        assert [a["bead_id"] for a in ar._read_assignments(root)] == ["b-1"]
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""Tests for ast_cache module.
+
+Tests cover:
+- Each distinct source is parsed once per process
+- Facts are persisted on disk and reused without parsing
+- Derived facts match the extractors they replace
+- Syntax errors yield empty facts
+"""
+
+import ast
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add lib to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "lib"))
+
+import ast_cache  # noqa: E402
+from analysis.god_component_detector import analyze_python_complexity  # noqa: E402
+from ast_analysis import analyze_code  # noqa: E402
+
+SOURCE = """\
+import os.path
+from json import loads
+from typing import *
+from . import sibling
+
+
+class Foo:
+    def method(self, items=[], *, opts=dict()):
+        return Bar(loads(items)).run()
+
+
+async def helper(x):
+    return os.path.join(x)
+"""
+
+
+@pytest.fixture
+def parse_counter(tmp_path, monkeypatch):
+    """Isolated disk cache and an ast.parse call counter."""
+    monkeypatch.setattr(ast_cache, "CACHE_DIR", tmp_path / "ast_cache")
+    ast_cache.clear_memory()
+    calls = {"n": 0}
+    real_parse = ast.parse
+
+    def counting_parse(*args, **kwargs):
+        calls["n"] += 1
+        return real_parse(*args, **kwargs)
+
+    monkeypatch.setattr(ast_cache.ast, "parse", counting_parse)
+    yield calls
+    ast_cache.clear_memory()
+
+
+class TestSharedParse:
+    """Tests for parse-once behaviour."""
+
+    def test_all_consumers_share_one_parse(self, parse_counter):
+        analyze_code(SOURCE)
+        analyze_python_complexity(SOURCE)
+        ast_cache.get_facts(SOURCE)
+        assert parse_counter["n"] == 1
+
+    def test_facts_reused_from_disk(self, parse_counter):
+        first = ast_cache.get_facts(SOURCE)
+        ast_cache.clear_memory()  # simulate the next hook process
+        assert ast_cache.get_facts(SOURCE) == first
+        assert parse_counter["n"] == 1
+
+    def test_syntax_error_gives_empty_facts(self, parse_counter):
+        facts = ast_cache.get_facts("def broken(:\n")
+        assert facts["ok"] is False
+        assert facts["functions"] == []
+        assert ast_cache.parse("def broken(:\n") is None
+
+
+class TestFacts:
+    """Tests for derived facts."""
+
+    def test_imports_and_calls(self, parse_counter):
+        facts = ast_cache.get_facts(SOURCE)
+        assert facts["imports"] == ["json", "os", "typing"]
+        assert facts["star_imports"] == ["typing"]
+        assert "Bar" in facts["class_calls"]
+        assert {"loads", "run", "join", "dict"} <= set(facts["method_calls"])
+
+    def test_functions_and_mutable_defaults(self, parse_counter):
+        facts = ast_cache.get_facts(SOURCE)
+        assert [f[0] for f in facts["functions"]] == ["helper", "method"]
+        assert facts["mutable_defaults"] == [
+            ["method", 8, "[]"],
+            ["method", 8, "dict()"],
+        ]
+
+    def test_complexity_matches_detector(self, parse_counter):
+        metrics = analyze_python_complexity(SOURCE)
+        assert (metrics.functions, metrics.classes, metrics.imports) == (2, 1, 4)
+        assert (
+            metrics.max_depth == ast_cache.get_facts(SOURCE)["complexity"]["max_depth"]
+        )
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""Tests for the shared atomic write, lock and prune helpers.
+
+Tests cover:
+- Atomic writes of text, bytes and JSON; failures leave the target intact
+- locked() excludes other holders, including after its file is unlinked
+- prune_oldest() drops the oldest quarter only past the limit
+"""
+
+import fcntl
+import json
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+# Add lib to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "lib"))
+
+import _atomic_io  # noqa: E402
+
+
+class TestWrites:
+    """Tests for write_atomic() and write_json_atomic()."""
+
+    def test_text_bytes_and_json(self, tmp_path):
+        path = tmp_path / "nested" / "out.txt"
+        _atomic_io.write_atomic(path, "text")
+        assert path.read_text() == "text"
+        _atomic_io.write_atomic(path, b"\x00bytes")
+        assert path.read_bytes() == b"\x00bytes"
+        _atomic_io.write_json_atomic(path, {"a": 1}, separators=(",", ":"))
+        assert path.read_text() == '{"a":1}'
+        assert os.listdir(path.parent) == ["out.txt"]
+
+    def test_failed_write_keeps_target(self, tmp_path, monkeypatch):
+        path = tmp_path / "out.json"
+        _atomic_io.write_json_atomic(path, {"ok": True})
+        with pytest.raises(TypeError):
+            _atomic_io.write_json_atomic(path, {"bad": object()})
+
+        def fail(src, dst):
+            raise OSError("replace failed")
+
+        monkeypatch.setattr(_atomic_io.os, "replace", fail)
+        with pytest.raises(OSError):
+            _atomic_io.write_atomic(path, "new")
+        monkeypatch.undo()
+        assert json.loads(path.read_text()) == {"ok": True}
+        assert os.listdir(tmp_path) == ["out.json"]
+
+    def test_concurrent_writers_never_tear(self, tmp_path):
+        path = tmp_path / "out.json"
+        errors = []
+
+        def writer(n):
+            for _ in range(50):
+                try:
+                    _atomic_io.write_json_atomic(path, {"n": n, "pad": "x" * 4096})
+                    assert len(json.loads(path.read_text())["pad"]) == 4096
+                except Exception as e:
+                    errors.append(e)
+
+        threads = [threading.Thread(target=writer, args=(n,)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert errors == []
+
+
+class TestLocked:
+    """Tests for locked()."""
+
+    def test_excludes_other_holders(self, tmp_path):
+        lock = tmp_path / "dir" / "x.lock"
+        with _atomic_io.locked(lock):
+            fd = os.open(str(lock), os.O_RDWR)
+            try:
+                with pytest.raises(BlockingIOError):
+                    fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            finally:
+                os.close(fd)
+        with _atomic_io.locked(lock):
+            pass  # Released on exit
+
+    def test_waiter_relocks_after_unlink(self, tmp_path):
+        lock = tmp_path / "x.lock"
+        entered, release = threading.Event(), threading.Event()
+
+        def waiter():
+            with _atomic_io.locked(lock):
+                entered.set()
+                release.wait(5)
+
+        held = _atomic_io.locked(lock)
+        held.__enter__()
+        thread = threading.Thread(target=waiter)
+        thread.start()
+        time.sleep(0.05)
+        lock.unlink()  # Holder retires the lock file
+        held.__exit__(None, None, None)
+        try:
+            assert entered.wait(5)
+            fd = os.open(str(lock), os.O_RDWR)
+            try:
+                with pytest.raises(BlockingIOError):
+                    fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            finally:
+                os.close(fd)
+        finally:
+            release.set()
+            thread.join()
+
+
+class TestPrune:
+    """Tests for prune_oldest()."""
+
+    def make(self, directory, count):
+        directory.mkdir()
+        now = time.time()
+        for n in range(count):
+            path = directory / f"{n:02}.json"
+            path.write_text("{}")
+            os.utime(path, (now - 1000 + n, now - 1000 + n))
+
+    def test_under_limit_untouched(self, tmp_path):
+        self.make(tmp_path / "cache", 8)
+        assert _atomic_io.prune_oldest(tmp_path / "cache", 8) == 0
+        assert len(os.listdir(tmp_path / "cache")) == 8
+
+    def test_drops_oldest_quarter(self, tmp_path):
+        cache = tmp_path / "cache"
+        self.make(cache, 8)
+        (cache / "sub").mkdir()  # Directories are ignored
+        assert _atomic_io.prune_oldest(cache, 7) == 2
+        assert sorted(os.listdir(cache))[:2] == ["02.json", "03.json"]
+
+    def test_missing_directory(self, tmp_path):
+        assert _atomic_io.prune_oldest(tmp_path / "missing", 0) == 0
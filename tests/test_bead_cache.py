@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""Tests for bead_cache module.
+
+Tests cover:
+- Snapshot reuse across calls while the beads DB is unchanged
+- Invalidation on DB mtime/size change
+- Explicit invalidation after writes
+- Failed bd calls are not cached
+"""
+
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add lib to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "lib"))
+
+import bead_cache  # noqa: E402
+
+
+@pytest.fixture
+def project(tmp_path, monkeypatch):
+    """Project with a fake beads DB and a counting fetcher."""
+    root = tmp_path / "proj"
+    (root / ".beads").mkdir(parents=True)
+    (root / ".beads" / "beads.db").write_bytes(b"v1")
+    monkeypatch.setattr(bead_cache, "CACHE_DIR", tmp_path / "cache")
+
+    calls = {"in_progress": 0}
+
+    def fetch():
+        calls["in_progress"] += 1
+        return [{"id": "b-1", "title": "Task", "status": "in_progress"}]
+
+    monkeypatch.setattr(bead_cache, "_fetchers", lambda: {"in_progress": fetch})
+    return root, calls
+
+
+class TestGetCachedBeads:
+    """Tests for get_cached_beads snapshot behaviour."""
+
+    def test_second_call_served_from_snapshot(self, project):
+        root, calls = project
+        first = bead_cache.get_cached_beads("in_progress", root)
+        second = bead_cache.get_cached_beads("in_progress", root)
+        assert first == second
+        assert calls["in_progress"] == 1
+
+    def test_db_change_invalidates_snapshot(self, project):
+        root, calls = project
+        bead_cache.get_cached_beads("in_progress", root)
+
+        db = root / ".beads" / "beads.db"
+        db.write_bytes(b"version-two")
+        st = db.stat()
+        os.utime(db, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+
+        bead_cache.get_cached_beads("in_progress", root)
+        assert calls["in_progress"] == 2
+
+    def test_explicit_invalidate(self, project):
+        root, calls = project
+        bead_cache.get_cached_beads("in_progress", root)
+        bead_cache.invalidate(root)
+        bead_cache.get_cached_beads("in_progress", root)
+        assert calls["in_progress"] == 2
+
+    def test_failures_not_cached(self, project, monkeypatch):
+        root, _ = project
+
+        def boom():
+            raise RuntimeError("bd failed")
+
+        monkeypatch.setattr(bead_cache, "_fetchers", lambda: {"in_progress": boom})
+        assert bead_cache.get_cached_beads("in_progress", root) == []
+        assert not bead_cache._snapshot_path(root).exists()
+
+
+def test_format_bead_line():
+    line = bead_cache.format_bead_line(
+        {
+            "id": "b-1",
+            "priority": 1,
+            "issue_type": "bug",
+            "status": "open",
+            "title": "Fix",
+        }
+    )
+    assert line == "b-1 [P1] [bug] open - Fix"
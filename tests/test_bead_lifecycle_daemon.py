@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""Tests for the bead lifecycle daemon's event-driven watcher.
+
+Tests cover:
+- Deadlines fire in stage order and each stage is reported once
+- A deadline processed exactly on time advances the stage
+- A new heartbeat supersedes the pending deadline
+- Reloads keep one live heap entry per assignment (heap stays bounded)
+- Projects whose .beads/ can't be watched yet are retried on refresh
+- Metrics report watched projects and queue size
+"""
+
+import json
+import signal
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+
+# Add lib and ops to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "lib"))
+sys.path.insert(0, str(Path(__file__).parent.parent / "ops"))
+
+import bead_lifecycle_daemon as daemon  # noqa: E402
+
+
+def assignment(bead_id, minutes_ago, agent="agent-1"):
+    heartbeat = datetime.now(timezone.utc) - timedelta(minutes=minutes_ago)
+    return {
+        "bead_id": bead_id,
+        "agent_session_id": agent,
+        "last_heartbeat": heartbeat.isoformat(),
+    }
+
+
+@pytest.fixture
+def env(tmp_path, monkeypatch):
+    """Fake projects, assignments and stage handling; returns (active, handled)."""
+    root = tmp_path / "proj"
+    (root / ".beads").mkdir(parents=True)
+    active = {root: []}
+    handled = []
+
+    monkeypatch.setattr(daemon, "get_all_project_roots", lambda: list(active))
+    monkeypatch.setattr(daemon, "get_active_assignments", lambda r: active.get(r, []))
+    monkeypatch.setattr(
+        daemon,
+        "handle_stage",
+        lambda stage, a, r, elapsed: (
+            handled.append((a["bead_id"], stage))
+            or {1: "warnings", 2: "stalled", 3: "reverted"}[stage]
+        ),
+    )
+    monkeypatch.setattr(daemon, "log", lambda *args, **kwargs: None)
+    monkeypatch.setattr(daemon, "METRICS_FILE", tmp_path / "metrics.json")
+    return root, active, handled
+
+
+def minutes(n):
+    return datetime.now(timezone.utc).timestamp() + n * 60
+
+
+class TestDeadlines:
+    """Tests for the deadline heap."""
+
+    def test_stages_fire_in_order_once(self, env):
+        root, active, handled = env
+        active[root] = [assignment("b-1", 0)]
+        watcher = daemon.LifecycleWatcher()
+        watcher.refresh_projects()
+
+        assert watcher.process_due(minutes(10)) == 0
+        assert watcher.process_due(minutes(31)) == 1
+        assert watcher.process_due(minutes(32)) == 0
+        assert watcher.process_due(minutes(121)) == 1  # Straight to orphan
+        assert handled == [("b-1", daemon.STAGE_STALE), ("b-1", daemon.STAGE_ORPHAN)]
+        assert watcher.pending == {}
+        assert watcher.metrics["warnings"] == watcher.metrics["reverted"] == 1
+
+    def test_exact_deadline_advances(self, env):
+        """Processing at exactly a deadline reports it instead of looping."""
+        root, active, handled = env
+        active[root] = [assignment("b-1", 0)]
+        watcher = daemon.LifecycleWatcher()
+        watcher.refresh_projects()
+
+        def hung(signum, frame):
+            raise TimeoutError("process_due did not return")
+
+        previous = signal.signal(signal.SIGALRM, hung)
+        signal.alarm(5)
+        try:
+            for expected in (daemon.STAGE_STALE, daemon.STAGE_STALLED):
+                assert watcher.process_due(watcher.heap[0][0]) == 1
+                assert handled[-1] == ("b-1", expected)
+        finally:
+            signal.alarm(0)
+            signal.signal(signal.SIGALRM, previous)
+        assert len(watcher.pending) == 1
+
+    def test_heartbeat_supersedes_deadline(self, env):
+        root, active, handled = env
+        active[root] = [assignment("b-1", 25)]
+        watcher = daemon.LifecycleWatcher()
+        watcher.refresh_projects()
+
+        active[root] = [assignment("b-1", 0)]
+        watcher.reload_project(root)
+        assert watcher.process_due(minutes(10)) == 0
+        assert handled == []
+        assert watcher.process_due(minutes(31)) == 1
+
+    def test_released_assignment_dropped(self, env):
+        root, active, handled = env
+        active[root] = [assignment("b-1", 0)]
+        watcher = daemon.LifecycleWatcher()
+        watcher.refresh_projects()
+        active[root] = []
+        watcher.reload_project(root)
+        assert watcher.pending == {}
+        assert watcher.process_due(minutes(200)) == 0
+        assert watcher.heap == []
+
+    def test_reloads_keep_heap_bounded(self, env):
+        root, active, _ = env
+        active[root] = [assignment(f"b-{n}", 0) for n in range(10)]
+        watcher = daemon.LifecycleWatcher()
+        watcher.refresh_projects()
+        for _ in range(500):
+            watcher.reload_project(root)
+
+        assert len(watcher.pending) == 10
+        limit = watcher.COMPACT_FACTOR * 10 + watcher.COMPACT_SLACK + 1
+        assert len(watcher.heap) <= limit
+
+    def test_next_timeout_skips_superseded(self, env):
+        root, active, _ = env
+        active[root] = [assignment("b-1", 29)]
+        watcher = daemon.LifecycleWatcher()
+        watcher.refresh_projects()
+        now = datetime.now(timezone.utc).timestamp()
+        assert watcher.next_timeout(now, 300) < 61
+
+        active[root] = [assignment("b-1", 0)]
+        watcher.reload_project(root)
+        assert watcher.next_timeout(now, 300) == 300
+
+
+class TestProjectsAndMetrics:
+    """Tests for project discovery and the metrics file."""
+
+    def test_unwatchable_project_retried(self, env, tmp_path):
+        _, active, _ = env
+        later = tmp_path / "later"
+        later.mkdir()
+        active[later] = []
+        watcher = daemon.LifecycleWatcher()
+        if watcher.inotify is None:
+            pytest.skip("inotify unavailable")
+
+        watcher.refresh_projects()
+        assert later in watcher.projects
+        assert later not in watcher.watched
+
+        (later / ".beads").mkdir()
+        active[later] = [assignment("b-9", 0)]
+        watcher.refresh_projects()
+        assert later in watcher.watched
+        assert (later, "b-9", "agent-1") in watcher.pending
+
+    def test_metrics(self, env):
+        root, active, _ = env
+        active[root] = [assignment("b-1", 0), assignment("b-2", 0, agent="agent-2")]
+        watcher = daemon.LifecycleWatcher()
+        watcher.refresh_projects()
+        watcher.reload_project(root)
+        watcher.write_metrics()
+
+        metrics = json.loads(daemon.METRICS_FILE.read_text())
+        assert metrics["watched_projects"] == 1
+        assert metrics["active_assignments"] == 2
+        assert metrics["queue_size"] == 2
+        assert metrics["reloads"] == 2
+        assert metrics["next_deadline"] == pytest.approx(minutes(30), abs=5)
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""Tests for the session-sharded block log.
+
+Tests cover:
+- Blocks are read from the session's own shard only
+- Clears append tombstones; shards compact once dead lines pile up
+- Idle shards roll up into per-hook counts, cleared blocks included
+- Lock files of retired shards are removed without breaking exclusion
+- A legacy single-file log is split into shards
+- synapse_core's block API on top of the shards
+"""
+
+import fcntl
+import json
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+# Add lib to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "lib"))
+
+import block_log  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def log_dir(tmp_path, monkeypatch):
+    block_dir = tmp_path / "block_log"
+    monkeypatch.setattr(block_log, "BLOCK_DIR", block_dir)
+    monkeypatch.setattr(block_log, "LEGACY_LOG", tmp_path / "block_log.jsonl")
+    monkeypatch.setattr(block_log, "SUMMARY_FILE", block_dir / "summary.json")
+    return block_dir
+
+
+def block(session_id, hook, n=0):
+    return {"session_id": session_id, "hook": hook, "reason": f"r{n}"}
+
+
+def shard_lines(session_id):
+    return block_log._shard_path(session_id).read_text().splitlines()
+
+
+def age(path, days):
+    past = time.time() - days * 86400
+    os.utime(path, (past, past))
+
+
+class TestSessionBlocks:
+    """Tests for append/read/clear."""
+
+    def test_sharded_by_session(self):
+        block_log.append_block(block("s1", "commit_gate", 1))
+        block_log.append_block(block("s2", "edit_gate", 2))
+        block_log.append_block(block("s1", "edit_gate", 3))
+        assert [b["reason"] for b in block_log.session_blocks("s1")] == ["r1", "r3"]
+        assert [b["reason"] for b in block_log.session_blocks("s2")] == ["r2"]
+        assert block_log.session_blocks("missing") == []
+
+    def test_clear_appends_tombstone(self):
+        block_log.append_block(block("s1", "commit_gate", 1))
+        block_log.append_block(block("s1", "edit_gate", 2))
+        block_log.clear_blocks("s1", hook="commit_gate")
+        assert [b["hook"] for b in block_log.session_blocks("s1")] == ["edit_gate"]
+        assert len(shard_lines("s1")) == 3
+
+        block_log.append_block(block("s1", "commit_gate", 3))
+        block_log.clear_blocks("s1")
+        assert block_log.session_blocks("s1") == []
+        block_log.append_block(block("s1", "edit_gate", 4))
+        assert [b["reason"] for b in block_log.session_blocks("s1")] == ["r4"]
+
+    def test_compaction_keeps_live_blocks_and_counts(self, monkeypatch):
+        monkeypatch.setattr(block_log, "COMPACT_DEAD_LINES", 4)
+        for n in range(3):
+            block_log.append_block(block("s1", "commit_gate", n))
+        block_log.append_block(block("s1", "edit_gate", 9))
+        block_log.clear_blocks("s1", hook="commit_gate")
+
+        lines = [json.loads(line) for line in shard_lines("s1")]
+        assert lines[0] == {"compacted": {"commit_gate": 3}}
+        assert [b["reason"] for b in lines[1:]] == ["r9"]
+        assert [b["reason"] for b in block_log.session_blocks("s1")] == ["r9"]
+        assert block_log._replay(block_log._shard_path("s1"))[2] == {
+            "commit_gate": 3,
+            "edit_gate": 1,
+        }
+
+    def test_legacy_log_migrated(self, tmp_path):
+        legacy = tmp_path / "block_log.jsonl"
+        legacy.write_text(
+            json.dumps(block("s1", "commit_gate", 1))
+            + "\nnot json\n"
+            + json.dumps(block("s2", "edit_gate", 2))
+            + "\n"
+        )
+        assert [b["reason"] for b in block_log.session_blocks("s2")] == ["r2"]
+        assert not legacy.exists()
+        assert [b["reason"] for b in block_log.session_blocks("s1")] == ["r1"]
+
+
+class TestRollup:
+    """Tests for roll_up() and the lesson summary."""
+
+    def test_idle_shards_rolled_up(self, log_dir):
+        block_log.append_block(block("old", "commit_gate", 1))
+        block_log.append_block(block("old", "commit_gate", 2))
+        block_log.clear_blocks("old")
+        block_log.append_block(block("new", "commit_gate", 3))
+        age(block_log._shard_path("old"), 10)
+
+        assert block_log.roll_up() == 1
+        assert not block_log._shard_path("old").exists()
+        assert block_log._shard_path("new").exists()
+        stats = block_log.load_summary()["hooks"]["commit_gate"]
+        assert (stats["blocks"], stats["sessions"]) == (2, 1)
+
+        age(block_log._shard_path("new"), 10)
+        assert block_log.roll_up() == 1
+        stats = block_log.load_summary()["hooks"]["commit_gate"]
+        assert (stats["blocks"], stats["sessions"]) == (3, 2)
+        assert list(log_dir.glob("*.jsonl")) == []
+
+    def test_waiter_relocks_after_rollup_unlink(self, log_dir):
+        """A waiter on a retired lock file must not run beside a new holder."""
+        shard = block_log._shard_path("s1")
+        lock_path = block_log._lock_path(shard)
+        entered, release = threading.Event(), threading.Event()
+
+        def waiter():
+            with block_log._locked(shard):
+                entered.set()
+                release.wait(5)
+
+        held = block_log._locked(shard)
+        held.__enter__()
+        thread = threading.Thread(target=waiter)
+        thread.start()
+        time.sleep(0.05)
+        lock_path.unlink()  # What roll_up() does while holding the lock
+        held.__exit__(None, None, None)
+        try:
+            assert entered.wait(5)
+            fd = os.open(str(lock_path), os.O_RDWR)
+            try:
+                with pytest.raises(BlockingIOError):
+                    fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            finally:
+                os.close(fd)
+        finally:
+            release.set()
+            thread.join()
+
+    def test_lock_file_removed_with_shard(self, log_dir):
+        block_log.append_block(block("old", "commit_gate"))
+        age(block_log._shard_path("old"), 10)
+        assert block_log.roll_up() == 1
+        assert not block_log._lock_path(block_log._shard_path("old")).exists()
+
+    def test_lessons(self, monkeypatch):
+        block_log.record_lessons(["use the venv"], ["python_path_injector"])
+        monkeypatch.setattr(block_log, "SUMMARY_MAX_LESSONS", 2)
+        block_log.record_lessons(["a", "b"], ["commit_gate"])
+        lessons = block_log.recent_lessons()
+        assert [lesson["content"] for lesson in lessons] == ["a", "b"]
+        assert lessons[0]["hooks"] == ["commit_gate"]
+
+        summary = block_log.load_summary()
+        summary["lessons"][0]["added_at"] -= 30 * 86400
+        block_log._save_summary(summary)
+        assert [lesson["content"] for lesson in block_log.recent_lessons()] == ["b"]
+
+
+def test_synapse_core_api(monkeypatch):
+    """log_block / get_session_blocks / clears go through the shards."""
+    import synapse_core
+
+    monkeypatch.setenv("CLAUDE_SESSION_ID", "sess-1")
+    synapse_core.log_block("commit_gate", "**COMMIT BLOCKED**", "Bash", {"cmd": "x"})
+    synapse_core.log_block("edit_gate", "blocked edit", "Edit")
+    assert [b["hook"] for b in synapse_core.get_session_blocks()] == [
+        "commit_gate",
+        "edit_gate",
+    ]
+    synapse_core.clear_acknowledged_block("commit_gate")
+    assert [b["hook"] for b in synapse_core.get_session_blocks()] == ["edit_gate"]
+    synapse_core.clear_session_blocks()
+    assert synapse_core.get_session_blocks() == []
+    assert synapse_core.get_session_blocks("other") == []
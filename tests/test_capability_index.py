@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""Tests for the compiled capability index.
+
+Tests cover:
+- Tag/stage/risk queries over the inverted indexes
+- Pre-rendered compact index matches build_compact_index()
+- Stale or corrupt artifacts are recompiled from the JSON
+- capability_inventory reuses cards of unchanged source files
+"""
+
+import json
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add lib/ops to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "lib"))
+sys.path.insert(0, str(Path(__file__).parent.parent / "ops"))
+
+import capability_index  # noqa: E402
+from capability_index import compiled_path_for, load_compiled  # noqa: E402
+
+
+def card(cid, tags, stages, **risk):
+    return {
+        "id": cid,
+        "type": cid.split("__")[0],
+        "name": cid,
+        "summary": f"Summary of {cid}",
+        "stages": stages,
+        "tags": tags,
+        "risk": {"read_only": not risk.get("writes_repo"), **risk},
+    }
+
+
+INDEX = {
+    "inventory_version": "sha256:test",
+    "capabilities": [
+        card("agent__tester", ["tests", "validation"], ["validate"]),
+        card("ops__fixer", ["refactor"], ["modify"], writes_repo=True),
+        card("ops__fetch", ["web_research"], ["locate"], network=True),
+        card("slash__/audit", ["tests", "static_analysis"], ["analyze", "validate"]),
+    ],
+}
+
+
+@pytest.fixture
+def index_path(tmp_path):
+    path = tmp_path / "capabilities_index.json"
+    path.write_text(json.dumps(INDEX))
+    return path
+
+
+def touch_later(path):
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+
+class TestCompiledIndex:
+    """Tests for compile/load/query."""
+
+    def test_queries(self, index_path):
+        compiled = load_compiled(index_path)
+        assert len(compiled) == 4
+        assert compiled.version == "sha256:test"
+        assert compiled.query(tags=["tests"]) == ["agent__tester", "slash__/audit"]
+        assert compiled.query(tags=["tests"], stages=["analyze"]) == ["slash__/audit"]
+        assert compiled.query(risk={"writes_repo": False, "network": False}) == [
+            "agent__tester",
+            "slash__/audit",
+        ]
+        assert compiled.query(risk={"network": True}) == ["ops__fetch"]
+        assert compiled.query(types=["ops"]) == ["ops__fixer", "ops__fetch"]
+        assert compiled.query(tags=["unknown"]) == []
+        assert "ops__fixer" in compiled
+        assert compiled.get("ops__fixer") == INDEX["capabilities"][1]
+        assert compiled.get("missing") is None
+
+    def test_compact_index_matches_router(self, index_path):
+        from mastermind.router_gpt import build_compact_index
+
+        compiled = load_compiled(index_path)
+        assert compiled.compact_index == build_compact_index(INDEX)
+
+    def test_artifact_persisted_and_reused(self, index_path, monkeypatch):
+        load_compiled(index_path)
+        assert compiled_path_for(index_path).exists()
+
+        def no_compile(index):
+            raise AssertionError("recompiled a fresh artifact")
+
+        monkeypatch.setattr(capability_index, "compile_index", no_compile)
+        assert len(load_compiled(index_path)) == 4
+
+    def test_stale_artifact_recompiled(self, index_path):
+        first = load_compiled(index_path)
+        index = dict(INDEX, capabilities=INDEX["capabilities"][:2])
+        index_path.write_text(json.dumps(index))
+        touch_later(index_path)
+        assert load_compiled(index_path, cached=first) is not first
+        assert len(load_compiled(index_path)) == 2
+        assert load_compiled(index_path.with_name("missing.json")) is None
+
+    def test_corrupt_artifact_recompiled(self, index_path):
+        compiled_path_for(index_path).write_bytes(b"\x00garbage")
+        assert len(load_compiled(index_path)) == 4
+        compiled_path_for(index_path).write_bytes(b"\x00garbage")
+        assert load_compiled(index_path, rebuild=False) is None
+
+
+class TestInventory:
+    """Tests for incremental regeneration in capability_inventory."""
+
+    @pytest.fixture
+    def inventory(self, tmp_path, monkeypatch):
+        import capability_inventory
+
+        ops_dir = tmp_path / "ops"
+        ops_dir.mkdir()
+        (ops_dir / "audit.py").write_text('"""Audit: check the test suite."""\n')
+        (ops_dir / "fetch.py").write_text('"""Fetch: search the web."""\n')
+        caps_dir = tmp_path / "capabilities"
+        caps_dir.mkdir()
+        (caps_dir / "tag_vocab.json").write_text('["tests", "web_research"]')
+        for name, value in {
+            "OPS_DIR": ops_dir,
+            "COMMANDS_DIR": tmp_path / "commands",
+            "REGISTRY_PATH": caps_dir / "registry.yaml",
+            "TAG_VOCAB_PATH": caps_dir / "tag_vocab.json",
+            "OUTPUT_PATH": caps_dir / "capabilities_index.json",
+        }.items():
+            monkeypatch.setattr(capability_inventory, name, value)
+
+        parsed = []
+        real_extract = capability_inventory.extract_python_docstring
+
+        def extract(content):
+            parsed.append(content)
+            return real_extract(content)
+
+        monkeypatch.setattr(capability_inventory, "extract_python_docstring", extract)
+        return capability_inventory, parsed
+
+    def write(self, capability_inventory, index):
+        capability_inventory.OUTPUT_PATH.write_text(json.dumps(index))
+
+    def test_only_changed_file_reparsed(self, inventory):
+        capability_inventory, parsed = inventory
+        index = capability_inventory.generate_inventory()
+        assert [c["id"] for c in index["capabilities"]] == ["ops__audit", "ops__fetch"]
+        assert len(parsed) == 2
+        self.write(capability_inventory, index)
+
+        parsed.clear()
+        fetch = capability_inventory.OPS_DIR / "fetch.py"
+        fetch.write_text('"""Fetch: search the web and run tests."""\n')
+        touch_later(fetch)
+        index = capability_inventory.generate_inventory()
+        assert parsed == [fetch.read_text()]
+        assert "tests" in index["capabilities"][1]["tags"]
+
+    def test_vocab_change_reparses_all(self, inventory):
+        capability_inventory, parsed = inventory
+        self.write(capability_inventory, capability_inventory.generate_inventory())
+        parsed.clear()
+        capability_inventory.TAG_VOCAB_PATH.write_text('["tests"]')
+        touch_later(capability_inventory.TAG_VOCAB_PATH)
+        index = capability_inventory.generate_inventory()
+        assert len(parsed) == 2
+        assert index["capabilities"][1]["tags"] == []
+
+    def test_main_writes_compiled(self, inventory, monkeypatch):
+        capability_inventory, _ = inventory
+        output = capability_inventory.OUTPUT_PATH
+        monkeypatch.setattr(sys, "argv", ["capability_inventory.py"])
+        capability_inventory.main()
+        compiled = load_compiled(output, rebuild=False)
+        assert compiled.ids == ["ops__audit", "ops__fetch"]
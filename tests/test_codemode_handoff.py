@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""Tests for the codemode handoff store.
+
+Tests cover:
+- Pending index ordering and removal on record
+- Per-call result lookups and resubmission
+- Unsafe call IDs map to files inside the store
+- FIFO wake-up in wait_for_result, including when the store is cleared
+- PlanExecutor routed through make_handoff_invoker
+"""
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+# Add lib to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "lib"))
+
+import _codemode_executor as cx  # noqa: E402
+from _codemode_planner import ExecutionPlan, ToolCallSpec  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def store(tmp_path, monkeypatch):
+    monkeypatch.setattr(cx, "HANDOFF_DIR", tmp_path / "handoff")
+    return tmp_path / "handoff"
+
+
+def _submit(call_id: str, tool: str = "mcp__x__y", priority: int = 0) -> None:
+    cx.submit_tool_call(
+        cx.ToolCallRequest(id=call_id, tool=tool, args={"n": 1}, priority=priority)
+    )
+
+
+class TestStore:
+    """Tests for submit/record/lookup."""
+
+    def test_pending_sorted_by_priority_then_submission(self):
+        _submit("b", priority=1)
+        _submit("a", priority=0)
+        _submit("c", priority=1)
+        assert [c.id for c in cx.get_pending_calls()] == ["a", "b", "c"]
+
+    def test_record_moves_call_to_results(self, store):
+        _submit("a")
+        cx.record_tool_result("a", success=True, result={"ok": 1})
+        assert cx.get_pending_calls() == []
+        assert cx.get_completed_result("a").result == {"ok": 1}
+        state = cx.read_handoff_state()
+        assert list(state.completed) == ["a"]
+        assert (store / "log.jsonl").read_text().count("\n") == 2
+
+    def test_resubmit_clears_stale_result(self):
+        _submit("a")
+        cx.record_tool_result("a", success=False, error="boom")
+        _submit("a")
+        assert cx.get_completed_result("a") is None
+        assert [c.id for c in cx.get_pending_calls()] == ["a"]
+
+    @pytest.mark.parametrize("call_id", ["", "..", ".", "a/b", "../x", ".hidden"])
+    def test_unsafe_ids_stay_files(self, store, call_id):
+        _submit(call_id)
+        assert [c.id for c in cx.get_pending_calls()] == [call_id]
+        cx.record_tool_result(call_id, success=True, result={"ok": 1})
+        assert cx.get_completed_result(call_id).result == {"ok": 1}
+        assert list(cx.read_handoff_state().completed) == [call_id]
+        _submit(call_id)  # Resubmitting unlinks a file, not a directory
+        assert cx.get_completed_result(call_id) is None
+        assert sorted(p.name for p in store.iterdir()) == [
+            "log.jsonl",
+            "pending",
+            "results",
+        ]
+
+    def test_empty_store(self):
+        assert cx.get_pending_calls() == []
+        assert cx.read_handoff_state() is None
+        cx.record_tool_result("ghost", success=True)
+        assert cx.get_completed_result("ghost") is None
+
+
+class TestWaitForResult:
+    """Tests for blocking waits."""
+
+    def test_wakes_on_record(self):
+        _submit("a")
+
+        def record():
+            time.sleep(0.05)
+            cx.record_tool_result("a", success=True, result={"v": 2})
+
+        threading.Thread(target=record).start()
+        start = time.time()
+        response = cx.wait_for_result("a", timeout=5)
+        assert response.result == {"v": 2}
+        assert time.time() - start < 1
+
+    def test_clear_wakes_waiter(self, store):
+        _submit("a")
+        _submit("b")
+
+        def clear():
+            time.sleep(0.05)
+            assert (store / "notify" / "a").exists()
+            cx.clear_handoff_state()
+
+        threading.Thread(target=clear).start()
+        start = time.time()
+        assert cx.wait_for_result("a", timeout=5) is None
+        assert time.time() - start < 1
+        assert cx.read_handoff_state() is None
+
+    def test_rewrite_keeps_waiting_for_kept_call(self):
+        _submit("a")
+
+        def rewrite_then_record():
+            time.sleep(0.05)
+            cx.write_handoff_state(cx.read_handoff_state())
+            time.sleep(0.05)
+            cx.record_tool_result("a", success=True, result={"v": 3})
+
+        threading.Thread(target=rewrite_then_record).start()
+        start = time.time()
+        assert cx.wait_for_result("a", timeout=5).result == {"v": 3}
+        assert time.time() - start < 1
+
+    def test_timeout(self):
+        _submit("a")
+        assert cx.wait_for_result("a", timeout=0.05) is None
+
+    def test_plan_through_handoff_invoker(self):
+        plan = ExecutionPlan(
+            run_id="t",
+            calls=[ToolCallSpec(id="s1", tool="mcp__x__y", args={"q": 1})],
+        )
+        stop = threading.Event()
+
+        def claude_side():
+            while not stop.is_set():
+                for call in cx.get_pending_calls():
+                    cx.record_tool_result(call.id, success=True, result={"q": 1})
+                time.sleep(0.01)
+
+        threading.Thread(target=claude_side, daemon=True).start()
+        try:
+            with cx.PlanExecutor(
+                tool_invoker=cx.make_handoff_invoker(timeout=5),
+                log_executions=False,
+            ) as executor:
+                result = executor.execute(plan)
+        finally:
+            stop.set()
+        assert result.results["s1"].result == {"q": 1}
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""Tests for the persistent codemode ResultCache.
+
+Tests cover:
+- Results persist across instances sharing a log
+- LRU eviction by entry count and byte budget, with recency shared across
+  instances through logged touches
+- Per-tool TTL policies (including never-cache)
+- Log compaction keeps live entries
+- Per-tool hit rates in stats()
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+# Add lib to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "lib"))
+
+from _codemode_executor import ResultCache  # noqa: E402
+
+
+@pytest.fixture
+def log(tmp_path):
+    return tmp_path / "results.jsonl"
+
+
+def _cache(log, **kwargs) -> ResultCache:
+    kwargs.setdefault("tool_ttls", {})
+    return ResultCache(path=log, **kwargs)
+
+
+class TestPersistence:
+    """Tests for cross-instance reuse."""
+
+    def test_result_visible_to_new_instance(self, log):
+        _cache(log).set("t", {"a": 1}, {"v": 1})
+        assert _cache(log).get("t", {"a": 1}) == (True, {"v": 1})
+
+    def test_clear_removes_log(self, log):
+        cache = _cache(log)
+        cache.set("t", {"a": 1}, {"v": 1})
+        cache.clear()
+        assert not log.exists()
+        assert _cache(log).get("t", {"a": 1}) == (False, None)
+
+    def test_compaction_keeps_live_entries(self, log, monkeypatch):
+        monkeypatch.setattr(ResultCache, "COMPACT_RATIO", 0)
+        cache = _cache(log, max_entries=3)
+        for i in range(10):
+            cache.set("t", {"i": i}, {"v": i})
+        assert len(log.read_text().splitlines()) <= 4
+        fresh = _cache(log, max_entries=3)
+        assert fresh.get("t", {"i": 9}) == (True, {"v": 9})
+        assert fresh.get("t", {"i": 0}) == (False, None)
+
+
+class TestEviction:
+    """Tests for LRU and TTL eviction."""
+
+    def test_least_recently_used_evicted(self, log):
+        cache = _cache(log, max_entries=2)
+        cache.set("t", {"i": 1}, 1)
+        cache.set("t", {"i": 2}, 2)
+        cache.get("t", {"i": 1})  # touch
+        cache.set("t", {"i": 3}, 3)
+        assert cache.get("t", {"i": 1})[0]
+        assert not cache.get("t", {"i": 2})[0]
+        assert cache.stats()["evictions"] == 1
+
+    def test_touches_shared_across_instances(self, log):
+        writer = _cache(log, max_entries=2)
+        reader = _cache(log, max_entries=2)
+        writer.set("t", {"i": 1}, 1)
+        writer.set("t", {"i": 2}, 2)
+        assert reader.get("t", {"i": 1}) == (True, 1)  # touch in another process
+        writer.set("t", {"i": 3}, 3)
+
+        # Both instances evict 2, the least recently used across processes
+        for cache in (writer, reader, _cache(log, max_entries=2)):
+            assert cache.get("t", {"i": 1}) == (True, 1)
+            assert cache.get("t", {"i": 2}) == (False, None)
+
+    def test_compaction_keeps_recency(self, log, monkeypatch):
+        cache = _cache(log, max_entries=3)
+        for i in range(3):
+            cache.set("t", {"i": i}, i)
+        cache.get("t", {"i": 0})
+        monkeypatch.setattr(ResultCache, "COMPACT_RATIO", 0)
+        cache.set("t", {"i": 3}, 3)  # Evicts 1, then compacts
+
+        fresh = _cache(log, max_entries=3)
+        fresh.set("t", {"i": 4}, 4)  # Evicts 2, not the touched 0
+        assert fresh.get("t", {"i": 0})[0]
+        assert not fresh.get("t", {"i": 2})[0]
+
+    def test_byte_budget(self, log):
+        cache = _cache(log, max_bytes=400)
+        for i in range(10):
+            cache.set("t", {"i": i}, "x" * 50)
+        stats = cache.stats()
+        assert stats["bytes"] <= 400
+        assert 0 < stats["entries"] < 10
+
+    def test_expired_entry_misses(self, log):
+        cache = _cache(log, tool_ttls={"t": 0.05})
+        cache.set("t", {}, 1)
+        time.sleep(0.06)
+        assert cache.get("t", {}) == (False, None)
+
+
+class TestPolicy:
+    """Tests for per-tool TTLs and stats."""
+
+    def test_zero_ttl_never_cached(self, log):
+        cache = _cache(log, tool_ttls={"mcp__pal__chat": 0})
+        cache.set("mcp__pal__chat", {"prompt": "hi"}, {"reply": 1})
+        assert cache.get("mcp__pal__chat", {"prompt": "hi"}) == (False, None)
+        assert not log.exists()
+
+    def test_per_tool_hit_rates(self, log):
+        cache = _cache(log)
+        cache.set("a", {}, 1)
+        cache.get("a", {})
+        cache.get("b", {})
+        by_tool = cache.stats()["by_tool"]
+        assert by_tool["a"]["hit_rate"] == 1.0
+        assert by_tool["b"]["hit_rate"] == 0.0
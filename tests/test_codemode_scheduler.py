@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""Tests for PlanExecutor ready-queue scheduling.
+
+Tests cover:
+- Dependents start without waiting for unrelated slow calls
+- Per-tool concurrency limits
+- Critical-path-first ordering
+- Failed, missing and circular dependencies
+"""
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Add lib to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "lib"))
+
+from _codemode_executor import PlanExecutor  # noqa: E402
+from _codemode_planner import ExecutionPlan, ToolCallSpec  # noqa: E402
+
+
+def _plan(*calls: ToolCallSpec) -> ExecutionPlan:
+    return ExecutionPlan(run_id="test", calls=list(calls))
+
+
+def _call(call_id: str, tool: str = "t", ms: int = 0, deps=(), **args) -> ToolCallSpec:
+    return ToolCallSpec(
+        id=call_id, tool=tool, args={"ms": ms, **args}, depends_on=list(deps)
+    )
+
+
+class Recorder:
+    """Invoker that sleeps args["ms"] and records start/end order."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.events: list[tuple[str, str]] = []
+        self.active: dict[str, int] = {}
+        self.peak: dict[str, int] = {}
+
+    def __call__(self, tool: str, args: dict) -> dict:
+        with self.lock:
+            self.events.append(("start", args["name"]))
+            self.active[tool] = self.active.get(tool, 0) + 1
+            self.peak[tool] = max(self.peak.get(tool, 0), self.active[tool])
+        time.sleep(args["ms"] / 1000)
+        with self.lock:
+            self.active[tool] -= 1
+            self.events.append(("end", args["name"]))
+        if args.get("fail"):
+            return {"error": "boom"}
+        return {"ok": True}
+
+
+def _named(*calls: ToolCallSpec) -> ExecutionPlan:
+    for call in calls:
+        call.args["name"] = call.id
+    return _plan(*calls)
+
+
+class TestReadyQueue:
+    """Tests for dependency-driven dispatch."""
+
+    def test_dependent_starts_before_unrelated_slow_call_ends(self):
+        rec = Recorder()
+        plan = _named(_call("slow", ms=150), _call("a", ms=5), _call("b", deps=["a"]))
+        with PlanExecutor(tool_invoker=rec, log_executions=False) as executor:
+            result = executor.execute(plan)
+        assert result.success
+        assert rec.events.index(("start", "b")) < rec.events.index(("end", "slow"))
+
+    def test_tool_limit_caps_concurrency(self):
+        rec = Recorder()
+        calls = [_call(f"c{i}", tool="mcp__pal__chat", ms=20) for i in range(4)]
+        with PlanExecutor(
+            tool_invoker=rec,
+            log_executions=False,
+            tool_limits={"mcp__pal__": 1},
+        ) as executor:
+            assert executor.execute(_named(*calls)).success
+        assert rec.peak["mcp__pal__chat"] == 1
+
+    def test_critical_path_first(self):
+        rec = Recorder()
+        plan = _named(
+            _call("leaf"),
+            _call("head"),
+            _call("mid", deps=["head"]),
+            _call("tail", deps=["mid"]),
+        )
+        executor = PlanExecutor(tool_invoker=rec, log_executions=False, max_workers=1)
+        executor.execute(plan)
+        executor.close()
+        starts = [name for kind, name in rec.events if kind == "start"]
+        assert starts[0] == "head"
+
+
+class TestUnresolved:
+    """Tests for calls that can never run."""
+
+    def test_failed_dependency_blocks_dependents(self):
+        rec = Recorder()
+        plan = _named(_call("a", fail=True), _call("b", deps=["a"]))
+        result = PlanExecutor(tool_invoker=rec, log_executions=False).execute(plan)
+        assert result.failed_calls == ["a", "b"]
+        assert "Unresolved" in result.results["b"].error
+
+    def test_missing_and_circular_dependencies(self):
+        plan = _plan(
+            _call("x", deps=["nope"]),
+            _call("p", deps=["q"]),
+            _call("q", deps=["p"]),
+            _call("ok"),
+        )
+        result = PlanExecutor(log_executions=False).execute(plan)
+        assert result.results["ok"].success
+        assert sorted(result.failed_calls) == ["p", "q", "x"]
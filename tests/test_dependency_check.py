@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""Tests for dependency_check's fingerprint-cached probes.
+
+Tests cover:
+- Unchanged probe inputs are answered from cache
+- Changed inputs, expired TTLs and timeouts re-run (or skip caching)
+- Probes that re-run execute concurrently
+- Cache-only runs (SessionStart's critical path) never run slow probes;
+  a later full run fills the cache for them
+- run_dependency_check() end to end against a fake home
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+# Add hooks to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "hooks"))
+
+import dependency_check  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def cache_file(tmp_path, monkeypatch):
+    path = tmp_path / "dep_check_cache.json"
+    monkeypatch.setattr(dependency_check, "CACHE_FILE", path)
+    return path
+
+
+@pytest.fixture
+def probes(monkeypatch):
+    """Replace PROBES with counting fakes; returns (calls, inputs)."""
+    calls = []
+    inputs = {"tool": "v1"}
+
+    def probe(name, delay=0.0):
+        def check():
+            calls.append(name)
+            time.sleep(delay)
+            return [{"type": "binary", "name": name, "required": False}]
+
+        return check
+
+    monkeypatch.setattr(
+        dependency_check,
+        "PROBES",
+        {
+            "always": {"check": probe("always")},
+            "tool": {
+                "check": probe("tool", 0.3),
+                "inputs": lambda: [inputs["tool"]],
+                "timeout": 2,
+            },
+            "other": {
+                "check": probe("other", 0.3),
+                "inputs": lambda: ["fixed"],
+                "timeout": 2,
+            },
+            "procs": {"check": probe("procs"), "ttl": 60},
+        },
+    )
+    return calls, inputs
+
+
+class TestProbeCache:
+    """Tests for run_probes() caching."""
+
+    def test_unchanged_inputs_cached(self, probes):
+        calls, _ = probes
+        issues, status = dependency_check.run_probes()
+        assert [i["name"] for i in issues] == ["always", "tool", "other", "procs"]
+        calls.clear()
+
+        issues, status = dependency_check.run_probes()
+        assert calls == ["always"]
+        assert [i["name"] for i in issues] == ["always", "tool", "other", "procs"]
+        assert status == {
+            "always": "ok",
+            "tool": "cached",
+            "other": "cached",
+            "procs": "cached",
+        }
+
+    def test_changed_inputs_rerun(self, probes):
+        calls, inputs = probes
+        dependency_check.run_probes()
+        calls.clear()
+        inputs["tool"] = "v2"
+        _, status = dependency_check.run_probes()
+        assert sorted(calls) == ["always", "tool"]
+        assert status["tool"] == "ok"
+
+    def test_ttl_expiry(self, probes, monkeypatch):
+        calls, _ = probes
+        dependency_check.run_probes()
+        calls.clear()
+        real_time = time.time
+        monkeypatch.setattr(dependency_check.time, "time", lambda: real_time() + 120)
+        dependency_check.run_probes()
+        assert "procs" in calls
+        assert "tool" not in calls  # Fingerprinted probes live longer
+
+    def test_no_cache(self, probes):
+        calls, _ = probes
+        dependency_check.run_probes()
+        calls.clear()
+        dependency_check.run_probes(use_cache=False)
+        assert sorted(calls) == ["always", "other", "procs", "tool"]
+
+    def test_reruns_are_concurrent(self, probes):
+        start = time.monotonic()
+        dependency_check.run_probes()
+        assert time.monotonic() - start < 0.55  # Two 0.3s probes
+
+    def test_timeout_not_cached(self, probes, monkeypatch):
+        calls, _ = probes
+        monkeypatch.setitem(dependency_check.PROBES["tool"], "timeout", 0.05)
+        issues, status = dependency_check.run_probes()
+        assert status["tool"] == "timeout"
+        assert "tool" not in [i["name"] for i in issues]
+
+        monkeypatch.setitem(dependency_check.PROBES["tool"], "timeout", 2)
+        calls.clear()
+        _, status = dependency_check.run_probes()
+        assert "tool" in calls
+
+
+class TestCacheOnly:
+    """Tests for refresh=False, as used on SessionStart's critical path."""
+
+    def test_cold_cache_pending(self, probes):
+        calls, _ = probes
+        issues, status = dependency_check.run_probes(refresh=False)
+        assert calls == ["always"]
+        assert status["tool"] == status["other"] == status["procs"] == "pending"
+        assert [i["name"] for i in issues] == ["always"]
+
+    def test_stale_entry_stands_in(self, probes):
+        calls, inputs = probes
+        dependency_check.run_probes()
+        calls.clear()
+        inputs["tool"] = "v2"
+        issues, status = dependency_check.run_probes(refresh=False)
+        assert calls == ["always"]
+        assert status["tool"] == "pending"
+        assert "tool" in [i["name"] for i in issues]
+
+    def test_foreground_timeout_then_background_refresh(self, probes):
+        from _task_graph import Task, run_tasks
+
+        def foreground():
+            return run_tasks(
+                [
+                    Task(
+                        "dependencies",
+                        lambda r: dependency_check.run_dependency_check(refresh=False),
+                        timeout=0.2,  # Shorter than the 0.3s probes
+                    )
+                ]
+            )
+
+        results, timings = foreground()
+        assert timings[0]["status"] == "ok"
+        assert not results["dependencies"]["cached"]
+
+        # The background process runs the full check and caches it
+        dependency_check.run_dependency_check()
+        results, _ = foreground()
+        assert results["dependencies"]["cached"]
+        assert results["dependencies"]["probes"]["tool"] == "cached"
+
+
+class TestRunDependencyCheck:
+    """End-to-end tests with the real probes."""
+
+    def test_second_run_cached(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("HOME", str(tmp_path / "home"))
+        first = dependency_check.run_dependency_check()
+        assert not first["cached"]
+        second = dependency_check.run_dependency_check()
+        assert second["cached"]
+        assert second["summary"] == first["summary"]
+
+        refreshed = dependency_check.run_dependency_check(force_refresh=True)
+        assert not refreshed["cached"]
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""Tests for the incremental false-positive rollup.
+
+Tests cover:
+- record_fp() appends to the history and updates the rollup
+- Readers fold in only entries appended since the checkpoint
+- A replaced or truncated history is re-read from the start
+- Time windows, reason clusters and recent entries
+- Windows longer than the bucket retention are clamped and flagged
+- fp_analyze and the health check read the rollup
+"""
+
+import json
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+# Add lib and ops to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "lib"))
+sys.path.insert(0, str(Path(__file__).parent.parent / "ops"))
+
+import fp_rollup  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def history(tmp_path, monkeypatch):
+    path = tmp_path / "fp_history.jsonl"
+    monkeypatch.setattr(fp_rollup, "FP_HISTORY_FILE", path)
+    monkeypatch.setattr(fp_rollup, "ROLLUP_FILE", tmp_path / "fp_rollup.json")
+    return path
+
+
+def entry(reducer, reason="", days_ago=0):
+    when = datetime.now() - timedelta(days=days_ago)
+    return {"timestamp": when.isoformat(), "reducer": reducer, "reason": reason}
+
+
+def append_raw(path, *entries):
+    with path.open("a") as f:
+        for e in entries:
+            f.write(json.dumps(e) + "\n")
+
+
+class TestRollup:
+    """Tests for maintaining the rollup."""
+
+    def test_record_updates_history_and_rollup(self, history):
+        fp_rollup.record_fp(entry("edit_oscillation", "legit refactor"))
+        fp_rollup.record_fp(entry("edit_oscillation"))
+
+        assert len(history.read_text().splitlines()) == 2
+        saved = json.loads(fp_rollup.ROLLUP_FILE.read_text())
+        assert saved["offset"] == history.stat().st_size
+        assert saved["reducers"] == {"edit_oscillation": 2}
+
+    def test_only_new_entries_parsed(self, history, monkeypatch):
+        append_raw(history, entry("a"), entry("b"))
+        assert fp_rollup.load_rollup()["total"] == 2
+
+        parsed = []
+        fold = fp_rollup._fold
+        monkeypatch.setattr(
+            fp_rollup, "_fold", lambda r, e: (parsed.append(e), fold(r, e))
+        )
+        assert fp_rollup.load_rollup()["total"] == 2
+        assert parsed == []
+
+        append_raw(history, entry("c"))
+        assert fp_rollup.load_rollup()["reducers"] == {"a": 1, "b": 1, "c": 1}
+        assert [e["reducer"] for e in parsed] == ["c"]
+
+    def test_partial_line_waits(self, history):
+        append_raw(history, entry("a"))
+        with history.open("a") as f:
+            f.write('{"reducer": "b"')
+        assert fp_rollup.load_rollup()["total"] == 1
+        with history.open("a") as f:
+            f.write("}\n")
+        assert fp_rollup.load_rollup()["reducers"] == {"a": 1, "b": 1}
+
+    def test_truncated_history_reread(self, history):
+        append_raw(history, entry("a"), entry("a"), entry("a"))
+        fp_rollup.load_rollup()
+        history.write_text(json.dumps(entry("b")) + "\n")
+        assert fp_rollup.load_rollup()["reducers"] == {"b": 1}
+
+    def test_missing_history_is_empty(self, history):
+        assert fp_rollup.load_rollup()["total"] == 0
+        append_raw(history, entry("a"))
+        fp_rollup.load_rollup()
+        history.unlink()
+        assert fp_rollup.load_rollup()["total"] == 0
+
+
+class TestWindow:
+    """Tests for windowed aggregates and reason clusters."""
+
+    def test_window_by_days(self, history):
+        append_raw(history, entry("old", days_ago=20), entry("new"), entry("new"))
+        rollup = fp_rollup.load_rollup()
+        assert fp_rollup.window(rollup, 14)["reducers"] == {"new": 2}
+        assert fp_rollup.window(rollup)["reducers"] == {"old": 1, "new": 2}
+
+    def test_window_beyond_buckets_is_clamped(self, history):
+        append_raw(history, entry("ancient", days_ago=120), entry("new"))
+        rollup = fp_rollup.load_rollup()
+        view = fp_rollup.window(rollup, 180)
+        assert view["reducers"] == {"new": 1}
+        assert view["clamped_days"] == fp_rollup.BUCKET_MAX_DAYS
+        assert "clamped_days" not in fp_rollup.window(rollup, 30)
+        assert "clamped_days" not in fp_rollup.window(rollup)
+
+    def test_reason_clusters(self, history):
+        append_raw(
+            history,
+            entry("r", "Edited file 3 times"),
+            entry("r", "edited  file 12 times"),
+            entry("r", "different"),
+        )
+        reasons = fp_rollup.window(fp_rollup.load_rollup())["reasons"]["r"]
+        assert reasons[0] == {"reason": "edited  file 12 times", "count": 2}
+        assert reasons[1]["count"] == 1
+
+    def test_cluster_cap(self, history, monkeypatch):
+        monkeypatch.setattr(fp_rollup, "REASON_CLUSTERS_MAX", 2)
+        append_raw(
+            history,
+            entry("r", "keep"),
+            entry("r", "keep"),
+            entry("r", "one"),
+            entry("r", "two"),
+        )
+        clusters = fp_rollup.load_rollup()["clusters"]["r"]
+        assert set(clusters) == {"keep", "two"}
+
+
+class TestConsumers:
+    """Tests for the analyzer and health check on top of the rollup."""
+
+    def test_fp_analyze(self, history):
+        import fp_analyze
+
+        append_raw(
+            history,
+            *[entry("edit_oscillation", "same reason") for _ in range(4)],
+            entry("other", days_ago=30),
+        )
+        analysis = fp_analyze.analyze_patterns(fp_rollup.load_rollup())
+        assert analysis["total"] == 5
+        types = {i["type"] for i in analysis["insights"]}
+        assert types == {"high_frequency", "recent_spike", "common_reason"}
+
+        recent = fp_analyze.analyze_patterns(fp_rollup.load_rollup(), since_days=7)
+        assert recent["reducers"] == {"edit_oscillation": 4}
+        assert "x4" in fp_analyze.format_full_report(recent)
+
+    def test_fp_analyze_reports_clamp(self, history):
+        import fp_analyze
+
+        append_raw(history, entry("edit_oscillation"))
+        analysis = fp_analyze.analyze_patterns(fp_rollup.load_rollup(), since_days=180)
+        assert analysis["clamped_days"] == fp_rollup.BUCKET_MAX_DAYS
+        assert "capped at 90d" in fp_analyze.format_summary(analysis)
+        assert "capped" not in fp_analyze.format_summary(
+            fp_analyze.analyze_patterns(fp_rollup.load_rollup(), since_days=7)
+        )
+
+    def test_health_check(self, history):
+        import health
+
+        append_raw(history, *[entry("noisy") for _ in range(5)])
+        result = health.check_fp_history()
+        assert result["metrics"]["total_fps"] == 5
+        assert result["status"] == "warning"
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""Tests for git_probe module.
+
+Tests cover:
+- Repo root, branch, HEAD and remote read from .git
+- Detached HEAD, packed refs and linked worktrees
+- status_porcelain() matching `git status --porcelain`
+- In-place edits answered without running git
+- Quoted (non-ASCII) paths decoded and re-quoted like git
+"""
+
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add lib to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "lib"))
+
+import git_probe  # noqa: E402
+
+pytestmark = pytest.mark.skipif(shutil.which("git") is None, reason="git not installed")
+
+
+def git(repo, *args):
+    return subprocess.run(
+        ["git", "-c", "user.name=t", "-c", "user.email=t@t", *args],
+        cwd=repo,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+
+
+def real_status(repo):
+    return sorted(git(repo, "status", "--porcelain").splitlines())
+
+
+def probe_status(repo):
+    return sorted((git_probe.status_porcelain(str(repo)) or "").splitlines())
+
+
+@pytest.fixture
+def repo(tmp_path, monkeypatch):
+    monkeypatch.setattr(git_probe, "CACHE_DIR", tmp_path / "cache")
+    monkeypatch.delenv("GIT_DIR", raising=False)
+    monkeypatch.delenv("GIT_WORK_TREE", raising=False)
+    root = tmp_path / "repo"
+    (root / "pkg").mkdir(parents=True)
+    (root / "a.py").write_text("a = 1\n")
+    (root / "pkg" / "b.py").write_text("b = 2\n")
+    (root / ".gitignore").write_text("*.log\n")
+    git(root, "init", "-q", "-b", "main")
+    git(root, "add", "-A")
+    git(root, "commit", "-q", "-m", "init")
+    return root
+
+
+class TestRefs:
+    """Tests for HEAD, branch, root and remote lookups."""
+
+    def test_root_and_branch(self, repo):
+        assert git_probe.repo_root(str(repo / "pkg")) == str(repo.resolve())
+        assert git_probe.current_branch(str(repo)) == "main"
+        assert git_probe.head_sha(str(repo)) == git(repo, "rev-parse", "HEAD").strip()
+
+    def test_outside_repo(self, tmp_path):
+        outside = tmp_path / "plain"
+        outside.mkdir()
+        assert git_probe.repo_root(str(outside)) is None
+        assert git_probe.current_branch(str(outside)) is None
+        assert git_probe.status_porcelain(str(outside)) is None
+
+    def test_detached_head(self, repo):
+        git(repo, "checkout", "-q", "--detach")
+        assert git_probe.current_branch(str(repo)) == ""
+        assert git_probe.head_sha(str(repo)) == git(repo, "rev-parse", "HEAD").strip()
+
+    def test_packed_refs(self, repo):
+        git(repo, "pack-refs", "--all")
+        assert not (repo / ".git" / "refs" / "heads" / "main").exists()
+        assert git_probe.head_sha(str(repo)) == git(repo, "rev-parse", "HEAD").strip()
+
+    def test_remote_url_with_insteadof(self, repo):
+        git(repo, "remote", "add", "origin", "gh:user/proj.git")
+        assert git_probe.remote_url(str(repo)) == "gh:user/proj.git"
+        git(repo, "config", "url.git@github.com:.insteadOf", "gh:")
+        assert (
+            git_probe.remote_url(str(repo))
+            == git(repo, "remote", "get-url", "origin").strip()
+        )
+        assert git_probe.remote_url(str(repo), "upstream") is None
+
+    def test_linked_worktree(self, repo, tmp_path):
+        wt = tmp_path / "wt"
+        git(repo, "worktree", "add", "-q", "-b", "feature", str(wt))
+        assert git_probe.current_branch(str(wt)) == "feature"
+        assert git_probe.repo_root(str(wt)) == str(wt.resolve())
+        (wt / "a.py").write_text("a = 2\n")
+        assert probe_status(wt) == real_status(wt)
+
+
+class TestStatus:
+    """Tests for status_porcelain() against real git."""
+
+    def test_clean(self, repo):
+        assert git_probe.status_porcelain(str(repo)) == ""
+        assert not git_probe.is_dirty(str(repo))
+
+    def test_worktree_changes(self, repo):
+        (repo / "a.py").write_text("a = 10\n")
+        (repo / "pkg" / "b.py").unlink()
+        (repo / "new.py").write_text("n = 1\n")
+        (repo / "ignored.log").write_text("x\n")
+        assert probe_status(repo) == real_status(repo)
+        assert git_probe.is_dirty(str(repo))
+
+    def test_staged_and_renamed(self, repo):
+        (repo / "c.py").write_text("c = 3\n")
+        git(repo, "add", "c.py")
+        git(repo, "mv", "pkg/b.py", "pkg/renamed.py")
+        (repo / "c.py").write_text("c = 4\n")
+        assert probe_status(repo) == real_status(repo)
+
+    def test_non_ascii_paths_quoted(self, repo):
+        (repo / "café.py").write_text("c = 1\n")
+        (repo / "naïve.py").write_text("n = 1\n")
+        git(repo, "add", "café.py", "naïve.py")
+        git(repo, "commit", "-q", "-m", "unicode")
+        (repo / "café.py").write_text("c = 2\n")
+        git(repo, "add", "café.py")
+        (repo / "café.py").write_text("c = 3\n")
+        (repo / "naïve.py").write_text("n = 2\n")
+        (repo / "tab\there.py").write_text("t = 1\n")
+        assert probe_status(repo) == real_status(repo)
+        assert len(probe_status(repo)) == 3
+
+    def test_unquote_roundtrip(self):
+        for path in ["café.py", 'say "hi".py', "back\\slash", "a\tb", "plain.py"]:
+            quoted = git_probe._quote_path(path)
+            assert git_probe._index_path(quoted) == path
+
+    def test_same_size_edit_detected(self, repo):
+        (repo / "a.py").write_text("a = 9\n")
+        assert probe_status(repo) == [" M a.py"]
+
+    def test_in_place_edit_does_not_run_git(self, repo, monkeypatch):
+        probe_status(repo)  # Prime the staged/untracked cache
+        calls = []
+        real_run = git_probe._run_status
+        monkeypatch.setattr(
+            git_probe, "_run_status", lambda root: calls.append(root) or real_run(root)
+        )
+        (repo / "a.py").write_text("a = 1\nb = 2\n")
+        assert probe_status(repo) == [" M a.py"]
+        assert calls == []
+
+        (repo / "pkg" / "new.py").write_text("x = 1\n")  # New file: dir mtime
+        assert probe_status(repo) == real_status(repo)
+        assert len(calls) == 1
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""Tests for the structured hook log sink.
+
+Tests cover:
+- Records are buffered and appended once on flush
+- Records carry hook, event, session and duration
+- DEBUG records are sampled; stderr output is unchanged
+- The active file rotates into indexed segments, oldest dropped
+- query_logs() filters by hook, level, time and session, skipping segments
+  the index rules out
+"""
+
+import json
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+# Add hooks to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "hooks"))
+
+import _logging  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def log_dir(tmp_path, monkeypatch):
+    directory = tmp_path / "hook_logs"
+    monkeypatch.setattr(_logging, "LOG_DIR", directory)
+    monkeypatch.setattr(_logging, "LOG_FILE", directory / "hooks.jsonl")
+    monkeypatch.setattr(_logging, "LOG_INDEX", directory / "index.json")
+    monkeypatch.setattr(_logging, "FILE_LOGGING", True)
+    monkeypatch.setattr(_logging, "LOG_LEVEL", 10)
+    monkeypatch.setattr(_logging, "DEBUG_SAMPLE_RATE", 1.0)
+    monkeypatch.setattr(_logging, "_context", {"event": None, "session": None})
+    _logging._records.clear()
+    yield directory
+    _logging._records.clear()
+
+
+def records(path):
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+class TestSink:
+    """Tests for buffering and record shape."""
+
+    def test_buffered_until_flush(self, log_dir, capsys):
+        _logging.set_log_context("PreToolUse", "sess-1")
+        _logging.log_warn("gate", "blocked")
+        _logging.log_timing("pre_tool_use_runner", 12.34)
+        assert not (log_dir / "hooks.jsonl").exists()
+        assert "[WARN] [gate] blocked" in capsys.readouterr().err
+
+        _logging.flush_logs()
+        warn, timing = records(log_dir / "hooks.jsonl")
+        assert warn["hook"] == "gate"
+        assert warn["level"] == "WARN"
+        assert warn["event"] == "PreToolUse"
+        assert warn["session"] == "sess-1"
+        assert timing["duration_ms"] == 12.3
+
+    def test_debug_sampled(self, log_dir, monkeypatch, capsys):
+        monkeypatch.setattr(_logging, "DEBUG_SAMPLE_RATE", 0.0)
+        _logging.log_debug("hook", "noisy")
+        _logging.log_error("hook", "failed", ValueError("bad"))
+        _logging.flush_logs()
+
+        (record,) = records(log_dir / "hooks.jsonl")
+        assert record["msg"] == "failed: ValueError: bad"
+        assert "noisy" in capsys.readouterr().err
+
+    def test_no_file_logging(self, log_dir, monkeypatch):
+        monkeypatch.setattr(_logging, "FILE_LOGGING", False)
+        _logging.log_warn("hook", "message")
+        _logging.flush_logs()
+        assert not log_dir.exists()
+
+
+class TestRotationAndQuery:
+    """Tests for rotated segments and log queries."""
+
+    def write(self, hook, level="INFO", session="s1", count=1):
+        _logging.set_log_context("Stop", session)
+        for n in range(count):
+            _logging._emit(hook, level, f"{hook} {n}")
+        _logging.flush_logs()
+
+    def test_rotation_indexes_segments(self, log_dir, monkeypatch):
+        monkeypatch.setattr(_logging, "LOG_MAX_BYTES", 1)
+        self.write("alpha", "INFO")
+        time.sleep(0.002)
+        self.write("beta", "ERROR")
+
+        index = json.loads((log_dir / "index.json").read_text())
+        assert len(index) == 2
+        assert [meta["hooks"] for _, meta in sorted(index.items())] == [
+            ["alpha"],
+            ["beta"],
+        ]
+        assert not (log_dir / "hooks.jsonl").exists()
+
+    def test_oldest_segments_dropped(self, log_dir, monkeypatch):
+        monkeypatch.setattr(_logging, "LOG_MAX_BYTES", 1)
+        monkeypatch.setattr(_logging, "LOG_MAX_FILES", 2)
+        for n in range(4):
+            self.write(f"hook{n}")
+            time.sleep(0.002)
+
+        index = json.loads((log_dir / "index.json").read_text())
+        assert [meta["hooks"][0] for _, meta in sorted(index.items())] == [
+            "hook2",
+            "hook3",
+        ]
+        assert len(list(log_dir.glob("hooks.*.jsonl"))) == 2
+
+    def test_query_filters(self, monkeypatch):
+        monkeypatch.setattr(_logging, "LOG_MAX_BYTES", 1)
+        self.write("alpha", "DEBUG", session="s1")
+        time.sleep(0.002)
+        self.write("alpha", "ERROR", session="s2")
+        monkeypatch.setattr(_logging, "LOG_MAX_BYTES", 1 << 20)
+        self.write("beta", "WARN", count=3)
+
+        assert len(_logging.query_logs(hook="alpha")) == 2
+        assert [r["level"] for r in _logging.query_logs(level="warn")] == [
+            "ERROR",
+            "WARN",
+            "WARN",
+            "WARN",
+        ]
+        assert _logging.query_logs(session="s2")[0]["hook"] == "alpha"
+        assert len(_logging.query_logs(hook="beta", limit=2)) == 2
+        assert _logging.query_logs(since=time.time() + 60) == []
+
+    def test_query_skips_excluded_segments(self, monkeypatch):
+        monkeypatch.setattr(_logging, "LOG_MAX_BYTES", 1)
+        self.write("alpha")
+        time.sleep(0.002)
+        self.write("beta")
+
+        opened = []
+        read_records = _logging._read_records
+
+        def tracking(path, needle=None):
+            opened.append(path.name)
+            return read_records(path, needle)
+
+        monkeypatch.setattr(_logging, "_read_records", tracking)
+        assert len(_logging.query_logs(hook="beta")) == 1
+        # Only beta's segment and the (absent) active file are read
+        assert len(opened) == 2
+        assert "hooks.jsonl" in opened
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""Tests for the hook registration manifest.
+
+Tests cover:
+- Registrations read from source without importing the module
+- Manifest revalidated when a module changes
+- LazyHook imports its module on first call
+- Manifest matches the runners' eager registrations
+- Runners import no hook module at load
+"""
+
+import os
+import subprocess
+import sys
+import textwrap
+import time
+from pathlib import Path
+
+import pytest
+
+HOOKS_DIR = Path(__file__).parent.parent / "hooks"
+
+# Add hooks/lib to path for imports
+sys.path.insert(0, str(HOOKS_DIR))
+sys.path.insert(0, str(Path(__file__).parent.parent / "lib"))
+sys.path.insert(0, str(Path(__file__).parent.parent / "ops"))
+
+import _hook_manifest  # noqa: E402
+from _hook_manifest import LazyHook, compile_matcher, load_hooks, scan_source  # noqa: E402
+
+SOURCE = textwrap.dedent(
+    """
+    from _hook_registry import register_hook
+
+    EDITS = "Edit|Write"
+
+    @register_hook("first", EDITS, priority=10)
+    def check_first(data, state, runner_state):
+        return "first"
+
+    @register_hook(
+        "second",
+        None,
+        priority=5,
+    )
+    def check_second(data, state, runner_state):
+        return "second"
+
+    def helper():
+        pass
+    """
+)
+
+
+@pytest.fixture
+def hook_module(tmp_path, monkeypatch):
+    """A hook module on disk, with the manifest directed at tmp_path."""
+    monkeypatch.setattr(_hook_manifest, "HOOKS_DIR", tmp_path)
+    monkeypatch.setattr(_hook_manifest, "MANIFEST_DIR", tmp_path / "manifest")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    path = tmp_path / "_hooks_demo.py"
+    path.write_text(SOURCE)
+    yield path
+    sys.modules.pop("_hooks_demo", None)
+    from _hook_registry import HOOKS
+
+    HOOKS[:] = [h for h in HOOKS if h[2].__module__ != "_hooks_demo"]
+
+
+class TestScan:
+    """Tests for reading registrations from source."""
+
+    def test_literals_and_constants(self):
+        assert scan_source(SOURCE) == [
+            ("first", "Edit|Write", 10, "check_first"),
+            ("second", None, 5, "check_second"),
+        ]
+
+    def test_nested_registration_unreadable(self):
+        source = SOURCE + textwrap.dedent(
+            """
+            if True:
+                @register_hook("hidden")
+                def check_hidden(data, state, runner_state):
+                    pass
+            """
+        )
+        assert scan_source(source) is None
+
+    def test_non_literal_argument_unreadable(self):
+        assert scan_source(SOURCE.replace('"first", EDITS', "NAME, EDITS")) is None
+
+
+class TestManifest:
+    """Tests for manifest caching and lazy hooks."""
+
+    def test_no_import_until_called(self, hook_module):
+        hooks = load_hooks("demo", ["_hooks_demo"])
+        assert [h[0] for h in hooks] == ["first", "second"]
+        assert "_hooks_demo" not in sys.modules
+        assert hooks[0][2]({}, None, {}) == "first"
+        assert "_hooks_demo" in sys.modules
+
+    def test_changed_module_rescanned(self, hook_module):
+        load_hooks("demo", ["_hooks_demo"])
+        hook_module.write_text(SOURCE.replace('"second"', '"renamed"'))
+        stat = hook_module.stat()
+        os.utime(hook_module, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        assert [h[0] for h in load_hooks("demo", ["_hooks_demo"])] == [
+            "first",
+            "renamed",
+        ]
+
+    def test_disable_env(self, hook_module, monkeypatch):
+        monkeypatch.setenv("CLAUDE_HOOK_DISABLE_FIRST", "1")
+        assert [h[0] for h in load_hooks("demo", ["_hooks_demo"])] == ["second"]
+
+    def test_unreadable_module_imported_eagerly(self, hook_module):
+        hook_module.write_text(SOURCE.replace('"first", EDITS', "NAME, EDITS"))
+        registry = []
+
+        def check_real(data, state, runner_state):
+            pass
+
+        check_real.__module__ = "_hooks_demo"
+        registry.append(("real", None, check_real, 1))
+        sys.modules["_hooks_demo"] = type(sys)("_hooks_demo")
+        assert load_hooks("demo", ["_hooks_demo"], registry=registry) == registry
+
+    def test_lazy_hook_repr(self):
+        hook = LazyHook("json", "dumps")
+        assert "lazy" in repr(hook)
+        assert hook([1]) == "[1]"
+        assert "loaded" in repr(hook)
+
+
+class TestMatchers:
+    """Tests for compile_matcher()."""
+
+    @pytest.mark.parametrize(
+        "matcher,tool,expected",
+        [
+            (None, "Anything", True),
+            ("Edit|Write", "Write", True),
+            ("Edit|Write", "MultiEdit", False),
+            ("mcp__serena__.*", "mcp__serena__find_symbol", True),
+            ("mcp__serena__.*", "Edit", False),
+        ],
+    )
+    def test_matches_regex_semantics(self, matcher, tool, expected):
+        assert bool(compile_matcher(matcher)(tool)) is expected
+
+
+class TestRunners:
+    """Tests against the real runners."""
+
+    def test_manifest_matches_eager_registration(self):
+        import _lib_path  # noqa: F401
+        import gates
+        import post_tool_use_runner
+        from _hook_registry import HOOKS as registered
+
+        lazy = [(n, m, f.__name__, p) for n, m, f, p in post_tool_use_runner.HOOKS]
+        for module in post_tool_use_runner.HOOK_MODULES:
+            __import__(module)
+        eager = [(n, m, f.__name__, p) for n, m, f, p in registered]
+        assert sorted(lazy) == sorted(eager)
+
+        lazy_gates = load_hooks(
+            "pre_tool_use", [f"gates.{m}" for m in gates.GATE_MODULES]
+        )
+        gates.load_all()
+        assert sorted((n, m, f.__name__, p) for n, m, f, p in lazy_gates) == sorted(
+            (n, m, f.__name__, p) for n, m, f, p in gates.HOOKS
+        )
+
+    def test_runners_within_import_budget(self):
+        import import_budget
+
+        start = time.monotonic()
+        results = import_budget.check(
+            {r: import_budget.RUNNER_BUDGETS_MS[r] for r in import_budget.LAZY_RUNNERS},
+            runs=1,
+        )
+        assert time.monotonic() - start < 60
+        for result in results:
+            assert result["error"] is None
+            assert result["eager"] == []
+
+    def test_parse_importtime(self):
+        import import_budget
+
+        rows = import_budget.parse_importtime(
+            "import time: self [us] | cumulative | imported package\n"
+            "import time:       120 |        120 |   _hooks_state\n"
+            "import time:      4000 |       4120 | post_tool_use_runner\n"
+        )
+        assert [r["module"] for r in rows] == ["_hooks_state", "post_tool_use_runner"]
+        assert rows[1]["cumulative_us"] == 4120
+        assert import_budget.eager_hook_modules(rows) == ["_hooks_state"]
+        assert import_budget.eager_hook_modules(
+            [{"module": "gates._common"}, {"module": "gates._bash"}]
+        ) == ["gates._bash"]
+
+
+def test_runner_subprocess_imports_no_hooks():
+    """Importing a runner in a fresh process loads no hook module."""
+    code = (
+        "import sys, _lib_path, pre_tool_use_runner, post_tool_use_runner;"
+        "print(sorted(m for m in sys.modules if m.startswith(('_hooks_', 'gates.'))))"
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=HOOKS_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    assert out.strip() == "['gates._common']"
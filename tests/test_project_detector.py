@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""Tests for project_detector's persistent detection cache.
+
+Tests cover:
+- A fresh process reuses the on-disk detection without re-detecting
+- Project file, remote config and HEAD changes invalidate the entry
+- Entries are per cwd
+"""
+
+import os
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add lib to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "lib"))
+
+import project_detector  # noqa: E402
+
+
+def new_process(monkeypatch):
+    """Forget in-process caches, as a new hook process would."""
+    for name in (
+        "_PROJECT_CACHE",
+        "_PROJECT_CACHE_CWD",
+        "_GIT_ROOT_CACHE",
+        "_GIT_ROOT_CACHE_CWD",
+        "_GIT_REMOTE_CACHE",
+        "_GIT_REMOTE_CACHE_CWD",
+    ):
+        monkeypatch.setattr(project_detector, name, None)
+
+
+@pytest.fixture
+def project(tmp_path, monkeypatch):
+    monkeypatch.setattr(project_detector, "DETECTION_CACHE_DIR", tmp_path / "cache")
+    root = tmp_path / "proj"
+    root.mkdir()
+    (root / "pyproject.toml").write_text('name = "demo"\n')
+    (root / "main.py").write_text("print(1)\n")
+    monkeypatch.chdir(root)
+    new_process(monkeypatch)
+    return root
+
+
+@pytest.fixture
+def count_detections(monkeypatch):
+    calls = []
+    real = project_detector._detect_uncached
+    monkeypatch.setattr(
+        project_detector,
+        "_detect_uncached",
+        lambda cwd: calls.append(cwd) or real(cwd),
+    )
+    return calls
+
+
+class TestDetectionCache:
+    """Tests for the cross-process detection cache."""
+
+    def test_fresh_process_uses_disk_cache(
+        self, project, count_detections, monkeypatch
+    ):
+        first = project_detector.detect_project()
+        assert first.project_name == "demo"
+        new_process(monkeypatch)
+        assert project_detector.detect_project() == first
+        assert len(count_detections) == 1
+
+    def test_project_file_change_invalidates(
+        self, project, count_detections, monkeypatch
+    ):
+        project_detector.detect_project()
+        (project / "pyproject.toml").write_text('name = "renamed-demo"\n')
+        new_process(monkeypatch)
+        assert project_detector.detect_project().project_name == "renamed-demo"
+        assert len(count_detections) == 2
+
+    def test_per_cwd_entries(self, project, count_detections, monkeypatch):
+        project_detector.detect_project()
+        other = project.parent / "other"
+        other.mkdir()
+        monkeypatch.chdir(other)
+        new_process(monkeypatch)
+        assert project_detector.detect_project().root_path == os.getcwd()
+        assert count_detections == [str(project), os.getcwd()]
+
+    @pytest.mark.skipif(shutil.which("git") is None, reason="git not installed")
+    def test_remote_change_invalidates(self, project, count_detections, monkeypatch):
+        subprocess.run(["git", "init", "-q"], cwd=project, check=True)
+        new_process(monkeypatch)
+        assert (
+            project_detector.detect_project().detection_method == "git+pyproject.toml"
+        )
+
+        subprocess.run(
+            ["git", "remote", "add", "origin", "https://example.com/team/svc.git"],
+            cwd=project,
+            check=True,
+        )
+        new_process(monkeypatch)
+        ctx = project_detector.detect_project()
+        assert ctx.project_name == "svc"
+        assert ctx.project_id.startswith("git_")
+        assert len(count_detections) == 2
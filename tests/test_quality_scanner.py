@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""Tests for the PostToolUse quality scanner.
+
+Tests cover:
+- Results are cached by file content
+- Scans that miss the budget are delivered by collect_late_results()
+- Late results for since-edited files are dropped
+- In-process radon complexity (when radon is installed)
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+# Add hooks to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "hooks"))
+sys.path.insert(0, str(Path(__file__).parent.parent / "lib"))
+
+import _quality_scanner  # noqa: E402
+from _quality_scanner import collect_late_results, scan_file  # noqa: E402
+
+RUFF_FINDING = (
+    '[{"code": "F401", "message": "`os` imported but unused", '
+    '"location": {"row": 1, "column": 8}}]'
+)
+
+
+@pytest.fixture
+def fake_ruff(tmp_path, monkeypatch):
+    """Put a `ruff` on PATH that logs each call and sleeps $RUFF_DELAY."""
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    calls = tmp_path / "ruff_calls"
+    script = bin_dir / "ruff"
+    script.write_text(
+        "#!/bin/sh\n"
+        f"echo x >> {calls}\n"
+        'sleep "${RUFF_DELAY:-0}"\n'
+        f"echo '{RUFF_FINDING}'\n"
+    )
+    script.chmod(0o755)
+    monkeypatch.setenv("PATH", f"{bin_dir}:/usr/bin:/bin")
+    monkeypatch.setattr(_quality_scanner, "CACHE_DIR", tmp_path / "cache")
+    monkeypatch.setattr(_quality_scanner, "PENDING_DIR", tmp_path / "cache" / "pending")
+
+    def call_count():
+        return len(calls.read_text().splitlines()) if calls.exists() else 0
+
+    return call_count
+
+
+@pytest.fixture
+def source(tmp_path):
+    path = tmp_path / "mod.py"
+    path.write_text("import os\n")
+    return path
+
+
+def wait_for_late(timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        late = collect_late_results()
+        if late:
+            return late
+        time.sleep(0.05)
+    return []
+
+
+class TestCache:
+    """Tests for content-hash caching."""
+
+    def test_unchanged_content_served_from_cache(self, fake_ruff, source):
+        first = scan_file(str(source))
+        assert first["issues"][0]["code"] == "F401"
+        assert scan_file(str(source)) == first
+        assert fake_ruff() == 1
+
+    def test_edit_rescans(self, fake_ruff, source):
+        scan_file(str(source))
+        source.write_text("import os\nimport sys\n")
+        scan_file(str(source))
+        assert fake_ruff() == 2
+
+    def test_non_python_ignored(self, fake_ruff, tmp_path):
+        path = tmp_path / "notes.txt"
+        path.write_text("import os\n")
+        assert scan_file(str(path)) is None
+        assert fake_ruff() == 0
+
+
+class TestBudget:
+    """Tests for budgeted scans with next-invocation delivery."""
+
+    def test_slow_scan_delivered_later(self, fake_ruff, source, monkeypatch):
+        monkeypatch.setenv("RUFF_DELAY", "0.5")
+        start = time.monotonic()
+        assert scan_file(str(source), budget=0.05) is None
+        assert time.monotonic() - start < 0.4
+
+        late = wait_for_late()
+        assert [r["file"] for r in late] == [str(source)]
+        assert collect_late_results() == []  # Delivered once
+
+        # Delivered result is cached for the same content
+        monkeypatch.setenv("RUFF_DELAY", "0")
+        assert scan_file(str(source), budget=0.05) == late[0]
+        assert fake_ruff() == 1
+
+    def test_same_content_not_rescanned_while_pending(
+        self, fake_ruff, source, monkeypatch
+    ):
+        monkeypatch.setenv("RUFF_DELAY", "0.5")
+        assert scan_file(str(source), budget=0.01) is None
+        assert scan_file(str(source), budget=0.01) is None
+        assert fake_ruff() == 1
+        wait_for_late()
+
+    def test_stale_late_result_dropped(self, fake_ruff, source, monkeypatch):
+        monkeypatch.setenv("RUFF_DELAY", "0.3")
+        assert scan_file(str(source), budget=0.01) is None
+        source.write_text("x = 1\n")
+        time.sleep(0.5)
+        assert collect_late_results() == []
+        assert not list(_quality_scanner.PENDING_DIR.glob("*.pending.json"))
+
+
+class TestRadon:
+    """Tests for in-process radon analysis."""
+
+    def test_complexity_in_process(self):
+        pytest.importorskip("radon")
+        branches = "".join(f"    if x == {i}:\n        return {i}\n" for i in range(25))
+        code = f"def busy(x):\n{branches}    return -1\n"
+        issues = _quality_scanner._run_radon_cc(code, "<code>", "C")
+        assert [i["name"] for i in issues] == ["busy"]
+        assert issues[0]["severity"] in ("high", "critical")
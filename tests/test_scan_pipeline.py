@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""Tests for scan_pipeline module.
+
+Tests cover:
+- Unchanged files are served from the cache
+- Content and version changes invalidate entries
+- Batch scanners run once over all cache misses
+- Failed batch tools are not cached
+- Process-pool results match serial results
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add lib to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "lib"))
+
+import scan_pipeline  # noqa: E402
+from scan_pipeline import scan_files  # noqa: E402
+
+
+def count_lines(path: str) -> int:
+    """Module-level worker so the process pool can pickle it."""
+    with open(path) as f:
+        return sum(1 for _ in f)
+
+
+@pytest.fixture
+def tree(tmp_path):
+    files = []
+    for i in range(20):
+        path = tmp_path / f"mod{i}.py"
+        path.write_text("x = 1\n" * (i + 1))
+        files.append(str(path))
+    return files
+
+
+@pytest.fixture
+def scan(tmp_path):
+    def _scan(paths, **kwargs):
+        kwargs.setdefault("name", "t")
+        kwargs.setdefault("version", "1")
+        return scan_files(paths, cache_dir=tmp_path / "cache", **kwargs)
+
+    return _scan
+
+
+class TestCache:
+    """Tests for content/version keyed caching."""
+
+    def test_second_scan_fully_cached(self, tree, scan):
+        first, stats = scan(tree, worker=count_lines, parallel=False)
+        assert (stats.cached, stats.scanned) == (0, 20)
+        second, stats = scan(tree, worker=count_lines, parallel=False)
+        assert second == first
+        assert (stats.cached, stats.scanned) == (20, 0)
+        assert stats.files_per_sec > 0
+
+    def test_changed_content_rescanned(self, tree, scan):
+        scan(tree, worker=count_lines, parallel=False)
+        Path(tree[0]).write_text("a\nb\nc\n")
+        results, stats = scan(tree, worker=count_lines, parallel=False)
+        assert stats.scanned == 1
+        assert results[tree[0]] == 3
+
+    def test_version_change_invalidates(self, tree, scan):
+        scan(tree, worker=count_lines, parallel=False)
+        _, stats = scan(tree, worker=count_lines, parallel=False, version="2")
+        assert stats.scanned == 20
+
+    def test_requires_one_scanner(self, tree, scan):
+        with pytest.raises(ValueError):
+            scan(tree)
+
+
+class TestBatch:
+    """Tests for one-invocation-per-tool scanners."""
+
+    def test_batch_called_once_for_misses(self, tree, scan):
+        calls = []
+
+        def batch(paths):
+            calls.append(list(paths))
+            return {p: ["finding"] for p in paths[:1]}
+
+        results, _ = scan(tree, batch=batch)
+        assert len(calls) == 1 and len(calls[0]) == 20
+        assert results[tree[0]] == ["finding"]
+        assert results[tree[1]] is None
+
+        Path(tree[5]).write_text("changed\n")
+        scan(tree, batch=batch)
+        assert calls[1] == [tree[5]]
+
+    def test_failed_tool_not_cached(self, tree, scan):
+        results, _ = scan(tree, batch=lambda paths: None)
+        assert set(results.values()) == {None}
+        _, stats = scan(tree, batch=lambda paths: {})
+        assert stats.scanned == 20
+
+
+class TestParallel:
+    """Tests for the process-pool path."""
+
+    def test_pool_matches_serial(self, tree, scan, monkeypatch):
+        monkeypatch.setattr(scan_pipeline, "PARALLEL_MIN_FILES", 2)
+        monkeypatch.setattr(scan_pipeline.os, "cpu_count", lambda: 2)
+        pooled, _ = scan(tree, worker=count_lines, use_cache=False)
+        serial, _ = scan(tree, worker=count_lines, parallel=False, use_cache=False)
+        assert pooled == serial
+        assert pooled[tree[19]] == 20
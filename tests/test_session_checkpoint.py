@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""Tests for delta-encoded session checkpoints.
+
+Tests cover:
+- Patches round-trip dicts and sliding-window lists
+- Checkpoints after the first store only a delta; chains rebase periodically
+- find_latest_checkpoint() answers from the index
+- Cleanup keeps surviving checkpoints loadable and drops orphaned blobs
+- Legacy cp_*.json snapshots still load
+"""
+
+import json
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+# Add lib to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "lib"))
+
+import session_checkpoint  # noqa: E402
+from session_checkpoint import (  # noqa: E402
+    SessionCheckpoint,
+    Tier1State,
+    Tier2State,
+    apply_patch,
+    cleanup_old_checkpoints,
+    diff_values,
+    find_latest_checkpoint,
+    list_checkpoints,
+    load_checkpoint_local,
+    save_checkpoint_local,
+)
+
+
+@pytest.fixture(autouse=True)
+def checkpoint_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(session_checkpoint, "CHECKPOINT_DIR", tmp_path)
+    return tmp_path
+
+
+def make_checkpoint(session_id="session-a", step=0):
+    files = [f"/src/f{i}.py" for i in range(max(0, step - 50), step)]
+    return SessionCheckpoint(
+        tier1=Tier1State(
+            session_id=session_id,
+            original_goal="ship it",
+            confidence=50 + step % 40,
+            last_tools=["Edit"],
+        ),
+        tier2=Tier2State(files_read=files, turn_count=step),
+        created_at=time.time(),
+        trigger="auto",
+    )
+
+
+def blob_bytes(checkpoint_dir):
+    return sorted(p.stat().st_size for p in (checkpoint_dir / "objects").glob("*.z"))
+
+
+class TestPatches:
+    """Tests for diff_values() / apply_patch()."""
+
+    @pytest.mark.parametrize(
+        "old,new",
+        [
+            ({"a": 1, "b": [1, 2]}, {"a": 2, "c": {"$set": 1}}),
+            ({"x": {"y": 1, "z": 2}}, {"x": {"y": 1}}),
+            ([1, 2, 3, 4], [3, 4, 5, 6]),
+            ([1, 2, 3], [9]),
+            ([], [1]),
+            ("text", None),
+        ],
+    )
+    def test_round_trip(self, old, new):
+        assert apply_patch(old, diff_values(old, new)) == new
+
+    def test_equal_values_no_patch(self):
+        assert diff_values({"a": [1]}, {"a": [1]}) is None
+
+    def test_sliding_window_stores_only_tail(self):
+        old = list(range(50))
+        patch = diff_values(old, list(range(1, 51)))
+        assert patch == {"$list": [1, [50]]}
+
+
+class TestStorage:
+    """Tests for save/load/find against the index."""
+
+    def test_delta_after_base(self, checkpoint_dir):
+        first = make_checkpoint(step=40)
+        save_checkpoint_local(first)
+        second = make_checkpoint(step=41)
+        save_checkpoint_local(second)
+
+        entries = list_checkpoints("session-a")
+        assert [e["kind"] for e in entries] == ["base", "delta"]
+        assert entries[1]["parent"] == entries[0]["id"]
+        base_size, delta_size = blob_bytes(checkpoint_dir)[::-1]
+        assert delta_size < base_size / 2
+
+        loaded = load_checkpoint_local(second.tier1.checkpoint_id)
+        assert loaded.tier1.confidence == second.tier1.confidence
+        assert loaded.tier2.files_read == second.tier2.files_read
+        assert loaded.tier2.turn_count == 41
+
+    def test_many_compactions_replay(self):
+        saved = []
+        for step in range(40):
+            checkpoint = make_checkpoint(step=step)
+            save_checkpoint_local(checkpoint)
+            saved.append(checkpoint)
+
+        entries = list_checkpoints()
+        assert len({e["id"] for e in entries}) == 40
+        assert max(e["chain"] for e in entries) == session_checkpoint.DELTA_CHAIN_MAX
+        for checkpoint in (saved[0], saved[17], saved[-1]):
+            loaded = load_checkpoint_local(checkpoint.tier1.checkpoint_id)
+            assert loaded.tier2.files_read == checkpoint.tier2.files_read
+
+    def test_latest_from_index(self, checkpoint_dir):
+        save_checkpoint_local(make_checkpoint("session-a"))
+        other = make_checkpoint("session-b")
+        save_checkpoint_local(other)
+        assert find_latest_checkpoint() == other.tier1.checkpoint_id
+        assert find_latest_checkpoint("session-a").endswith("session-")
+        assert find_latest_checkpoint("missing") is None
+        # No directory scan: stray files are ignored once indexed
+        (checkpoint_dir / "cp_9999999999_zzzzzzzz.json").write_text("{}")
+        assert find_latest_checkpoint() == other.tier1.checkpoint_id
+
+    def test_legacy_snapshot(self, checkpoint_dir):
+        checkpoint = make_checkpoint(step=3)
+        data = session_checkpoint._checkpoint_to_dict(checkpoint)
+        data["tier1"]["checkpoint_id"] = "cp_1_legacy00"
+        (checkpoint_dir / "cp_1_legacy00.json").write_text(json.dumps(data))
+        assert find_latest_checkpoint() == "cp_1_legacy00"
+        loaded = load_checkpoint_local("cp_1_legacy00")
+        assert loaded.tier2.files_read == checkpoint.tier2.files_read
+
+
+class TestCleanup:
+    """Tests for cleanup_old_checkpoints()."""
+
+    def test_count_limit_rebases_survivors(self, checkpoint_dir):
+        saved = []
+        for step in range(12):
+            checkpoint = make_checkpoint(step=step)
+            save_checkpoint_local(checkpoint)
+            saved.append(checkpoint)
+
+        assert cleanup_old_checkpoints(max_count=3) == 9
+        entries = list_checkpoints()
+        assert [e["kind"] for e in entries] == ["base", "delta", "delta"]
+        assert len(blob_bytes(checkpoint_dir)) == 3
+        for checkpoint in saved[-3:]:
+            loaded = load_checkpoint_local(checkpoint.tier1.checkpoint_id)
+            assert loaded.tier2.files_read == checkpoint.tier2.files_read
+        assert load_checkpoint_local(saved[0].tier1.checkpoint_id) is None
+
+        # Chains continue from the rebased survivors
+        save_checkpoint_local(make_checkpoint(step=12))
+        assert list_checkpoints()[-1]["chain"] == 3
+
+    def test_age_limit(self, checkpoint_dir):
+        old = make_checkpoint("session-old")
+        old.created_at = time.time() - 48 * 3600
+        save_checkpoint_local(old)
+        save_checkpoint_local(make_checkpoint("session-new"))
+        assert cleanup_old_checkpoints() == 1
+        assert [e["session_id"] for e in list_checkpoints()] == ["session-new"]
+        assert find_latest_checkpoint("session-old") is None
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""Tests for session_cleanup's detached cleanup worker.
+
+Tests cover:
+- Queued jobs are drained and removed when every stage finished
+- Interrupted jobs resume where they stopped; failing stages give up
+- A hung stage is interrupted so later stages and workers proceed
+- Shared stages are coalesced across jobs and sessions
+- Only one worker drains the queue at a time
+"""
+
+import fcntl
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+# Add hooks/lib to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "hooks"))
+sys.path.insert(0, str(Path(__file__).parent.parent / "lib"))
+
+import session_cleanup  # noqa: E402
+
+
+@pytest.fixture
+def queue(tmp_path, monkeypatch):
+    """Job queue in tmp_path with recording fake stages; returns the calls."""
+    jobs_dir = tmp_path / "cleanup_jobs"
+    monkeypatch.setattr(session_cleanup, "JOBS_DIR", jobs_dir)
+    monkeypatch.setattr(session_cleanup, "WORKER_LOCK", jobs_dir / "worker.lock")
+    monkeypatch.setattr(
+        session_cleanup, "STAGE_RUNS_FILE", jobs_dir / "stage_runs.json"
+    )
+    monkeypatch.chdir(tmp_path)
+    calls = []
+
+    def stage(name):
+        def run(job):
+            calls.append((name, job["id"]))
+            return {"stage": name}
+
+        return run
+
+    monkeypatch.setattr(
+        session_cleanup,
+        "CLEANUP_STAGES",
+        (
+            ("lessons", stage("lessons"), "job"),
+            ("scratch", stage("scratch"), "global"),
+            ("serena", stage("serena"), "cwd"),
+        ),
+    )
+    return calls
+
+
+def job_files():
+    return sorted(session_cleanup.JOBS_DIR.glob("job_*.json"))
+
+
+class TestWorker:
+    """Tests for run_cleanup_worker()."""
+
+    def test_drains_queue(self, queue):
+        path = session_cleanup.enqueue_cleanup_job([])
+        job_id = json.loads(path.read_text())["id"]
+        results = session_cleanup.run_cleanup_worker()
+        assert queue == [
+            ("lessons", job_id),
+            ("scratch", job_id),
+            ("serena", job_id),
+        ]
+        assert results == {
+            "lessons": {"stage": "lessons"},
+            "scratch": {"stage": "scratch"},
+            "serena": {"stage": "serena"},
+        }
+        assert job_files() == []
+
+    def test_shared_stages_coalesced(self, queue, tmp_path):
+        session_cleanup.enqueue_cleanup_job([])
+        session_cleanup.enqueue_cleanup_job([])
+        other = tmp_path / "other"
+        other.mkdir()
+        os.chdir(other)
+        session_cleanup.enqueue_cleanup_job([])
+        session_cleanup.run_cleanup_worker()
+
+        names = [name for name, _ in queue]
+        assert names.count("lessons") == 3  # Per job
+        assert names.count("scratch") == 1  # Once for the machine
+        assert names.count("serena") == 2  # Once per directory
+        assert job_files() == []
+
+        # A session ending shortly after doesn't sweep again
+        queue.clear()
+        session_cleanup.enqueue_cleanup_job([])
+        session_cleanup.run_cleanup_worker()
+        assert [name for name, _ in queue] == ["lessons"]
+
+    def test_interrupted_job_resumes(self, queue):
+        path = session_cleanup.enqueue_cleanup_job([])
+        job = json.loads(path.read_text())
+        # Worker died during "scratch" after finishing "lessons"
+        job["stages"]["lessons"] = {"status": "done", "attempts": 1}
+        job["stages"]["scratch"] = {"status": "running", "attempts": 1}
+        path.write_text(json.dumps(job))
+
+        session_cleanup.run_cleanup_worker()
+        assert [name for name, _ in queue] == ["scratch", "serena"]
+        assert job_files() == []
+
+    def test_failing_stage_retried_then_dropped(self, queue, monkeypatch):
+        def broken(job):
+            raise RuntimeError("boom")
+
+        stages = session_cleanup.CLEANUP_STAGES
+        monkeypatch.setattr(
+            session_cleanup,
+            "CLEANUP_STAGES",
+            (stages[0], ("scratch", broken, "global"), stages[2]),
+        )
+        session_cleanup.enqueue_cleanup_job([])
+        for attempt in range(session_cleanup.STAGE_MAX_ATTEMPTS):
+            assert job_files(), f"job dropped after {attempt} attempts"
+            session_cleanup.run_cleanup_worker()
+        session_cleanup.run_cleanup_worker()
+        assert job_files() == []
+        assert [name for name, _ in queue] == ["lessons", "serena"]
+
+    def test_hung_stage_interrupted(self, queue, monkeypatch):
+        import subprocess
+
+        def hung(job):
+            subprocess.run(["sleep", "30"])
+
+        stages = session_cleanup.CLEANUP_STAGES
+        monkeypatch.setattr(session_cleanup, "STAGE_TIMEOUT", 1)
+        monkeypatch.setattr(
+            session_cleanup,
+            "CLEANUP_STAGES",
+            (stages[0], ("scratch", hung, "global"), stages[2]),
+        )
+        path = session_cleanup.enqueue_cleanup_job([])
+        start = time.monotonic()
+        session_cleanup.run_cleanup_worker()
+        assert time.monotonic() - start < 10
+        assert [name for name, _ in queue] == ["lessons", "serena"]
+        assert json.loads(path.read_text())["stages"]["scratch"] == {
+            "status": "pending",
+            "attempts": 1,
+        }
+
+    def test_second_worker_defers_to_running_one(self, queue):
+        session_cleanup.enqueue_cleanup_job([])
+        lock_fd = os.open(str(session_cleanup.WORKER_LOCK), os.O_CREAT | os.O_RDWR)
+        try:
+            fcntl.flock(lock_fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            assert session_cleanup.run_cleanup_worker() == {}
+            assert queue == []
+            assert len(job_files()) == 1
+        finally:
+            fcntl.flock(lock_fd, fcntl.LOCK_UN)
+            os.close(lock_fd)
+
+    def test_corrupt_job_discarded(self, queue):
+        session_cleanup.JOBS_DIR.mkdir(parents=True)
+        (session_cleanup.JOBS_DIR / "job_1_1.json").write_text("{not json")
+        session_cleanup.run_cleanup_worker()
+        assert job_files() == []
+        assert queue == []
+
+
+class TestSummary:
+    """Tests for format_cleanup_summary()."""
+
+    def test_summary(self):
+        summary = session_cleanup.format_cleanup_summary(
+            {"scratch": 2, "thinking": {"indexed": 3, "pruned": 0}, "beads": {}}
+        )
+        assert summary == "🧹 Cleaned 2 scratch files, 3 thinking memories indexed"
+        assert session_cleanup.format_cleanup_summary({}) == ""
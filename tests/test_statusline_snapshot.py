@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""Tests for the statusline snapshot.
+
+Tests cover:
+- Stale field detection against per-field TTLs
+- Concurrent writers merge their fields without losing any
+- Refreshers are rate-limited by the last refresh time
+- Rendering with no snapshot falls back to placeholders
+"""
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+# Add hooks to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "hooks"))
+
+import _statusline_snapshot as snapshot_mod  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def snapshot_dir(tmp_path, monkeypatch):
+    directory = tmp_path / "statusline"
+    monkeypatch.setattr(snapshot_mod, "SNAPSHOT_DIR", directory)
+    return directory
+
+
+class TestSnapshot:
+    """Tests for loading, merging and staleness."""
+
+    def test_stale_fields(self):
+        now = time.time()
+        snapshot = {
+            "fields": {
+                "cpu": {"val": "1%", "ts": now},
+                "disk": {"val": "10%", "ts": now - 31},
+            }
+        }
+        stale = snapshot_mod.stale_fields(snapshot, now=now)
+        assert "cpu" not in stale
+        assert "disk" in stale
+        assert "git" in stale  # Missing
+        later = now + snapshot_mod.FIELD_TTL["cpu"]
+        assert "cpu" in snapshot_mod.stale_fields(snapshot, now=later)
+
+    def test_update_merges(self):
+        snapshot_mod.update_snapshot({"cpu": "1%"})
+        snapshot_mod.update_snapshot({"git": "main"}, context={"used": 5})
+        loaded = snapshot_mod.load_snapshot()
+        assert {k: v["val"] for k, v in loaded["fields"].items()} == {
+            "cpu": "1%",
+            "git": "main",
+        }
+        assert loaded["context"] == {"used": 5}
+        assert "refreshed_at" not in loaded
+
+    def test_concurrent_writers_keep_all_fields(self):
+        def writer(name):
+            for n in range(20):
+                snapshot_mod.update_snapshot({f"{name}{n}": n})
+
+        threads = [threading.Thread(target=writer, args=(c,)) for c in "abcd"]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert len(snapshot_mod.load_snapshot()["fields"]) == 80
+
+    def test_refresh_rate_limited(self):
+        assert snapshot_mod.refresh_due(snapshot_mod.load_snapshot())
+        snapshot_mod.update_snapshot({"cpu": "1%"}, refreshed=True)
+        snapshot = snapshot_mod.load_snapshot()
+        assert not snapshot_mod.refresh_due(snapshot)
+        later = time.time() + snapshot_mod.REFRESH_MIN_INTERVAL
+        assert snapshot_mod.refresh_due(snapshot, now=later)
+
+
+class TestRender:
+    """Tests for statusline.py rendering and refresh scheduling."""
+
+    def test_render_without_snapshot(self):
+        import statusline
+
+        rendered = statusline.render({}, snapshot_mod.load_snapshot())
+        line1, line2 = rendered.split("\n")
+        assert "CPU:" in line1 and "--" in line1
+        assert "$200K" in line1
+        assert Path.cwd().name in line2
+
+    def test_main_skips_spawn_after_recent_refresh(self, monkeypatch, capsys):
+        import io
+
+        import statusline
+
+        spawned = []
+        monkeypatch.setattr(
+            statusline, "spawn_refresher", lambda *args: spawned.append(args)
+        )
+        monkeypatch.setattr(sys, "argv", ["statusline.py"])
+
+        monkeypatch.setattr(sys, "stdin", io.StringIO("{}"))
+        statusline.main()
+        assert len(spawned) == 1
+
+        snapshot_mod.update_snapshot({}, refreshed=True)
+        monkeypatch.setattr(sys, "stdin", io.StringIO("{}"))
+        statusline.main()
+        assert len(spawned) == 1
+        assert "CPU:" in capsys.readouterr().out
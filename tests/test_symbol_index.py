@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+"""Tests for symbol_index module.
+
+Tests cover:
+- Symbol extraction (qualnames, spans, decorators, call-site callers)
+- Incremental refresh: only changed files are re-parsed
+- Touched-but-identical files are not re-parsed
+- Deleted files drop out of the index
+- Process-pool first build matches the serial build
+- Single-file updates go to a journal that refresh() folds back in
+- xray-style queries, including decorator search
+- Reverse call graph and read-only integration-grep resolution
+"""
+
+import os
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+# Add lib to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "lib"))
+
+import _session_batch  # noqa: E402
+import symbol_index  # noqa: E402
+from symbol_index import SymbolIndex, extract_symbols, find_root  # noqa: E402
+
+MODULE = """\
+import os
+from json import loads as jl
+
+
+@dataclass
+class Config(Base):
+    \"\"\"Settings.\"\"\"
+
+    @property
+    def path(self):
+        return os.path.join("a")
+
+
+def load(raw, *args, **kw):
+    return jl(raw)
+"""
+
+
+@pytest.fixture
+def project(tmp_path):
+    root = tmp_path / "proj"
+    (root / "pkg").mkdir(parents=True)
+    (root / "pkg" / "mod.py").write_text(MODULE)
+    (root / "pkg" / "other.py").write_text("def helper():\n    load(1)\n")
+    (root / "__pycache__").mkdir()
+    (root / "__pycache__" / "skip.py").write_text("def hidden():\n    pass\n")
+    return root
+
+
+@pytest.fixture
+def make_index(tmp_path):
+    def _make(root):
+        return SymbolIndex(root, cache_dir=tmp_path / "cache")
+
+    return _make
+
+
+@pytest.fixture
+def parse_counter(monkeypatch):
+    calls = {"n": 0}
+    real = symbol_index.extract_symbols
+
+    def counting(*args, **kwargs):
+        calls["n"] += 1
+        return real(*args, **kwargs)
+
+    monkeypatch.setattr(symbol_index, "extract_symbols", counting)
+    return calls
+
+
+class TestExtraction:
+    """Tests for per-file symbol records."""
+
+    def test_definitions(self):
+        symbols = extract_symbols(MODULE)
+        cls = next(s for s in symbols if s["type"] == "class")
+        assert (cls["bases"], cls["decorators"], cls["docstring"]) == (
+            ["Base"],
+            ["dataclass"],
+            "Settings.",
+        )
+        funcs = {s["qualname"]: s for s in symbols if s["type"] == "function"}
+        assert funcs["Config.path"]["decorators"] == ["property"]
+        assert funcs["load"]["args"] == ["raw", "*args", "**kw"]
+        assert (funcs["load"]["lineno"], funcs["load"]["end_lineno"]) == (14, 15)
+
+    def test_calls_record_enclosing_scope(self):
+        calls = {
+            s["name"]: s["caller"]
+            for s in extract_symbols(MODULE)
+            if s["type"] == "call"
+        }
+        assert calls == {"join": "Config.path", "jl": "load"}
+
+    def test_syntax_error_is_empty(self):
+        assert extract_symbols("def broken(:\n") == []
+
+
+class TestIncremental:
+    """Tests for refresh bookkeeping."""
+
+    def test_first_build_then_noop(self, project, make_index, parse_counter):
+        assert make_index(project).refresh()["parsed"] == 2
+        stats = make_index(project).refresh()
+        assert stats == {"files": 2, "parsed": 0, "removed": 0, "deferred": 0}
+        assert parse_counter["n"] == 2
+
+    def test_only_changed_file_reparsed(self, project, make_index, parse_counter):
+        make_index(project).refresh()
+        (project / "pkg" / "other.py").write_text("def helper2():\n    pass\n")
+        index = make_index(project)
+        assert index.refresh()["parsed"] == 1
+        assert parse_counter["n"] == 3
+        assert [s["name"] for s in index.query("def", "helper")] == ["helper2"]
+
+    def test_touch_without_change_skips_parse(self, project, make_index, parse_counter):
+        make_index(project).refresh()
+        path = project / "pkg" / "mod.py"
+        st = path.stat()
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+        assert make_index(project).refresh()["parsed"] == 0
+        assert parse_counter["n"] == 2
+
+    def test_deleted_file_removed(self, project, make_index):
+        make_index(project).refresh()
+        (project / "pkg" / "other.py").unlink()
+        index = make_index(project)
+        assert index.refresh()["removed"] == 1
+        assert index.query("def", "helper") == []
+
+    def test_update_file(self, project, make_index):
+        index = make_index(project)
+        index.refresh()
+        (project / "pkg" / "new.py").write_text("class Fresh:\n    pass\n")
+        assert index.update_file(project / "pkg" / "new.py")
+        assert not index.update_file(project / "pkg" / "new.py")
+        assert make_index(project).query("class", "Fresh")
+
+    def test_update_journals_instead_of_saving(self, project, make_index):
+        (project / ".git").mkdir()
+        index = make_index(project)
+        index.refresh()
+        saved = index.path.read_bytes()
+        (project / "pkg" / "other.py").write_text("def helper2():\n    pass\n")
+        assert symbol_index.record_write(
+            project / "pkg" / "other.py", index.path.parent
+        )
+        (project / "pkg" / "mod.py").unlink()
+        assert make_index(project).update_file(project / "pkg" / "mod.py")
+        assert index.path.read_bytes() == saved
+        reloaded = make_index(project)
+        assert [s["name"] for s in reloaded.query("def", "helper")] == ["helper2"]
+        assert reloaded.query("class", "Config") == []
+
+    def test_refresh_folds_journal(self, project, make_index, parse_counter):
+        make_index(project).refresh()
+        (project / "pkg" / "other.py").write_text("def helper2():\n    pass\n")
+        make_index(project).update_file(project / "pkg" / "other.py")
+        index = make_index(project)
+        assert index.refresh()["parsed"] == 0  # Journaled entry is current
+        assert parse_counter["n"] == 3
+        assert not index.journal_path.exists()
+        assert make_index(project).query("def", "helper2")
+
+    def test_stale_journal_record_ignored(self, project, make_index):
+        make_index(project).refresh()
+        path = project / "pkg" / "other.py"
+        path.write_text("def helper2():\n    pass\n")
+        make_index(project).update_file(path)
+        journal = make_index(project).journal_path.read_bytes()
+        path.write_text("def helper3():\n    pass\n")
+        st = path.stat()
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+        make_index(project).refresh()
+        make_index(project).journal_path.write_bytes(journal)  # Lost the race
+        assert [s["name"] for s in make_index(project).query("def", "helper")] == [
+            "helper3"
+        ]
+
+    def test_record_write_needs_built_index(self, project, tmp_path):
+        cache = tmp_path / "cache"
+        assert not symbol_index.record_write(project / "pkg" / "mod.py", cache)
+        assert not cache.exists()
+
+    def test_process_pool_matches_serial(self, project, tmp_path, monkeypatch):
+        monkeypatch.setattr(symbol_index, "PARALLEL_MIN_FILES", 1)
+        monkeypatch.setattr(symbol_index.os, "cpu_count", lambda: 2)
+        pooled = SymbolIndex(project, cache_dir=tmp_path / "a")
+        pooled.refresh()
+        serial = SymbolIndex(project, cache_dir=tmp_path / "b")
+        serial.refresh(parallel=False)
+        assert pooled.files == serial.files
+
+
+class TestQuery:
+    """Tests for xray-style queries."""
+
+    def test_decorator_search(self, project, make_index):
+        index = make_index(project)
+        index.refresh()
+        assert [s["name"] for s in index.query("decorator", "dataclass")] == ["Config"]
+        assert {s["name"] for s in index.query("decorator")} == {"Config", "path"}
+
+    def test_import_from_matches_full_name(self, project, make_index):
+        index = make_index(project)
+        index.refresh()
+        (hit,) = index.query("import", r"json\.loads")
+        assert (hit["module"], hit["alias"]) == ("json", "jl")
+
+    def test_under_restricts_path(self, project, make_index):
+        index = make_index(project)
+        index.refresh()
+        hits = index.query("call", "load", under=project / "pkg" / "other.py")
+        assert [Path(h["filepath"]).name for h in hits] == ["other.py"]
+
+
+class TestCallerGraph:
+    """Tests for callers() and integration-grep resolution."""
+
+    def test_callers_across_files(self, project, make_index):
+        index = make_index(project)
+        index.refresh()
+        sites = index.callers("load")
+        assert [(s["filepath"], s["caller"]) for s in sites] == [
+            (os.path.join("pkg", "other.py"), "helper")
+        ]
+        assert [s["caller"] for s in index.callers("jl")] == ["load"]
+
+    def test_graph_follows_updates(self, project, make_index):
+        index = make_index(project)
+        index.refresh()
+        assert index.callers("load")
+        (project / "pkg" / "other.py").write_text("def helper():\n    pass\n")
+        index.update_file(project / "pkg" / "other.py")
+        assert index.callers("load") == []
+
+    def test_find_root(self, project):
+        (project / ".git").mkdir()
+        assert find_root(project / "pkg" / "mod.py") == project.resolve()
+
+    def test_resolve_pending_grep(self, project, tmp_path, monkeypatch):
+        (project / ".git").mkdir()
+        monkeypatch.setattr(symbol_index, "CACHE_DIR", tmp_path / "cache")
+        SymbolIndex(project).refresh()
+        state = SimpleNamespace(
+            turn_count=5,
+            grepped_functions={},
+            pending_integration_greps=[
+                {
+                    "function": "load",
+                    "file": str(project / "pkg" / "mod.py"),
+                    "turn": 5,
+                },
+                {"function": "render", "file": "/elsewhere/app.ts", "turn": 5},
+            ],
+        )
+        context = _session_batch.resolve_integration_callers(state)
+        assert "pkg/other.py:2 in `helper`" in context
+        assert [p["function"] for p in state.pending_integration_greps] == ["render"]
+
+    def test_resolve_keeps_overlapping_names(self, project, tmp_path, monkeypatch):
+        (project / ".git").mkdir()
+        monkeypatch.setattr(symbol_index, "CACHE_DIR", tmp_path / "cache")
+        (project / "pkg" / "runner.py").write_text(
+            "def run():\n    pass\n\n\ndef rerun():\n    run()\n"
+        )
+        SymbolIndex(project).refresh()
+        state = SimpleNamespace(
+            turn_count=5,
+            grepped_functions={},
+            pending_integration_greps=[
+                {
+                    "function": "run",
+                    "file": str(project / "pkg" / "runner.py"),
+                    "turn": 5,
+                },
+                {"function": "run_tests", "file": "/elsewhere/run.ts", "turn": 5},
+                {"function": "rerun", "file": "/elsewhere/rerun.go", "turn": 5},
+            ],
+        )
+        context = _session_batch.resolve_integration_callers(
+            state, str(project / "pkg" / "runner.py")
+        )
+        assert "Callers of `run`" in context
+        assert [p["function"] for p in state.pending_integration_greps] == [
+            "run_tests",
+            "rerun",
+        ]
+        assert state.grepped_functions == {"run": 5}
+
+    def test_unbuilt_index_falls_back_to_grep(self, project, tmp_path, monkeypatch):
+        monkeypatch.setattr(symbol_index, "CACHE_DIR", tmp_path / "cache")
+        state = SimpleNamespace(
+            turn_count=5,
+            grepped_functions={},
+            pending_integration_greps=[
+                {"function": "load", "file": str(project / "pkg" / "mod.py"), "turn": 5}
+            ],
+        )
+        assert _session_batch.resolve_integration_callers(state) == ""
+        assert len(state.pending_integration_greps) == 1
+        assert not (tmp_path / "cache").exists()  # Not built on the hot path
+
+    def test_resolve_never_walks(self, project, tmp_path, monkeypatch):
+        (project / ".git").mkdir()
+        monkeypatch.setattr(symbol_index, "CACHE_DIR", tmp_path / "cache")
+        SymbolIndex(project).refresh()
+        (project / "pkg" / "late.py").write_text("def late():\n    load(2)\n")
+        symbol_index.record_write(project / "pkg" / "late.py")
+
+        def no_walk(self):
+            raise AssertionError("walked the tree")
+
+        monkeypatch.setattr(SymbolIndex, "_walk", no_walk)
+        state = SimpleNamespace(
+            turn_count=5,
+            grepped_functions={},
+            pending_integration_greps=[
+                {"function": "load", "file": str(project / "pkg" / "mod.py"), "turn": 5}
+            ],
+        )
+        context = _session_batch.resolve_integration_callers(state)
+        assert "pkg/late.py:2 in `late`" in context
+        assert "pkg/other.py:2 in `helper`" in context
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""Tests for the hook task graph runner.
+
+Tests cover:
+- Independent tasks run concurrently
+- Dependents receive upstream results, after upstream finishes
+- Per-task timeouts and errors fall back to defaults without blocking
+- The overall budget skips unstarted work
+- Uncapped (timeout=None) tasks are waited for, even past the budget
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+# Add hooks to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "hooks"))
+
+from _task_graph import Task, run_tasks  # noqa: E402
+
+
+def sleeper(seconds, value):
+    def run(results):
+        time.sleep(seconds)
+        return value
+
+    return run
+
+
+def statuses(timings):
+    return {t["name"]: t["status"] for t in timings}
+
+
+class TestScheduling:
+    """Tests for dependency ordering and concurrency."""
+
+    def test_independent_tasks_overlap(self):
+        start = time.monotonic()
+        results, timings = run_tasks(
+            [Task(f"t{i}", sleeper(0.3, i)) for i in range(3)],
+        )
+        assert time.monotonic() - start < 0.8
+        assert results == {"t0": 0, "t1": 1, "t2": 2}
+        assert set(statuses(timings).values()) == {"ok"}
+
+    def test_dependents_see_upstream_results(self):
+        order = []
+        results, timings = run_tasks(
+            [
+                Task("b", lambda r: order.append("b") or r["a"] + 1, deps=("a",)),
+                Task("a", lambda r: order.append("a") or 1),
+            ]
+        )
+        assert results == {"a": 1, "b": 2}
+        assert order == ["a", "b"]
+        assert [t["name"] for t in timings] == ["a", "b"]
+
+    def test_unknown_dependency_rejected(self):
+        with pytest.raises(ValueError):
+            run_tasks([Task("a", lambda r: 1, deps=("missing",))])
+
+    def test_cycle_skipped(self):
+        results, timings = run_tasks(
+            [
+                Task("a", lambda r: 1, deps=("b",), default="x"),
+                Task("b", lambda r: 2, deps=("a",)),
+            ]
+        )
+        assert results == {"a": "x", "b": None}
+        assert statuses(timings) == {"a": "skipped", "b": "skipped"}
+
+
+class TestFailures:
+    """Tests for timeouts, errors and the overall budget."""
+
+    def test_timeout_uses_default_and_dependents_run(self):
+        start = time.monotonic()
+        results, timings = run_tasks(
+            [
+                Task("slow", sleeper(2.0, "late"), timeout=0.1, default="fallback"),
+                Task("next", lambda r: f"got {r['slow']}", deps=("slow",)),
+            ]
+        )
+        assert time.monotonic() - start < 1.0
+        assert results == {"slow": "fallback", "next": "got fallback"}
+        assert statuses(timings) == {"slow": "timeout", "next": "ok"}
+
+    def test_error_uses_default(self):
+        results, timings = run_tasks([Task("bad", lambda r: 1 / 0, default=0)])
+        assert results == {"bad": 0}
+        assert statuses(timings) == {"bad": "error"}
+
+    def test_budget_skips_unstarted(self):
+        start = time.monotonic()
+        results, timings = run_tasks(
+            [
+                Task("slow", sleeper(2.0, 1), timeout=5.0),
+                Task("after", lambda r: 2, deps=("slow",)),
+                Task("quick", lambda r: 3),
+            ],
+            budget=0.2,
+        )
+        assert time.monotonic() - start < 1.0
+        assert results == {"slow": None, "after": None, "quick": 3}
+        assert statuses(timings) == {
+            "slow": "timeout",
+            "after": "skipped",
+            "quick": "ok",
+        }
+
+    def test_uncapped_task_outlives_budget(self):
+        finished = []
+
+        def write_state(results):
+            time.sleep(0.3)
+            finished.append("state")
+            return "saved"
+
+        results, timings = run_tasks(
+            [
+                Task("state", write_state, timeout=None),
+                Task("slow", sleeper(2.0, 1), timeout=5.0),
+                Task("after", lambda r: 2, deps=("state",)),
+            ],
+            budget=0.1,
+        )
+        assert finished == ["state"]
+        assert results["state"] == "saved"
+        assert statuses(timings) == {
+            "state": "ok",
+            "slow": "timeout",
+            "after": "skipped",
+        }
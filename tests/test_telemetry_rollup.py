@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""Tests for buffered mastermind telemetry with daily rollups.
+
+Tests cover:
+- Events are buffered until flush (or the buffer fills)
+- Flushes fold events into per-day rollups; fleet reports read only those
+- Per-session reports match the fleet report for a single session
+- Size-based rotation moves files to archive/ without losing events
+- Pre-rollup telemetry directories are backfilled once
+- Pruning deletes old raw files but keeps the rollups
+"""
+
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+# Add lib to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "lib"))
+
+from mastermind import telemetry  # noqa: E402
+from mastermind.config import MastermindConfig  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def telemetry_dir(tmp_path, monkeypatch):
+    directory = tmp_path / "telemetry"
+    monkeypatch.setattr(telemetry, "TELEMETRY_DIR", directory)
+    monkeypatch.setattr(telemetry, "get_config", MastermindConfig)
+    telemetry._buffer.clear()
+    yield directory
+    telemetry._buffer.clear()
+    telemetry._buffered_count = 0
+
+
+def route(session_id, classification, stuck=False, confidence=0.8):
+    telemetry.log_router_decision(
+        session_id,
+        1,
+        classification,
+        confidence,
+        [],
+        10,
+        context_signals={"stuck_loop": stuck, "agent_confidence": 50},
+    )
+
+
+def fire(session_id, breaker, action, tool="Read"):
+    telemetry.log_circuit_breaker_fire(session_id, 1, breaker, action, 3, 4, tool)
+
+
+class TestBuffering:
+    """Tests for buffered writes."""
+
+    def test_events_written_on_flush(self, telemetry_dir):
+        route("s1", "trivial")
+        route("s1", "medium")
+        path = telemetry_dir / "s1.jsonl"
+        assert not path.exists()
+
+        telemetry.flush()
+        lines = path.read_text().splitlines()
+        assert [json.loads(line)["data"]["classification"] for line in lines] == [
+            "trivial",
+            "medium",
+        ]
+
+    def test_full_buffer_flushes(self, telemetry_dir, monkeypatch):
+        monkeypatch.setattr(telemetry, "BUFFER_MAX_EVENTS", 3)
+        for _ in range(3):
+            route("s1", "trivial")
+        assert len((telemetry_dir / "s1.jsonl").read_text().splitlines()) == 3
+
+    def test_readers_see_buffered_events(self):
+        route("s1", "complex")
+        assert len(telemetry.read_session_telemetry("s1")) == 1
+
+
+class TestRollups:
+    """Tests for the daily aggregates."""
+
+    def test_fleet_reports_read_rollups(self, telemetry_dir):
+        route("s1", "trivial", stuck=True)
+        route("s2", "complex", confidence=0.6)
+        fire("s1", "exploration", "block")
+        fire("s2", "exploration", "bypass", tool="")
+        telemetry.flush()
+
+        # Raw events gone: reports still come from the rollups
+        for path in telemetry_dir.glob("*.jsonl"):
+            path.unlink()
+
+        analysis = telemetry.get_routing_analysis()
+        assert analysis["event_count"] == 2
+        assert analysis["classification_distribution"] == {"trivial": 1, "complex": 1}
+        assert analysis["context_signal_correlation"]["trivial"]["stuck_loop"] == 1
+        assert analysis["average_confidence_by_class"] == {
+            "trivial": 0.8,
+            "complex": 0.6,
+        }
+        assert any("stuck_loop" in s for s in analysis["suggested_adjustments"])
+
+        stats = telemetry.get_circuit_breaker_stats()
+        assert stats["total_events"] == 2
+        assert stats["by_breaker"]["exploration"] == {
+            "block": 1,
+            "warn": 0,
+            "bypass": 1,
+        }
+        assert stats["tools_blocked"] == {"Read": 1}
+        assert stats["effectiveness_pct"] == 50.0
+
+    def test_rollups_are_per_day_and_incremental(self, telemetry_dir):
+        route("s1", "trivial")
+        telemetry.flush()
+        route("s1", "medium")
+        telemetry.flush()
+
+        rollups = list((telemetry_dir / "rollup").glob("*.json"))
+        assert len(rollups) == 1
+        data = json.loads(rollups[0].read_text())
+        assert data["router"]["classifications"] == {"trivial": 1, "medium": 1}
+        assert data["sessions"] == ["s1"]
+
+    def test_days_window(self, telemetry_dir):
+        route("s1", "trivial")
+        telemetry.flush()
+        old = telemetry_dir / "rollup" / "2000-01-01.json"
+        rollup = telemetry._empty_rollup()
+        rollup["router"]["count"] = 5
+        rollup["router"]["classifications"] = {"complex": 5}
+        old.write_text(json.dumps(rollup))
+
+        assert telemetry.get_routing_analysis()["event_count"] == 6
+        assert telemetry.get_routing_analysis(days=7)["event_count"] == 1
+
+    def test_session_report_matches_raw(self):
+        route("s1", "trivial")
+        route("s2", "complex")
+        telemetry.log_pal_continuation_event("s1", 1, "debug", "reused")
+        telemetry.log_pal_continuation_event("s1", 2, "debug", "wasted")
+
+        assert telemetry.get_routing_analysis("s1")["classification_distribution"] == {
+            "trivial": 1
+        }
+        session = telemetry.get_continuation_reuse_stats("s1")
+        fleet = telemetry.get_continuation_reuse_stats()
+        assert session["reuse_rate_pct"] == fleet["reuse_rate_pct"] == 50.0
+        assert fleet["session_count"] == 2
+
+    def test_legacy_directory_backfilled_once(self, telemetry_dir):
+        telemetry_dir.mkdir()
+        event = {
+            "event_type": "router_decision",
+            "session_id": "old",
+            "timestamp": time.time(),
+            "turn": 1,
+            "data": {"classification": "medium", "confidence": 0.5},
+        }
+        (telemetry_dir / "old.jsonl").write_text(json.dumps(event) + "\n")
+
+        route("new", "trivial")
+        telemetry.flush()
+        telemetry.flush()
+        analysis = telemetry.get_routing_analysis()
+        assert analysis["classification_distribution"] == {"medium": 1, "trivial": 1}
+
+
+class TestRotation:
+    """Tests for rotation and retention."""
+
+    def test_size_rotation_keeps_session_history(self, telemetry_dir, monkeypatch):
+        monkeypatch.setattr(telemetry, "ROTATE_MAX_BYTES", 1)
+        route("s1", "trivial")
+        telemetry.flush()
+        route("s1", "medium")
+        telemetry.flush()
+
+        assert len(list((telemetry_dir / "archive").glob("s1.*.jsonl"))) == 1
+        events = telemetry.read_session_telemetry("s1")
+        assert [e.data["classification"] for e in events] == ["trivial", "medium"]
+
+    def test_age_rotation(self, telemetry_dir):
+        route("s1", "trivial")
+        telemetry.flush()
+        path = telemetry_dir / "s1.jsonl"
+        event = json.loads(path.read_text())
+        event["timestamp"] -= (telemetry.ROTATE_MAX_AGE_HOURS + 1) * 3600
+        path.write_text(json.dumps(event) + "\n")
+
+        route("s1", "medium")
+        telemetry.flush()
+        assert len(path.read_text().splitlines()) == 1
+        assert list((telemetry_dir / "archive").glob("s1.*.jsonl"))
+
+    def test_prune_keeps_rollups(self, telemetry_dir):
+        route("s1", "trivial")
+        route("s2", "medium")
+        telemetry.flush()
+        past = time.time() - (telemetry.RAW_RETENTION_DAYS + 1) * 86400
+        os.utime(telemetry_dir / "s1.jsonl", (past, past))
+
+        assert telemetry.prune_telemetry() == 1
+        assert not (telemetry_dir / "s1.jsonl").exists()
+        assert telemetry.get_routing_analysis()["event_count"] == 2